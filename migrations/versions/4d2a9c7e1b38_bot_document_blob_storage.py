@@ -0,0 +1,35 @@
+"""move bot document bytes to the blob store: storage reference columns
+
+Revision ID: 4d2a9c7e1b38
+Revises: bcb130a16354
+Create Date: 2026-10-18 13:05:17.482903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d2a9c7e1b38'
+down_revision: Union[str, None] = 'bcb130a16354'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # file_data stays until document_blob_migrator has moved every row to the blob store
+    op.add_column('bot_documents', sa.Column('storage_key', sa.String(length=512), nullable=True))
+    op.add_column('bot_documents', sa.Column('file_size', sa.BigInteger(), nullable=True))
+    op.add_column('bot_documents', sa.Column('checksum', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('uq_bot_documents_storage_key', 'bot_documents', ['storage_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_bot_documents_storage_key', 'bot_documents', type_='unique')
+    op.drop_column('bot_documents', 'checksum')
+    op.drop_column('bot_documents', 'file_size')
+    op.drop_column('bot_documents', 'storage_key')
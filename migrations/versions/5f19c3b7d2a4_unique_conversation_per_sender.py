@@ -0,0 +1,87 @@
+"""merge duplicate conversations and make (bot_uid, platform, sender_id) unique
+
+Revision ID: 5f19c3b7d2a4
+Revises: e8a41c7d3b52
+Create Date: 2026-10-18 18:05:12.204113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f19c3b7d2a4'
+down_revision: Union[str, None] = 'e8a41c7d3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The oldest conversation of every (bot_uid, platform, sender_id) is kept, the others are merged into it
+    op.execute("""
+        CREATE TEMPORARY TABLE conversation_merge ON COMMIT DROP AS
+        SELECT uid AS duplicate_uid, keeper_uid
+        FROM (
+            SELECT uid, first_value(uid) OVER (
+                PARTITION BY bot_uid, platform, sender_id ORDER BY created_at, uid
+            ) AS keeper_uid
+            FROM conversations
+        ) ranked
+        WHERE uid <> keeper_uid
+    """)
+    # A platform message stored in two of the duplicates would break uq_messages_conversation_uid_external_id
+    op.execute("""
+        DELETE FROM messages
+        USING (
+            SELECT m.uid, row_number() OVER (
+                PARTITION BY COALESCE(cm.keeper_uid, m.conversation_uid), m.external_id ORDER BY m.timestamp, m.uid
+            ) AS copy_number
+            FROM messages m
+            LEFT JOIN conversation_merge cm ON cm.duplicate_uid = m.conversation_uid
+            WHERE m.external_id IS NOT NULL
+              AND m.conversation_uid IN (
+                  SELECT duplicate_uid FROM conversation_merge UNION SELECT keeper_uid FROM conversation_merge
+              )
+        ) copies
+        WHERE messages.uid = copies.uid AND copies.copy_number > 1
+    """)
+    op.execute("""
+        UPDATE messages SET conversation_uid = cm.keeper_uid
+        FROM conversation_merge cm
+        WHERE messages.conversation_uid = cm.duplicate_uid
+    """)
+    op.execute("""
+        UPDATE conversations SET
+            updated_at = GREATEST(conversations.updated_at, merged.updated_at),
+            crm_catalog_id = COALESCE(conversations.crm_catalog_id, merged.crm_catalog_id),
+            sender_number = COALESCE(conversations.sender_number, merged.sender_number),
+            sender_nickname = COALESCE(conversations.sender_nickname, merged.sender_nickname)
+        FROM (
+            SELECT cm.keeper_uid, MAX(c.updated_at) AS updated_at, MAX(c.crm_catalog_id) AS crm_catalog_id,
+                   MAX(c.sender_number) AS sender_number, MAX(c.sender_nickname) AS sender_nickname
+            FROM conversation_merge cm
+            JOIN conversations c ON c.uid = cm.duplicate_uid
+            GROUP BY cm.keeper_uid
+        ) merged
+        WHERE conversations.uid = merged.keeper_uid
+    """)
+    op.execute("""
+        DELETE FROM conversations
+        USING conversation_merge cm
+        WHERE conversations.uid = cm.duplicate_uid
+    """)
+    op.create_index(
+        'uq_conversations_bot_uid_platform_sender_id',
+        'conversations',
+        ['bot_uid', 'platform', 'sender_id'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Merged conversations are not split again
+    op.drop_index('uq_conversations_bot_uid_platform_sender_id', table_name='conversations')
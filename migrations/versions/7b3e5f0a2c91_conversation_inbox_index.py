@@ -0,0 +1,33 @@
+"""add conversation inbox keyset index
+
+Revision ID: 7b3e5f0a2c91
+Revises: 4d2a9c7e1b38
+Create Date: 2026-10-18 13:05:27.418903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e5f0a2c91'
+down_revision: Union[str, None] = '4d2a9c7e1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_conversations_bot_uid_updated_at_uid',
+        'conversations',
+        ['bot_uid', sa.text('updated_at DESC'), sa.text('uid DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conversations_bot_uid_updated_at_uid', table_name='conversations')
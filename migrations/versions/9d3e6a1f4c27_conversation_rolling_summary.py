@@ -0,0 +1,35 @@
+"""add rolling conversation summary and bot summarization threshold
+
+Revision ID: 9d3e6a1f4c27
+Revises: 5f19c3b7d2a4
+Create Date: 2026-10-18 19:41:07.532816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3e6a1f4c27'
+down_revision: Union[str, None] = '5f19c3b7d2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bots', sa.Column('summarize_after_messages', sa.Integer(), nullable=True))
+    op.add_column('conversations', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('summarized_until', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('conversations', sa.Column('summarized_until_uid', postgresql.UUID(as_uuid=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('conversations', 'summarized_until_uid')
+    op.drop_column('conversations', 'summarized_until')
+    op.drop_column('conversations', 'summary')
+    op.drop_column('bots', 'summarize_after_messages')
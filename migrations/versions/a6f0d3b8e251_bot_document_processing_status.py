@@ -0,0 +1,40 @@
+"""track text extraction and indexing of bot documents
+
+Revision ID: a6f0d3b8e251
+Revises: c27b5e94a1d8
+Create Date: 2026-10-18 23:04:17.520931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f0d3b8e251'
+down_revision: Union[str, None] = 'c27b5e94a1d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing documents were never indexed, so they start as pending (see document_index_backfill)
+    op.add_column('bot_documents', sa.Column('status', sa.String(length=16), server_default='pending', nullable=False))
+    op.add_column('bot_documents', sa.Column('status_error', sa.String(length=500), nullable=True))
+    op.add_column('bot_documents', sa.Column('chunk_count', sa.Integer(), nullable=True))
+    op.add_column('bot_documents', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(
+        'ix_bot_documents_unprocessed', 'bot_documents', ['status'],
+        postgresql_where=sa.text("status IN ('pending', 'processing')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bot_documents_unprocessed', table_name='bot_documents')
+    op.drop_column('bot_documents', 'content_hash')
+    op.drop_column('bot_documents', 'chunk_count')
+    op.drop_column('bot_documents', 'status_error')
+    op.drop_column('bot_documents', 'status')
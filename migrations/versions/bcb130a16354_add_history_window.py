@@ -0,0 +1,40 @@
+"""add bot history window and message tail index
+
+Revision ID: bcb130a16354
+Revises: e605875fc218
+Create Date: 2026-10-18 10:12:41.305112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bcb130a16354'
+down_revision: Union[str, None] = 'e605875fc218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing bots get the default window; the server default is dropped afterwards
+    # so new rows take the ORM-side default.
+    op.add_column('bots', sa.Column('history_window_messages', sa.Integer(), server_default='50', nullable=True))
+    op.alter_column('bots', 'history_window_messages', server_default=None)
+    op.add_column('bots', sa.Column('history_token_budget', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_messages_conversation_uid_timestamp_desc',
+        'messages',
+        ['conversation_uid', sa.text('timestamp DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_messages_conversation_uid_timestamp_desc', table_name='messages')
+    op.drop_column('bots', 'history_token_budget')
+    op.drop_column('bots', 'history_window_messages')
@@ -0,0 +1,30 @@
+"""add per-bot response cache settings
+
+Revision ID: c27b5e94a1d8
+Revises: 9d3e6a1f4c27
+Create Date: 2026-10-18 21:12:44.903517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27b5e94a1d8'
+down_revision: Union[str, None] = '9d3e6a1f4c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bots', sa.Column('response_cache_ttl_seconds', sa.Integer(), nullable=True))
+    op.add_column('bots', sa.Column('response_cache_history_messages', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bots', 'response_cache_history_messages')
+    op.drop_column('bots', 'response_cache_ttl_seconds')
@@ -0,0 +1,28 @@
+"""add bot reply coalescing window
+
+Revision ID: c2d84f6a9e13
+Revises: 7b3e5f0a2c91
+Create Date: 2026-10-18 14:05:12.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d84f6a9e13'
+down_revision: Union[str, None] = '7b3e5f0a2c91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bots', sa.Column('coalesce_window_ms', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bots', 'coalesce_window_ms')
@@ -0,0 +1,33 @@
+"""add message external id for idempotent ingestion
+
+Revision ID: e8a41c7d3b52
+Revises: c2d84f6a9e13
+Create Date: 2026-10-18 16:22:40.513977
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a41c7d3b52'
+down_revision: Union[str, None] = 'c2d84f6a9e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('messages', sa.Column('external_id', sa.String(), nullable=True))
+    # NULLs are distinct, so replies and messages without a platform id never collide
+    op.create_unique_constraint(
+        'uq_messages_conversation_uid_external_id', 'messages', ['conversation_uid', 'external_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_messages_conversation_uid_external_id', 'messages', type_='unique')
+    op.drop_column('messages', 'external_id')
@@ -4,14 +4,15 @@ from fastapi import FastAPI
 from src.di_container import ApplicationContainer, initialize_identity_container, initialize_notification_container, \
     initialize_application_container, initialize_bot_container, initialize_telegram_container, \
     initialize_conversation_container, initialize_announcement_container, initialize_support_container, \
-    initialize_platform_price_container
+    initialize_platform_price_container, shutdown_conversation_container, shutdown_telegram_container, \
+    shutdown_bot_container
 from src.app_wiring import get_modules_to_wire
 from src.infra.persistence.models.models_loader import import_all_orm_models # NEW import
 from src.infra.startup_checks import check_redis_connection, check_celery_connection # NEW import
 
 # Using standard logging for initial messages if async_logger isn't fully configured yet
 # The specific logger for this module.
-from src.infra.logging.setup_async_logging import setup_async_logging, async_logger
+from src.infra.logging.setup_async_logging import setup_async_logging, async_logger, shutdown_async_logging
 
 logger = async_logger
 
@@ -72,3 +73,9 @@ async def lifespan(app: FastAPI):
     # Shutdown events can be added here if needed
     logger.info("FastAPI application lifespan: Shutdown initiated.")
 
+    await shutdown_telegram_container(app_container)
+    await shutdown_conversation_container(app_container)
+    await shutdown_bot_container(app_container)
+
+    # Must stay last: drains the buffered database log records, including the line above.
+    await shutdown_async_logging()
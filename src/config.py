@@ -7,6 +7,9 @@ class Settings(BaseSettings):
     REDIS_URL: str
     EXTERNAL_LIBRARY_LEVEL_LOG: Optional[str] = "WARNING"
     LOG_LEVEL: str = "INFO"
+    LOG_DB_BATCH_SIZE: int = 500
+    LOG_DB_FLUSH_INTERVAL: float = 1.0
+    LOG_DB_MAX_BUFFER: int = 10000
     # OPENAI_API_KEY: str
     #
     REFRESH_TOKEN_EXPIRY_DAYS: int = 30
@@ -51,6 +54,10 @@ class Settings(BaseSettings):
     AWS_SECRET_KEY: str
     AWS_BUCKET_NAME: str
     AWS_REGION: str
+    S3_MULTIPART_PART_SIZE: int = 8 * 1024 * 1024
+    S3_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    BOT_DOCUMENT_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    BOT_DOCUMENT_KEY_PREFIX: str = "bot_documents"
 
     SECRET_KEY: str
     TOKEN_RESET_SALT: str
@@ -59,9 +66,101 @@ class Settings(BaseSettings):
     LLM_API_URL: str
     LLM_API_KEY: str
     LLM_MODEL: str
+    LLM_HTTP_POOL_LIMIT: int = 100
+    LLM_HTTP_POOL_LIMIT_PER_HOST: int = 20
+    LLM_HTTP_DNS_CACHE_TTL: int = 300
+    LLM_HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    LLM_HTTP_CONNECT_TIMEOUT: float = 10.0
+    LLM_HTTP_TOTAL_TIMEOUT: float = 120.0
+    LLM_API_URLS: str = ""  # Comma-separated backend endpoints; empty uses LLM_API_URL alone
+    LLM_REQUEST_TIMEOUT: float = 60.0
+    LLM_RETRY_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BACKOFF_BASE: float = 0.25
+    LLM_RETRY_BACKOFF_MAX: float = 4.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_TIMEOUT: float = 30.0
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_MIN_DELAY: float = 0.0  # Optional floor under the p95 hedge delay; 0 hedges at the p95 alone
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_BATCHING_ENABLED: bool = False
+    LLM_BATCH_API_URLS: str = ""  # Comma-separated batch endpoints; batching stays off without one
+    LLM_BATCH_MAX_SIZE: int = 16
+    LLM_BATCH_MAX_WAIT: float = 0.005
+
+    BOT_LOOKUP_CACHE_TTL_SECONDS: float = 30.0  # Longest a worker serves a bot config after missing its invalidation
+    BOT_LOOKUP_CACHE_MAX_SIZE: int = 1024
+    BOT_LOOKUP_CACHE_USE_REDIS: bool = False
+    BOT_LOOKUP_CACHE_REDIS_TTL_SECONDS: int = 300
+    BOT_LOOKUP_CACHE_INVALIDATION_CHANNEL: str = "bot_config:invalidated"  # Empty keeps invalidations in-process
+
+    MESSAGE_DEDUP_ENABLED: bool = True
+    MESSAGE_DEDUP_TTL_SECONDS: int = 86400
+    MESSAGE_DEDUP_KEY_PREFIX: str = "message_dedup:"
+
+    TOKEN_QUOTA_ENABLED: bool = True
+    TOKEN_QUOTA_KEY_PREFIX: str = "bot_tokens:"
+    TOKEN_QUOTA_KEY_TTL_SECONDS: int = 86400
+    TOKEN_QUOTA_FLUSH_INTERVAL: float = 5.0
+    TOKEN_QUOTA_FLUSH_BATCH_SIZE: int = 500
+
+    CONVERSATION_SUMMARY_ENABLED: bool = True
+    CONVERSATION_SUMMARY_MAX_MESSAGES_PER_RUN: int = 200
+    CONVERSATION_SUMMARY_MAX_TOKENS: int = 400
+
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_KEY_PREFIX: str = "response_cache:"
+    RESPONSE_CACHE_MAX_ENTRIES_PER_BOT: int = 1000
+    RESPONSE_CACHE_MAX_RESPONSE_CHARS: int = 4000
+
+    GENERATION_SCHEDULER_ENABLED: bool = True
+    GENERATION_MAX_CONCURRENCY: int = 32
+    GENERATION_MAX_PER_BOT: int = 4
+    GENERATION_MAX_PER_OWNER: int = 8
+    GENERATION_MAX_QUEUED: int = 1000
+    GENERATION_QUEUE_TIMEOUT_PRODUCTION: float = 20.0
+    GENERATION_QUEUE_TIMEOUT_PLAYGROUND: float = 10.0
+    GENERATION_QUEUE_TIMEOUT_BACKGROUND: float = 120.0
+    GENERATION_OVERLOAD_REPLY: str = "We are receiving a lot of messages right now. Please try again in a minute."
+
+    # Off by default; when on, every app process processes uploads and maps the bots' index files
+    KNOWLEDGE_ENABLED: bool = False
+    KNOWLEDGE_INDEX_DIR: str = "data/knowledge_index"
+    KNOWLEDGE_EMBEDDER: str = "hashing"  # or "sentence-transformers:<model name or path>"
+    KNOWLEDGE_EMBEDDING_DIM: int = 1024  # Buckets of the hashing embedder; models bring their own
+    KNOWLEDGE_CHUNK_CHARS: int = 800
+    KNOWLEDGE_CHUNK_OVERLAP_CHARS: int = 150
+    KNOWLEDGE_MAX_DOCUMENT_BYTES: int = 50 * 1024 * 1024
+    # Worker processes that extract, chunk and embed uploaded documents, per app process (uvicorn worker);
+    # -1 = one per CPU, 0 = a thread instead
+    KNOWLEDGE_PROCESS_WORKERS: int = 2
+    KNOWLEDGE_PROCESS_MAX_PENDING: int = 0  # Documents read and queued for the workers at once; 0 = twice the workers
+    KNOWLEDGE_TOP_K: int = 4
+    KNOWLEDGE_MIN_SCORE: float = 0.05
+    KNOWLEDGE_MAX_CONTEXT_CHARS: int = 4000
 
     TELEGRAM_API_ID: str
     TELEGRAM_API_HASH: str
+    TELEGRAM_LISTENER_SUPERVISOR_ENABLED: bool = True
+    TELEGRAM_LISTENER_RESTORE_BATCH_SIZE: int = 100
+    TELEGRAM_LISTENER_MAX_CONCURRENT_STARTS: int = 5
+    TELEGRAM_LISTENER_BACKOFF_BASE: float = 1.0
+    TELEGRAM_LISTENER_BACKOFF_MAX: float = 300.0
+    TELEGRAM_LISTENER_STABLE_AFTER: float = 60.0
+    TELEGRAM_LISTENER_SYNC_INTERVAL: float = 15.0
+    TELEGRAM_LISTENER_USE_REDIS_LEASES: bool = True
+    TELEGRAM_LISTENER_LEASE_TTL_SECONDS: int = 45
+    TELEGRAM_SENDER_PROFILE_TTL_SECONDS: float = 600.0
+    TELEGRAM_SENDER_PROFILE_CACHE_SIZE: int = 10000
+    TELEGRAM_INGESTION_BACKEND: str = "memory"  # "memory", "redis" or "inline"
+    TELEGRAM_INGESTION_WORKERS: int = 16
+    TELEGRAM_INGESTION_MAX_PENDING: int = 1000
+    TELEGRAM_INGESTION_MAX_PENDING_PER_CONVERSATION: int = 50
+    TELEGRAM_INGESTION_SUBMIT_TIMEOUT: float = 2.0
+    TELEGRAM_INGESTION_STREAM_PREFIX: str = "telegram:ingest:"
+    TELEGRAM_INGESTION_MAX_PENDING_PER_PARTITION: int = 100  # Redis backend: entries per stream before backpressure
+    TELEGRAM_INGESTION_ROUTE_TTL_SECONDS: int = 86400  # Redis backend: an account's route is forgotten after this long without messages
+    # Redis backend: unset gives every process its own streams; only set it to a value unique to one process
+    TELEGRAM_INGESTION_STREAM_NAMESPACE: Optional[str] = None
 
     class Config:
         env_file = ".env"
@@ -38,11 +38,21 @@ from src.features.bot.application.queries.bot_management.get_user_bots.get_user_
 from src.features.bot.application.queries.bot_participants.get_participants.get_bot_participants_query import \
     GetBotParticipantsQuery
 from src.features.bot.application.queries.bot_services.get_services.get_services_query import GetServicesQuery
+from src.features.bot.application.queries.bot_documents.download_document.download_document_query import \
+    DownloadBotDocumentQuery
 from src.features.bot.di_container import BotContainer
-from src.features.bot.domain.events.bot_events import BotExpirySetEvent
+from src.features.bot.domain.events.bot_events import (
+    BotConfigChangedEvent,
+    BotDocumentsDeletedEvent,
+    BotDocumentsUploadedEvent,
+    BotExpirySetEvent,
+    BotQuotaChangedEvent,
+)
 from src.features.bot.domain.events.service_unlinked_event import ServiceUnlinkedEvent
 from src.features.conversation.application.queries.get_all_conversations.get_all_conversations_query import \
     GetAllConversationsQuery
+from src.features.conversation.application.queries.get_ingestion_stats.get_ingestion_stats_query import \
+    GetIngestionStatsQuery
 from src.features.conversation.application.queries.get_playground_conversation.get_playground_conversation_query import \
     GetPlaygroundConversationQuery
 from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_query import \
@@ -86,6 +96,8 @@ from src.features.integrations.messengers.telegram.application.commands.request_
     RequestTelegramCodeCommand
 from src.features.integrations.messengers.telegram.application.commands.submit_telegram_code.submit_telegram_code_command import \
     SubmitTelegramCodeCommand
+from src.features.integrations.messengers.telegram.application.queries.get_listener_health.get_listener_health_query import \
+    GetTelegramListenerHealthQuery
 from src.features.integrations.messengers.telegram.di_container import TelegramContainer
 from src.features.notification.di_container import NotificationContainer
 from src.features.prices.application.commands.create_platfrom_price_command import CreatePlatformPriceCommand
@@ -120,6 +132,8 @@ class ApplicationContainer(containers.DeclarativeContainer):
 
     s3_uploader = providers.Singleton(
         S3UploaderServiceHandler,
+        multipart_part_size=config.provided.S3_MULTIPART_PART_SIZE,
+        download_chunk_size=config.provided.S3_DOWNLOAD_CHUNK_SIZE,
     )
 
     avatar_upload_event_handler = providers.Factory(
@@ -305,6 +319,8 @@ async def initialize_bot_container(app_container: ApplicationContainer) -> None:
     bot_container = BotContainer(
         mediator=app_container.mediator(),
         user_lookup_service=identity_container.user_lookup_service(),
+        redis_service=app_container.redis_service(),
+        s3_service=app_container.s3_uploader(),
     )
 
     # # Store the bot container
@@ -408,6 +424,11 @@ async def initialize_bot_container(app_container: ApplicationContainer) -> None:
         bot_container.get_services_query_handler
     )
 
+    mediator.register_query_handler(
+        DownloadBotDocumentQuery,
+        bot_container.download_bot_document_query_handler
+    )
+
     # Register domain event handler
 
     # Register infrastructure event handlers
@@ -417,6 +438,46 @@ async def initialize_bot_container(app_container: ApplicationContainer) -> None:
         providers=[app_container.bot_expiry_handler]
     )
 
+    mediator.register_event_handlers(
+        event_type=BotConfigChangedEvent,
+        providers=[bot_container.bot_config_cache_invalidation_handler]
+    )
+
+    mediator.register_event_handlers(
+        event_type=BotQuotaChangedEvent,
+        providers=[bot_container.bot_quota_reset_handler]
+    )
+
+    mediator.register_event_handlers(
+        event_type=BotDocumentsUploadedEvent,
+        providers=[bot_container.document_indexing_handler]
+    )
+
+    mediator.register_event_handlers(
+        event_type=BotDocumentsDeletedEvent,
+        providers=[bot_container.document_index_removal_handler]
+    )
+
+    token_quota_service = bot_container.token_quota_service()
+    if token_quota_service is not None:
+        await token_quota_service.start()
+    # Drops the configs other workers invalidate
+    await bot_container.bot_lookup_cache().start()
+
+
+async def shutdown_bot_container(app_container: ApplicationContainer) -> None:
+    bot_container = app_container.bot_container
+    if bot_container is not None:
+        token_quota_service = bot_container.token_quota_service()
+        if token_quota_service is not None:
+            # Writes back the balances changed since the last interval
+            await token_quota_service.stop()
+        await bot_container.bot_lookup_cache().stop()
+        document_knowledge_base = bot_container.document_knowledge_base()
+        if document_knowledge_base is not None:
+            # Stops the document processing workers
+            document_knowledge_base.close()
+
 
 async def initialize_conversation_container(app_container: ApplicationContainer) -> None:
     bot_container = app_container.bot_container
@@ -424,6 +485,9 @@ async def initialize_conversation_container(app_container: ApplicationContainer)
         mediator=app_container.mediator(),
         bot_access_service=bot_container.bot_access_service(),
         bot_lookup_service=bot_container.bot_lookup_service(),
+        bot_lookup_cache=bot_container.bot_lookup_cache,
+        token_quota_service=bot_container.token_quota_service,
+        document_retrieval_service=bot_container.document_knowledge_base,
     )
 
     # # Store the bot container
@@ -451,6 +515,29 @@ async def initialize_conversation_container(app_container: ApplicationContainer)
         conversation_container.get_single_bot_conversation_query_handler
     )
 
+    mediator.register_query_handler(
+        GetIngestionStatsQuery,
+        conversation_container.get_ingestion_stats_query_handler
+    )
+
+    mediator.register_event_handlers(
+        event_type=BotConfigChangedEvent,
+        providers=[conversation_container.response_cache_invalidation_handler]
+    )
+
+    await conversation_container.llm_http_client().start()
+
+
+async def shutdown_conversation_container(app_container: ApplicationContainer) -> None:
+    conversation_container = app_container.conversation_container
+    if conversation_container is not None:
+        await conversation_container.response_coalescer().stop()
+        conversation_summarizer = conversation_container.conversation_summarizer()
+        if conversation_summarizer is not None:
+            await conversation_summarizer.stop()
+        await conversation_container.deepseek_generation_service().close()
+        await conversation_container.llm_http_client().close()
+
 
 async def initialize_telegram_container(app_container: ApplicationContainer) -> None:
     bot_container = app_container.bot_container
@@ -485,6 +572,27 @@ async def initialize_telegram_container(app_container: ApplicationContainer) ->
         providers=[telegram_container.stop_telegram_event_handler]
     )
 
+    mediator.register_query_handler(
+        GetTelegramListenerHealthQuery,
+        telegram_container.get_listener_health_query_handler
+    )
+
+    ingestion_queue = telegram_container.ingestion_queue()
+    if ingestion_queue is not None:
+        await ingestion_queue.start(telegram_container.telegram_event_handler_service().process_queued_message)
+
+    if telegram_container.config().TELEGRAM_LISTENER_SUPERVISOR_ENABLED:
+        await telegram_container.listener_supervisor().start()
+
+
+async def shutdown_telegram_container(app_container: ApplicationContainer) -> None:
+    telegram_container = app_container.telegram_container
+    if telegram_container is not None:
+        await telegram_container.listener_supervisor().stop()
+        ingestion_queue = telegram_container.ingestion_queue()
+        if ingestion_queue is not None:
+            await ingestion_queue.stop()
+
 
 async def initialize_announcement_container(app_container: ApplicationContainer) -> None:
     """Initialize the announcement container by registering all handlers with the mediator"""
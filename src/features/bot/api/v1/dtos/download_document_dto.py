@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+
+@dataclass
+class BotDocumentDownloadDTO:
+    """A document ready to be streamed to the client; `content` is consumed once."""
+    filename: str
+    content_type: str
+    file_size: Optional[int]
+    checksum: Optional[str]
+    content: AsyncIterator[bytes]
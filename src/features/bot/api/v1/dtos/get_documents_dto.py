@@ -3,6 +3,8 @@ logger = async_logger
 from pydantic import BaseModel, Field
 from uuid import UUID
 from typing import List, Optional
+
+from src.features.bot.domain.enums import BotDocumentStatus
 # ... other DTO imports ...
 
 
@@ -14,6 +16,9 @@ class BotDocumentResponseItemDTO(BaseModel):
     # bot_uid: UUID # Usually not needed in the item if part of a bot's document list
     filename: str = Field(..., description="Original filename of the document.")
     content_type: Optional[str] = Field(None, description="MIME type of the document.")
+    status: BotDocumentStatus = Field(BotDocumentStatus.PENDING, description="Text extraction and indexing progress.")
+    status_error: Optional[str] = Field(None, description="Why processing failed, when status is 'failed'.")
+    chunk_count: Optional[int] = Field(None, description="Passages indexed for retrieval, once ready.")
     # created_at: datetime # Optional: if you want to show when it was uploaded
 
     model_config = { # Pydantic v2
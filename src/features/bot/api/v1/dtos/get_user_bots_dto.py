@@ -54,6 +54,12 @@ class BotDTO(BaseModel):
     top_k: int
     repetition_penalty: float
     generation_model: str
+    history_window_messages: Optional[int] = None
+    history_token_budget: Optional[int] = None
+    coalesce_window_ms: Optional[int] = None
+    summarize_after_messages: Optional[int] = None
+    response_cache_ttl_seconds: Optional[int] = None
+    response_cache_history_messages: Optional[int] = None
     crm_lead_id: Optional[int]
 
     bot_services: List[BotServiceDTO]
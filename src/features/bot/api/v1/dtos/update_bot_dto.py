@@ -16,6 +16,12 @@ class UpdateBotRequestDTO(BaseModel):
     top_k: Optional[int] = None
     repetition_penalty: Optional[float] = None
     generation_model: Optional[str] = None
+    history_window_messages: Optional[int] = None
+    history_token_budget: Optional[int] = None
+    coalesce_window_ms: Optional[int] = None
+    summarize_after_messages: Optional[int] = None
+    response_cache_ttl_seconds: Optional[int] = None
+    response_cache_history_messages: Optional[int] = None
 
 class UpdateBotInputDTO(BaseModel):
     uid: UUID
@@ -7,12 +7,15 @@ from fastapi import UploadFile  # For type hinting in InputDTO
 
 # Import entities for internal DTO
 from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.enums import BotDocumentStatus
 
 
 class UploadedDocumentInfoDTO(BaseModel):
     """Information about a single successfully uploaded document."""
     document_uid: UUID
     filename: str
+    # Processing for retrieval starts after the upload returns; the document list shows its progress
+    status: BotDocumentStatus = BotDocumentStatus.PENDING
 
 
 class UploadBotDocumentsResponseDTO(BaseModel):
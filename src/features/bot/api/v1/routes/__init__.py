@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from src.features.bot.api.v1.routes.bot_documents.delete_documents import delete_documents_router
+from src.features.bot.api.v1.routes.bot_documents.download_document import download_document_router
 from src.features.bot.api.v1.routes.bot_documents.upload_documents import upload_documents_router
 from src.features.bot.api.v1.routes.bot_management.create_bot import create_bot_router
 from src.features.bot.api.v1.routes.bot_management.delete_bot import delete_bot_router
@@ -53,3 +54,4 @@ bot_services_router.include_router(get_services_router)
 
 bot_documents_router.include_router(upload_documents_router)
 bot_documents_router.include_router(delete_documents_router)
+bot_documents_router.include_router(download_document_router)
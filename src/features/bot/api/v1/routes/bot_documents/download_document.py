@@ -0,0 +1,40 @@
+from urllib.parse import quote
+from uuid import UUID
+
+from dependency_injector.wiring import inject, Provide
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+
+from src.core.mediator.mediator import Mediator
+from src.di_container import ApplicationContainer
+from src.features.bot.application.queries.bot_documents.download_document.download_document_query import \
+    DownloadBotDocumentQuery
+from src.features.identity.dependencies import get_current_user
+from src.features.identity.domain.entities.user_entity import UserEntity
+
+download_document_router = APIRouter()
+
+
+@download_document_router.get(
+    "/{uid}/documents/{document_uid}",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Download a Bot Document",
+    description="Streams the document from storage without loading it into memory."
+)
+@inject
+async def download_document_for_bot(
+    uid: UUID,
+    document_uid: UUID,
+    current_user: UserEntity = Depends(get_current_user),
+    mediator: Mediator = Depends(Provide[ApplicationContainer.mediator]),
+):
+    query = DownloadBotDocumentQuery(user_uid=current_user.uid, bot_uid=uid, document_uid=document_uid)
+    document = await mediator.query(query)
+
+    headers = {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(document.filename)}"}
+    if document.file_size is not None:
+        headers["Content-Length"] = str(document.file_size)
+    if document.checksum:
+        headers["ETag"] = f'"{document.checksum}"'
+    return StreamingResponse(document.content, media_type=document.content_type, headers=headers)
@@ -11,6 +11,8 @@ from src.features.bot.application.commands.bot_documents.delete_documents.delete
 
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 from src.features.bot.application.services.bot_access_service import BotAccessService
+from src.features.bot.application.services.bot_document_storage_service import BotDocumentStorageService
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent, BotDocumentsDeletedEvent
 
 
 
@@ -18,6 +20,7 @@ from src.features.bot.application.services.bot_access_service import BotAccessSe
 class DeleteBotDocumentsCommandHandler(BaseCommandHandler[DeleteBotDocumentsCommand, DeleteBotDocumentsResponseDTO]):
     _unit_of_work: BotUnitOfWork
     _access_service: BotAccessService
+    _document_storage: BotDocumentStorageService
     _mediator: Mediator
     _allowed_roles: list[str]
 
@@ -34,6 +37,7 @@ class DeleteBotDocumentsCommandHandler(BaseCommandHandler[DeleteBotDocumentsComm
 
         deleted_uids: List[UUID] = []
         not_found_uids: List[UUID] = []
+        storage_keys: List[str] = []
 
         try:
             async with self._unit_of_work:
@@ -58,12 +62,25 @@ class DeleteBotDocumentsCommandHandler(BaseCommandHandler[DeleteBotDocumentsComm
                 if uids_to_delete:
                     deleted_count = await self._unit_of_work.bot_document_repository.delete_by_uids(uids_to_delete)
                     deleted_uids = uids_to_delete
+                    storage_keys = [doc.storage_key for doc in found_documents if doc.storage_key]
                     logger.info(f"Deleted {deleted_count} document records for bot {bot.uid}.")
 
         except Exception as e:
             logger.error(f"Error during document deletion for bot {bot.uid}: {e}", exc_info=True)
             raise
 
+        await self._mediator.publish([
+            BotConfigChangedEvent(bot_uid=str(bot.uid), reason="documents deleted"),
+            BotDocumentsDeletedEvent(bot_uid=str(bot.uid), document_uids=tuple(str(uid) for uid in deleted_uids)),
+        ])
+
+        # Blobs go only after the rows are committed; a failure here leaves orphans, not dangling rows
+        if storage_keys:
+            try:
+                await self._document_storage.delete(storage_keys)
+            except Exception as e:
+                logger.error(f"Failed to delete {len(storage_keys)} document blobs for bot {bot.uid}: {e}", exc_info=True)
+
         message = f"{len(deleted_uids)} document(s) deleted successfully."
         if not_found_uids:
             message += f" {len(not_found_uids)} document(s) not found or not belonging to this bot."
@@ -2,6 +2,9 @@ from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 import uuid
 from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import UploadFile
 
 from src.core.base.command import BaseCommandHandler
 from src.core.mediator.mediator import Mediator
@@ -9,6 +12,8 @@ from src.features.bot.api.v1.dtos.upload_documents_dto import UploadBotDocuments
 from src.features.bot.application.commands.bot_documents.upload_documents.upload_documents_command import \
     UploadBotDocumentsCommand
 from src.features.bot.application.services.bot_access_service import BotAccessService
+from src.features.bot.application.services.bot_document_storage_service import BotDocumentStorageService
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent, BotDocumentsUploadedEvent
 from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 from src.features.bot.exceptions.bot_exceptions import DocumentUploadFailedError
@@ -20,8 +25,10 @@ from src.features.bot.exceptions.bot_exceptions import DocumentUploadFailedError
 class UploadBotDocumentsCommandHandler(BaseCommandHandler[UploadBotDocumentsCommand, UploadBotDocumentsResponseDTO]):
     _unit_of_work: BotUnitOfWork
     _access_service: BotAccessService
+    _document_storage: BotDocumentStorageService
     _mediator: Mediator
     _allowed_roles: list[str]
+    _chunk_size: int = 1024 * 1024
 
     async def __call__(self, command: UploadBotDocumentsCommand) -> UploadBotDocumentsResponseDTO:
         logger.info(f"User {command.current_user_uid} uploading documents to bot {command.bot_uid}")
@@ -38,29 +45,61 @@ class UploadBotDocumentsCommandHandler(BaseCommandHandler[UploadBotDocumentsComm
             try:
                 if not file.filename:
                     continue
-                content = await file.read()
-                await file.close()
+                document_uid = uuid.uuid4()
+                # Streamed to the blob store; only the reference goes into the row
+                blob = await self._document_storage.store(
+                    bot_uid=bot.uid,
+                    document_uid=document_uid,
+                    chunks=self._read_chunks(file),
+                    content_type=file.content_type,
+                )
 
                 documents.append(BotDocumentEntity(
-                    uid=uuid.uuid4(),
+                    uid=document_uid,
                     bot_uid=bot.uid,
                     filename=file.filename,
-                    content_type=file.content_type,
-                    file_data=content
+                    content_type=blob.content_type,
+                    storage_key=blob.storage_key,
+                    file_size=blob.file_size,
+                    checksum=blob.checksum,
                 ))
             except Exception as e:
                 logger.error(f"Failed to process file {file.filename}: {e}", exc_info=True)
+            finally:
+                await file.close()
 
         if not documents:
             raise DocumentUploadFailedError("No valid documents to upload.")
 
-        async with self._unit_of_work:
-            saved_docs = await self._unit_of_work.bot_document_repository.create_many(documents)
+        try:
+            async with self._unit_of_work:
+                saved_docs = await self._unit_of_work.bot_document_repository.create_many(documents)
+        except Exception:
+            # The rows were not written; don't leave their blobs behind
+            await self._discard_blobs([doc.storage_key for doc in documents])
+            raise
+        await self._mediator.publish([
+            BotConfigChangedEvent(bot_uid=str(bot.uid), reason="documents uploaded"),
+            BotDocumentsUploadedEvent(bot_uid=str(bot.uid), document_uids=tuple(str(doc.uid) for doc in saved_docs)),
+        ])
 
         return UploadBotDocumentsResponseDTO(
             message=f"{len(saved_docs)} documents uploaded successfully to bot {bot.uid}.",
             documents=[
-                UploadedDocumentInfoDTO(document_uid=doc.uid, filename=doc.filename)
+                UploadedDocumentInfoDTO(document_uid=doc.uid, filename=doc.filename, status=doc.status)
                 for doc in saved_docs
             ]
         )
+
+    async def _read_chunks(self, file: UploadFile) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await file.read(self._chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    async def _discard_blobs(self, storage_keys: list[str]) -> None:
+        try:
+            await self._document_storage.delete(storage_keys)
+        except Exception as e:
+            logger.error(f"Failed to remove {len(storage_keys)} orphaned document blobs: {e}", exc_info=True)
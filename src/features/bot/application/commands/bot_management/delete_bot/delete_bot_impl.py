@@ -1,4 +1,6 @@
 # src/features/bot/application/commands/bot_management/delete_bot/delete_bot_command_handler.py
+from src.infra.logging.setup_async_logging import async_logger
+logger = async_logger
 from dataclasses import dataclass, field
 
 from src.core.base.command import BaseCommandHandler
@@ -8,7 +10,9 @@ from src.features.bot.api.v1.dtos.minimal_bot_dto import MinimalBotDTO
 from src.features.bot.application.commands.bot_management.delete_bot.delete_bot_command import DeleteBotCommand
 from src.features.bot.application.mappers.minimal_bot_dto_mapper import MinimalBotDTOMapper
 from src.features.bot.application.services.bot_access_service import BotAccessService
+from src.features.bot.application.services.bot_document_storage_service import BotDocumentStorageService
 from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent, BotDocumentsDeletedEvent
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 
 
@@ -16,6 +20,7 @@ from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 class DeleteBotCommandHandler(BaseCommandHandler[DeleteBotCommand, DeleteBotResponseDTO]):
     _unit_of_work: BotUnitOfWork
     _access_service: BotAccessService
+    _document_storage: BotDocumentStorageService
     _mediator: Mediator
     _allowed_roles: list[str]
 
@@ -34,9 +39,25 @@ class DeleteBotCommandHandler(BaseCommandHandler[DeleteBotCommand, DeleteBotResp
             )
             delete_bot_dto = self._minimal_bot_dto_mapper.to_dto(bot)
 
+            # Document rows go with the bot (FK cascade); their blobs are removed below
+            documents = await self._unit_of_work.bot_document_repository.find_by_bot_uid(bot.uid)
+            storage_keys = [doc.storage_key for doc in documents if doc.storage_key]
+
             # Delete the bot
             await self._unit_of_work.bot_repository.delete_by_uid(command.bot_uid)
 
+        if storage_keys:
+            try:
+                await self._document_storage.delete(storage_keys)
+            except Exception as e:
+                logger.error(f"Failed to delete {len(storage_keys)} document blobs of bot {bot.uid}: {e}", exc_info=True)
+
+        events = [BotConfigChangedEvent(bot_uid=str(bot.uid), reason="deleted")]
+        if documents:
+            events.append(BotDocumentsDeletedEvent(
+                bot_uid=str(bot.uid), document_uids=tuple(str(doc.uid) for doc in documents)
+            ))
+        await self._mediator.publish(events)
 
         # You could publish a BotDeletedEvent here if needed
         # await self._mediator.publish(BotDeletedEvent(bot_uid=str(bot.uid), deleted_by=command.user_uid))
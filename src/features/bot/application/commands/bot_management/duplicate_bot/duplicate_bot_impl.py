@@ -3,6 +3,7 @@ import uuid
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from dataclasses import dataclass
+from typing import List
 
 from src.core.mediator.command import BaseCommandHandler
 from src.core.mediator.mediator import Mediator
@@ -13,7 +14,7 @@ from src.features.bot.application.services.user_lookup_service import UserLookup
 from src.features.bot.domain.entities.bot_entity import BotEntity, BotStatus
 from src.features.bot.domain.entities.bot_participant_entity import BotParticipantEntity
 from src.features.bot.domain.entities.bot_service_entity import BotServiceEntity
-from src.features.bot.domain.enums import OWNER_ROLE_VALUE
+from src.features.bot.domain.enums import OWNER_ROLE_VALUE, BotLoadProfile
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
 from src.features.bot.utils import build_bot_response
@@ -35,7 +36,8 @@ class DuplicateBotCommandHandler(BaseCommandHandler[DuplicateBotCommand, BotResp
         original_bot = await self._access_service.check_single_bot_access(
             user_uid=command.user_uid,
             bot_uid=command.bot_uid,
-            allowed_roles=self._allowed_roles
+            allowed_roles=self._allowed_roles,
+            profile=BotLoadProfile.WITH_SERVICES,
         )
         logger.info(f"Duplicating bot {original_bot.uid} for user {command.user_uid}")
 
@@ -94,7 +96,12 @@ class DuplicateBotCommandHandler(BaseCommandHandler[DuplicateBotCommand, BotResp
             await self._unit_of_work.bot_participant_repository.create(owner_participant)
 
             # Duplicate services
-            await self._duplicate_services(original_bot.uid, new_bot.uid)
+            new_services = await self._duplicate_services(original_bot, new_bot.uid)
+
+        # Everything the response needs was just written; build_bot_response skips its queries
+        new_bot.services = new_services
+        new_bot.participants = [owner_participant]
+        new_bot.documents = []
 
 
         logger.info(f"Successfully created duplicate bot (UID: {new_bot.uid}) and duplicated services.")
@@ -108,12 +115,12 @@ class DuplicateBotCommandHandler(BaseCommandHandler[DuplicateBotCommand, BotResp
 
         return BotResponseDTO(message=f"Bot duplicated successfully! Here is bot's uid: {new_bot.uid}",bot=bot_response)
 
-    async def _duplicate_services(self, original_bot_uid: uuid.UUID, new_bot_uid: uuid.UUID):
-        """Finds services of the original bot and creates copies for the new bot."""
-        logger.debug(f"Fetching services for original bot UID: {original_bot_uid}")
-        original_services = await self._unit_of_work.bot_service_repository.find_by_bot_uid(original_bot_uid)
+    async def _duplicate_services(self, original_bot: BotEntity, new_bot_uid: uuid.UUID) -> List[BotServiceEntity]:
+        """Creates copies of the original bot's services (loaded with the bot) for the new bot."""
+        original_services = original_bot.services or []
         logger.debug(f"Found {len(original_services)} services to duplicate.")
 
+        new_services: List[BotServiceEntity] = []
         for service in original_services:
             logger.debug(f"Creating duplicate service for platform: {service.platform}")
             new_service = BotServiceEntity(
@@ -122,6 +129,7 @@ class DuplicateBotCommandHandler(BaseCommandHandler[DuplicateBotCommand, BotResp
                 platform=service.platform,
                 status="reserved"  # New services start as reserved
             )
-            await self._unit_of_work.bot_service_repository.create(new_service)
+            new_services.append(await self._unit_of_work.bot_service_repository.create(new_service))
 
-        logger.debug("Finished creating duplicate service entries.")
\ No newline at end of file
+        logger.debug("Finished creating duplicate service entries.")
+        return new_services
\ No newline at end of file
@@ -12,6 +12,7 @@ from src.features.bot.application.services.bot_access_service import BotAccessSe
 from src.features.bot.application.services.user_lookup_service import UserLookupService
 from src.features.bot.domain.entities.bot_participant_entity import BotParticipantEntity
 from src.features.bot.domain.enums import OWNER_ROLE_VALUE
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 from src.features.bot.exceptions.bot_exceptions import (
     CannotTransferToSelfError,
@@ -101,6 +102,7 @@ class TransferBotCommandHandler(BaseCommandHandler[TransferBotCommand, BotRespon
 
 
         logger.info(f"Bot {bot_to_transfer.uid} successfully transferred to {new_owner.email}.")
+        await self._mediator.publish([BotConfigChangedEvent(bot_uid=str(bot_to_transfer.uid), reason="transferred")])
 
         # Build response
         bot_response = await build_bot_response(
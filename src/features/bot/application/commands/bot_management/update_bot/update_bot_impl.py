@@ -9,7 +9,9 @@ from src.features.bot.api.v1.dtos.get_user_bots_dto import BotResponseDTO
 from src.features.bot.application.commands.bot_management.update_bot.update_bot_command import UpdateBotCommand
 from src.features.bot.application.services.bot_access_service import BotAccessService
 from src.features.bot.application.services.user_lookup_service import UserLookupService
+from src.features.bot.domain.enums import BotLoadProfile
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent, BotQuotaChangedEvent
 from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
 from src.features.bot.exceptions.bot_exceptions import (
     InvalidBotAISettingsError,
@@ -35,6 +37,7 @@ class UpdateBotCommandHandler(BaseCommandHandler[UpdateBotCommand, BotResponseDT
                 user_uid=command.user_uid,
                 bot_uid=command.bot_uid,
                 allowed_roles=self._allowed_roles,
+                profile=BotLoadProfile.FULL_WITHOUT_BLOBS,
             )
             update_data = command.update_data.model_dump(exclude_unset=True)
             logger.debug(f"Attempting update for bot {bot.uid} with data: {update_data}")
@@ -90,6 +93,12 @@ class UpdateBotCommandHandler(BaseCommandHandler[UpdateBotCommand, BotResponseDT
             else:
                 logger.info(f"No effective changes detected for bot {bot.uid}, skipping update persistence.")
 
+        if updated:
+            events = [BotConfigChangedEvent(bot_uid=str(bot.uid), reason="updated")]
+            if "token_limit" in update_data:
+                events.append(BotQuotaChangedEvent(bot_uid=str(bot.uid), tokens_left=bot.quota.tokens_left))
+            await self._mediator.publish(events)
+
         # Build Response using UserLookupService
         logger.debug(f"Building response DTO for updated bot {bot.uid}")
         bot_response = await build_bot_response(
@@ -14,6 +14,7 @@ from src.features.bot.application.mappers.bot_service_dto_mapper import BotServi
 from src.features.bot.application.services.bot_access_service import BotAccessService
 from src.features.bot.domain.entities.bot_service_entity import BotServiceEntity  # For mapper init
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
 
 
 
@@ -75,6 +76,7 @@ class LinkServiceCommandHandler(BaseCommandHandler[LinkServiceCommand, LinkServi
             # The status would then be updated by a separate handler/service.
 
         logger.info(f"Successfully linked service '{command.request_data.platform}' to bot '{target_bot.uid}'.")
+        await self._mediator.publish([BotConfigChangedEvent(bot_uid=str(target_bot.uid), reason="service linked")])
 
         # 5. Map the created entity to the DTO for response
         # Use the mapper to create the nested BotServiceDTO
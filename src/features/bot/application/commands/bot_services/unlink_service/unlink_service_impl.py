@@ -17,6 +17,7 @@ from src.features.bot.exceptions.bot_exceptions import (
 )
 from src.core.mediator.mediator import Mediator
 from src.features.bot.domain.events.service_unlinked_event import ServiceUnlinkedEvent
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
 
 
 
@@ -75,7 +76,8 @@ class UnlinkServiceCommandHandler(BaseCommandHandler[UnlinkServiceCommand, Unlin
                 service_uid=command.service_uid,
                 platform=platform,
                 linked_account_uid=linked_account_uid
-            )
+            ),
+            BotConfigChangedEvent(bot_uid=str(bot.uid), reason="service unlinked"),
         ])
 
         logger.info(f"Successfully unlinked service UID {command.service_uid} from bot UID {command.bot_uid}")
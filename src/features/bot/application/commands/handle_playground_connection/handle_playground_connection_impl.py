@@ -2,7 +2,9 @@
 
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
+import json
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from fastapi import WebSocketDisconnect, HTTPException, status # Import HTTPException and status
 from fastapi.websockets import WebSocketState
@@ -27,6 +29,21 @@ class HandlePlaygroundConnectionCommandHandler(
     _mediator: Mediator
     _bot_access_service: BotAccessService # Inject BotAccessService
 
+    @staticmethod
+    def _parse_message(text: str) -> Tuple[str, Optional[str]]:
+        """
+        A frame is either the plain message text or {"content": ..., "client_message_id": ...};
+        only messages sent with a client_message_id are deduplicated when the client resends them.
+        """
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            return text, None
+        if not isinstance(payload, dict) or not isinstance(payload.get("content"), str):
+            return text, None
+        client_message_id = payload.get("client_message_id")
+        return payload["content"], str(client_message_id) if client_message_id else None
+
     async def __call__(self, command: HandlePlaygroundConnectionCommand) -> None:
         websocket = command.websocket
         bot_uid = command.bot_uid
@@ -54,13 +71,16 @@ class HandlePlaygroundConnectionCommandHandler(
                         f"Received playground message for bot {bot_uid} from user {current_user.uid}: '{user_message_text}'"
                     )
 
+                    message_content, client_message_id = self._parse_message(user_message_text)
+
                     # Dispatch a command to process the incoming message, passing the resolved BotEntity
                     receive_command = PlaygroundReceiveMessageCommand(
                         bot_uid=target_bot.uid, # Use target_bot.uid
                         user_uid=current_user.uid,
                         websocket=websocket,
-                        message_content=user_message_text,
-                        target_bot_entity=target_bot # Pass the resolved BotEntity
+                        message_content=message_content,
+                        target_bot_entity=target_bot, # Pass the resolved BotEntity
+                        client_message_id=client_message_id,
                     )
                     await self._mediator.execute(receive_command)
 
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 from uuid import UUID
 
 from fastapi import WebSocket
@@ -16,4 +17,6 @@ class PlaygroundReceiveMessageCommand(BaseCommand):
     user_uid: UUID
     websocket: WebSocket
     message_content: str
-    target_bot_entity: BotEntity # Add the resolved BotEntity
\ No newline at end of file
+    target_bot_entity: BotEntity # Add the resolved BotEntity
+    # Set by the client per message; a resent message carries the same id and is not answered twice
+    client_message_id: Optional[str] = None
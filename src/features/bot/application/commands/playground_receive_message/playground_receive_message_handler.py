@@ -29,6 +29,13 @@ class PlaygroundReceiveMessageCommandHandler(
         # Use the resolved target_bot_entity from the command
         target_bot: BotEntity = command.target_bot_entity
 
+        async def forward_chunk(chunk: str) -> None:
+            await self._mediator.execute(PlaygroundSendMessageCommand(
+                websocket=command.websocket,
+                message_content=chunk,
+                message_type="chunk",
+            ))
+
         try:
             # Create the ProcessIncomingMessageCommand
             # The ProcessIncomingMessageCommand itself needs to be a BaseCommand and have an associated handler
@@ -40,12 +47,23 @@ class PlaygroundReceiveMessageCommandHandler(
                 content=command.message_content,
                 timestamp=datetime.now(timezone.utc),
                 sender_number=f"playground_{command.user_uid}",  # A unique identifier for playground user's "number"
-                sender_nickname=f"Playground User {command.user_uid}"
+                sender_nickname=f"Playground User {command.user_uid}",
                 # Placeholder, ideally fetch user's real nickname/email
+                on_response_chunk=forward_chunk, # Stream the reply to the socket as it is generated
+                external_message_id=command.client_message_id,
             )
             # Dispatch the ProcessIncomingMessageCommand via the mediator
             response_data: ProcessIncomingMessageResponseDTO = await self._mediator.execute(process_chat_command)
 
+            if response_data.reply_interrupted:
+                # The chunks already sent are not a reply; the client drops them
+                await self._mediator.execute(PlaygroundSendMessageCommand(
+                    websocket=command.websocket,
+                    message_content=response_data.message,
+                    message_type="error",
+                ))
+                return
+
             message_to_send: str = ""
             if response_data.ai_response_generated and response_data.ai_response_content:
                 message_to_send = response_data.ai_response_content
@@ -60,6 +78,7 @@ class PlaygroundReceiveMessageCommandHandler(
                 logger.warning(f"No AI response or system message generated for bot {command.bot_uid}. Defaulting to generic message.")
                 message_to_send = "I'm not sure how to respond to that."
 
+            # The complete reply closes the streamed chunks (or is the only frame for system messages)
             send_command = PlaygroundSendMessageCommand(
                 websocket=command.websocket,
                 message_content=message_to_send
@@ -70,6 +89,7 @@ class PlaygroundReceiveMessageCommandHandler(
             logger.error(f"Error processing PlaygroundReceiveMessageCommand for bot {command.bot_uid}: {e}", exc_info=True)
             error_send_command = PlaygroundSendMessageCommand(
                 websocket=command.websocket,
-                message_content=f"Error processing your request: {str(e)}"
+                message_content=f"Error processing your request: {str(e)}",
+                message_type="error",
             )
             await self._mediator.execute(error_send_command)
\ No newline at end of file
@@ -9,6 +9,9 @@ from src.core.mediator.command import BaseCommand
 class PlaygroundSendMessageCommand(BaseCommand):
     """
     Command dispatched to send a message back to the bot playground WebSocket.
+    Frames are sent as JSON: {"type": message_type, "content": message_content}, where
+    message_type is "chunk" (streamed delta), "message" (complete reply) or "error".
     """
     websocket: WebSocket
-    message_content: str
\ No newline at end of file
+    message_content: str
+    message_type: str = "message"
\ No newline at end of file
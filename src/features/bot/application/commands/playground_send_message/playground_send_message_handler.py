@@ -20,10 +20,13 @@ class PlaygroundSendMessageCommandHandler(
 ):
     _mediator: Mediator
     async def __call__(self, command: PlaygroundSendMessageCommand) -> None:
-        logger.info(f"Attempting to send message to playground WebSocket: '{command.message_content[:50]}...'")
+        if command.message_type != "chunk": # Chunks are too frequent to log individually
+            logger.info(f"Attempting to send message to playground WebSocket: '{command.message_content[:50]}...'")
         try:
             if command.websocket.client_state != WebSocketState.DISCONNECTED:
-                await command.websocket.send_text(command.message_content)
+                await command.websocket.send_json(
+                    {"type": command.message_type, "content": command.message_content}
+                )
                 logger.debug("Message successfully sent to playground WebSocket.")
             else:
                 logger.warning("Attempted to send message to a disconnected playground WebSocket.")
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.infra.logging.setup_async_logging import async_logger
+logger = async_logger
+
+from src.core.base.event import BaseEventHandler
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
+from src.features.bot.infra.services.bot_lookup_cache import BotLookupCache
+
+
+@dataclass(kw_only=True)
+class BotConfigCacheInvalidationHandler(BaseEventHandler[BotConfigChangedEvent, None]):
+    """Drops the cached bot configuration so the next lookup reads the database"""
+    _bot_lookup_cache: BotLookupCache
+
+    async def handle(self, event: BotConfigChangedEvent) -> None:
+        try:
+            await self._bot_lookup_cache.invalidate(UUID(event.bot_uid))
+            logger.debug(f"Invalidated cached config for bot {event.bot_uid} ({event.reason})")
+        except Exception as e:
+            logger.error(f"Failed to invalidate cached config for bot {event.bot_uid}: {e}")
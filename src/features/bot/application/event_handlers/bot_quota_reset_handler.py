@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from src.infra.logging.setup_async_logging import async_logger
+logger = async_logger
+
+from src.core.base.event import BaseEventHandler
+from src.features.bot.application.services.token_quota_service import TokenQuotaService
+from src.features.bot.domain.events.bot_events import BotQuotaChangedEvent
+
+
+@dataclass(kw_only=True)
+class BotQuotaResetHandler(BaseEventHandler[BotQuotaChangedEvent, None]):
+    """Overwrites the tracked token balance so it does not outlive the new limit"""
+    _token_quota_service: Optional[TokenQuotaService]
+
+    async def handle(self, event: BotQuotaChangedEvent) -> None:
+        if self._token_quota_service is None:
+            return
+        try:
+            await self._token_quota_service.reset(UUID(event.bot_uid), event.tokens_left)
+            logger.debug(f"Reset token balance of bot {event.bot_uid} to {event.tokens_left}")
+        except Exception as e:
+            logger.error(f"Failed to reset token balance of bot {event.bot_uid}: {e}")
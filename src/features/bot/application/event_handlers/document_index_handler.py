@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from src.infra.logging.setup_async_logging import async_logger
+logger = async_logger
+
+from src.core.base.event import BaseEventHandler
+from src.features.bot.application.services.document_retrieval_service import DocumentRetrievalService
+from src.features.bot.domain.events.bot_events import BotDocumentsDeletedEvent, BotDocumentsUploadedEvent
+
+
+@dataclass(kw_only=True)
+class DocumentIndexingHandler(BaseEventHandler[BotDocumentsUploadedEvent, None]):
+    """Adds newly uploaded documents to the bot's retrieval index"""
+    _document_retrieval_service: Optional[DocumentRetrievalService]
+
+    async def handle(self, event: BotDocumentsUploadedEvent) -> None:
+        if self._document_retrieval_service is None:
+            return
+        try:
+            await self._document_retrieval_service.index_documents(
+                UUID(event.bot_uid), [UUID(uid) for uid in event.document_uids]
+            )
+        except Exception as e:
+            logger.error(f"Failed to index {len(event.document_uids)} documents of bot {event.bot_uid}: {e}")
+
+
+@dataclass(kw_only=True)
+class DocumentIndexRemovalHandler(BaseEventHandler[BotDocumentsDeletedEvent, None]):
+    """Drops deleted documents from the bot's retrieval index"""
+    _document_retrieval_service: Optional[DocumentRetrievalService]
+
+    async def handle(self, event: BotDocumentsDeletedEvent) -> None:
+        if self._document_retrieval_service is None:
+            return
+        try:
+            await self._document_retrieval_service.remove_documents(
+                UUID(event.bot_uid), [UUID(uid) for uid in event.document_uids]
+            )
+        except Exception as e:
+            logger.error(f"Failed to remove {len(event.document_uids)} documents of bot {event.bot_uid} from the index: {e}")
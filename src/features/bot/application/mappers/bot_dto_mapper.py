@@ -68,6 +68,12 @@ class BotDTOMapper:
                 "top_k": ai_settings.top_k if ai_settings and ai_settings.top_k is not None else 0,
                 "repetition_penalty": ai_settings.repetition_penalty if ai_settings and ai_settings.repetition_penalty is not None else 0.0,
                 "generation_model": ai_settings.generation_model if ai_settings and ai_settings.generation_model is not None else "",
+                "history_window_messages": ai_settings.history_window_messages if ai_settings else None,
+                "history_token_budget": ai_settings.history_token_budget if ai_settings else None,
+                "coalesce_window_ms": ai_settings.coalesce_window_ms if ai_settings else None,
+                "summarize_after_messages": ai_settings.summarize_after_messages if ai_settings else None,
+                "response_cache_ttl_seconds": ai_settings.response_cache_ttl_seconds if ai_settings else None,
+                "response_cache_history_messages": ai_settings.response_cache_history_messages if ai_settings else None,
 
                 # Quota Settings from BotQuota Value Object.
                 # Access attributes only if quota object exists. Provide sensible defaults.
@@ -0,0 +1,65 @@
+# src/features/bot/application/queries/bot_documents/download_document/download_document_impl.py
+from src.infra.logging.setup_async_logging import async_logger
+logger = async_logger
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from src.core.mediator.query import BaseQueryHandler
+from src.features.bot.api.v1.dtos.download_document_dto import BotDocumentDownloadDTO
+from src.features.bot.application.queries.bot_documents.download_document.download_document_query import \
+    DownloadBotDocumentQuery
+from src.features.bot.application.services.bot_access_service import BotAccessService
+from src.features.bot.application.services.bot_document_storage_service import BotDocumentStorageService
+from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
+from src.features.bot.exceptions.bot_exceptions import DocumentNotFoundError
+
+
+@dataclass(kw_only=True)
+class DownloadBotDocumentQueryHandler(BaseQueryHandler[DownloadBotDocumentQuery, BotDocumentDownloadDTO]):
+    _bot_uow: BotUnitOfWork
+    _access_service: BotAccessService
+    _document_storage: BotDocumentStorageService
+    _allowed_roles: list[str]
+
+    async def __call__(self, query: DownloadBotDocumentQuery) -> BotDocumentDownloadDTO:
+        """
+        Checks access and returns the document metadata with a lazy byte stream.
+        The bytes are read from the blob store only while the response is sent.
+        """
+        target_bot = await self._access_service.check_single_bot_access(
+            user_uid=query.user_uid,
+            bot_uid=query.bot_uid,
+            allowed_roles=self._allowed_roles
+        )
+
+        async with self._bot_uow as uow:
+            documents = await uow.bot_document_repository.find_by_uids_and_bot_uid(
+                document_uids=[query.document_uid],
+                bot_uid=target_bot.uid
+            )
+            if not documents:
+                raise DocumentNotFoundError(f"Document {query.document_uid} not found for bot {target_bot.uid}.")
+            document = documents[0]
+
+            if document.storage_key:
+                # A 404 can't be sent once StreamingResponse has started, so check up front
+                if not await self._document_storage.exists(document.storage_key):
+                    logger.error(f"Blob {document.storage_key} of document {document.uid} is missing")
+                    raise DocumentNotFoundError(f"Document {query.document_uid} has no stored content.")
+                content = self._document_storage.open_stream(document.storage_key)
+            else:
+                # Not moved to the blob store yet (see document_blob_migrator)
+                logger.warning(f"Document {document.uid} is still stored inline; serving it from the database")
+                content = self._single_chunk(await uow.bot_document_repository.find_legacy_file_data(document.uid) or b"")
+
+        return BotDocumentDownloadDTO(
+            filename=document.filename,
+            content_type=document.content_type or "application/octet-stream",
+            file_size=document.file_size,
+            checksum=document.checksum,
+            content=content,
+        )
+
+    @staticmethod
+    async def _single_chunk(data: bytes) -> AsyncIterator[bytes]:
+        yield data
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.core.base.query import BaseQuery
+
+
+@dataclass
+class DownloadBotDocumentQuery(BaseQuery):
+    user_uid: UUID
+    bot_uid: UUID
+    document_uid: UUID
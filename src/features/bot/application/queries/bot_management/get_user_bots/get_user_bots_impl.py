@@ -12,7 +12,7 @@ from src.features.bot.application.services.bot_access_service import BotAccessSe
 from src.features.bot.application.services.user_lookup_service import UserLookupService
 # from src.features.bot.domain.events.bot_events import UserBotsQueriedEvent
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
-from src.features.bot.utils import build_bot_response
+from src.features.bot.utils import build_bot_responses
 
 
 
@@ -47,26 +47,21 @@ class GetUserBotsQueryHandler(BaseQueryHandler[GetUserBotsQuery, GetUserBotsResp
         try:
             accessible_bots = await self._access_service.get_accessible_bots(
                 query.user_uid,
-                allowed_roles=self._allowed_roles
+                allowed_roles=self._allowed_roles,
             )
             logger.debug(f"Found {len(accessible_bots)} accessible bots")
         except Exception as e:
             logger.error(f"Error getting accessible bots: {e}", exc_info=True)
             return []
 
-        for bot in accessible_bots:
-            try:
-                bot_dto = await build_bot_response(
-                    bot=bot,
-                    bot_uow=self._bot_uow,
-                    user_lookup_service=self._user_lookup_service
-                )
-                if bot_dto:
-                    bots_data.append(bot_dto)
-                else:
-                    logger.warning(f"build_bot_response returned None for bot {bot.uid}")
-            except Exception as e:
-                logger.error(f"Failed to build response for bot {bot.uid}: {e}", exc_info=True)
+        # Related data for all bots is fetched in one query per relation
+        bots_data = await build_bot_responses(
+            bots=accessible_bots,
+            bot_uow=self._bot_uow,
+            user_lookup_service=self._user_lookup_service
+        )
+        if len(bots_data) < len(accessible_bots):
+            logger.warning(f"Built responses for {len(bots_data)} of {len(accessible_bots)} accessible bots")
 
         # Publish analytics event
         # await self._mediator.publish([
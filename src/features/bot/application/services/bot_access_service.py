@@ -6,6 +6,7 @@ from typing import List, Optional, Dict
 from uuid import UUID
 
 from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.enums import BotLoadProfile
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 from src.features.bot.exceptions.bot_exceptions import BotNotFoundError, BotAccessDeniedError
 
@@ -28,17 +29,18 @@ class BotAccessService:
             self,
             user_uid: UUID,
             bot_uid: UUID,
-            allowed_roles: Optional[List[str]] = None
+            allowed_roles: Optional[List[str]] = None,
+            profile: BotLoadProfile = BotLoadProfile.MINIMAL,
     ) -> BotEntity:
         """
         Centralized access control method.
         Ensures the user can access a specific bot, or raises a meaningful exception.
-        Uses helper methods like `can_manage_bot`.
+        The returned bot carries the related collections requested by `profile`.
         """
         logger.debug(f"Checking access for user {user_uid} to bot {bot_uid}. Allowed roles: {allowed_roles}")
 
         async with self._uow:
-            bot = await self._uow.bot_repository.find_by_uid(bot_uid)
+            bot = await self._uow.bot_repository.find_by_uid(bot_uid, profile=profile)
             if not bot:
                 logger.warning(f"Bot not found with UID: {bot_uid}")
                 raise BotNotFoundError(f"Bot with UID {bot_uid} not found.")
@@ -46,11 +48,8 @@ class BotAccessService:
             can_access = False
 
             if allowed_roles:
-                can_access = await self.can_manage_bot(
-                    user_uid=str(user_uid),
-                    bot_uid=str(bot_uid),
-                    allowed_roles=allowed_roles
-                )
+                # The bot is already loaded; only the participant role needs a query
+                can_access = await self._has_role(bot, user_uid, allowed_roles)
             else:
                 # Fall back to: is owner or any participant
                 can_access = str(bot.user_uid) == str(
@@ -69,7 +68,8 @@ class BotAccessService:
     async def get_accessible_bots(
         self,
         user_uid: UUID,
-        allowed_roles: Optional[List[str]] = None
+        allowed_roles: Optional[List[str]] = None,
+        profile: BotLoadProfile = BotLoadProfile.MINIMAL,
     ) -> List[BotEntity]:
         """
         Gets a list of all bots accessible to the user (owned or participating with allowed roles).
@@ -79,7 +79,7 @@ class BotAccessService:
 
         async with self._uow:
             # 1. Get Owned Bots using the existing findall_by_user_uid method
-            owned_bots = await self._uow.bot_repository.findall_by_user_uid(user_uid)
+            owned_bots = await self._uow.bot_repository.findall_by_user_uid(user_uid, profile=profile)
             for bot in owned_bots:
                 accessible_bots_map[bot.uid] = bot
 
@@ -100,7 +100,7 @@ class BotAccessService:
             #   Fetch the actual BotEntities for the valid participant entries
             if bots_to_fetch_uids:
                 uids_list = list(bots_to_fetch_uids)
-                participant_bots_list = await self._uow.bot_repository.find_by_uids(uids_list)
+                participant_bots_list = await self._uow.bot_repository.find_by_uids(uids_list, profile=profile)
 
                 # Add the fetched bots to the map
                 for bot in participant_bots_list:
@@ -126,18 +126,19 @@ class BotAccessService:
             bot = await self._uow.bot_repository.find_by_uid(UUID(bot_uid))
             if not bot:
                 return False
+            return await self._has_role(bot, UUID(user_uid), allowed_roles)
 
-            # Owner always has access
-            if str(bot.user_uid) == user_uid:
-                return True
+    async def _has_role(self, bot: BotEntity, user_uid: UUID, allowed_roles: Optional[List[str]]) -> bool:
+        """Owner always passes; otherwise the participant role must be in allowed_roles."""
+        if str(bot.user_uid) == str(user_uid):
+            return True
 
-            # Check participant roles
-            if allowed_roles:
-                participant_role = await self._uow.bot_participant_repository.find_participant_role(
-                    bot_uid=UUID(bot_uid),
-                    user_uid=UUID(user_uid)
-                )
-                return participant_role in allowed_roles if participant_role else False
+        if allowed_roles:
+            participant_role = await self._uow.bot_participant_repository.find_participant_role(
+                bot_uid=bot.uid,
+                user_uid=user_uid
+            )
+            return participant_role in allowed_roles if participant_role else False
 
-            return False
+        return False
 
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class StoredDocumentBlob:
+    """Where a document's bytes ended up; this is what the bot_documents row keeps."""
+    storage_key: str
+    file_size: int
+    checksum: str  # sha256 hex digest
+    content_type: Optional[str]
+
+
+class BotDocumentStorageService(ABC):
+    @abstractmethod
+    async def store(
+        self,
+        bot_uid: UUID,
+        document_uid: UUID,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+    ) -> StoredDocumentBlob:
+        """Streams the document bytes to the blob store."""
+        pass
+
+    @abstractmethod
+    async def exists(self, storage_key: str) -> bool:
+        """Whether the blob is there; checked before a download response is started."""
+        pass
+
+    @abstractmethod
+    def open_stream(self, storage_key: str) -> AsyncIterator[bytes]:
+        """Streams the stored bytes back without buffering the whole document."""
+        pass
+
+    @abstractmethod
+    async def delete(self, storage_keys: Iterable[str]) -> None:
+        pass
@@ -1,6 +1,6 @@
 # src/features/bot/application/services/i_bot_platform_linker_service.py (or bot_platform_linker_service_interface.py)
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from uuid import UUID
 
 from src.features.bot.domain.entities.bot_entity import BotEntity
@@ -41,4 +41,16 @@ class BotPlatformLinkerService(ABC):
         Raises:
             Exception or specific domain exceptions if the operation fails critically.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def find_active_service_uids(
+        self,
+        platform: ChatPlatform,
+        linked_account_uids: List[UUID],
+    ) -> Dict[UUID, UUID]:
+        """
+        Maps linked account uids to the uid of the active service they are bound to.
+        Accounts without an active service are left out.
+        """
+        pass
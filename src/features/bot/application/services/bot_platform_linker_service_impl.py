@@ -2,7 +2,7 @@
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from uuid import UUID  # Not strictly needed here anymore if not creating UID, but BotServiceEntity might use it
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from src.features.bot.application.services.bot_platform_linker_service import \
     BotPlatformLinkerService  # Assuming interface
@@ -98,4 +98,20 @@ class BotPlatformLinkerServiceHandler(BotPlatformLinkerService):  # Implement yo
             logger.critical(critical_error_msg)
             raise Exception(critical_error_msg)
 
-        return activated_service
\ No newline at end of file
+        return activated_service
+
+    async def find_active_service_uids(
+            self,
+            platform: ChatPlatform,
+            linked_account_uids: List[UUID],
+    ) -> Dict[UUID, UUID]:
+        async with self._bot_uow:
+            services = await self._bot_uow.bot_service_repository.find_by_linked_account_uids(
+                platform=platform.value,
+                linked_account_uids=linked_account_uids,
+            )
+        return {
+            service.linked_account_uid: service.uid
+            for service in services
+            if service.status == "active" and service.linked_account_uid
+        }
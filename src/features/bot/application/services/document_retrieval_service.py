@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Sequence
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class RetrievedChunk:
+    """A passage of one of the bot's documents, with its similarity to the query."""
+    document_uid: UUID
+    filename: str
+    text: str
+    score: float
+
+
+class DocumentRetrievalService(ABC):
+    """
+    Answers "which passages of this bot's documents are about this message".
+    Documents are indexed when they are uploaded and dropped when deleted.
+    """
+
+    @abstractmethod
+    async def retrieve(self, bot_uid: UUID, query: str, top_k: int) -> List[RetrievedChunk]:
+        """The best matching passages, best first; empty when the bot has no indexed documents."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def index_documents(self, bot_uid: UUID, document_uids: Sequence[UUID]) -> int:
+        """Extracts, chunks and indexes the given documents; returns the number of chunks added."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def remove_documents(self, bot_uid: UUID, document_uids: Sequence[UUID]) -> int:
+        """Drops the given documents from the bot's index; returns the number of chunks removed."""
+        raise NotImplementedError
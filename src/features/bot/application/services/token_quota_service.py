@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class QuotaReservation:
+    """Tokens taken from a bot's balance ahead of an LLM call, settled once the real usage is known."""
+    bot_uid: UUID
+    tokens: int
+    # False when the balance could not be reached; settling it is then a no-op
+    tracked: bool = True
+
+
+class TokenQuotaService(ABC):
+    """
+    Keeps the remaining token balance of every bot consistent across concurrent
+    messages and workers. Callers reserve before generating and settle after.
+    """
+
+    @abstractmethod
+    async def reserve(self, bot_uid: UUID, known_tokens_left: int, estimated_tokens: int) -> Optional[QuotaReservation]:
+        """
+        Takes up to `estimated_tokens` from the bot's balance; None when it is
+        exhausted. `known_tokens_left` (the stored BotORM.tokens_left) seeds a
+        balance that is not tracked yet.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def settle(self, reservation: QuotaReservation, used_tokens: int) -> Optional[int]:
+        """Replaces the reservation with the tokens actually used; returns the balance left."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reset(self, bot_uid: UUID, tokens_left: int) -> None:
+        """Overwrites the balance, e.g. after the bot's token limit changed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        raise NotImplementedError
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from dependency_injector import containers, providers
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -35,6 +37,8 @@ from src.features.bot.application.queries.bot_management.get_user_bots.get_user_
 from src.features.bot.application.queries.bot_participants.get_participants.get_bot_participants_impl import \
     GetBotParticipantsQueryHandler
 from src.features.bot.application.queries.bot_services.get_services.get_services_impl import GetServicesQueryHandler
+from src.features.bot.application.queries.bot_documents.download_document.download_document_impl import \
+    DownloadBotDocumentQueryHandler
 from src.features.bot.application.services.bot_access_service import BotAccessService
 from src.features.bot.application.services.bot_platform_linker_service_impl import BotPlatformLinkerServiceHandler
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
@@ -43,7 +47,20 @@ from src.features.bot.infra.persistence.repositories.bot_participant_repository_
 from src.features.bot.infra.persistence.repositories.bot_repository_impl import BotRepositoryImpl
 from src.features.bot.infra.persistence.repositories.bot_service_repository_impl import BotServiceRepositoryImpl
 from src.features.bot.infra.persistence.uow.bot_unit_of_work_impl import BotUnitOfWorkImpl
+from src.features.bot.infra.services.bot_document_storage_service_handler import BotDocumentStorageServiceHandler
+from src.features.bot.infra.services.bot_lookup_cache import BotLookupCache
 from src.features.bot.infra.services.bot_lookup_service_handler import BotLookupServiceHandler
+from src.features.bot.application.event_handlers.bot_config_cache_handler import BotConfigCacheInvalidationHandler
+from src.features.bot.application.event_handlers.bot_quota_reset_handler import BotQuotaResetHandler
+from src.features.bot.application.event_handlers.document_index_handler import (
+    DocumentIndexingHandler,
+    DocumentIndexRemovalHandler,
+)
+from src.features.bot.infra.services.document_knowledge_base import DocumentKnowledgeBase
+from src.features.bot.infra.services.document_processing_pool import DocumentProcessingPool
+from src.features.bot.infra.services.document_vector_index import DocumentVectorIndexStore
+from src.features.bot.infra.services.text_embedder import create_text_embedder
+from src.features.bot.infra.services.redis_token_quota_service import RedisTokenQuotaService
 from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
 
 
@@ -51,6 +68,8 @@ class BotContainer(containers.DeclarativeContainer):
     # Dependencies from parent
     mediator = providers.Dependency(instance_of=Mediator)
     user_lookup_service = providers.Dependency()
+    redis_service = providers.Dependency()
+    s3_service = providers.Dependency()
     config = providers.DelegatedSingleton(Settings)
 
 
@@ -82,9 +101,113 @@ class BotContainer(containers.DeclarativeContainer):
         uow=bot_unit_of_work,
     )
 
+    bot_document_storage = providers.Singleton(
+        BotDocumentStorageServiceHandler,
+        s3_service=s3_service,
+        key_prefix=config.provided.BOT_DOCUMENT_KEY_PREFIX,
+    )
+
+    @staticmethod
+    def create_bot_lookup_cache(
+        ttl_seconds: float, max_size: int, use_redis: bool, redis_ttl_seconds: int, invalidation_channel: str,
+        redis_service
+    ) -> BotLookupCache:
+        return BotLookupCache(
+            ttl_seconds=ttl_seconds,
+            max_size=max_size,
+            redis_service=redis_service if use_redis else None,
+            redis_ttl_seconds=redis_ttl_seconds,
+            invalidation_channel=invalidation_channel or None,
+        )
+
+    bot_lookup_cache = providers.Singleton(
+        create_bot_lookup_cache,
+        ttl_seconds=config.provided.BOT_LOOKUP_CACHE_TTL_SECONDS,
+        max_size=config.provided.BOT_LOOKUP_CACHE_MAX_SIZE,
+        use_redis=config.provided.BOT_LOOKUP_CACHE_USE_REDIS,
+        redis_ttl_seconds=config.provided.BOT_LOOKUP_CACHE_REDIS_TTL_SECONDS,
+        invalidation_channel=config.provided.BOT_LOOKUP_CACHE_INVALIDATION_CHANNEL,
+        redis_service=redis_service,
+    )
+
     bot_lookup_service = providers.Factory(
         BotLookupServiceHandler,
         bot_uow=bot_unit_of_work,
+        cache=bot_lookup_cache,
+    )
+
+    bot_config_cache_invalidation_handler = providers.Factory(
+        BotConfigCacheInvalidationHandler,
+        _bot_lookup_cache=bot_lookup_cache,
+    )
+
+    @staticmethod
+    def create_token_quota_service(settings: Settings) -> Optional[RedisTokenQuotaService]:
+        if not settings.TOKEN_QUOTA_ENABLED:
+            return None
+        return RedisTokenQuotaService(
+            session_maker=AsyncSessionLocal,
+            key_prefix=settings.TOKEN_QUOTA_KEY_PREFIX,
+            key_ttl_seconds=settings.TOKEN_QUOTA_KEY_TTL_SECONDS,
+            flush_interval=settings.TOKEN_QUOTA_FLUSH_INTERVAL,
+            flush_batch_size=settings.TOKEN_QUOTA_FLUSH_BATCH_SIZE,
+        )
+
+    # One per process: it remembers which balances this worker still has to write back
+    token_quota_service = providers.Singleton(create_token_quota_service, settings=config.provided)
+
+    bot_quota_reset_handler = providers.Factory(
+        BotQuotaResetHandler,
+        _token_quota_service=token_quota_service,
+    )
+
+    @staticmethod
+    def create_document_knowledge_base(
+        settings: Settings, uow_factory, document_storage, mediator: Mediator
+    ) -> Optional[DocumentKnowledgeBase]:
+        if not settings.KNOWLEDGE_ENABLED:
+            return None
+        embedder = create_text_embedder(settings.KNOWLEDGE_EMBEDDER, settings.KNOWLEDGE_EMBEDDING_DIM)
+        return DocumentKnowledgeBase(
+            index_store=DocumentVectorIndexStore(
+                root=settings.KNOWLEDGE_INDEX_DIR,
+                dim=embedder.dim,
+                embedder=embedder.name,
+                term_weighted=embedder.term_weighted,
+            ),
+            embedder=embedder,
+            uow_factory=uow_factory,
+            document_storage=document_storage,
+            processing_pool=DocumentProcessingPool(
+                embedder_spec=settings.KNOWLEDGE_EMBEDDER,
+                dim=settings.KNOWLEDGE_EMBEDDING_DIM,
+                workers=None if settings.KNOWLEDGE_PROCESS_WORKERS < 0 else settings.KNOWLEDGE_PROCESS_WORKERS,
+                max_pending=settings.KNOWLEDGE_PROCESS_MAX_PENDING or None,
+                chunk_chars=settings.KNOWLEDGE_CHUNK_CHARS,
+                chunk_overlap_chars=settings.KNOWLEDGE_CHUNK_OVERLAP_CHARS,
+            ),
+            max_document_bytes=settings.KNOWLEDGE_MAX_DOCUMENT_BYTES,
+            min_score=settings.KNOWLEDGE_MIN_SCORE,
+            mediator=mediator,
+        )
+
+    # One per process: it keeps the bots' index files mapped
+    document_knowledge_base = providers.Singleton(
+        create_document_knowledge_base,
+        settings=config.provided,
+        uow_factory=bot_unit_of_work.provider,
+        document_storage=bot_document_storage,
+        mediator=mediator,
+    )
+
+    document_indexing_handler = providers.Factory(
+        DocumentIndexingHandler,
+        _document_retrieval_service=document_knowledge_base,
+    )
+
+    document_index_removal_handler = providers.Factory(
+        DocumentIndexRemovalHandler,
+        _document_retrieval_service=document_knowledge_base,
     )
 
     bot_platform_linker_service = providers.Singleton(
@@ -119,6 +242,7 @@ class BotContainer(containers.DeclarativeContainer):
         DeleteBotCommandHandler,
         _unit_of_work=bot_unit_of_work,
         _access_service=bot_access_service,
+        _document_storage=bot_document_storage,
         _mediator=mediator,
         _allowed_roles=["owner"]
     )
@@ -196,14 +320,17 @@ class BotContainer(containers.DeclarativeContainer):
         UploadBotDocumentsCommandHandler,
         _unit_of_work=bot_unit_of_work,
         _access_service=bot_access_service,
+        _document_storage=bot_document_storage,
         _mediator=mediator,
-        _allowed_roles=["editor", "admin", "owner"]
+        _allowed_roles=["editor", "admin", "owner"],
+        _chunk_size=config.provided.BOT_DOCUMENT_UPLOAD_CHUNK_SIZE,
     )
 
     delete_bot_documents_command_handler = providers.Factory(
         DeleteBotDocumentsCommandHandler,
         _unit_of_work=bot_unit_of_work,
         _access_service=bot_access_service,
+        _document_storage=bot_document_storage,
         _mediator=mediator,
         _allowed_roles=["editor", "admin", "owner"]
     )
@@ -244,4 +371,10 @@ class BotContainer(containers.DeclarativeContainer):
         _allowed_roles=["viewer", "editor", "admin","owner"]
     )
 
-
+    download_bot_document_query_handler = providers.Factory(
+        DownloadBotDocumentQueryHandler,
+        _bot_uow=bot_unit_of_work,
+        _access_service=bot_access_service,
+        _document_storage=bot_document_storage,
+        _allowed_roles=["viewer", "editor", "admin", "owner"]
+    )
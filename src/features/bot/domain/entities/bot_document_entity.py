@@ -5,6 +5,7 @@ from typing import Optional, Any
 from datetime import datetime
 
 from src.core.models.base_entity import BaseEntity  # Adjust import path
+from src.features.bot.domain.enums import BotDocumentStatus
 
 
 class BotDocumentEntity(BaseEntity):
@@ -12,12 +13,17 @@ class BotDocumentEntity(BaseEntity):
     bot_uid: uuid.UUID
     filename: str
     content_type: Optional[str] = None
-    # Option 1: Store file data directly (as in your example - not ideal for large files)
-    file_data: Optional[bytes] = None  # For simplicity matching your example
-
-    # Option 2: Store a reference (better for production)
-    # storage_path: Optional[str] = None # e.g., "s3://bucket/bot_docs/bot_uid/filename"
-    # file_size: Optional[int] = None
+    # Reference to the bytes in the blob store, e.g. "bot_documents/<bot_uid>/<uid>"
+    storage_key: Optional[str] = None
+    file_size: Optional[int] = None
+    checksum: Optional[str] = None  # sha256 hex digest
+    # Legacy inline bytes of documents not yet moved to the blob store
+    file_data: Optional[bytes] = None
+    # Text extraction and indexing for retrieval, done after the upload has returned
+    status: BotDocumentStatus = BotDocumentStatus.PENDING
+    status_error: Optional[str] = None
+    chunk_count: Optional[int] = None
+    content_hash: Optional[str] = None  # sha256 hex digest of the normalized text
 
     def __init__(
             self,
@@ -27,9 +33,14 @@ class BotDocumentEntity(BaseEntity):
             created_at: Optional[datetime] = None,
             updated_at: Optional[datetime] = None,
             content_type: Optional[str] = None,
-            file_data: Optional[bytes] = None,  # For Option 1
-            # storage_path: Optional[str] = None, # For Option 2
-            # file_size: Optional[int] = None,    # For Option 2
+            storage_key: Optional[str] = None,
+            file_size: Optional[int] = None,
+            checksum: Optional[str] = None,
+            file_data: Optional[bytes] = None,
+            status: BotDocumentStatus = BotDocumentStatus.PENDING,
+            status_error: Optional[str] = None,
+            chunk_count: Optional[int] = None,
+            content_hash: Optional[str] = None,
     ):
         super().__init__(uid=uid)
         if not bot_uid:
@@ -40,8 +51,13 @@ class BotDocumentEntity(BaseEntity):
         self.bot_uid = bot_uid
         self.filename = filename
         self.content_type = content_type
-        self.file_data = file_data  # Option 1
-        # self.storage_path = storage_path # Option 2
-        # self.file_size = file_size       # Option 2
+        self.storage_key = storage_key
+        self.file_size = file_size
+        self.checksum = checksum
+        self.file_data = file_data
+        self.status = BotDocumentStatus(status)
+        self.status_error = status_error
+        self.chunk_count = chunk_count
+        self.content_hash = content_hash
 
     # Add other domain methods if needed
@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 from dataclasses import dataclass, field # Import dataclass and field
 from datetime import datetime, timezone # Import for BaseEntity defaults
 
@@ -9,6 +9,11 @@ from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 
+if TYPE_CHECKING:
+    from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
+    from src.features.bot.domain.entities.bot_participant_entity import BotParticipantEntity
+    from src.features.bot.domain.entities.bot_service_entity import BotServiceEntity
+
 
 
 class BotStatus: # Simple Enum-like class for status
@@ -40,6 +45,12 @@ class BotEntity(BaseEntity):
     auto_deduction: bool = False
     crm_lead_id: Optional[int] = None
 
+    # Related collections, set by the repository only when the requested
+    # BotLoadProfile includes them. None means "not loaded", not "empty".
+    services: Optional[List["BotServiceEntity"]] = field(default=None, repr=False, compare=False)
+    participants: Optional[List["BotParticipantEntity"]] = field(default=None, repr=False, compare=False)
+    documents: Optional[List["BotDocumentEntity"]] = field(default=None, repr=False, compare=False)
+
     def __post_init__(self):
         """
         Initializes the BaseEntity and performs initial state validation.
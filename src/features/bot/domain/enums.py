@@ -21,4 +21,22 @@ class BotType(str, Enum):
     @classmethod
     def list(cls):
         """Returns a list of all defined bot types."""
-        return list(map(lambda c: c.value, cls))
\ No newline at end of file
+        return list(map(lambda c: c.value, cls))
+
+class BotDocumentStatus(str, Enum):
+    """Where a document is in text extraction and indexing for retrieval."""
+    PENDING = "pending"        # Uploaded, waiting for a processing worker
+    PROCESSING = "processing"  # Claimed by a worker
+    READY = "ready"            # Indexed; its passages can be retrieved
+    FAILED = "failed"          # Could not be processed; status_error says why
+
+class BotLoadProfile(str, Enum):
+    """
+    What BotRepository loads together with the bots row. Related collections
+    are set on BotEntity (services / participants / documents) only when the
+    profile includes them; otherwise those attributes stay None.
+    """
+    MINIMAL = "minimal"                        # bots row only
+    WITH_SERVICES = "with_services"            # + bot_services
+    WITH_PARTICIPANTS = "with_participants"    # + bot_participants
+    FULL_WITHOUT_BLOBS = "full_without_blobs"  # + services, participants, documents (no file_data)
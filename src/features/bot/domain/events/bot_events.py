@@ -1,6 +1,7 @@
 # 3. Domain Events (src/features/bot/domain/events/bot_events.py)
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Tuple
 from src.core.base.event import BaseEvent
 
 
@@ -28,4 +29,32 @@ class BotExpirySetEvent(BaseEvent):
     """Event published to set bot expiry in cache"""
     bot_uid: str
     expiry_seconds: int
-    set_at: datetime = field(default_factory=datetime.utcnow)
\ No newline at end of file
+    set_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass(frozen=True)
+class BotConfigChangedEvent(BaseEvent):
+    """Event published when a bot's configuration, owner or services change (or it is deleted)"""
+    bot_uid: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class BotQuotaChangedEvent(BaseEvent):
+    """Event published when a bot's token balance is set outright (e.g. a new token limit)"""
+    bot_uid: str
+    tokens_left: int
+
+
+@dataclass(frozen=True)
+class BotDocumentsUploadedEvent(BaseEvent):
+    """Event published after new document rows are committed, so they can be indexed for retrieval"""
+    bot_uid: str
+    document_uids: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class BotDocumentsDeletedEvent(BaseEvent):
+    """Event published after document rows are deleted (also when their bot is), so they leave the index"""
+    bot_uid: str
+    document_uids: Tuple[str, ...]
@@ -5,6 +5,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
+from src.features.bot.domain.enums import BotDocumentStatus
 from src.core.base.repository import BaseRepository  # Assuming you have this
 
 
@@ -25,6 +26,11 @@ class BotDocumentRepository(ABC):  # Inherit if applicable
         """Finds all documents associated with a specific bot."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_by_bot_uids(self, bot_uids: List[UUID]) -> List[BotDocumentEntity]:
+        """Finds document metadata (never the bytes) of several bots with a single query."""
+        raise NotImplementedError
+
     @abstractmethod
     async def find_by_uid(self, uid: UUID) -> Optional[BotDocumentEntity]:
         raise NotImplementedError
@@ -33,6 +39,11 @@ class BotDocumentRepository(ABC):  # Inherit if applicable
     async def delete_by_uid(self, uid: UUID) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_legacy_file_data(self, uid: UUID) -> Optional[bytes]:
+        """Loads the inline bytes of a document not yet moved to the blob store."""
+        raise NotImplementedError
+
     @abstractmethod
     async def find_by_uids_and_bot_uid(self, document_uids: List[UUID], bot_uid: UUID) -> List[BotDocumentEntity]:
         """Finds documents by their UIDs, ensuring they belong to the specified bot."""
@@ -43,6 +54,26 @@ class BotDocumentRepository(ABC):  # Inherit if applicable
         """Deletes multiple documents by their UIDs. Returns the count of deleted documents."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def claim_for_processing(self, document_uids: List[UUID], bot_uid: UUID) -> List[BotDocumentEntity]:
+        """
+        Moves the bot's pending documents among `document_uids` to processing and
+        returns them; a document claimed by another worker is left out.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_processing_result(
+        self,
+        uid: UUID,
+        status: BotDocumentStatus,
+        chunk_count: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """Records how processing of a document ended (ready or failed); False if it was deleted meanwhile."""
+        raise NotImplementedError
+
     # Add update if needed, though documents are often immutable once uploaded
     # @abstractmethod
     # async def update(self, entity: BotDocumentEntity) -> BotDocumentEntity:
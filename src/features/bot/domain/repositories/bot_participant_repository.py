@@ -30,6 +30,11 @@ class BotParticipantRepository(ABC):
         """Finds all participants associated with a specific bot."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_by_bot_uids(self, bot_uids: List[UUID]) -> List[BotParticipantEntity]:
+        """Finds the participants of several bots with a single query."""
+        raise NotImplementedError
+
     @abstractmethod
     async def find_bots_by_user_uid(self, user_uid: UUID) -> List[BotParticipantEntity]:
         """Finds all participant entries for a specific user."""
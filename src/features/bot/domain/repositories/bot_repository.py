@@ -1,19 +1,31 @@
 from abc import abstractmethod
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from src.core.base.repository import BaseRepository
 from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.enums import BotLoadProfile
 
 
 class BotRepository(BaseRepository[BotEntity]):
 
     # in BotRepository
     @abstractmethod
-    async def findall_by_user_uid(self, user_uid: UUID) -> List[BotEntity]:
+    async def findall_by_user_uid(
+        self, user_uid: UUID, profile: BotLoadProfile = BotLoadProfile.MINIMAL
+    ) -> List[BotEntity]:
         ...
 
     @abstractmethod
-    async def find_by_uids(self, uids: List[UUID]) -> List[BotEntity]:
+    async def find_by_uid(
+        self, uid: UUID, profile: BotLoadProfile = BotLoadProfile.MINIMAL
+    ) -> Optional[BotEntity]:
+        """Finds a bot by UID, loading the related collections named by `profile`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_uids(
+        self, uids: List[UUID], profile: BotLoadProfile = BotLoadProfile.MINIMAL
+    ) -> List[BotEntity]:
         """Finds multiple bots by their UIDs."""
         raise NotImplementedError
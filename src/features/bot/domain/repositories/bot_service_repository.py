@@ -17,6 +17,16 @@ class BotServiceRepository(ABC):
     async def find_by_bot_uid(self, bot_uid: UUID) -> List[BotServiceEntity]:
         ...
 
+    @abstractmethod
+    async def find_by_bot_uids(self, bot_uids: List[UUID]) -> List[BotServiceEntity]:
+        """Finds the services of several bots with a single query."""
+        ...
+
+    @abstractmethod
+    async def find_by_linked_account_uids(self, platform: str, linked_account_uids: List[UUID]) -> List[BotServiceEntity]:
+        """Finds the services of a platform bound to any of the given linked accounts, with a single query."""
+        ...
+
     async def find_platforms_by_bot_uid(self, bot_uid: UUID) -> list[str]:
         ...
 
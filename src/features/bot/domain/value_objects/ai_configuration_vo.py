@@ -16,6 +16,21 @@ class AIConfigurationSettings:
     max_response: int = 250
     repetition_penalty: float = 0.0
     generation_model: str = "deepseek-v2:16b"
+    # Prompt history window: last N messages and/or an estimated token budget.
+    # None disables the respective limit (full conversation history).
+    history_window_messages: Optional[int] = 50
+    history_token_budget: Optional[int] = None
+    # Messages arriving within this many milliseconds of each other are answered
+    # with a single reply on messenger channels. None/0 answers every message.
+    coalesce_window_ms: Optional[int] = None
+    # Once this many messages follow the conversation's rolling summary, the older
+    # half is folded into it in the background. None disables summarization.
+    summarize_after_messages: Optional[int] = None
+    # Replies to a repeated question (and, optionally, the same few preceding
+    # messages) are served from the response cache for this many seconds.
+    # None disables caching for the bot.
+    response_cache_ttl_seconds: Optional[int] = None
+    response_cache_history_messages: Optional[int] = None
 
     def __post_init__(self):
         # Example Validation within the Value Object itself
@@ -23,4 +38,20 @@ class AIConfigurationSettings:
             raise ValueError("Temperature must be between 0.0 and 1.0")
         if self.max_response <= 0:
             raise ValueError("Max response must be positive")
+        if self.history_window_messages is not None and self.history_window_messages <= 0:
+            raise ValueError("History window must be a positive number of messages")
+        if self.history_token_budget is not None and self.history_token_budget <= 0:
+            raise ValueError("History token budget must be positive")
+        if self.coalesce_window_ms is not None and not (0 <= self.coalesce_window_ms <= 60000):
+            raise ValueError("Coalesce window must be between 0 and 60000 ms")
+        if self.summarize_after_messages is not None:
+            if not (4 <= self.summarize_after_messages <= 1000):
+                raise ValueError("Summarize after must be between 4 and 1000 messages")
+            # The trigger counts the loaded window, so it has to fit into it
+            if self.history_window_messages is not None and self.summarize_after_messages > self.history_window_messages:
+                raise ValueError("Summarize after cannot exceed the history window")
+        if self.response_cache_ttl_seconds is not None and not (60 <= self.response_cache_ttl_seconds <= 604800):
+            raise ValueError("Response cache TTL must be between 60 and 604800 seconds")
+        if self.response_cache_history_messages is not None and not (0 <= self.response_cache_history_messages <= 10):
+            raise ValueError("Response cache history must be between 0 and 10 messages")
         # ... other validations ...
@@ -125,6 +125,11 @@ class FileTooLargeError(AppException):
     status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
     error_code = "file_too_large"
 
+class UnsupportedDocumentTypeError(AppException):
+    message = "The document's text could not be extracted."
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    error_code = "unsupported_document_type"
+
 
 class BotAuthorizationError(AppException):
     message = "Bot authorization failed."
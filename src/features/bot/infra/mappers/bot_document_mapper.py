@@ -4,6 +4,8 @@ from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from typing import Optional, Type
 
+from sqlalchemy import inspect
+
 # Assuming BotDocumentEntity now also inherits from BaseEntity (a dataclass)
 from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
 from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
@@ -41,9 +43,15 @@ class BotDocumentMapper:
             bot_uid=orm_obj.bot_uid,
             filename=orm_obj.filename,
             content_type=orm_obj.content_type,
-            file_data=orm_obj.file_data
-            # storage_path=orm_obj.storage_path, # Uncomment if used
-            # file_size=orm_obj.file_size        # Uncomment if used
+            storage_key=orm_obj.storage_key,
+            file_size=orm_obj.file_size,
+            checksum=orm_obj.checksum,
+            status=orm_obj.status,
+            status_error=orm_obj.status_error,
+            chunk_count=orm_obj.chunk_count,
+            content_hash=orm_obj.content_hash,
+            # Legacy inline bytes are deferred and only present when explicitly loaded
+            file_data=None if "file_data" in inspect(orm_obj).unloaded else orm_obj.file_data
         )
 
     def from_entity(self, entity: BotDocumentEntity) -> Optional[BotDocumentORM]:
@@ -57,9 +65,14 @@ class BotDocumentMapper:
             "bot_uid": entity.bot_uid,
             "filename": entity.filename,
             "content_type": entity.content_type,
+            "storage_key": entity.storage_key,
+            "file_size": entity.file_size,
+            "checksum": entity.checksum,
             "file_data": entity.file_data,
-            # "storage_path": entity.storage_path, # Uncomment if used
-            # "file_size": entity.file_size,        # Uncomment if used
+            "status": entity.status.value,
+            "status_error": entity.status_error,
+            "chunk_count": entity.chunk_count,
+            "content_hash": entity.content_hash,
             # Explicitly pass created_at and updated_at as they are part of the entity
             "created_at": entity.created_at,
             "updated_at": entity.updated_at,
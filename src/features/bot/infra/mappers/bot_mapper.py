@@ -2,11 +2,22 @@ from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from typing import Optional
 
+from sqlalchemy import inspect
+
 # Import your specific Entity, ORM, and VOs
 from src.features.bot.domain.entities.bot_entity import BotEntity
 from src.features.bot.infra.persistence.models.bot import BotORM
 from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
 from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
+from src.features.bot.domain.entities.bot_participant_entity import BotParticipantEntity
+from src.features.bot.domain.entities.bot_service_entity import BotServiceEntity
+from src.features.bot.infra.mappers.bot_document_mapper import BotDocumentMapper
+from src.features.bot.infra.mappers.bot_participant_mapper import BotParticipantMapper
+from src.features.bot.infra.mappers.bot_service_mapper import BotServiceMapper
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.features.bot.infra.persistence.models.bot_participant import BotParticipantORM
+from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
 
 
 
@@ -18,6 +29,11 @@ class BotMapper:
     not data storage.
     """
 
+    def __init__(self):
+        self._service_mapper = BotServiceMapper(BotServiceEntity, BotServiceORM)
+        self._participant_mapper = BotParticipantMapper(BotParticipantEntity, BotParticipantORM)
+        self._document_mapper = BotDocumentMapper(BotDocumentEntity, BotDocumentORM)
+
     def to_entity(self, orm_obj: BotORM) -> Optional[BotEntity]:
         """
         Maps a BotORM object from the persistence layer to a BotEntity domain object.
@@ -38,7 +54,13 @@ class BotMapper:
                 top_k=orm_obj.top_k,
                 max_response=orm_obj.max_response,
                 repetition_penalty=orm_obj.repetition_penalty,
-                generation_model=orm_obj.generation_model
+                generation_model=orm_obj.generation_model,
+                history_window_messages=orm_obj.history_window_messages,
+                history_token_budget=orm_obj.history_token_budget,
+                coalesce_window_ms=orm_obj.coalesce_window_ms,
+                summarize_after_messages=orm_obj.summarize_after_messages,
+                response_cache_ttl_seconds=orm_obj.response_cache_ttl_seconds,
+                response_cache_history_messages=orm_obj.response_cache_history_messages
             )
 
             quota = BotQuota(
@@ -72,6 +94,16 @@ class BotMapper:
                 auto_deduction=orm_obj.auto_deduction,
                 crm_lead_id=orm_obj.crm_lead_id
             )
+
+            # 3. Related collections: only those the query loaded (see BotLoadProfile).
+            # Touching an unloaded one would raise (lazy="raise"), so check first.
+            unloaded = inspect(orm_obj).unloaded
+            if "bot_services" not in unloaded:
+                entity.services = [self._service_mapper.to_entity(s) for s in orm_obj.bot_services]
+            if "bot_participants" not in unloaded:
+                entity.participants = [self._participant_mapper.to_entity(p) for p in orm_obj.bot_participants]
+            if "documents" not in unloaded:
+                entity.documents = [self._document_mapper.to_entity(d) for d in orm_obj.documents]
             return entity
 
         except Exception as e:
@@ -110,6 +142,12 @@ class BotMapper:
                 "max_response": entity.ai_settings.max_response,
                 "repetition_penalty": entity.ai_settings.repetition_penalty,
                 "generation_model": entity.ai_settings.generation_model,
+                "history_window_messages": entity.ai_settings.history_window_messages,
+                "history_token_budget": entity.ai_settings.history_token_budget,
+                "coalesce_window_ms": entity.ai_settings.coalesce_window_ms,
+                "summarize_after_messages": entity.ai_settings.summarize_after_messages,
+                "response_cache_ttl_seconds": entity.ai_settings.response_cache_ttl_seconds,
+                "response_cache_history_messages": entity.ai_settings.response_cache_history_messages,
 
                 # Fields from BotQuota VO
                 "token_limit": entity.quota.token_limit,
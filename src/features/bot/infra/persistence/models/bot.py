@@ -41,6 +41,12 @@ class BotORM(SQLAlchemyBase):
     top_k: Mapped[int | None] = mapped_column(Integer, default=40, nullable=True)
     repetition_penalty: Mapped[float | None] = mapped_column(Float, default=0.0, nullable=True)
     generation_model: Mapped[str] = mapped_column(String, default="stub", nullable=False)
+    history_window_messages: Mapped[int | None] = mapped_column(Integer, default=50, nullable=True)
+    history_token_budget: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    coalesce_window_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    summarize_after_messages: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_cache_ttl_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_cache_history_messages: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     token_limit: Mapped[int | None] = mapped_column(Integer, default=500, nullable=True)
     tokens_left: Mapped[int | None] = mapped_column(Integer, default=50000, nullable=True)
@@ -48,11 +54,13 @@ class BotORM(SQLAlchemyBase):
     crm_lead_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
 
+    # Collections are never loaded implicitly: BotRepositoryImpl loads what a
+    # BotLoadProfile asks for, anything else raises instead of issuing hidden SELECTs.
     payments: Mapped[List["PaymentORM"]] = relationship(
         "src.features.payments.infra.persistence.models.payment.PaymentORM",
         back_populates="bot",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True
     )
 
@@ -60,7 +68,7 @@ class BotORM(SQLAlchemyBase):
         "BotServiceORM",
         back_populates="bot",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True
     )
 
@@ -68,7 +76,7 @@ class BotORM(SQLAlchemyBase):
         "src.features.bot.infra.persistence.models.bot_participant.BotParticipantORM",
         back_populates="bot",  # Matches BotParticipantORM.bot relationship
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True
     )
 
@@ -76,6 +84,7 @@ class BotORM(SQLAlchemyBase):
         "src.features.bot.infra.persistence.models.bot_document.BotDocumentORM",
         back_populates="bot", # This should match the 'bot' relationship in BotDocumentORM
         cascade="all, delete-orphan",
-        lazy="selectin" # Or your preferred loading strategy
+        lazy="raise",
+        passive_deletes=True # The FK cascades; deleting a bot must not load document blobs
     )
 
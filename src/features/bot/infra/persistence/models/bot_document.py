@@ -4,7 +4,7 @@ from __future__ import annotations  # MUST BE FIRST LINE
 import uuid
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, LargeBinary, Integer  # Import LargeBinary for file_data
+from sqlalchemy import String, ForeignKey, LargeBinary, BigInteger, Index, Integer, UniqueConstraint, text  # Import LargeBinary for file_data
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,11 @@ if TYPE_CHECKING:
 class BotDocumentORM(SQLAlchemyBase):
     """SQLAlchemy ORM model for Bot Documents."""
     __tablename__ = "bot_documents"
+    __table_args__ = (
+        UniqueConstraint("storage_key", name="uq_bot_documents_storage_key"),
+        # Only the few rows still waiting for (or stuck in) processing are looked up by status
+        Index("ix_bot_documents_unprocessed", "status", postgresql_where=text("status IN ('pending', 'processing')")),
+    )
 
     # uid, created_at, updated_at inherited from SQLAlchemyBase
 
@@ -29,16 +34,25 @@ class BotDocumentORM(SQLAlchemyBase):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
 
-    # Option 1: Store file data directly (as in your example)
-    file_data: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
-    # Option 2: Store reference
-    # storage_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
-    # file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # The bytes live in the blob store (BotDocumentStorageService); the row keeps a reference
+    storage_key: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    file_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    checksum: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # sha256 hex
+
+    # Legacy inline bytes; emptied by document_blob_migrator, never written for new uploads
+    file_data: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True, deferred_raiseload=True)
+
+    # Text extraction and indexing (BotDocumentStatus); the upload returns before it is done
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending", server_default="pending")
+    status_error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    chunk_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # sha256 hex of the normalized text
 
     # Relationship back to the bot
     bot: Mapped["BotORM"] = relationship(
         "src.features.bot.infra.persistence.models.bot.BotORM",
-        back_populates="documents"  # Ensure BotORM has 'documents' relationship
+        back_populates="documents",  # Ensure BotORM has 'documents' relationship
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
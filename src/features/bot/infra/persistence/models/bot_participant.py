@@ -29,12 +29,13 @@ class BotParticipantORM(SQLAlchemyBase):
 
     bot: Mapped[BotORM] = relationship(
         "src.features.bot.infra.persistence.models.bot.BotORM",
-        back_populates="bot_participants"
+        back_populates="bot_participants",
+        lazy="raise"
     )
 
     user: Mapped[UserORM] = relationship(
         "src.features.identity.infra.persistence.models.user.UserORM",
-        lazy="selectin"
+        lazy="raise"
     )
 
     def __repr__(self) -> str:
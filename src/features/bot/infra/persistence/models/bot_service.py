@@ -20,5 +20,5 @@ class BotServiceORM(SQLAlchemyBase):
     bot: Mapped["BotORM"] = relationship(
         "BotORM",
         back_populates="bot_services",
-        lazy="selectin"
+        lazy="raise"
     )
\ No newline at end of file
@@ -8,13 +8,15 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import delete
+from sqlalchemy import delete, update
 
 from src.features.bot.domain.repositories.bot_document_repository import BotDocumentRepository
 from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
+from src.features.bot.domain.enums import BotDocumentStatus
 from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
 from src.features.bot.infra.mappers.bot_document_mapper import BotDocumentMapper  # To be created
 from src.features.bot.exceptions.bot_exceptions import DocumentNotFoundError  # Example
+from src.infra.persistence.returning import insert_many_returning, insert_returning
 
 
 
@@ -32,10 +34,8 @@ class BotDocumentRepositoryImpl(BotDocumentRepository):
         orm_obj = self._mapper.from_entity(entity)
         if not orm_obj:
             raise ValueError("Failed to map BotDocumentEntity to ORM for creation.")
-        self._session.add(orm_obj)
         try:
-            await self._session.flush()
-            await self._session.refresh(orm_obj)
+            orm_obj = await insert_returning(self._session, orm_obj)
             return self._mapper.to_entity(orm_obj)
         except IntegrityError as e:
             logger.error(f"IntegrityError creating document for bot {entity.bot_uid}: {e}", exc_info=True)
@@ -50,18 +50,10 @@ class BotDocumentRepositoryImpl(BotDocumentRepository):
         if not entities:
             return []
         orm_objs = [self._mapper.from_entity(e) for e in entities if e]
-        self._session.add_all(orm_objs)
         try:
-            await self._session.flush()
-            # Refreshing multiple objects needs care or individual refresh
-            # For simplicity, we'll map back from the input entities if no DB defaults change them,
-            # or re-fetch if necessary. Here, we assume from_entity -> to_entity is safe after flush.
-            # A more robust way is to refresh each orm_obj and map back.
-            refreshed_entities = []
-            for orm_obj in orm_objs:  # Assuming flush populated UIDs if they were None
-                await self._session.refresh(orm_obj)
-                refreshed_entities.append(self._mapper.to_entity(orm_obj))
-            return refreshed_entities
+            # One bulk INSERT … RETURNING instead of a refresh per document
+            inserted = await insert_many_returning(self._session, orm_objs)
+            return [self._mapper.to_entity(orm_obj) for orm_obj in inserted]
         except IntegrityError as e:
             logger.error(f"IntegrityError creating multiple documents: {e}", exc_info=True)
             await self._session.rollback()
@@ -76,10 +68,23 @@ class BotDocumentRepositoryImpl(BotDocumentRepository):
         result = await self._session.execute(stmt)
         return [self._mapper.to_entity(orm) for orm in result.scalars().all() if orm]
 
+    async def find_by_bot_uids(self, bot_uids: List[UUID]) -> List[BotDocumentEntity]:
+        if not bot_uids:
+            return []
+        # file_data is a deferred column, so only metadata is selected
+        stmt = select(BotDocumentORM).where(BotDocumentORM.bot_uid.in_(set(bot_uids)))
+        result = await self._session.execute(stmt)
+        return [self._mapper.to_entity(orm) for orm in result.scalars().all() if orm]
+
     async def find_by_uid(self, uid: UUID) -> Optional[BotDocumentEntity]:
         orm_obj = await self._session.get(BotDocumentORM, uid)
         return self._mapper.to_entity(orm_obj) if orm_obj else None
 
+    async def find_legacy_file_data(self, uid: UUID) -> Optional[bytes]:
+        stmt = select(BotDocumentORM.file_data).where(BotDocumentORM.uid == uid)
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def delete_by_uid(self, uid: UUID) -> None:
         orm_obj = await self._session.get(BotDocumentORM, uid)
         if not orm_obj:
@@ -99,6 +104,43 @@ class BotDocumentRepositoryImpl(BotDocumentRepository):
         result = await self._session.execute(stmt)
         return [self._mapper.to_entity(orm) for orm in result.scalars().all() if orm]
 
+    async def claim_for_processing(self, document_uids: List[UUID], bot_uid: UUID) -> List[BotDocumentEntity]:
+        if not document_uids:
+            return []
+        # The status check makes the claim atomic: of two workers, only one gets the row back
+        statement = (
+            update(BotDocumentORM)
+            .where(
+                BotDocumentORM.uid.in_(document_uids),
+                BotDocumentORM.bot_uid == bot_uid,
+                BotDocumentORM.status == BotDocumentStatus.PENDING.value,
+            )
+            .values(status=BotDocumentStatus.PROCESSING.value, status_error=None)
+            .returning(BotDocumentORM)
+        )
+        result = await self._session.scalars(statement)
+        return [self._mapper.to_entity(orm) for orm in result.all()]
+
+    async def set_processing_result(
+        self,
+        uid: UUID,
+        status: BotDocumentStatus,
+        chunk_count: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        result = await self._session.execute(
+            update(BotDocumentORM)
+            .where(BotDocumentORM.uid == uid)
+            .values(
+                status=status.value,
+                chunk_count=chunk_count,
+                content_hash=content_hash,
+                status_error=error[:500] if error else None,
+            )
+        )
+        return result.rowcount > 0
+
     async def delete_by_uids(self, uids: List[UUID]) -> int:
         """Deletes multiple documents by their UIDs. Returns count of deleted documents."""
         if not uids:
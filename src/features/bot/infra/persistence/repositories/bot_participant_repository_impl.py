@@ -108,6 +108,14 @@ class BotParticipantRepositoryImpl(BotParticipantRepository):
             logger.error(f"Error finding participants for Bot={bot_uid}: {e}", exc_info=True)
             return []
 
+    async def find_by_bot_uids(self, bot_uids: List[UUID]) -> List[BotParticipantEntity]:
+        """Finds the participants of several bots with one IN query."""
+        if not bot_uids:
+            return []
+        statement = select(BotParticipantORM).where(BotParticipantORM.bot_uid.in_(set(bot_uids)))
+        result = await self._session.execute(statement)
+        return [self._mapper.to_entity(orm_obj) for orm_obj in result.scalars().all() if orm_obj]
+
     # *** ADDED MISSING METHOD IMPLEMENTATION ***
     async def find_bots_by_user_uid(self, user_uid: UUID) -> List[BotParticipantEntity]:
         """Finds all participant entries for a specific user."""
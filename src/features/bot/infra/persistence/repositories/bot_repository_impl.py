@@ -6,11 +6,15 @@ logger = async_logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import defer, raiseload, selectinload
 
 from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.enums import BotLoadProfile
 from src.features.bot.domain.repositories.bot_repository import BotRepository
 from src.features.bot.infra.persistence.models.bot import BotORM
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
 from src.features.bot.infra.mappers.bot_mapper import BotMapper
+from src.infra.persistence.returning import insert_returning
 from src.features.bot.exceptions.bot_exceptions import (
     BotNotFoundError,
     BotAlreadyExistsError,
@@ -19,6 +23,21 @@ from src.features.bot.exceptions.bot_exceptions import (
 
 
 
+def _load_options(profile: BotLoadProfile) -> list:
+    """Loader options for a profile; every relationship not listed raises if touched."""
+    options = []
+    if profile in (BotLoadProfile.WITH_SERVICES, BotLoadProfile.FULL_WITHOUT_BLOBS):
+        options.append(selectinload(BotORM.bot_services))
+    if profile in (BotLoadProfile.WITH_PARTICIPANTS, BotLoadProfile.FULL_WITHOUT_BLOBS):
+        options.append(selectinload(BotORM.bot_participants))
+    if profile == BotLoadProfile.FULL_WITHOUT_BLOBS:
+        options.append(
+            selectinload(BotORM.documents).options(defer(BotDocumentORM.file_data, raiseload=True))
+        )
+    options.append(raiseload("*"))
+    return options
+
+
 class BotRepositoryImpl(BotRepository):
     def __init__(self, session: AsyncSession):
         self._session = session
@@ -26,11 +45,9 @@ class BotRepositoryImpl(BotRepository):
 
     async def create(self, entity: BotEntity) -> BotEntity:
         orm_obj = self._mapper.from_entity(entity)
-        self._session.add(orm_obj)
 
         try:
-            await self._session.flush()  # May raise IntegrityError
-            await self._session.refresh(orm_obj)
+            orm_obj = await insert_returning(self._session, orm_obj)  # May raise IntegrityError
             return self._mapper.to_entity(orm_obj)
         except IntegrityError as e:
             logger.error(f"❌ IntegrityError while creating bot: {e}")
@@ -73,6 +90,13 @@ class BotRepositoryImpl(BotRepository):
             existing_orm.max_response = ai_settings.max_response if ai_settings.max_response is not None else 0
             existing_orm.repetition_penalty = ai_settings.repetition_penalty if ai_settings.repetition_penalty is not None else 0.0
             existing_orm.generation_model = ai_settings.generation_model if ai_settings.generation_model is not None else ""
+            # None is meaningful here (no limit), so the window settings are copied as-is
+            existing_orm.history_window_messages = ai_settings.history_window_messages
+            existing_orm.history_token_budget = ai_settings.history_token_budget
+            existing_orm.coalesce_window_ms = ai_settings.coalesce_window_ms
+            existing_orm.summarize_after_messages = ai_settings.summarize_after_messages
+            existing_orm.response_cache_ttl_seconds = ai_settings.response_cache_ttl_seconds
+            existing_orm.response_cache_history_messages = ai_settings.response_cache_history_messages
         else:
             # If ai_settings itself is None, ensure ORM fields are set to defaults
             existing_orm.instructions = ""
@@ -85,8 +109,13 @@ class BotRepositoryImpl(BotRepository):
 
         quota = entity.quota
         if quota:
-            existing_orm.token_limit = quota.token_limit if quota.token_limit is not None else 0
-            existing_orm.tokens_left = quota.tokens_left if quota.tokens_left is not None else 0
+            token_limit = quota.token_limit if quota.token_limit is not None else 0
+            # The live balance is kept by the token quota service and written back on its own;
+            # copying the balance this edit loaded could undo a write-back that landed meanwhile.
+            # Only a new limit (which resets the balance) writes it here.
+            if existing_orm.token_limit != token_limit:
+                existing_orm.tokens_left = quota.tokens_left if quota.tokens_left is not None else 0
+            existing_orm.token_limit = token_limit
         else:
             # If quota itself is None, ensure ORM fields are set to defaults
             existing_orm.token_limit = 0
@@ -122,11 +151,17 @@ class BotRepositoryImpl(BotRepository):
         await self._session.delete(bot)
         await self._session.flush()  # Just flush
 
-    async def find_by_uid(self, uid: UUID) -> Optional[BotEntity]:
-        bot = await self._session.get(BotORM, uid)
+    async def find_by_uid(
+        self, uid: UUID, profile: BotLoadProfile = BotLoadProfile.MINIMAL
+    ) -> Optional[BotEntity]:
+        statement = select(BotORM).where(BotORM.uid == uid).options(*_load_options(profile))
+        result = await self._session.execute(statement)
+        bot = result.scalars().first()
         return self._mapper.to_entity(bot) if bot else None
 
-    async def find_by_uids(self, uids: List[UUID]) -> List[BotEntity]:
+    async def find_by_uids(
+        self, uids: List[UUID], profile: BotLoadProfile = BotLoadProfile.MINIMAL
+    ) -> List[BotEntity]:
         """Finds multiple bots by their UIDs using an IN clause."""
         if not uids:
             logger.debug("find_by_uids received empty list, returning empty list.")
@@ -135,7 +170,7 @@ class BotRepositoryImpl(BotRepository):
         # Ensure UIDs are unique if necessary, although IN clause handles duplicates
         unique_uids = list(set(uids))
         logger.debug(f"Finding bots by UIDs: {unique_uids}")
-        statement = select(BotORM).where(BotORM.uid.in_(unique_uids))
+        statement = select(BotORM).where(BotORM.uid.in_(unique_uids)).options(*_load_options(profile))
         try:
             result = await self._session.execute(statement)
             orm_results = result.scalars().all()
@@ -149,11 +184,13 @@ class BotRepositoryImpl(BotRepository):
             return []  # Return empty list on error or re-raise
 
     async def findall(self, entity: BotEntity) -> List[BotEntity]:
-        stmt = select(BotORM).where(BotORM.user_uid == entity.user_uid)
+        stmt = select(BotORM).where(BotORM.user_uid == entity.user_uid).options(raiseload("*"))
         result = await self._session.execute(stmt)
         return [self._mapper.to_entity(row) for row in result.scalars().all()]
 
-    async def findall_by_user_uid(self, user_uid: UUID) -> List[BotEntity]:
-        stmt = select(BotORM).where(BotORM.user_uid == user_uid)
+    async def findall_by_user_uid(
+        self, user_uid: UUID, profile: BotLoadProfile = BotLoadProfile.MINIMAL
+    ) -> List[BotEntity]:
+        stmt = select(BotORM).where(BotORM.user_uid == user_uid).options(*_load_options(profile))
         result = await self._session.execute(stmt)
         return [self._mapper.to_entity(row) for row in result.scalars().all()]
@@ -16,6 +16,7 @@ from src.features.bot.exceptions.bot_exceptions import ServiceNotFoundError, \
     ServiceAlreadyLinkedError
 from src.features.bot.infra.mappers.bot_service_mapper import BotServiceMapper
 from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
+from src.infra.persistence.returning import insert_returning
 
 
 
@@ -40,14 +41,11 @@ class BotServiceRepositoryImpl(BotServiceRepository):
         if not orm_obj:
              raise ValueError("Failed to map BotServiceEntity to ORM object.")
 
-        logger.debug(f"Adding BotService ORM object to session: Bot={entity.bot_uid}, Platform={entity.platform}")
-        self._session.add(orm_obj)
+        logger.debug(f"Inserting BotService: Bot={entity.bot_uid}, Platform={entity.platform}")
         try:
-            await self._session.flush()
-            # Refresh to get DB defaults like created_at/updated_at if BaseEntity handles them
-            await self._session.refresh(orm_obj)
-            logger.info(f"Successfully flushed creation for BotService: Bot={entity.bot_uid}, Platform={entity.platform}, UID={orm_obj.uid}")
-            # Map back the refreshed state
+            # RETURNING brings back DB defaults like created_at/updated_at in the same round trip
+            orm_obj = await insert_returning(self._session, orm_obj)
+            logger.info(f"Successfully created for BotService: Bot={entity.bot_uid}, Platform={entity.platform}, UID={orm_obj.uid}")
             return self._mapper.to_entity(orm_obj)
         except IntegrityError as e:
             logger.error(f"IntegrityError creating BotService (Bot={entity.bot_uid}, Platform={entity.platform}): {e}", exc_info=True)
@@ -118,10 +116,10 @@ class BotServiceRepositoryImpl(BotServiceRepository):
 
         try:
             # The changes to existing_orm (which is tracked by the session) will be flushed.
+            # updated_at comes from the Python-side onupdate, so the flushed object is already current
             await self._session.flush()
-            await self._session.refresh(existing_orm)  # Refresh to get DB triggers/defaults and confirm state
             logger.info(f"Successfully flushed update for service UID {entity.uid}")
-            return self._mapper.to_entity(existing_orm)  # Map the refreshed ORM object back to an entity
+            return self._mapper.to_entity(existing_orm)
         except Exception as e:
             logger.error(f"Error during service link update (UID: {entity.uid}): {e}", exc_info=True)
             # Rollback should ideally be handled by the Unit of Work context manager
@@ -176,6 +174,25 @@ class BotServiceRepositoryImpl(BotServiceRepository):
             logger.error(f"Error finding services for Bot={bot_uid}: {e}", exc_info=True)
             return []
 
+    async def find_by_bot_uids(self, bot_uids: List[UUID]) -> List[BotServiceEntity]:
+        """Finds the services of several bots with one IN query."""
+        if not bot_uids:
+            return []
+        statement = select(BotServiceORM).where(BotServiceORM.bot_uid.in_(set(bot_uids)))
+        result = await self._session.execute(statement)
+        return [self._mapper.to_entity(orm_obj) for orm_obj in result.scalars().all() if orm_obj]
+
+    async def find_by_linked_account_uids(self, platform: str, linked_account_uids: List[UUID]) -> List[BotServiceEntity]:
+        """Finds the services of a platform bound to any of the given linked accounts with one IN query."""
+        if not linked_account_uids:
+            return []
+        statement = select(BotServiceORM).where(
+            BotServiceORM.platform == platform,
+            BotServiceORM.linked_account_uid.in_(set(linked_account_uids)),
+        )
+        result = await self._session.execute(statement)
+        return [self._mapper.to_entity(orm_obj) for orm_obj in result.scalars().all() if orm_obj]
+
     async def find_by_bot_and_platform(self, bot_uid: UUID, platform: str) -> Optional[BotServiceEntity]:
         """Finds a specific service link by bot and platform name."""
         logger.debug(f"Finding service link for Bot={bot_uid}, Platform='{platform}'")
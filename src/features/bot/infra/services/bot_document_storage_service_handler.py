@@ -0,0 +1,68 @@
+# src/features/bot/infra/services/bot_document_storage_service_handler.py
+
+import hashlib
+from typing import AsyncIterator, Iterable, Optional
+from uuid import UUID
+
+from src.features.bot.application.services.bot_document_storage_service import (
+    BotDocumentStorageService,
+    StoredDocumentBlob,
+)
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.s3.s3_service import S3UploaderService
+
+logger = async_logger
+
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+
+class BotDocumentStorageServiceHandler(BotDocumentStorageService):
+    """
+    Keeps bot document bytes in S3 under `<key_prefix>/<bot_uid>/<document_uid>`.
+
+    Uploads are passed through chunk by chunk; size and sha256 are computed on
+    the way, so the bytes are never held in memory as a whole.
+    """
+
+    def __init__(self, s3_service: S3UploaderService, key_prefix: str = "bot_documents"):
+        self._s3_service = s3_service
+        self._key_prefix = key_prefix.rstrip("/")
+
+    def build_key(self, bot_uid: UUID, document_uid: UUID) -> str:
+        return f"{self._key_prefix}/{bot_uid}/{document_uid}"
+
+    async def store(
+        self,
+        bot_uid: UUID,
+        document_uid: UUID,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+    ) -> StoredDocumentBlob:
+        key = self.build_key(bot_uid, document_uid)
+        digest = hashlib.sha256()
+        size = 0
+
+        async def hashed_chunks() -> AsyncIterator[bytes]:
+            nonlocal size
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        await self._s3_service.upload_stream(key, hashed_chunks(), content_type or DEFAULT_CONTENT_TYPE)
+        logger.debug(f"Stored document {document_uid} of bot {bot_uid} at {key} ({size} bytes)")
+        return StoredDocumentBlob(
+            storage_key=key,
+            file_size=size,
+            checksum=digest.hexdigest(),
+            content_type=content_type,
+        )
+
+    async def exists(self, storage_key: str) -> bool:
+        return await self._s3_service.file_exists(storage_key)
+
+    def open_stream(self, storage_key: str) -> AsyncIterator[bytes]:
+        return self._s3_service.stream_file(storage_key)
+
+    async def delete(self, storage_keys: Iterable[str]) -> None:
+        await self._s3_service.delete_files(storage_keys)
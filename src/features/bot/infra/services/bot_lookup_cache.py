@@ -0,0 +1,213 @@
+# src/features/bot/infra/services/bot_lookup_cache.py
+
+import asyncio
+import contextlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.redis.redis_service import RedisService
+
+logger = async_logger
+
+
+class BotLookupCache:
+    """
+    Read-through cache for bot configuration used on the incoming message path.
+
+    Entries are slim snapshots (plain dicts of the BotEntity scalar fields and
+    value objects), kept in an in-process LRU with a TTL and optionally mirrored
+    to Redis so other workers can share them. Every hit builds a fresh BotEntity,
+    so callers may mutate what they get (e.g. quota deduction) without touching
+    the cache. Invalidation happens through BotConfigChangedEvent.
+
+    The event only reaches the process that changed the bot, so with an
+    `invalidation_channel` invalidate() also publishes the bot uid on that Redis
+    channel and start() subscribes every worker to it. A worker that misses a
+    message (its subscription dropped, or Redis was unreachable when the change
+    was published) serves the old config until the entry's TTL runs out, so
+    `ttl_seconds` is the staleness bound; without a channel it applies to every
+    worker but the one that made the change.
+    """
+
+    REDIS_KEY_PREFIX = "bot_config:"
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_size: int = 1024,
+        redis_service: Optional[RedisService] = None,
+        redis_ttl_seconds: int = 300,
+        invalidation_channel: Optional[str] = None,
+        redis: Optional[Any] = None,
+    ) -> None:
+        if redis is None and invalidation_channel:
+            from src.infra.services.redis.redis_client import redis_client
+            redis = redis_client
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._redis_service = redis_service
+        self._redis_ttl_seconds = redis_ttl_seconds
+        self._entries: "OrderedDict[UUID, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._invalidation_channel = invalidation_channel
+        self._redis = redis
+        self._listener_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "remote_invalidations": self.remote_invalidations,
+        }
+
+    async def start(self) -> None:
+        """Listens for invalidations published by other workers; a no-op without a channel."""
+        if self._invalidation_channel and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen(), name="bot-lookup-cache-invalidations")
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    async def get(self, bot_uid: UUID) -> Optional[BotEntity]:
+        entry = self._entries.get(bot_uid)
+        if entry is not None:
+            expires_at, snapshot = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(bot_uid)
+                self.hits += 1
+                return self._from_snapshot(snapshot)
+            del self._entries[bot_uid]
+
+        if self._redis_service is not None:
+            snapshot = await self._redis_get(bot_uid)
+            if snapshot is not None:
+                self._store_local(bot_uid, snapshot)
+                self.redis_hits += 1
+                return self._from_snapshot(snapshot)
+
+        self.misses += 1
+        return None
+
+    async def set(self, bot: BotEntity) -> None:
+        snapshot = self._to_snapshot(bot)
+        self._store_local(bot.uid, snapshot)
+        if self._redis_service is not None:
+            try:
+                await self._redis_service.set_key(
+                    self._redis_key(bot.uid), json.dumps(snapshot), expire=self._redis_ttl_seconds
+                )
+            except Exception as e:
+                logger.warning(f"BotLookupCache: Failed to store bot {bot.uid} in Redis: {e}")
+
+    async def invalidate(self, bot_uid: UUID) -> None:
+        self._entries.pop(bot_uid, None)
+        self.invalidations += 1
+        if self._redis_service is not None:
+            try:
+                await self._redis_service.delete_key(self._redis_key(bot_uid))
+            except Exception as e:
+                logger.warning(f"BotLookupCache: Failed to invalidate bot {bot_uid} in Redis: {e}")
+        if self._invalidation_channel:
+            try:
+                await self._redis.publish(self._invalidation_channel, str(bot_uid))
+            except Exception as e:
+                logger.warning(f"BotLookupCache: Failed to publish the invalidation of bot {bot_uid}: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self._invalidation_channel)
+                # Entries cached before the subscription may have missed an invalidation
+                self._entries.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    self._entries.pop(UUID(data.decode() if isinstance(data, bytes) else data), None)
+                    self.remote_invalidations += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"BotLookupCache: Invalidation subscription failed, resubscribing: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+
+    def _store_local(self, bot_uid: UUID, snapshot: Dict[str, Any]) -> None:
+        self._entries[bot_uid] = (time.monotonic() + self._ttl_seconds, snapshot)
+        self._entries.move_to_end(bot_uid)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _redis_get(self, bot_uid: UUID) -> Optional[Dict[str, Any]]:
+        try:
+            raw = await self._redis_service.get_key(self._redis_key(bot_uid))
+        except Exception as e:
+            logger.warning(f"BotLookupCache: Redis lookup failed for bot {bot_uid}: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    def _redis_key(self, bot_uid: UUID) -> str:
+        return f"{self.REDIS_KEY_PREFIX}{bot_uid}"
+
+    @staticmethod
+    def _to_snapshot(bot: BotEntity) -> Dict[str, Any]:
+        return {
+            "uid": str(bot.uid),
+            "created_at": bot.created_at.isoformat(),
+            "updated_at": bot.updated_at.isoformat(),
+            "user_uid": str(bot.user_uid),
+            "bot_type": bot.bot_type,
+            "ai_settings": asdict(bot.ai_settings),
+            "quota": asdict(bot.quota),
+            "name": bot.name,
+            "status": bot.status,
+            "tariff": bot.tariff,
+            "auto_deduction": bot.auto_deduction,
+            "crm_lead_id": bot.crm_lead_id,
+        }
+
+    @staticmethod
+    def _from_snapshot(snapshot: Dict[str, Any]) -> BotEntity:
+        return BotEntity(
+            uid=UUID(snapshot["uid"]),
+            created_at=datetime.fromisoformat(snapshot["created_at"]),
+            updated_at=datetime.fromisoformat(snapshot["updated_at"]),
+            user_uid=UUID(snapshot["user_uid"]),
+            bot_type=snapshot["bot_type"],
+            ai_settings=AIConfigurationSettings(**snapshot["ai_settings"]),
+            quota=BotQuota(**snapshot["quota"]),
+            name=snapshot["name"],
+            status=snapshot["status"],
+            tariff=snapshot["tariff"],
+            auto_deduction=snapshot["auto_deduction"],
+            crm_lead_id=snapshot["crm_lead_id"],
+        )
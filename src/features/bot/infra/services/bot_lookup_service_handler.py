@@ -1,17 +1,28 @@
+from typing import Optional
 from uuid import UUID
 from src.features.bot.domain.entities.bot_entity import BotEntity
 from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
 from src.features.bot.exceptions.bot_exceptions import BotNotFoundError
+from src.features.bot.infra.services.bot_lookup_cache import BotLookupCache
 from src.features.conversation.domain.services.bot_lookup_service import BotLookupService
 
 
 class BotLookupServiceHandler(BotLookupService):
-    def __init__(self, bot_uow: BotUnitOfWork):
+    def __init__(self, bot_uow: BotUnitOfWork, cache: Optional[BotLookupCache] = None):
         self._bot_uow = bot_uow
+        self._cache = cache
 
     async def get_bot(self, bot_uid: UUID) -> BotEntity:
+        if self._cache is not None:
+            cached = await self._cache.get(bot_uid)
+            if cached is not None:
+                return cached
+
         async with self._bot_uow:
-            bot = await self._bot_uow.bot_repository.find_by_uid(bot_uid)
+            bot = await self._bot_uow.bot_repository.find_by_uid(bot_uid)  # BotLoadProfile.MINIMAL: bots row only
             if not bot:
                 raise BotNotFoundError(f"Bot configuration not found for UID: {bot_uid}")
-            return bot
\ No newline at end of file
+
+        if self._cache is not None:
+            await self._cache.set(bot)
+        return bot
@@ -0,0 +1,142 @@
+# src/features/bot/infra/services/document_blob_migrator.py
+"""
+Moves document bytes still stored inline in bot_documents.file_data to the blob
+store, a batch at a time.
+
+    python -m src.features.bot.infra.services.document_blob_migrator --batch-size 50
+
+Rows are walked in uid order and only one document's bytes are held in memory at
+a time. Each migrated row gets storage_key/file_size/checksum and its file_data
+is set to NULL; every batch is committed on its own. Storage keys are
+deterministic, so a run that dies halfway can simply be started again.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.features.bot.application.services.bot_document_storage_service import BotDocumentStorageService
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+@dataclass
+class BlobMigrationStats:
+    migrated: int = 0
+    migrated_bytes: int = 0
+    failed_uids: List[UUID] = field(default_factory=list)
+
+
+class BotDocumentBlobMigrator:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        storage: BotDocumentStorageService,
+        batch_size: int = 50,
+        chunk_size: int = 1024 * 1024,
+    ) -> None:
+        self._session_maker = session_maker
+        self._storage = storage
+        self._batch_size = batch_size
+        self._chunk_size = chunk_size
+
+    async def run(self, limit: Optional[int] = None) -> BlobMigrationStats:
+        stats = BlobMigrationStats()
+        last_uid: Optional[UUID] = None
+
+        while limit is None or stats.migrated + len(stats.failed_uids) < limit:
+            batch_size = self._batch_size if limit is None else min(
+                self._batch_size, limit - stats.migrated - len(stats.failed_uids)
+            )
+            async with self._session_maker() as session:
+                rows = await self._next_batch(session, last_uid, batch_size)
+                if not rows:
+                    break
+                for uid, bot_uid, content_type in rows:
+                    await self._migrate_one(session, uid, bot_uid, content_type, stats)
+                await session.commit()
+            last_uid = rows[-1][0]
+            logger.info(
+                f"BotDocumentBlobMigrator: {stats.migrated} migrated, "
+                f"{len(stats.failed_uids)} failed so far (last uid {last_uid})"
+            )
+
+        return stats
+
+    @staticmethod
+    async def _next_batch(session: AsyncSession, last_uid: Optional[UUID], batch_size: int):
+        stmt = (
+            select(BotDocumentORM.uid, BotDocumentORM.bot_uid, BotDocumentORM.content_type)
+            .where(BotDocumentORM.storage_key.is_(None), BotDocumentORM.file_data.is_not(None))
+            .order_by(BotDocumentORM.uid)
+            .limit(batch_size)
+        )
+        if last_uid is not None:
+            stmt = stmt.where(BotDocumentORM.uid > last_uid)
+        return (await session.execute(stmt)).all()
+
+    async def _migrate_one(
+        self, session: AsyncSession, uid: UUID, bot_uid: UUID, content_type: Optional[str], stats: BlobMigrationStats
+    ) -> None:
+        try:
+            data = (await session.execute(
+                select(BotDocumentORM.file_data).where(BotDocumentORM.uid == uid)
+            )).scalar_one()
+            blob = await self._storage.store(
+                bot_uid=bot_uid,
+                document_uid=uid,
+                chunks=self._chunks(data),
+                content_type=content_type,
+            )
+            await session.execute(
+                update(BotDocumentORM)
+                .where(BotDocumentORM.uid == uid)
+                .values(storage_key=blob.storage_key, file_size=blob.file_size, checksum=blob.checksum, file_data=None)
+            )
+            stats.migrated += 1
+            stats.migrated_bytes += blob.file_size
+        except Exception as e:
+            logger.error(f"BotDocumentBlobMigrator: Failed to migrate document {uid}: {e}", exc_info=True)
+            stats.failed_uids.append(uid)
+
+    async def _chunks(self, data: bytes) -> AsyncIterator[bytes]:
+        view = memoryview(data)
+        for start in range(0, len(view), self._chunk_size):
+            yield bytes(view[start:start + self._chunk_size])
+
+
+async def main(batch_size: int, limit: Optional[int]) -> None:
+    from src.config import Settings
+    from src.features.bot.infra.services.bot_document_storage_service_handler import BotDocumentStorageServiceHandler
+    from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
+    from src.infra.services.s3.s3_service_impl import S3UploaderServiceHandler
+
+    settings = Settings()
+    storage = BotDocumentStorageServiceHandler(
+        s3_service=S3UploaderServiceHandler(multipart_part_size=settings.S3_MULTIPART_PART_SIZE),
+        key_prefix=settings.BOT_DOCUMENT_KEY_PREFIX,
+    )
+    migrator = BotDocumentBlobMigrator(
+        AsyncSessionLocal, storage, batch_size=batch_size, chunk_size=settings.BOT_DOCUMENT_UPLOAD_CHUNK_SIZE
+    )
+    stats = await migrator.run(limit=limit)
+    print(f"migrated={stats.migrated} bytes={stats.migrated_bytes} failed={len(stats.failed_uids)}")
+    for uid in stats.failed_uids:
+        print(f"failed: {uid}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many documents")
+    args = parser.parse_args()
+    # No log handlers are configured outside the app; the summary is printed instead
+    async_logger.disabled = True
+    asyncio.run(main(args.batch_size, args.limit))
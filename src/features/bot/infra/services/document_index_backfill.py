@@ -0,0 +1,148 @@
+# src/features/bot/infra/services/document_index_backfill.py
+"""
+Processes bot documents that are still waiting to be indexed for retrieval:
+documents uploaded before processing status existed, or whose processing was
+lost when the app stopped.
+
+    python -m src.features.bot.infra.services.document_index_backfill --retry-failed --stuck-after-minutes 30
+
+Documents left in processing for longer than --stuck-after-minutes, and failed
+ones with --retry-failed, are put back to pending first. Pending documents are
+then claimed and processed a batch at a time, the same way an upload does, and
+end up ready or failed. Run it on a host that shares KNOWLEDGE_INDEX_DIR with
+the app.
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.features.bot.domain.enums import BotDocumentStatus
+from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.features.bot.infra.services.document_knowledge_base import DocumentKnowledgeBase
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+@dataclass
+class IndexBackfillStats:
+    requeued: int = 0
+    claimed: int = 0
+    chunks: int = 0
+
+
+class DocumentIndexBackfill:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        knowledge_base: DocumentKnowledgeBase,
+        batch_size: int = 50,
+    ) -> None:
+        self._session_maker = session_maker
+        self._knowledge_base = knowledge_base
+        self._batch_size = batch_size
+
+    async def run(self, retry_failed: bool = False, stuck_after: Optional[timedelta] = None) -> IndexBackfillStats:
+        stats = IndexBackfillStats(requeued=await self._requeue(retry_failed, stuck_after))
+        last_uid: Optional[UUID] = None
+
+        while True:
+            async with self._session_maker() as session:
+                rows = await self._next_batch(session, last_uid)
+            if not rows:
+                break
+            by_bot: Dict[UUID, List[UUID]] = defaultdict(list)
+            for uid, bot_uid in rows:
+                by_bot[bot_uid].append(uid)
+            for bot_uid, document_uids in by_bot.items():
+                # Documents claimed meanwhile by the app are skipped by the claim
+                stats.chunks += await self._knowledge_base.index_documents(bot_uid, document_uids)
+                stats.claimed += len(document_uids)
+            last_uid = rows[-1][0]
+            logger.info(f"DocumentIndexBackfill: {stats.claimed} documents processed so far (last uid {last_uid})")
+
+        return stats
+
+    async def _requeue(self, retry_failed: bool, stuck_after: Optional[timedelta]) -> int:
+        conditions = []
+        if retry_failed:
+            conditions.append(BotDocumentORM.status == BotDocumentStatus.FAILED.value)
+        if stuck_after is not None:
+            conditions.append(
+                (BotDocumentORM.status == BotDocumentStatus.PROCESSING.value)
+                & (BotDocumentORM.updated_at < datetime.now(timezone.utc) - stuck_after)
+            )
+        if not conditions:
+            return 0
+        async with self._session_maker() as session:
+            result = await session.execute(
+                update(BotDocumentORM)
+                .where(or_(*conditions))
+                .values(status=BotDocumentStatus.PENDING.value, status_error=None)
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def _next_batch(self, session: AsyncSession, last_uid: Optional[UUID]):
+        stmt = (
+            select(BotDocumentORM.uid, BotDocumentORM.bot_uid)
+            .where(BotDocumentORM.status == BotDocumentStatus.PENDING.value)
+            .order_by(BotDocumentORM.uid)
+            .limit(self._batch_size)
+        )
+        if last_uid is not None:
+            stmt = stmt.where(BotDocumentORM.uid > last_uid)
+        return (await session.execute(stmt)).all()
+
+
+async def main(batch_size: int, retry_failed: bool, stuck_after_minutes: Optional[int]) -> None:
+    from src.config import Settings
+    from src.features.bot.di_container import BotContainer
+    from src.features.bot.infra.services.bot_document_storage_service_handler import BotDocumentStorageServiceHandler
+    from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
+    from src.infra.services.s3.s3_service_impl import S3UploaderServiceHandler
+
+    settings = Settings()
+    uow_factory: Callable[[], BotUnitOfWork] = lambda: BotContainer.create_uow(AsyncSessionLocal())
+    knowledge_base = BotContainer.create_document_knowledge_base(
+        settings,
+        uow_factory=uow_factory,
+        document_storage=BotDocumentStorageServiceHandler(
+            s3_service=S3UploaderServiceHandler(multipart_part_size=settings.S3_MULTIPART_PART_SIZE),
+            key_prefix=settings.BOT_DOCUMENT_KEY_PREFIX,
+        ),
+    )
+    if knowledge_base is None:
+        print("KNOWLEDGE_ENABLED is off; nothing to do")
+        return
+    try:
+        stats = await DocumentIndexBackfill(AsyncSessionLocal, knowledge_base, batch_size=batch_size).run(
+            retry_failed=retry_failed,
+            stuck_after=timedelta(minutes=stuck_after_minutes) if stuck_after_minutes is not None else None,
+        )
+    finally:
+        knowledge_base.close()
+    summary = knowledge_base.stats()
+    print(f"requeued={stats.requeued} processed={stats.claimed} chunks={stats.chunks} "
+          f"indexed={summary['documents_indexed']} failed={summary['index_failures']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--retry-failed", action="store_true", help="Process failed documents again")
+    parser.add_argument("--stuck-after-minutes", type=int, default=None,
+                        help="Requeue documents left in processing for longer than this")
+    args = parser.parse_args()
+    # No log handlers are configured outside the app; the summary is printed instead
+    async_logger.disabled = True
+    asyncio.run(main(args.batch_size, args.retry_failed, args.stuck_after_minutes))
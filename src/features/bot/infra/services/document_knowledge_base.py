@@ -0,0 +1,205 @@
+# src/features/bot/infra/services/document_knowledge_base.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from src.core.mediator.mediator import Mediator
+from src.features.bot.application.services.bot_document_storage_service import BotDocumentStorageService
+from src.features.bot.application.services.document_retrieval_service import DocumentRetrievalService, RetrievedChunk
+from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
+from src.features.bot.domain.enums import BotDocumentStatus
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
+from src.features.bot.domain.repositories.bot_unit_of_work import BotUnitOfWork
+from src.features.bot.exceptions.bot_exceptions import FileTooLargeError
+from src.features.bot.infra.services.document_processing_pool import DocumentProcessingPool
+from src.features.bot.infra.services.document_vector_index import DocumentVectorIndexStore
+from src.features.bot.infra.services.text_embedder import TextEmbedder
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+class DocumentKnowledgeBase(DocumentRetrievalService):
+    """
+    Bot documents as searchable passages. A document is read from the blob
+    store, turned into text, split into overlapping passages and embedded; the
+    vectors go into the bot's memory-mapped index. A query is embedded the same
+    way and scored against every passage of the bot in one matrix product.
+
+    Uploads return before their documents are processed. Each document row
+    moves from pending to processing when it is claimed here, and to ready or
+    failed once the processing pool's workers are done with it. Extraction and
+    embedding run in those worker processes; index writes and searches run in
+    threads, so the event loop keeps serving other requests meanwhile.
+
+    Whenever the passages a bot's replies can draw on change (a document
+    became ready, or left the index) a BotConfigChangedEvent is published, so
+    replies cached under the bot's previous config version are not served.
+    """
+
+    # Number of recent search latencies kept for the percentiles in stats()
+    LATENCY_SAMPLES = 1024
+
+    def __init__(
+        self,
+        index_store: DocumentVectorIndexStore,
+        embedder: TextEmbedder,
+        uow_factory: Callable[[], BotUnitOfWork],
+        document_storage: BotDocumentStorageService,
+        processing_pool: DocumentProcessingPool,
+        max_document_bytes: int = 50 * 1024 * 1024,
+        min_score: float = 0.05,
+        mediator: Optional[Mediator] = None,
+    ) -> None:
+        self._index_store = index_store
+        self._embedder = embedder
+        self._uow_factory = uow_factory
+        self._document_storage = document_storage
+        self._processing_pool = processing_pool
+        self._max_document_bytes = max_document_bytes
+        self._min_score = min_score
+        self._mediator = mediator
+        self._search_latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._searches = 0
+        self._search_hits = 0
+        self._search_failures = 0
+        self._documents_indexed = 0
+        self._chunks_indexed = 0
+        self._index_failures = 0
+        self._chunks_removed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self._search_latencies)
+        return {
+            "embedder": self._embedder.name,
+            "searches": self._searches,
+            "searches_with_results": self._search_hits,
+            "search_failures": self._search_failures,
+            "search_latency_p50_ms": round(self._percentile(samples, 0.50) * 1000, 2),
+            "search_latency_p99_ms": round(self._percentile(samples, 0.99) * 1000, 2),
+            "documents_indexed": self._documents_indexed,
+            "chunks_indexed": self._chunks_indexed,
+            "index_failures": self._index_failures,
+            "chunks_removed": self._chunks_removed,
+            "open_indexes": self._index_store.open_indexes(),
+            "processing": self._processing_pool.stats(),
+        }
+
+    @staticmethod
+    def _percentile(samples: List[float], fraction: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    async def retrieve(self, bot_uid: UUID, query: str, top_k: int) -> List[RetrievedChunk]:
+        # Most bots have no documents; they don't pay for a thread hop
+        if top_k <= 0 or not query.strip() or not self._index_store.exists(str(bot_uid)):
+            return []
+        started = time.perf_counter()
+        self._searches += 1
+        try:
+            rows = await asyncio.to_thread(self._search, str(bot_uid), query, top_k)
+        except Exception as e:
+            # Answering without the documents beats not answering
+            self._search_failures += 1
+            logger.error(f"Document search for bot {bot_uid} failed: {e}", exc_info=True)
+            return []
+        finally:
+            self._search_latencies.append(time.perf_counter() - started)
+        if rows:
+            self._search_hits += 1
+        return [
+            RetrievedChunk(document_uid=UUID(document_uid), filename=filename, text=text, score=score)
+            for document_uid, filename, text, score in rows
+        ]
+
+    async def index_documents(self, bot_uid: UUID, document_uids: Sequence[UUID]) -> int:
+        async with self._uow_factory() as uow:
+            documents = await uow.bot_document_repository.claim_for_processing(
+                document_uids=list(document_uids), bot_uid=bot_uid
+            )
+        # The pool bounds how many of them are read and processed at once
+        added = await asyncio.gather(*(self._index_one(bot_uid, document) for document in documents))
+        return sum(added)
+
+    def close(self) -> None:
+        self._processing_pool.close()
+
+    async def remove_documents(self, bot_uid: UUID, document_uids: Sequence[UUID]) -> int:
+        if not self._index_store.exists(str(bot_uid)):
+            return 0
+        index = self._index_store.get(str(bot_uid))
+        removed = await asyncio.to_thread(index.remove, [str(uid) for uid in document_uids])
+        self._chunks_removed += removed
+        if removed:
+            await self._knowledge_changed(bot_uid, "documents removed from the index")
+        return removed
+
+    def _search(self, bot_uid: str, query: str, top_k: int):
+        vector = self._embedder.embed([query])[0]
+        return self._index_store.get(bot_uid).search(vector, top_k, self._min_score)
+
+    async def _index_one(self, bot_uid: UUID, document: BotDocumentEntity) -> int:
+        try:
+            processed = await self._processing_pool.process(
+                lambda: self._read(document), document.content_type, document.filename
+            )
+            index = self._index_store.get(str(bot_uid))
+            chunks = await asyncio.to_thread(
+                index.add, str(document.uid), document.filename, processed.vectors, processed.chunks
+            )
+        except Exception as e:
+            self._index_failures += 1
+            logger.warning(f"Document {document.uid} ({document.filename}) of bot {bot_uid} was not indexed: {e}")
+            await self._set_status(document, BotDocumentStatus.FAILED, error=str(e) or type(e).__name__)
+            return 0
+
+        if not await self._set_status(
+            document, BotDocumentStatus.READY, chunk_count=chunks, content_hash=processed.content_hash
+        ):
+            # Deleted while it was being processed; its removal may already have run
+            if await asyncio.to_thread(index.remove, [str(document.uid)]):
+                await self._knowledge_changed(bot_uid, "deleted document removed from the index")
+            return 0
+        self._documents_indexed += 1
+        self._chunks_indexed += chunks
+        await self._knowledge_changed(bot_uid, "document indexed")
+        logger.info(f"Indexed document {document.uid} ({document.filename}) of bot {bot_uid}: {chunks} passages")
+        return chunks
+
+    async def _knowledge_changed(self, bot_uid: UUID, reason: str) -> None:
+        if self._mediator is None:
+            return
+        try:
+            await self._mediator.publish([BotConfigChangedEvent(bot_uid=str(bot_uid), reason=reason)])
+        except Exception as e:
+            logger.error(f"Failed to publish the knowledge change of bot {bot_uid}: {e}")
+
+    async def _set_status(self, document: BotDocumentEntity, status: BotDocumentStatus, **result) -> bool:
+        try:
+            async with self._uow_factory() as uow:
+                return await uow.bot_document_repository.set_processing_result(document.uid, status, **result)
+        except Exception as e:
+            # The row stays in processing; document_index_backfill --stuck-after-minutes picks it up again
+            logger.error(f"Failed to record status {status.value} of document {document.uid}: {e}", exc_info=True)
+            return True
+
+    async def _read(self, document: BotDocumentEntity) -> bytes:
+        if document.file_size is not None and document.file_size > self._max_document_bytes:
+            raise FileTooLargeError(f"{document.file_size} bytes is more than the indexing limit")
+        if not document.storage_key:
+            # Not moved to the blob store yet (see document_blob_migrator)
+            async with self._uow_factory() as uow:
+                return await uow.bot_document_repository.find_legacy_file_data(document.uid) or b""
+
+        parts: List[bytes] = []
+        size = 0
+        async for chunk in self._document_storage.open_stream(document.storage_key):
+            size += len(chunk)
+            if size > self._max_document_bytes:
+                raise FileTooLargeError(f"More than {self._max_document_bytes} bytes; not indexed")
+            parts.append(chunk)
+        return b"".join(parts)
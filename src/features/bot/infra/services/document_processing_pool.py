@@ -0,0 +1,169 @@
+# src/features/bot/infra/services/document_processing_pool.py
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from src.features.bot.infra.services.document_text_extractor import chunk_text, extract_text, normalize_text
+from src.features.bot.infra.services.text_embedder import TextEmbedder, create_text_embedder
+
+
+@dataclass(frozen=True)
+class ProcessedDocument:
+    """What a worker sends back for one document: its passages, their vectors and the text's hash."""
+    chunks: List[str]
+    vectors: np.ndarray
+    content_hash: str  # sha256 hex digest of the normalized text
+
+
+# Set once per worker process by _init_worker; the event loop process uses its own embedder
+_worker_embedder: Optional[TextEmbedder] = None
+
+
+def _init_worker(embedder_spec: str, dim: int) -> None:
+    global _worker_embedder
+    _worker_embedder = create_text_embedder(embedder_spec, dim)
+
+
+def process_document(
+    data: bytes,
+    content_type: Optional[str],
+    filename: str,
+    chunk_chars: int,
+    chunk_overlap_chars: int,
+    embedder: Optional[TextEmbedder] = None,
+) -> ProcessedDocument:
+    """Extraction, normalization, hashing, chunking and embedding of one document; runs in a worker."""
+    text = normalize_text(extract_text(data, content_type, filename))
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    chunks = chunk_text(text, chunk_chars, chunk_overlap_chars)
+    vectors = (embedder or _worker_embedder).embed(chunks)
+    return ProcessedDocument(chunks=chunks, vectors=vectors, content_hash=content_hash)
+
+
+class DocumentProcessingPool:
+    """
+    Turns uploaded documents into embedded passages in a pool of worker
+    processes, so a large PDF neither blocks the event loop nor holds the GIL
+    the request handlers need, and throughput grows with the cores given to it.
+
+    At most `max_pending` documents are read and queued at a time: the loader
+    of a document only runs once a slot is free, so a burst of uploads does not
+    pull every file into memory at once. Workers are started with `spawn` on
+    first use; a worker that dies (e.g. out of memory on a hostile PDF) fails
+    only its document and the pool is started again. With `workers=0` the work
+    runs in a thread of this process instead.
+    """
+
+    # Number of recent processing times kept for the percentiles in stats()
+    LATENCY_SAMPLES = 1024
+
+    def __init__(
+        self,
+        embedder_spec: str,
+        dim: int,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        chunk_chars: int = 800,
+        chunk_overlap_chars: int = 150,
+    ) -> None:
+        self._embedder_spec = embedder_spec
+        self._dim = dim
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._max_pending = max_pending or max(2, self._workers * 2)
+        self._chunk_chars = chunk_chars
+        self._chunk_overlap_chars = chunk_overlap_chars
+        self._slots = asyncio.Semaphore(self._max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._local_embedder: Optional[TextEmbedder] = None
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._in_flight = 0
+        self._processed = 0
+        self._failed = 0
+        self._restarts = 0
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self._latencies)
+        return {
+            "workers": self._workers,
+            "max_pending": self._max_pending,
+            "in_flight": self._in_flight,
+            "processed": self._processed,
+            "failed": self._failed,
+            "worker_restarts": self._restarts,
+            "processing_p50_ms": round(self._percentile(samples, 0.50) * 1000, 2),
+            "processing_p99_ms": round(self._percentile(samples, 0.99) * 1000, 2),
+        }
+
+    @staticmethod
+    def _percentile(samples: List[float], fraction: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    async def process(
+        self, load: Callable[[], Awaitable[bytes]], content_type: Optional[str], filename: str
+    ) -> ProcessedDocument:
+        """Reads the document with `load` once a slot is free, then processes it off the event loop."""
+        async with self._slots:
+            self._in_flight += 1
+            try:
+                data = await load()
+                started = time.perf_counter()
+                result = await self._run(data, content_type, filename)
+            except Exception:
+                self._failed += 1
+                raise
+            finally:
+                self._in_flight -= 1
+            self._latencies.append(time.perf_counter() - started)
+            self._processed += 1
+            return result
+
+    async def _run(self, data: bytes, content_type: Optional[str], filename: str) -> ProcessedDocument:
+        if self._workers <= 0:
+            if self._local_embedder is None:
+                self._local_embedder = create_text_embedder(self._embedder_spec, self._dim)
+            return await asyncio.to_thread(
+                process_document, data, content_type, filename,
+                self._chunk_chars, self._chunk_overlap_chars, self._local_embedder,
+            )
+
+        executor = self._ensure_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, process_document, data, content_type, filename,
+                self._chunk_chars, self._chunk_overlap_chars,
+            )
+        except BrokenProcessPool:
+            # Every document queued on the dead pool fails; the next one gets fresh workers
+            if self._executor is executor:
+                self._executor = None
+                self._restarts += 1
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and driver threads is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._embedder_spec, self._dim),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
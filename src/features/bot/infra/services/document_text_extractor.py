@@ -0,0 +1,205 @@
+# src/features/bot/infra/services/document_text_extractor.py
+
+import io
+import json
+import re
+import unicodedata
+import zipfile
+from html.parser import HTMLParser
+from typing import List, Optional
+from xml.etree import ElementTree
+
+from src.features.bot.exceptions.bot_exceptions import UnsupportedDocumentTypeError
+
+_TEXT_EXTENSIONS = (".txt", ".md", ".markdown", ".csv", ".tsv", ".log", ".rst", ".yaml", ".yml")
+_DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+# Control and format characters (NUL, soft hyphens, zero-width spaces, BOMs) other than line breaks and tabs
+_INVISIBLE = re.compile(r"[\x00-\x08\x0b-\x1f\x7f-\x9f\u00ad\u200b-\u200f\u2028\u2029\u2060\ufeff]")
+
+
+def extract_text(data: bytes, content_type: Optional[str], filename: str) -> str:
+    """
+    Plain text of an uploaded document. Handles text-like files, HTML, JSON,
+    DOCX and PDF; raises UnsupportedDocumentTypeError for anything else.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    name = filename.lower()
+
+    if content_type == "application/pdf" or name.endswith(".pdf"):
+        return _pdf_text(data)
+    if content_type == _DOCX_CONTENT_TYPE or name.endswith(".docx"):
+        return _docx_text(data)
+    if content_type in ("text/html", "application/xhtml+xml") or name.endswith((".html", ".htm")):
+        return _html_text(_decode(data))
+    if content_type == "application/json" or name.endswith(".json"):
+        return _json_text(_decode(data))
+    if content_type.startswith("text/") or name.endswith(_TEXT_EXTENSIONS):
+        return _decode(data)
+    raise UnsupportedDocumentTypeError(f"No text extractor for {filename} ({content_type or 'unknown type'})")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Extracted text in one canonical form: NFKC (ligatures, full-width and
+    compatibility characters folded), invisible characters dropped, runs of
+    spaces collapsed and paragraphs separated by exactly one blank line. Two
+    copies of a document normalise to the same string whatever they came from.
+    """
+    text = unicodedata.normalize("NFKC", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = _INVISIBLE.sub("", text)
+    paragraphs = (
+        "\n".join(line for line in (_SPACES.sub(" ", line).strip() for line in paragraph.split("\n")) if line)
+        for paragraph in _BLANK_LINES.split(text)
+    )
+    return "\n\n".join(p for p in paragraphs if p)
+
+
+def chunk_text(text: str, max_chars: int = 800, overlap_chars: int = 150) -> List[str]:
+    """
+    Splits text into passages of at most `max_chars`, cut at paragraph and
+    sentence boundaries where possible. Each passage repeats the last sentences
+    of the previous one, up to `overlap_chars`, so a fact spanning a cut is
+    still found in one piece.
+    """
+    units: List[str] = []
+    for paragraph in _BLANK_LINES.split(text):
+        paragraph = _SPACES.sub(" ", paragraph).replace("\n", " ").strip()
+        for sentence in _SENTENCE_END.split(paragraph):
+            units.extend(_hard_wrap(sentence.strip(), max_chars))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        if current and size + 1 + len(unit) > max_chars:
+            chunks.append(" ".join(current))
+            # Carry the tail of the passage over into the next one
+            carried: List[str] = []
+            carried_size = 0
+            for previous in reversed(current):
+                if carried_size + len(previous) + 1 > overlap_chars or carried_size + len(previous) + len(unit) + 2 > max_chars:
+                    break
+                carried.insert(0, previous)
+                carried_size += len(previous) + 1
+            current, size = carried, carried_size
+        current.append(unit)
+        size += len(unit) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _hard_wrap(sentence: str, max_chars: int) -> List[str]:
+    if not sentence:
+        return []
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces: List[str] = []
+    words = sentence.split(" ")
+    current = ""
+    for word in words:
+        while len(word) > max_chars:  # A "word" longer than a passage, e.g. a URL or a table row
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _decode(data: bytes) -> str:
+    if data.startswith(b"\xef\xbb\xbf"):
+        data = data[3:]
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1251", errors="replace")
+
+
+class _HtmlTextParser(HTMLParser):
+    _SKIPPED = {"script", "style", "noscript", "template"}
+    _BLOCKS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "table"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED:
+            self._skipping += 1
+        elif tag in self._BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED and self._skipping:
+            self._skipping -= 1
+        elif tag in self._BLOCKS:
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def _html_text(html: str) -> str:
+    parser = _HtmlTextParser()
+    parser.feed(html)
+    parser.close()
+    return "".join(parser.parts)
+
+
+def _json_text(raw: str) -> str:
+    """Every string value of the document, one per paragraph (keys give no answers on their own)."""
+    values: List[str] = []
+
+    def walk(node, key: Optional[str] = None):
+        if isinstance(node, dict):
+            for k, v in node.items():
+                walk(v, k)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, key)
+        elif isinstance(node, (str, int, float)) and not isinstance(node, bool):
+            values.append(f"{key}: {node}" if key else str(node))
+
+    try:
+        walk(json.loads(raw))
+    except ValueError:
+        return raw
+    return "\n\n".join(values)
+
+
+def _docx_text(data: bytes) -> str:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise UnsupportedDocumentTypeError(f"Unreadable DOCX document: {e}")
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NAMESPACE}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NAMESPACE}t")))
+    return "\n\n".join(p for p in paragraphs if p.strip())
+
+
+def _pdf_text(data: bytes) -> str:
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+    except PdfReadError as e:
+        raise UnsupportedDocumentTypeError(f"Unreadable PDF document: {e}")
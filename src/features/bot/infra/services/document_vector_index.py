@@ -0,0 +1,386 @@
+# src/features/bot/infra/services/document_vector_index.py
+
+import bisect
+import fcntl
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_MANIFEST = "manifest.json"
+_LOCK = "lock"
+_MIN_CAPACITY = 64
+
+
+class DocumentVectorIndex:
+    """
+    One bot's passages as a [capacity, dim] float32 matrix in a memory-mapped
+    .npy file, next to a row liveness mask, the passage texts (one append-only
+    file plus an offsets matrix) and per-dimension document frequencies.
+    `manifest.json` says which files are current and which rows belong to which
+    document; it is replaced atomically and always written last.
+
+    Adding appends rows, doubling the capacity into new files when full;
+    removing only clears rows in the liveness mask, and the files are
+    rewritten without the dead rows once those outnumber the live ones. Files
+    that are replaced get a new name, so a reader that mapped the old ones
+    keeps a consistent view until it notices the new manifest. Writers in
+    other worker processes are kept out with a lock file.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory: Path, dim: int, embedder: str, term_weighted: bool):
+        self.directory = directory
+        self.dim = dim
+        self.embedder = embedder
+        self.term_weighted = term_weighted
+        self._lock = threading.RLock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._manifest: Optional[dict] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._alive: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._df: Optional[np.ndarray] = None
+        self._row_starts: List[int] = []
+        self._row_documents: List[str] = []
+
+    # --- reading ---
+
+    def exists(self) -> bool:
+        return (self.directory / _MANIFEST).exists()
+
+    def size(self) -> Tuple[int, int]:
+        """(live passages, documents)"""
+        with self._lock:
+            self._refresh()
+            if self._manifest is None:
+                return 0, 0
+            return self._manifest["count"] - self._manifest["dead"], len(self._manifest["documents"])
+
+    def search(self, query: np.ndarray, top_k: int, min_score: float = 0.0) -> List[Tuple[str, str, str, float]]:
+        """(document uid, filename, passage, cosine similarity) of the best `top_k` live passages."""
+        if top_k <= 0:
+            return []
+        try:
+            return self._search(query, top_k, min_score)
+        except FileNotFoundError:
+            # Compacted by another writer between mapping the rows and reading their texts
+            with self._lock:
+                self._stamp = None
+            return self._search(query, top_k, min_score)
+
+    def _search(self, query: np.ndarray, top_k: int, min_score: float) -> List[Tuple[str, str, str, float]]:
+        with self._lock:
+            self._refresh()
+            if self._manifest is None:
+                return []
+            manifest = self._manifest
+            count, live = manifest["count"], manifest["count"] - manifest["dead"]
+            vectors, alive, offsets, df = self._vectors, self._alive, self._offsets, self._df
+            row_starts, row_documents = self._row_starts, self._row_documents
+        if live <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        if self.term_weighted:
+            # The IDF half of TF-IDF: rare terms in the query count for more
+            query = query * (np.log((1.0 + live) / (1.0 + df)) + 1.0).astype(np.float32)
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                return []
+            query /= norm
+
+        scores = vectors[:count] @ query
+        np.putmask(scores, ~alive[:count], -np.inf)
+        k = min(top_k, count)
+        best = np.argpartition(scores, count - k)[count - k:]
+        best = best[np.argsort(-scores[best])]
+
+        results: List[Tuple[str, str, str, float]] = []
+        with open(self.directory / manifest["files"]["texts"], "rb") as texts:
+            for row in best:
+                score = float(scores[row])
+                if not score > min_score:
+                    break
+                start, end = (int(v) for v in offsets[row])
+                texts.seek(start)
+                document_uid = row_documents[bisect.bisect_right(row_starts, int(row)) - 1]
+                filename = manifest["documents"][document_uid]["filename"]
+                results.append((document_uid, filename, texts.read(end - start).decode("utf-8"), score))
+        return results
+
+    # --- writing ---
+
+    def add(self, document_uid: str, filename: str, vectors: np.ndarray, texts: Sequence[str]) -> int:
+        """Appends a document's passages, replacing any earlier version of it; returns rows added."""
+        if len(texts) != len(vectors):
+            raise ValueError(f"{len(texts)} passages but {len(vectors)} vectors")
+        with self._exclusive():
+            manifest = self._manifest
+            if manifest is not None and document_uid in manifest["documents"]:
+                self._remove_rows([document_uid])
+                manifest = self._manifest
+            if manifest is None:
+                manifest = self._create()
+            if not len(texts):
+                return 0
+
+            if manifest["count"] + len(texts) > manifest["capacity"]:
+                # Grow into new files, leaving out the removed rows on the way
+                live_rows = np.flatnonzero(self._alive[:manifest["count"]])
+                self._rewrite(rows=live_rows, capacity=_capacity_for(2 * (len(live_rows) + len(texts))))
+                manifest = self._manifest
+            count = manifest["count"]
+
+            encoded = [text.encode("utf-8") for text in texts]
+            texts_path = self.directory / manifest["files"]["texts"]
+            position = manifest["text_bytes"]
+            with open(texts_path, "r+b") as handle:
+                handle.seek(position)
+                handle.write(b"".join(encoded))
+            ends = position + np.cumsum([len(chunk) for chunk in encoded], dtype=np.int64)
+
+            rows = slice(count, count + len(texts))
+            self._vectors[rows] = vectors
+            self._offsets[rows, 0] = ends - [len(chunk) for chunk in encoded]
+            self._offsets[rows, 1] = ends
+            self._alive[rows] = True
+            self._df += np.count_nonzero(vectors, axis=0)
+            self._flush()
+
+            manifest["count"] = count + len(texts)
+            manifest["text_bytes"] = int(ends[-1])
+            manifest["documents"][document_uid] = {"filename": filename, "rows": [count, count + len(texts)]}
+            self._write_manifest(manifest)
+            return len(texts)
+
+    def remove(self, document_uids: Sequence[str]) -> int:
+        """Drops the documents' passages; returns rows removed. Deletes the data files once nothing is left."""
+        with self._exclusive():
+            if self._manifest is None:
+                return 0
+            return self._remove_rows(document_uids)
+
+    def clear(self) -> None:
+        with self._exclusive():
+            self._clear()
+
+    def _remove_rows(self, document_uids: Sequence[str]) -> int:
+        manifest = self._manifest
+        removed = 0
+        for document_uid in document_uids:
+            document = manifest["documents"].pop(document_uid, None)
+            if document is None:
+                continue
+            start, end = document["rows"]
+            self._alive[start:end] = False
+            self._df -= np.count_nonzero(self._vectors[start:end], axis=0)
+            removed += end - start
+        if not removed:
+            return 0
+
+        manifest["dead"] += removed
+        live = manifest["count"] - manifest["dead"]
+        if live <= 0 and not manifest["documents"]:
+            self._clear()
+            return removed
+        self._flush()
+        if manifest["dead"] > live:
+            self._rewrite(rows=np.flatnonzero(self._alive[:manifest["count"]]), capacity=_capacity_for(live))
+        else:
+            self._write_manifest(manifest)
+        return removed
+
+    def _create(self) -> dict:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": self.VERSION, "embedder": self.embedder, "dim": self.dim,
+            "count": 0, "dead": 0, "capacity": 0, "text_bytes": 0, "files": {}, "documents": {},
+        }
+        self._manifest = manifest
+        self._rewrite(rows=np.arange(0), capacity=_MIN_CAPACITY)
+        return self._manifest
+
+    def _rewrite(self, rows: np.ndarray, capacity: int) -> None:
+        """Copies `rows` (in order) into a fresh set of files with room for `capacity` rows."""
+        manifest = self._manifest
+        old_files = dict(manifest["files"])
+        tag = uuid.uuid4().hex[:12]
+        files = {kind: f"{kind}-{tag}.{ext}" for kind, ext in
+                 (("vectors", "npy"), ("alive", "npy"), ("offsets", "npy"), ("df", "npy"), ("texts", "bin"))}
+
+        vectors = self._open_array(files["vectors"], "w+", (capacity, self.dim), np.float32)
+        alive = self._open_array(files["alive"], "w+", (capacity,), np.bool_)
+        offsets = self._open_array(files["offsets"], "w+", (capacity, 2), np.int64)
+        df = self._open_array(files["df"], "w+", (self.dim,), np.int64)
+
+        n = len(rows)
+        with open(self.directory / files["texts"], "wb") as out:
+            if n:
+                vectors[:n] = self._vectors[rows]
+                alive[:n] = self._alive[rows]
+                df[:] = self._df
+                lengths = self._offsets[rows, 1] - self._offsets[rows, 0]
+                offsets[:n, 1] = np.cumsum(lengths)
+                offsets[:n, 0] = offsets[:n, 1] - lengths
+                with open(self.directory / old_files["texts"], "rb") as source:
+                    for start, end in self._offsets[rows]:
+                        source.seek(int(start))
+                        out.write(source.read(int(end - start)))
+        for array in (vectors, alive, offsets, df):
+            array.flush()
+
+        # Rows move, so every document's range is remapped
+        new_row = np.full(manifest["count"] + 1, -1, dtype=np.int64)
+        new_row[rows] = np.arange(n)
+        for document in manifest["documents"].values():
+            start, end = document["rows"]
+            kept = new_row[start:end]
+            kept = kept[kept >= 0]
+            document["rows"] = [int(kept[0]), int(kept[-1]) + 1] if len(kept) else [0, 0]
+
+        manifest.update(files=files, capacity=capacity, count=n, dead=0,
+                        text_bytes=int(offsets[n - 1, 1]) if n else 0)
+        self._vectors, self._alive, self._offsets, self._df = vectors, alive, offsets, df
+        self._write_manifest(manifest)
+        for name in old_files.values():
+            (self.directory / name).unlink(missing_ok=True)
+
+    def _clear(self) -> None:
+        # The lock file stays: a writer waiting on it must keep excluding the ones that come after it
+        for path in self.directory.iterdir():
+            if path.name != _LOCK:
+                path.unlink(missing_ok=True)
+        self._reset_state()
+
+    # --- files ---
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / _LOCK, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._stamp = None  # Another worker may have written since we last looked
+                    self._refresh()
+                    if self._manifest is None and (self.directory / _MANIFEST).exists():
+                        # Built with another embedder; its vectors mean nothing to this one
+                        self._clear()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """(Re)maps the files when the manifest changed since we last read it."""
+        for _ in range(3):
+            try:
+                stat = (self.directory / _MANIFEST).stat()
+            except FileNotFoundError:
+                self._reset_state()
+                return
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if stamp == self._stamp:
+                return
+            try:
+                with open(self.directory / _MANIFEST) as f:
+                    manifest = json.load(f)
+                if not self._compatible(manifest):
+                    self._reset_state()
+                    self._stamp = stamp
+                    return
+                files = manifest["files"]
+                self._vectors = self._open_array(files["vectors"], "r+")
+                self._alive = self._open_array(files["alive"], "r+")
+                self._offsets = self._open_array(files["offsets"], "r+")
+                self._df = self._open_array(files["df"], "r+")
+            except FileNotFoundError:
+                continue  # Replaced while we were reading it; look again
+            self._manifest = manifest
+            self._stamp = stamp
+            self._index_rows(manifest)
+            return
+        raise RuntimeError(f"Vector index in {self.directory} kept changing while it was read")
+
+    def _compatible(self, manifest: dict) -> bool:
+        return (manifest.get("version") == self.VERSION and manifest.get("dim") == self.dim
+                and manifest.get("embedder") == self.embedder)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        path = self.directory / _MANIFEST
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path)
+        stat = path.stat()
+        self._manifest = manifest
+        self._stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self._index_rows(manifest)
+
+    def _index_rows(self, manifest: dict) -> None:
+        spans = sorted((document["rows"][0], uid) for uid, document in manifest["documents"].items()
+                       if document["rows"][1] > document["rows"][0])
+        self._row_starts = [start for start, _ in spans]
+        self._row_documents = [uid for _, uid in spans]
+
+    def _open_array(self, name: str, mode: str, shape=None, dtype=None) -> np.ndarray:
+        path = self.directory / name
+        if mode == "w+":
+            return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        return np.load(path, mmap_mode=mode)
+
+    def _flush(self) -> None:
+        for array in (self._vectors, self._alive, self._offsets, self._df):
+            array.flush()
+
+    def _reset_state(self) -> None:
+        self._stamp = None
+        self._manifest = None
+        self._vectors = self._alive = self._offsets = self._df = None
+        self._row_starts, self._row_documents = [], []
+
+
+class DocumentVectorIndexStore:
+    """The per-bot indexes under one directory, each bot in `<root>/<bot uid>/`."""
+
+    def __init__(self, root: str, dim: int, embedder: str, term_weighted: bool, max_open: int = 256):
+        self.root = Path(root)
+        self.dim = dim
+        self.embedder = embedder
+        self.term_weighted = term_weighted
+        self._max_open = max_open
+        self._open: "OrderedDict[str, DocumentVectorIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, bot_uid: str) -> DocumentVectorIndex:
+        with self._lock:
+            index = self._open.get(bot_uid)
+            if index is None:
+                index = DocumentVectorIndex(self.root / bot_uid, self.dim, self.embedder, self.term_weighted)
+                self._open[bot_uid] = index
+                # Closing a map is just dropping it; a bot that comes back maps its files again
+                while len(self._open) > self._max_open:
+                    self._open.popitem(last=False)
+            else:
+                self._open.move_to_end(bot_uid)
+            return index
+
+    def exists(self, bot_uid: str) -> bool:
+        return (self.root / bot_uid / _MANIFEST).exists()
+
+    def open_indexes(self) -> int:
+        return len(self._open)
+
+
+def _capacity_for(rows: int) -> int:
+    capacity = _MIN_CAPACITY
+    while capacity < rows:
+        capacity *= 2
+    return capacity
@@ -0,0 +1,202 @@
+# src/features/bot/infra/services/redis_token_quota_service.py
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.features.bot.application.services.token_quota_service import QuotaReservation, TokenQuotaService
+from src.features.bot.infra.persistence.models.bot import BotORM
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+# KEYS[1] balance; ARGV: wanted, seed, ttl. Returns the tokens reserved, or -1 when exhausted.
+_RESERVE_SCRIPT = """
+local current = redis.call('get', KEYS[1])
+if not current then
+    current = ARGV[2]
+end
+current = tonumber(current)
+if current <= 0 then
+    redis.call('set', KEYS[1], current, 'EX', ARGV[3])
+    return -1
+end
+local reserved = math.min(tonumber(ARGV[1]), current)
+redis.call('set', KEYS[1], current - reserved, 'EX', ARGV[3])
+return reserved
+"""
+
+# KEYS[1] balance; ARGV: reserved, used, ttl. Returns the balance left, never below zero.
+_SETTLE_SCRIPT = """
+local current = redis.call('get', KEYS[1])
+if not current then
+    return false
+end
+local left = tonumber(current) + tonumber(ARGV[1]) - tonumber(ARGV[2])
+if left < 0 then
+    left = 0
+end
+redis.call('set', KEYS[1], left, 'EX', ARGV[3])
+return left
+"""
+
+_bots = BotORM.__table__
+_WRITE_BACK = (
+    update(_bots)
+    .where(_bots.c.uid == bindparam("b_uid"))
+    # Spending tokens is not an edit of the bot, so updated_at is kept
+    .values(tokens_left=bindparam("b_tokens_left"), updated_at=_bots.c.updated_at)
+)
+
+
+class RedisTokenQuotaService(TokenQuotaService):
+    """
+    Token balances held in Redis, one integer key per bot, and changed only by
+    Lua scripts so that concurrent reservations cannot overspend. A balance is
+    seeded from BotORM.tokens_left the first time it is needed; balances this
+    worker changed are written back to the bots table in batches every
+    `flush_interval` seconds (and on stop), so the database lags Redis by at
+    most one interval.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        key_prefix: str = "bot_tokens:",
+        key_ttl_seconds: int = 86400,
+        flush_interval: float = 5.0,
+        flush_batch_size: int = 500,
+        redis: Optional[Any] = None,
+    ) -> None:
+        if redis is None:
+            from src.infra.services.redis.redis_client import redis_client
+            redis = redis_client
+        self._redis = redis
+        self._session_maker = session_maker
+        self._key_prefix = key_prefix
+        self._key_ttl_seconds = key_ttl_seconds
+        self._flush_interval = flush_interval
+        self._flush_batch_size = flush_batch_size
+        self._dirty: Set[UUID] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.reserved = 0
+        self.rejected = 0
+        self.settled = 0
+        self.flushed = 0
+        self.flush_failures = 0
+        self.redis_errors = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "reserved": self.reserved,
+            "rejected": self.rejected,
+            "settled": self.settled,
+            "dirty": len(self._dirty),
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+            "redis_errors": self.redis_errors,
+        }
+
+    async def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop(), name="token-quota-flush")
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def reserve(self, bot_uid: UUID, known_tokens_left: int, estimated_tokens: int) -> Optional[QuotaReservation]:
+        try:
+            reserved = int(await self._redis.eval(
+                _RESERVE_SCRIPT, 1, self._key(bot_uid), max(estimated_tokens, 1), known_tokens_left or 0,
+                self._key_ttl_seconds,
+            ))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"RedisTokenQuotaService: Reserve failed for bot {bot_uid}, using the stored balance: {e}")
+            if (known_tokens_left or 0) <= 0:
+                self.rejected += 1
+                return None
+            return QuotaReservation(bot_uid=bot_uid, tokens=0, tracked=False)
+
+        if reserved < 0:
+            self.rejected += 1
+            return None
+        self.reserved += 1
+        self._dirty.add(bot_uid)
+        return QuotaReservation(bot_uid=bot_uid, tokens=reserved)
+
+    async def settle(self, reservation: QuotaReservation, used_tokens: int) -> Optional[int]:
+        if not reservation.tracked:
+            return None
+        try:
+            left = await self._redis.eval(
+                _SETTLE_SCRIPT, 1, self._key(reservation.bot_uid), reservation.tokens, max(used_tokens, 0),
+                self._key_ttl_seconds,
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"RedisTokenQuotaService: Settle failed for bot {reservation.bot_uid}: {e}")
+            return None
+        self.settled += 1
+        self._dirty.add(reservation.bot_uid)
+        if left is None:
+            logger.warning(f"RedisTokenQuotaService: Balance of bot {reservation.bot_uid} expired before settling")
+            return None
+        return int(left)
+
+    async def reset(self, bot_uid: UUID, tokens_left: int) -> None:
+        self._dirty.discard(bot_uid)
+        try:
+            await self._redis.set(self._key(bot_uid), tokens_left, ex=self._key_ttl_seconds)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"RedisTokenQuotaService: Failed to reset the balance of bot {bot_uid}: {e}")
+
+    async def flush(self) -> int:
+        """Writes the balances changed since the last flush to bots.tokens_left; returns the rows written."""
+        pending, self._dirty = list(self._dirty), set()
+        written = 0
+        for start in range(0, len(pending), self._flush_batch_size):
+            batch = pending[start:start + self._flush_batch_size]
+            try:
+                written += await self._write_back(batch)
+            except Exception as e:
+                self.flush_failures += 1
+                self._dirty.update(batch)
+                logger.error(f"RedisTokenQuotaService: Failed to write back {len(batch)} balances: {e}", exc_info=True)
+        self.flushed += written
+        return written
+
+    async def _write_back(self, bot_uids: List[UUID]) -> int:
+        values = await self._redis.mget([self._key(bot_uid) for bot_uid in bot_uids])
+        params = [
+            {"b_uid": bot_uid, "b_tokens_left": int(value)}
+            for bot_uid, value in zip(bot_uids, values)
+            if value is not None
+        ]
+        if not params:
+            return 0
+        async with self._session_maker() as session:
+            await session.execute(_WRITE_BACK, params)
+            await session.commit()
+        logger.debug(f"RedisTokenQuotaService: Wrote back {len(params)} token balances")
+        return len(params)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    def _key(self, bot_uid: UUID) -> str:
+        return f"{self._key_prefix}{bot_uid}"
@@ -0,0 +1,104 @@
+# src/features/bot/infra/services/text_embedder.py
+
+import re
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STEM_CHARS = 6
+
+
+class TextEmbedder(ABC):
+    """Turns passages into L2-normalised float32 vectors, so a dot product is their cosine similarity."""
+
+    name: str
+    dim: int
+    # Dimensions are term buckets, so the index may weight a query by inverse document frequency
+    term_weighted: bool = False
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """A [len(texts), dim] float32 matrix with unit-length rows (zero rows for empty texts)."""
+        raise NotImplementedError
+
+
+class HashingTextEmbedder(TextEmbedder):
+    """
+    Feature hashing of words, word stems and word pairs into `dim` signed
+    buckets, with sublinear term frequencies. Needs no model and no network,
+    and two processes always agree on a vector; the index adds the IDF part of
+    TF-IDF at query time.
+    """
+
+    name = "hashing"
+    term_weighted = True
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        buckets: List[int] = []
+        signs: List[float] = []
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.casefold())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            # A crude stem, so "refund"/"refunds" or "доставка"/"доставки" share a feature in any language
+            features += [f"~{token[:_STEM_CHARS]}" for token in tokens if len(token) >= _STEM_CHARS]
+            for feature in features:
+                bucket, sign = _hash_feature(feature, self.dim)
+                rows.append(row)
+                buckets.append(bucket)
+                signs.append(sign)
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(buckets, dtype=np.intp)),
+                  np.asarray(signs, dtype=np.float32))
+        np.copysign(np.log1p(np.abs(matrix)), matrix, out=matrix)
+        return normalize_rows(matrix)
+
+
+class SentenceTransformerTextEmbedder(TextEmbedder):
+    """A local sentence-transformers model; the package is only needed when this embedder is configured."""
+
+    def __init__(self, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "KNOWLEDGE_EMBEDDER names a sentence-transformers model, but the package is not installed"
+            ) from e
+        self._model = SentenceTransformer(model_name)
+        self.name = f"sentence-transformers:{model_name}"
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._model.encode(list(texts), convert_to_numpy=True, show_progress_bar=False)
+        return normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+
+def create_text_embedder(spec: str, dim: int) -> TextEmbedder:
+    """`hashing` or `sentence-transformers:<model name or path>`."""
+    kind, _, argument = spec.partition(":")
+    if kind == "hashing":
+        return HashingTextEmbedder(dim=dim)
+    if kind == "sentence-transformers" and argument:
+        return SentenceTransformerTextEmbedder(argument)
+    raise ValueError(f"Unknown text embedder '{spec}'")
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+@lru_cache(maxsize=200_000)
+def _hash_feature(feature: str, dim: int) -> Tuple[int, float]:
+    digest = zlib.crc32(feature.encode("utf-8"))
+    # The top bit picks the sign, so colliding features tend to cancel rather than add up
+    return digest % dim, (1.0 if digest & 0x80000000 else -1.0)
@@ -1,6 +1,8 @@
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
-from typing import Dict, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
+from uuid import UUID
 
 from src.features.bot.api.v1.dtos.get_documents_dto import BotDocumentResponseItemDTO
 from src.features.bot.api.v1.dtos.get_user_bots_dto import BotDTO, BotServiceDTO, BotParticipantDTO
@@ -25,78 +27,139 @@ async def build_bot_response(
         user_lookup_service: UserLookupService
 ) -> Optional[BotDTO]:
     """
-    Builds the complete BotDTO from a BotEntity and its related entities,
-    using BotDTOMapper for core attributes and fetching nested data.
+    Builds the complete BotDTO from a BotEntity and its related entities.
+    Single-bot shortcut for build_bot_responses.
     """
     if not bot:
         logger.warning("build_bot_response received None bot entity, returning None.")
         return None
 
-    try:
-        # Use the mapper to get the core BotDTO attributes
-        # This will already handle flattening AI settings and quota from the entity.
-        bot_dto = _bot_dto_mapper.to_dto(bot)
-
-        # --- Fetch and Map Related Services ---
-        bot_service_entities = await bot_uow.bot_service_repository.find_by_bot_uid(bot.uid)
-        bot_dto.bot_services = [
-            BotServiceDTO(
-                platform=s.platform,
-                status=s.status,
-                uid=s.uid,
-                service_details=s.service_details # Ensure service_details is mapped correctly if it's a complex type
-            )
-            for s in bot_service_entities
-        ]
-
-        # --- Fetch and Map Participants ---
-        participant_entities = await bot_uow.bot_participant_repository.find_by_bot_uid(bot.uid)
-
-        if participant_entities:
-            # Extract unique user UIDs to query user_lookup_service efficiently
-            participant_user_uids = [
-                str(p.user_uid)
-                for p in participant_entities
-                if p.user_uid
-            ]
-
-            # Get user details for participants
-            user_details_list = await user_lookup_service.get_users_by_uids(participant_user_uids)
-            user_details_map: Dict[str, UserInfo] = {
-                str(user.uid): user for user in user_details_list
-            }
-
-            # Map participants to DTOs, enriching with user details
-            for p_entity in participant_entities:
-                user_detail = user_details_map.get(str(p_entity.user_uid))
-                if user_detail:
-                    bot_dto.participants.append(
-                        BotParticipantDTO(
-                            user_uid=p_entity.user_uid,
-                            role=p_entity.role,
-                            email=user_detail.email,
-                            avatar=user_detail.avatar_file_url
-                        )
-                    )
-                else:
-                    logger.warning(f"User detail not found for participant user UID: {p_entity.user_uid} in bot {bot.uid}")
-
-        # --- Fetch and Map Documents ---
-        logger.debug(f"Fetching documents for bot UID: {bot.uid}")
-        document_entities = await bot_uow.bot_document_repository.find_by_bot_uid(bot.uid)
-        bot_dto.documents = [
-            BotDocumentResponseItemDTO(
-                document_uid=doc.uid,
-                filename=doc.filename,
-                content_type=doc.content_type
-            )
-            for doc in document_entities
-        ]
+    bot_dtos = await build_bot_responses([bot], bot_uow, user_lookup_service)
+    return bot_dtos[0] if bot_dtos else None
+
+
+async def build_bot_responses(
+        bots: List[BotEntity],
+        bot_uow: BotUnitOfWork,
+        user_lookup_service: UserLookupService
+) -> List[BotDTO]:
+    """
+    Builds BotDTOs for many bots with a constant number of queries.
 
-        logger.debug(f"Successfully assembled full BotDTO for bot UID: {bot.uid} with {len(bot_dto.participants)} participants and {len(bot_dto.documents)} documents.")
-        return bot_dto
+    Services, participants and document metadata of all bots that don't already
+    carry them (see BotLoadProfile) are fetched with one IN (...) query per
+    relation, participant users with one lookup, and the DTOs are stitched
+    together in memory. Bots whose DTO fails to build are logged and skipped;
+    the order of `bots` is kept.
+    """
+    bots = [bot for bot in bots if bot]
+    if not bots:
+        return []
 
+    try:
+        services_by_bot = await _group_by_bot(
+            bots, lambda b: b.services, bot_uow.bot_service_repository.find_by_bot_uids
+        )
+        participants_by_bot = await _group_by_bot(
+            bots, lambda b: b.participants, bot_uow.bot_participant_repository.find_by_bot_uids
+        )
+        documents_by_bot = await _group_by_bot(
+            bots, lambda b: b.documents, bot_uow.bot_document_repository.find_by_bot_uids
+        )
+
+        participant_user_uids = {
+            str(p.user_uid)
+            for participants in participants_by_bot.values()
+            for p in participants
+            if p.user_uid
+        }
+        user_details_map: Dict[str, UserInfo] = {}
+        if participant_user_uids:
+            user_details_list = await user_lookup_service.get_users_by_uids(list(participant_user_uids))
+            user_details_map = {str(user.uid): user for user in user_details_list}
     except Exception as e:
-        logger.error(f"Error building complete BotDTO for bot UID {bot.uid}: {e}", exc_info=True)
-        # Propagate the error or return None, depending on the error handling strategy
-        return None
\ No newline at end of file
+        logger.error(f"Error loading related data for {len(bots)} bot(s): {e}", exc_info=True)
+        return []
+
+    bot_dtos: List[BotDTO] = []
+    for bot in bots:
+        try:
+            bot_dtos.append(_assemble_bot_dto(
+                bot,
+                services_by_bot.get(bot.uid, []),
+                participants_by_bot.get(bot.uid, []),
+                documents_by_bot.get(bot.uid, []),
+                user_details_map,
+            ))
+        except Exception as e:
+            logger.error(f"Error building complete BotDTO for bot UID {bot.uid}: {e}", exc_info=True)
+
+    logger.debug(f"Assembled {len(bot_dtos)} BotDTO(s) from {len(bots)} bot(s).")
+    return bot_dtos
+
+
+async def _group_by_bot(bots: List[BotEntity], loaded, find_by_bot_uids) -> Dict[UUID, list]:
+    """Uses collections already loaded on the bots and fetches the rest in one query."""
+    grouped: Dict[UUID, list] = defaultdict(list)
+    missing: List[UUID] = []
+    for bot in bots:
+        items = loaded(bot)
+        if items is None:
+            missing.append(bot.uid)
+        else:
+            grouped[bot.uid].extend(items)
+
+    if missing:
+        for item in await find_by_bot_uids(missing):
+            grouped[item.bot_uid].append(item)
+    return grouped
+
+
+def _assemble_bot_dto(
+        bot: BotEntity,
+        service_entities: list,
+        participant_entities: list,
+        document_entities: list,
+        user_details_map: Dict[str, UserInfo],
+) -> BotDTO:
+    # Use the mapper to get the core BotDTO attributes
+    # This will already handle flattening AI settings and quota from the entity.
+    bot_dto = _bot_dto_mapper.to_dto(bot)
+
+    bot_dto.bot_services = [
+        BotServiceDTO(
+            platform=s.platform,
+            status=s.status,
+            uid=s.uid,
+            service_details=s.service_details # Ensure service_details is mapped correctly if it's a complex type
+        )
+        for s in service_entities
+    ]
+
+    # Map participants to DTOs, enriching with user details
+    for p_entity in participant_entities:
+        user_detail = user_details_map.get(str(p_entity.user_uid))
+        if user_detail:
+            bot_dto.participants.append(
+                BotParticipantDTO(
+                    user_uid=p_entity.user_uid,
+                    role=p_entity.role,
+                    email=user_detail.email,
+                    avatar=user_detail.avatar_file_url
+                )
+            )
+        else:
+            logger.warning(f"User detail not found for participant user UID: {p_entity.user_uid} in bot {bot.uid}")
+
+    bot_dto.documents = [
+        BotDocumentResponseItemDTO(
+            document_uid=doc.uid,
+            filename=doc.filename,
+            content_type=doc.content_type,
+            status=doc.status,
+            status_error=doc.status_error,
+            chunk_count=doc.chunk_count,
+        )
+        for doc in document_entities
+    ]
+    return bot_dto
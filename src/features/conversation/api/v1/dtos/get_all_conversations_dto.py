@@ -75,4 +75,5 @@ class ConversationMinimalDTO(BaseModel):
 
 class GetConversationsResponseDTO(BaseModel):
     message: str
-    conversations: List[ConversationMinimalDTO]
\ No newline at end of file
+    conversations: List[ConversationMinimalDTO]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page.")
\ No newline at end of file
@@ -21,6 +21,7 @@ class OwnerInfoDTO(BaseModel):
     owner_id: UUID
 
 class MessageDTO(BaseModel):
+    uid: Optional[UUID] = None
     role: str
     content: str
     timestamp: datetime
@@ -36,7 +37,11 @@ class ConversationDTO(BaseModel):
 
 class GetConversationResponseDTO(BaseModel):
     message: str = Field(..., description="A descriptive message about the retrieved conversation.")
-    conversation: ConversationDTO = Field(..., description="Full details of the conversation.")
+    conversation: ConversationDTO = Field(..., description="Conversation details with one page of messages.")
+    before_cursor: Optional[str] = Field(None, description="Pass as `before` to fetch older messages; null for an empty page.")
+    after_cursor: Optional[str] = Field(None, description="Pass as `after` to fetch newer messages; null for an empty page.")
+    has_more_before: bool = Field(False, description="Whether older messages exist.")
+    has_more_after: bool = Field(False, description="Whether newer messages exist.")
 
     model_config = {
         "json_schema_extra": {
@@ -0,0 +1,51 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class IngestionStatsResponseDTO(BaseModel):
+    """Counters of the incoming message path in the worker that served the request."""
+    deduplication_enabled: bool
+    deduplication: Dict[str, int] = Field(
+        default_factory=dict,
+        description="checked/claimed deliveries and duplicates caught by Redis (redis_hits) or the database (db_hits).",
+    )
+    coalescing: Dict[str, int] = Field(default_factory=dict, description="Counters of the reply coalescer.")
+    summarization: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Rolling summaries written, messages folded and the estimated prompt tokens saved per later prompt.",
+    )
+    response_cache: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Cached reply lookups, hits, hit_rate and the prompt/completion tokens the hits did not spend.",
+    )
+    generation: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Generation scheduler: active and queued calls, and per priority class the admitted, "
+                    "shed and waiting calls with their queue wait times.",
+    )
+    llm_backends: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="LLM endpoint pool: retries, hedged requests and hedge wins, and per endpoint the circuit "
+                    "state, requests, failures and latency.",
+    )
+    llm_http_pool: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Pooled HTTP client of the LLM calls: connections in use and queued, connections created "
+                    "and reused, and connection acquire latency percentiles.",
+    )
+    llm_batching: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Micro-batching of LLM calls: batches sent, average and largest batch size, batch latency "
+                    "percentiles, items per second, and item/batch errors and timeouts. Empty when batching is off.",
+    )
+    document_retrieval: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Bot document retrieval: searches, search latency percentiles, and documents and passages "
+                    "indexed or removed. Empty when retrieval is off.",
+    )
+    bot_lookup_cache: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Bot configuration cache of the message path: entries held, in-process and Redis hits, "
+                    "misses, evictions and invalidations.",
+    )
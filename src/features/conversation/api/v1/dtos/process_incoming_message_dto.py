@@ -14,13 +14,24 @@ from src.features.conversation.domain.enums import ChatPlatform, MessageRole
 # Response DTO (Optional - might just be success/failure or trigger other events)
 class ProcessIncomingMessageResponseDTO(BaseModel):
     """Response after processing an incoming message."""
-    conversation_uid: UUID
-    user_message_uid: UUID
+    # None only for a duplicate whose first delivery has not stored its message yet
+    conversation_uid: Optional[UUID]
+    user_message_uid: Optional[UUID]
     ai_response_generated: bool = False
     ai_message_uid: Optional[UUID] = None
     # *** ADD THIS FIELD ***
     ai_response_content: Optional[str] = Field(None, description="The textual content of the AI's response, if generated.")
     message: str = "Message processed." # General status message
+    # True when the reply will be delivered later through on_deferred_response
+    response_deferred: bool = False
+    # True when the message was already processed; the AI fields then describe the earlier reply
+    duplicate: bool = False
+    # True when no reply was generated because the bot's token quota is used up
+    quota_exhausted: bool = False
+    # True when the generation was shed under load; `message` then holds the fallback reply
+    overloaded: bool = False
+    # True when the streamed reply broke off; the chunks already sent were not stored as a reply
+    reply_interrupted: bool = False
 
     model_config = { # Pydantic v2
         "json_schema_extra": {
@@ -6,8 +6,11 @@ from fastapi import APIRouter, Depends, status, Query
 from src.core.mediator.mediator import Mediator
 from src.di_container import ApplicationContainer
 from src.features.conversation.api.v1.dtos.get_all_conversations_dto import GetConversationsResponseDTO
-from src.features.conversation.application.queries.get_all_conversations.get_all_conversations_query import \
-    GetAllConversationsQuery
+from src.features.conversation.application.queries.get_all_conversations.get_all_conversations_query import (
+    DEFAULT_INBOX_PAGE_SIZE,
+    MAX_INBOX_PAGE_SIZE,
+    GetAllConversationsQuery,
+)
 from src.features.identity.dependencies import get_role_checker, get_current_user
 
 get_all_conversations_router = APIRouter()
@@ -18,7 +21,8 @@ get_all_conversations_router = APIRouter()
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_role_checker(["user", "admin"]))],
     summary="Get All Accessible Conversations",
-    description="Retrieves a list of conversations associated with bots the user can access, optionally filtered by platform."
+    description="Retrieves a page of conversations associated with bots the user can access, most recently "
+                "updated first, optionally filtered by platform. Follow `next_cursor` for further pages."
 )
 @inject
 async def get_all_conversations(
@@ -26,10 +30,14 @@ async def get_all_conversations(
     platform: Optional[str] = Query(
         None, description="Filter conversations by platform (e.g., 'playground', 'telegram')."
     ),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page."),
+    limit: int = Query(DEFAULT_INBOX_PAGE_SIZE, ge=1, le=MAX_INBOX_PAGE_SIZE, description="Page size."),
     mediator: Mediator = Depends(Provide[ApplicationContainer.mediator])
 ):
     query = GetAllConversationsQuery(
         user=user.uid,
-        platform_filter=platform
+        platform_filter=platform,
+        cursor=cursor,
+        limit=limit,
     )
     return await mediator.query(query)
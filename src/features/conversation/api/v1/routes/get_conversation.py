@@ -1,12 +1,18 @@
 # src/features/conversation/api/routes/get_single_bot_conversation_router.py
 
-from fastapi import APIRouter, Depends, status, Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, status, Path, Query
+from fastapi.responses import ORJSONResponse
 from uuid import UUID
 
 from src.core.mediator.mediator import Mediator
 from src.di_container import ApplicationContainer
-from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_query import \
-    GetSingleBotConversationQuery
+from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_query import (
+    DEFAULT_MESSAGE_PAGE_SIZE,
+    MAX_MESSAGE_PAGE_SIZE,
+    GetSingleBotConversationQuery,
+)
 from src.features.identity.domain.entities.user_entity import UserEntity
 from src.features.identity.dependencies import get_current_user, get_role_checker
 
@@ -19,19 +25,29 @@ get_conversation_router = APIRouter()
 @get_conversation_router.get(
     "/{uid}",
     response_model=GetConversationResponseDTO,
+    response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
     dependencies=[Depends(get_role_checker(["user", "admin"]))],
     summary="Get Single Bot Conversation",
-    description="Returns a single conversation by its ID, ensuring the user has access to the associated bot."
+    description="Returns a single conversation by its ID with one page of messages (the latest by default; "
+                "use the `before`/`after` cursors to page), ensuring the user has access to the associated bot."
 )
 @inject
 async def get_conversation(
     uid: UUID = Path(..., description="Conversation UID"),
+    before: Optional[str] = Query(None, description="`before_cursor` of a page: fetch older messages."),
+    after: Optional[str] = Query(None, description="`after_cursor` of a page: fetch newer messages."),
+    limit: int = Query(DEFAULT_MESSAGE_PAGE_SIZE, ge=1, le=MAX_MESSAGE_PAGE_SIZE, description="Messages per page."),
     current_user: UserEntity = Depends(get_current_user),
     mediator: Mediator = Depends(Provide[ApplicationContainer.mediator]),
 ):
     query = GetSingleBotConversationQuery(
         conversation_uid=uid,
-        user_uid=current_user.uid
+        user_uid=current_user.uid,
+        before=before,
+        after=after,
+        limit=limit,
     )
-    return await mediator.query(query)
+    response: GetConversationResponseDTO = await mediator.query(query)
+    # The handler already built validated DTOs; orjson serializes UUIDs and datetimes natively
+    return ORJSONResponse(content=response.model_dump())
@@ -0,0 +1,28 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, status
+
+from src.core.mediator.mediator import Mediator
+from src.features.conversation.api.v1.dtos.ingestion_stats_dto import IngestionStatsResponseDTO
+from src.features.conversation.application.queries.get_ingestion_stats.get_ingestion_stats_query import \
+    GetIngestionStatsQuery
+from src.features.identity.dependencies import get_role_checker
+
+get_ingestion_stats_router = APIRouter()
+
+
+@get_ingestion_stats_router.get(
+    "/ingestion/stats",
+    response_model=IngestionStatsResponseDTO,
+    status_code=status.HTTP_200_OK,
+    summary="Counters of the incoming message path in this worker.",
+    description="Message deduplication, reply coalescing, conversation summarization, the response cache, the "
+                "generation scheduler, the LLM backends (endpoint pool and pooled HTTP client), LLM call batching, "
+                "bot document retrieval and the bot lookup cache. Counters are per worker process and reset on "
+                "restart.",
+    dependencies=[Depends(get_role_checker(["admin"]))],
+)
+@inject
+async def get_ingestion_stats(
+    mediator: Mediator = Depends(Provide["mediator"]),
+) -> IngestionStatsResponseDTO:
+    return await mediator.query(GetIngestionStatsQuery())
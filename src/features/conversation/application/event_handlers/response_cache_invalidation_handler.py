@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from src.infra.logging.setup_async_logging import async_logger
+logger = async_logger
+
+from src.core.base.event import BaseEventHandler
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
+from src.features.conversation.infra.services.response_cache import ResponseCache
+
+
+@dataclass(kw_only=True)
+class ResponseCacheInvalidationHandler(BaseEventHandler[BotConfigChangedEvent, None]):
+    """Retires the cached replies of a bot whose settings, services or documents changed"""
+    _response_cache: Optional[ResponseCache]
+
+    async def handle(self, event: BotConfigChangedEvent) -> None:
+        if self._response_cache is None:
+            return
+        try:
+            await self._response_cache.invalidate(UUID(event.bot_uid))
+            logger.debug(f"Invalidated cached replies of bot {event.bot_uid} ({event.reason})")
+        except Exception as e:
+            logger.error(f"Failed to invalidate cached replies of bot {event.bot_uid}: {e}")
@@ -34,6 +34,7 @@ class ConversationDTOMapper:
         sorted_messages = sorted(messages, key=lambda m: m.timestamp if m.timestamp else datetime.min)
         return [
             MessageDTO(
+                uid=msg.uid,
                 role=msg.role,
                 content=msg.content,
                 timestamp=msg.timestamp
@@ -41,8 +42,15 @@ class ConversationDTOMapper:
             for msg in sorted_messages
         ]
 
-    def to_dto(self, entity: ConversationEntity) -> Optional[ConversationDTO]:
-        """Maps a ConversationEntity domain object to a ConversationDTO."""
+    def to_dto(
+            self,
+            entity: ConversationEntity,
+            messages: Optional[List[MessageEntity]] = None,
+    ) -> Optional[ConversationDTO]:
+        """
+        Maps a ConversationEntity domain object to a ConversationDTO.
+        `messages` (e.g. one page of history) replaces the messages loaded on the entity.
+        """
         if not entity:
             logger.warning("Attempted to map a None ConversationEntity to DTO.")
             return None
@@ -66,7 +74,7 @@ class ConversationDTOMapper:
                     sender_username=entity.participant.sender_nickname
                 ),
                 owner=OwnerInfoDTO(owner_id=entity.owner_uid), # Corrected to owner_uid
-                messages=self._map_messages(entity.messages), # Use helper for messages
+                messages=self._map_messages(entity.messages if messages is None else messages), # Use helper for messages
                 crm_catalog_id=entity.crm_catalog_id,
                 updated_at=getattr(entity, 'updated_at', None) # Use getattr for robustness
             )
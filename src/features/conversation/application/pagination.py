@@ -0,0 +1,29 @@
+# src/features/conversation/application/pagination.py
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+from src.features.conversation.exceptions.conversation_exceptions import InvalidCursorError
+
+# A keyset position: the sort timestamp and the row uid that breaks ties
+KeysetPosition = Tuple[datetime, UUID]
+
+
+def encode_cursor(position: KeysetPosition) -> str:
+    """Encodes a keyset position as an opaque, URL-safe cursor string."""
+    timestamp, uid = position
+    raw = f"{timestamp.isoformat()}|{uid}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> KeysetPosition:
+    """Decodes a cursor produced by encode_cursor; raises InvalidCursorError otherwise."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, uid = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), UUID(uid)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError() from e
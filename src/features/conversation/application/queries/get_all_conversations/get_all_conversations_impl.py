@@ -1,8 +1,7 @@
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List
 
 from src.core.base.query import BaseQueryHandler
 from src.core.mediator.mediator import Mediator
@@ -15,10 +14,10 @@ from src.features.conversation.api.v1.dtos.get_all_conversations_dto import (
     OwnerInfoDTO,
     GetConversationsResponseDTO  # <-- NEW: Import the response wrapper DTO
 )
-from src.features.conversation.domain.entities.message_entity import MessageEntity
+from src.features.conversation.application.pagination import decode_cursor, encode_cursor
 from src.features.conversation.domain.enums import ChatPlatform
 from src.features.conversation.domain.uow.chat_unit_of_work import ConversationUnitOfWork
-from .get_all_conversations_query import GetAllConversationsQuery  # Assuming it's in the same directory
+from .get_all_conversations_query import MAX_INBOX_PAGE_SIZE, GetAllConversationsQuery  # Assuming it's in the same directory
 
 
 
@@ -32,7 +31,8 @@ class GetAllConversationsQueryHandler(BaseQueryHandler[GetAllConversationsQuery,
         user_uid = query.user # Use the more specific user_uid for clarity
         platform_filter = query.platform_filter
 
-        logger.info(f"Fetching all conversations for user UID: {user_uid} with platform filter: {platform_filter}")
+        logger.info(f"Fetching conversations for user UID: {user_uid} with platform filter: {platform_filter}, "
+                    f"cursor: {query.cursor}, limit: {query.limit}")
 
         # Get accessible bots for the user
         # Note: get_accessible_bots typically returns BotEntity objects.
@@ -45,30 +45,34 @@ class GetAllConversationsQueryHandler(BaseQueryHandler[GetAllConversationsQuery,
             logger.info(message)
             return GetConversationsResponseDTO(message=message, conversations=[])
 
+        try:
+            platform_enum = ChatPlatform(platform_filter) if platform_filter else None
+        except ValueError:
+            logger.warning(f"Invalid platform filter provided: {platform_filter}. No conversations returned.")
+            return GetConversationsResponseDTO(message=f"Invalid platform filter: '{platform_filter}'.", conversations=[])
+
+        after = decode_cursor(query.cursor) if query.cursor else None
+        limit = max(1, min(query.limit, MAX_INBOX_PAGE_SIZE))
         conversations_found: List[ConversationMinimalDTO] = []
 
         async with self._unit_of_work as uow: # Use the UoW context
-            if platform_filter:
-                try:
-                    platform_enum = ChatPlatform(platform_filter)
-                    conversations = await uow.conversation_repository.find_by_bot_uids_and_platform(
-                        bot_uids=bot_uids,
-                        platform=platform_enum,
-                        load_messages=True
-                    )
-                except ValueError:
-                    logger.warning(f"Invalid platform filter provided: {platform_filter}. No conversations returned.")
-                    return GetConversationsResponseDTO(message=f"Invalid platform filter: '{platform_filter}'.", conversations=[])
-            else:
-                conversations = await uow.conversation_repository.find_by_bot_uids(
-                    bot_uids=bot_uids,
-                    load_messages=True
-                )
+            # One row more than requested tells whether another page exists
+            conversations = await uow.conversation_repository.find_inbox_page(
+                bot_uids=bot_uids,
+                limit=limit + 1,
+                platform=platform_enum,
+                after=after,
+            )
         logger.debug(f"Retrieved {len(conversations)} raw conversation entities.")
 
+        next_cursor = None
+        if len(conversations) > limit:
+            conversations = conversations[:limit]
+            next_cursor = encode_cursor((conversations[-1].updated_at, conversations[-1].uid))
+
         for conv in conversations:
             try:
-                last_msg = self._get_last_message(conv.messages)
+                last_msg = conv.get_last_message()
                 last_message_dto = LastMessageItemDTO(
                     content=last_msg.content,
                     timestamp=last_msg.timestamp
@@ -94,9 +98,6 @@ class GetAllConversationsQueryHandler(BaseQueryHandler[GetAllConversationsQuery,
             except Exception as e:
                 logger.error(f"Failed to process conversation {conv.uid}: {e}", exc_info=True)
 
-        # Sort the results by updated_at
-        conversations_found.sort(key=lambda dto: dto.updated_at or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
-
         message = f"Successfully retrieved {len(conversations_found)} conversation(s) for user {user_uid}."
         if platform_filter:
             message += f" Filtered by platform: '{platform_filter}'."
@@ -106,16 +107,6 @@ class GetAllConversationsQueryHandler(BaseQueryHandler[GetAllConversationsQuery,
         logger.info(message)
         return GetConversationsResponseDTO(
             message=message,
-            conversations=conversations_found
+            conversations=conversations_found,
+            next_cursor=next_cursor,
         )
-
-    def _get_last_message(self, messages: list[MessageEntity]) -> Optional[MessageEntity]:
-        """
-        Helper method to get the last message from a list of messages.
-        Assumes messages are already sorted or the last element is the latest.
-        """
-        if not messages:
-            return None
-        # It's safer to sort by timestamp here if messages are not guaranteed to be ordered
-        # return sorted(messages, key=lambda msg: msg.timestamp if msg.timestamp else datetime.min.replace(tzinfo=timezone.utc))[-1]
-        return messages[-1] # Assuming messages are ordered by creation/update time
\ No newline at end of file
@@ -3,8 +3,13 @@ from uuid import UUID
 
 from src.core.base.query import BaseQuery
 
+DEFAULT_INBOX_PAGE_SIZE = 50
+MAX_INBOX_PAGE_SIZE = 200
+
 
 @dataclass
 class GetAllConversationsQuery(BaseQuery):
     user: UUID
     platform_filter: str | None
+    cursor: str | None = None
+    limit: int = DEFAULT_INBOX_PAGE_SIZE
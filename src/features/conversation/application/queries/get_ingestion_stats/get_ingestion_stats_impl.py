@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from src.core.base.query import BaseQueryHandler
+from src.features.bot.infra.services.bot_lookup_cache import BotLookupCache
+from src.features.bot.infra.services.document_knowledge_base import DocumentKnowledgeBase
+from src.features.conversation.api.v1.dtos.ingestion_stats_dto import IngestionStatsResponseDTO
+from src.features.conversation.infra.services.conversation_summarizer import ConversationSummarizer
+from src.features.conversation.infra.services.message_deduplicator import MessageDeduplicator
+from src.features.conversation.infra.services.response_cache import ResponseCache
+from src.features.conversation.infra.services.response_coalescer import ResponseCoalescer
+from src.features.generation.application.services.deepseek_generation_service_impl import DeepSeekGenerationServiceImpl
+from src.features.generation.application.services.generation_scheduler import GenerationScheduler
+from src.infra.services.http.endpoint_pool import EndpointPool
+from src.infra.services.http.pooled_http_client import PooledHttpClient
+from .get_ingestion_stats_query import GetIngestionStatsQuery
+
+
+@dataclass
+class GetIngestionStatsQueryHandler(BaseQueryHandler[GetIngestionStatsQuery, IngestionStatsResponseDTO]):
+    _message_deduplicator: Optional[MessageDeduplicator]
+    _response_coalescer: ResponseCoalescer
+    _conversation_summarizer: Optional[ConversationSummarizer] = None
+    _response_cache: Optional[ResponseCache] = None
+    _generation_scheduler: Optional[GenerationScheduler] = None
+    _llm_endpoint_pool: Optional[EndpointPool] = None
+    _llm_generation_service: Optional[DeepSeekGenerationServiceImpl] = None
+    _document_retrieval_service: Optional[DocumentKnowledgeBase] = None
+    _llm_http_client: Optional[PooledHttpClient] = None
+    _bot_lookup_cache: Optional[BotLookupCache] = None
+
+    async def __call__(self, query: GetIngestionStatsQuery) -> IngestionStatsResponseDTO:
+        return IngestionStatsResponseDTO(
+            deduplication_enabled=self._message_deduplicator is not None,
+            deduplication=self._message_deduplicator.stats() if self._message_deduplicator is not None else {},
+            coalescing=self._response_coalescer.stats(),
+            summarization=self._conversation_summarizer.stats() if self._conversation_summarizer is not None else {},
+            response_cache=self._response_cache.stats() if self._response_cache is not None else {},
+            generation=self._generation_scheduler.stats() if self._generation_scheduler is not None else {},
+            llm_backends=self._llm_endpoint_pool.stats() if self._llm_endpoint_pool is not None else {},
+            llm_http_pool=self._llm_http_client.metrics() if self._llm_http_client is not None else {},
+            llm_batching=(
+                self._llm_generation_service.batching_stats() if self._llm_generation_service is not None else {}
+            ),
+            document_retrieval=(
+                self._document_retrieval_service.stats() if self._document_retrieval_service is not None else {}
+            ),
+            bot_lookup_cache=self._bot_lookup_cache.stats() if self._bot_lookup_cache is not None else {},
+        )
@@ -17,12 +17,13 @@ from src.features.conversation.api.v1.dtos.get_single_conversation_dto import (
     # No longer needed directly here: BotInfoDTO, SenderInfoDTO, OwnerInfoDTO, MessageDTO,
 )
 from src.features.conversation.application.mappers.conversation_dto_mapper import ConversationDTOMapper # Import your mapper
+from src.features.conversation.application.pagination import decode_cursor, encode_cursor
 from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_query import \
-    GetSingleBotConversationQuery # Note: original file name was get_single_bot_conversation_query.py
+    MAX_MESSAGE_PAGE_SIZE, GetSingleBotConversationQuery # Note: original file name was get_single_bot_conversation_query.py
 from src.features.conversation.domain.entities.conversation_entity import ConversationEntity # For mapper init
 from src.features.conversation.domain.uow.chat_unit_of_work import ConversationUnitOfWork
 # Import specific exceptions that should be raised by the handler
-from src.features.conversation.exceptions.conversation_exceptions import ConversationNotFoundError, BotAccessDeniedError # Assuming these exist
+from src.features.conversation.exceptions.conversation_exceptions import ConversationNotFoundError, BotAccessDeniedError, InvalidCursorError # Assuming these exist
 from src.features.bot.exceptions.bot_exceptions import BotNotFoundError # If check_single_bot_access can raise this
 
 
@@ -41,13 +42,20 @@ class GetSingleBotConversationQueryHandler(BaseQueryHandler[GetSingleBotConversa
         self._conversation_dto_mapper = ConversationDTOMapper(ConversationEntity, ConversationDTO)
 
     async def __call__(self, query: GetSingleBotConversationQuery) -> GetConversationResponseDTO:
-        logger.info(f"Fetching single conversation {query.conversation_uid} for user UID: {query.user_uid}")
+        logger.info(f"Fetching single conversation {query.conversation_uid} for user UID: {query.user_uid} "
+                    f"(before={query.before}, after={query.after}, limit={query.limit})")
 
-        # 1. Fetch conversation
+        if query.before and query.after:
+            raise InvalidCursorError("Only one of 'before' and 'after' can be given.")
+        before = decode_cursor(query.before) if query.before else None
+        after = decode_cursor(query.after) if query.after else None
+        limit = max(1, min(query.limit, MAX_MESSAGE_PAGE_SIZE))
+
+        # 1. Fetch conversation metadata; messages are paged separately below
         async with self._unit_of_work as uow:
             conversation = await uow.conversation_repository.find_by_uid(
                 query.conversation_uid, # Corrected from conversation_id to conversation_uid
-                load_messages=True
+                load_messages=False
             )
 
         if not conversation:
@@ -66,9 +74,23 @@ class GetSingleBotConversationQueryHandler(BaseQueryHandler[GetSingleBotConversa
             logger.warning(f"Access denied for user {query.user_uid} to conversation {query.conversation_uid} via bot {conversation.bot_uid}: {e}")
             raise BotAccessDeniedError(f"Not authorized to access conversation {query.conversation_uid}.") # Re-raise as a conversation-specific access error
 
-        # 3. Map ConversationEntity to ConversationDTO
+        # 3. Fetch one page of messages; one row more than requested tells whether the page is the last one
+        async with self._unit_of_work as uow:
+            page = await uow.message_repository.find_latest_by_conversation_uid(
+                conversation.uid, limit=limit + 1, before=before, after=after
+            )
+        if after is not None:
+            has_more_after = len(page) > limit
+            page = page[:limit]
+            has_more_before = True
+        else:
+            has_more_before = len(page) > limit
+            page = page[-limit:]
+            has_more_after = before is not None
+
+        # 4. Map ConversationEntity to ConversationDTO
         try:
-            conversation_dto = self._conversation_dto_mapper.to_dto(conversation)
+            conversation_dto = self._conversation_dto_mapper.to_dto(conversation, messages=page)
             if not conversation_dto:
                 logger.error(f"Mapper returned None for conversation {conversation.uid}. This should not happen if entity is not None.")
                 raise RuntimeError(f"Failed to map conversation {conversation.uid} to DTO.")
@@ -78,8 +100,12 @@ class GetSingleBotConversationQueryHandler(BaseQueryHandler[GetSingleBotConversa
 
 
         logger.info(f"Successfully retrieved conversation {conversation.uid} for user {query.user_uid}.")
-        # 4. Return the response wrapper DTO
+        # 5. Return the response wrapper DTO
         return GetConversationResponseDTO(
             message="Conversation retrieved successfully.",
-            conversation=conversation_dto
+            conversation=conversation_dto,
+            before_cursor=encode_cursor((page[0].timestamp, page[0].uid)) if page else None,
+            after_cursor=encode_cursor((page[-1].timestamp, page[-1].uid)) if page else None,
+            has_more_before=has_more_before,
+            has_more_after=has_more_after,
         )
\ No newline at end of file
@@ -1,11 +1,18 @@
 # src/features/conversation/application/queries/get_single_bot_conversation/get_single_bot_conversation_query.py
 
 from dataclasses import dataclass
+from typing import Optional
 from uuid import UUID
 from src.core.base.query import BaseQuery
 
+DEFAULT_MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 200
+
 
 @dataclass
 class GetSingleBotConversationQuery(BaseQuery):
     conversation_uid: UUID
     user_uid: UUID
+    before: Optional[str] = None  # Cursor: messages older than this position
+    after: Optional[str] = None   # Cursor: messages newer than this position
+    limit: int = DEFAULT_MESSAGE_PAGE_SIZE
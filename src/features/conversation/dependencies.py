@@ -17,7 +17,7 @@ from src.features.conversation.infra.services.process_incoming_message_impl impo
 from src.features.conversation.domain.uow.chat_unit_of_work import ConversationUnitOfWork
 from src.features.conversation.infra.persistence.uow.chat_unit_of_work_impl import ConversationUnitOfWorkImpl # Import UoW Impl
 from src.features.generation.application.services.generation_service import IGenerationService
-from src.features.generation.dependencies import get_stub_generation_service, get_deepseek_generation_service
+from src.features.generation.dependencies import get_stub_generation_service
 from src.infra.persistence.connection.sqlalchemy_engine import get_async_db # Import DB Session provider
 
 
@@ -37,7 +37,6 @@ def get_process_incoming_message_use_case(
     bot_uow: BotUnitOfWork = Depends(get_bot_unit_of_work),
     # Inject individual generation services
     stub_generation_service: IGenerationService = Depends(get_stub_generation_service),
-    deepseek_generation_service: IGenerationService = Depends(get_deepseek_generation_service),
     # openai_generation_service: IGenerationService = Depends(get_openai_generation_service), # Example
 ) -> ProcessIncomingMessageCommand:
     """
@@ -49,7 +48,7 @@ def get_process_incoming_message_use_case(
     # Create a map of available generation services
     available_generation_services: Dict[str, IGenerationService] = {
         "stub": stub_generation_service,
-        "deepseek-v2:16b": deepseek_generation_service,
+        # LLM-backed services live in ConversationContainer; messages are handled through the mediator
         # Add other services here as they are implemented
     }
 
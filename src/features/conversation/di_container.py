@@ -1,20 +1,36 @@
+from typing import Optional
+
 from dependency_injector import containers, providers
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import Settings
 from src.core.mediator.mediator import Mediator
+from src.features.conversation.application.event_handlers.response_cache_invalidation_handler import \
+    ResponseCacheInvalidationHandler
 from src.features.conversation.application.queries.get_all_conversations.get_all_conversations_impl import \
     GetAllConversationsQueryHandler
+from src.features.conversation.application.queries.get_ingestion_stats.get_ingestion_stats_impl import \
+    GetIngestionStatsQueryHandler
 from src.features.conversation.application.queries.get_playground_conversation.get_playground_conversation_impl import \
     GetPlaygroundConversationQueryHandler
 from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_impl import \
     GetSingleBotConversationQueryHandler
 from src.features.conversation.domain.uow.chat_unit_of_work import ConversationUnitOfWork
 from src.features.conversation.infra.persistence.uow.chat_unit_of_work_impl import ConversationUnitOfWorkImpl
+from src.features.conversation.infra.services.conversation_summarizer import ConversationSummarizer
+from src.features.conversation.infra.services.message_deduplicator import MessageDeduplicator
 from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
-from src.features.generation.application.services.deepseek_generation_service_impl import DeepSeekGenerationServiceImpl
+from src.features.conversation.infra.services.response_cache import ResponseCache
+from src.features.conversation.infra.services.response_coalescer import ResponseCoalescer
+from src.features.generation.application.services.deepseek_generation_service_impl import (
+    DeepSeekGenerationServiceImpl,
+    create_llm_endpoint_pool,
+)
+from src.features.generation.application.services.generation_scheduler import GenerationPriority, GenerationScheduler
 from src.features.generation.application.services.stub_generation_service_impl import StubGenerationServiceImpl
 from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
+from src.infra.services.http.endpoint_pool import EndpointPool
+from src.infra.services.http.pooled_http_client import PooledHttpClient
 
 
 class ConversationContainer(containers.DeclarativeContainer):
@@ -22,11 +38,47 @@ class ConversationContainer(containers.DeclarativeContainer):
     mediator = providers.Dependency(instance_of=Mediator)
     bot_access_service = providers.Dependency()
     bot_lookup_service = providers.Dependency()
+    bot_lookup_cache = providers.Dependency()
+    # None when token quotas are disabled
+    token_quota_service = providers.Dependency()
+    # None when document retrieval is disabled
+    document_retrieval_service = providers.Dependency()
     # available_generation_services = providers.Dependency(instance_of=dict)
     config = providers.DelegatedSingleton(Settings)
 
+    # Shared by all LLM calls; opened/closed by the app lifespan
+    llm_http_client = providers.Singleton(
+        PooledHttpClient,
+        name="llm",
+        limit=config.provided.LLM_HTTP_POOL_LIMIT,
+        limit_per_host=config.provided.LLM_HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl=config.provided.LLM_HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=config.provided.LLM_HTTP_KEEPALIVE_TIMEOUT,
+        connect_timeout=config.provided.LLM_HTTP_CONNECT_TIMEOUT,
+        total_timeout=config.provided.LLM_HTTP_TOTAL_TIMEOUT,
+    )
+
+    # Backend endpoints with their circuit breakers and latency figures
+    llm_endpoint_pool = providers.Singleton(create_llm_endpoint_pool, settings=config.provided)
+
+    @staticmethod
+    def create_llm_batch_endpoint_pool(settings: Settings) -> Optional[EndpointPool]:
+        if not settings.LLM_BATCHING_ENABLED or not settings.LLM_BATCH_API_URLS.strip():
+            return None
+        return create_llm_endpoint_pool(settings, urls=settings.LLM_BATCH_API_URLS)
+
+    # None keeps every generate_response call a request of its own
+    llm_batch_endpoint_pool = providers.Singleton(create_llm_batch_endpoint_pool, settings=config.provided)
+
     stub_generation_service = providers.Singleton(StubGenerationServiceImpl)
-    deepseek_generation_service = providers.Singleton(DeepSeekGenerationServiceImpl)
+    deepseek_generation_service = providers.Singleton(
+        DeepSeekGenerationServiceImpl,
+        http_client=llm_http_client,
+        endpoints=llm_endpoint_pool,
+        batch_endpoints=llm_batch_endpoint_pool,
+        max_batch_size=config.provided.LLM_BATCH_MAX_SIZE,
+        max_batch_wait=config.provided.LLM_BATCH_MAX_WAIT,
+    )
 
     available_generation_services = providers.Singleton(
         lambda stub, deepseek: {
@@ -37,6 +89,25 @@ class ConversationContainer(containers.DeclarativeContainer):
         deepseek=deepseek_generation_service,
     )
 
+    @staticmethod
+    def create_generation_scheduler(settings: Settings) -> Optional[GenerationScheduler]:
+        if not settings.GENERATION_SCHEDULER_ENABLED:
+            return None
+        return GenerationScheduler(
+            max_concurrency=settings.GENERATION_MAX_CONCURRENCY,
+            max_per_bot=settings.GENERATION_MAX_PER_BOT,
+            max_per_owner=settings.GENERATION_MAX_PER_OWNER,
+            max_queued=settings.GENERATION_MAX_QUEUED,
+            queue_timeouts={
+                GenerationPriority.PRODUCTION: settings.GENERATION_QUEUE_TIMEOUT_PRODUCTION,
+                GenerationPriority.PLAYGROUND: settings.GENERATION_QUEUE_TIMEOUT_PLAYGROUND,
+                GenerationPriority.BACKGROUND: settings.GENERATION_QUEUE_TIMEOUT_BACKGROUND,
+            },
+        )
+
+    # Every LLM call of this process is admitted through it
+    generation_scheduler = providers.Singleton(create_generation_scheduler, settings=config.provided)
+
     db_session: providers.Factory[AsyncSession] = providers.Factory(AsyncSessionLocal)
 
     @staticmethod
@@ -50,12 +121,80 @@ class ConversationContainer(containers.DeclarativeContainer):
         session=db_session,
     )
 
+    # Shared by all incoming messages so a newer message can supersede a pending reply
+    response_coalescer = providers.Singleton(ResponseCoalescer)
+
+    @staticmethod
+    def create_message_deduplicator(settings: Settings) -> Optional[MessageDeduplicator]:
+        if not settings.MESSAGE_DEDUP_ENABLED:
+            return None
+        return MessageDeduplicator(
+            ttl_seconds=settings.MESSAGE_DEDUP_TTL_SECONDS,
+            key_prefix=settings.MESSAGE_DEDUP_KEY_PREFIX,
+        )
+
+    # Counters are per process; the messages unique constraint backs it up across processes
+    message_deduplicator = providers.Singleton(create_message_deduplicator, settings=config.provided)
+
+    @staticmethod
+    def create_conversation_summarizer(
+        settings: Settings, uow_factory, available_generation_services, token_quota_service, generation_scheduler
+    ) -> Optional[ConversationSummarizer]:
+        if not settings.CONVERSATION_SUMMARY_ENABLED:
+            return None
+        return ConversationSummarizer(
+            uow_factory=uow_factory,
+            available_generation_services=available_generation_services,
+            token_quota_service=token_quota_service,
+            max_messages_per_run=settings.CONVERSATION_SUMMARY_MAX_MESSAGES_PER_RUN,
+            max_summary_tokens=settings.CONVERSATION_SUMMARY_MAX_TOKENS,
+            generation_scheduler=generation_scheduler,
+        )
+
+    # Runs the per-bot summarization jobs; each job opens its own unit of work
+    conversation_summarizer = providers.Singleton(
+        create_conversation_summarizer,
+        settings=config.provided,
+        uow_factory=conversation_unit_of_work.provider,
+        available_generation_services=available_generation_services,
+        token_quota_service=token_quota_service,
+        generation_scheduler=generation_scheduler,
+    )
+
+    @staticmethod
+    def create_response_cache(settings: Settings) -> Optional[ResponseCache]:
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        return ResponseCache(
+            key_prefix=settings.RESPONSE_CACHE_KEY_PREFIX,
+            max_entries_per_bot=settings.RESPONSE_CACHE_MAX_ENTRIES_PER_BOT,
+            max_response_chars=settings.RESPONSE_CACHE_MAX_RESPONSE_CHARS,
+        )
+
+    # Entries live in Redis; bots opt in through response_cache_ttl_seconds
+    response_cache = providers.Singleton(create_response_cache, settings=config.provided)
+
+    response_cache_invalidation_handler = providers.Factory(
+        ResponseCacheInvalidationHandler,
+        _response_cache=response_cache,
+    )
+
     process_incoming_message_command_impl = providers.Factory(
         ProcessIncomingMessageCommandHandler,
         chat_uow=conversation_unit_of_work,
         bot_lookup_service=bot_lookup_service,
         available_generation_services=available_generation_services,
         _mediator=mediator,
+        response_coalescer=response_coalescer,
+        message_deduplicator=message_deduplicator,
+        token_quota_service=token_quota_service,
+        conversation_summarizer=conversation_summarizer,
+        response_cache=response_cache,
+        generation_scheduler=generation_scheduler,
+        overload_reply=config.provided.GENERATION_OVERLOAD_REPLY,
+        document_retrieval_service=document_retrieval_service,
+        knowledge_top_k=config.provided.KNOWLEDGE_TOP_K,
+        knowledge_max_chars=config.provided.KNOWLEDGE_MAX_CONTEXT_CHARS,
     )
 
 
@@ -79,3 +218,17 @@ class ConversationContainer(containers.DeclarativeContainer):
         _bot_access_service=bot_access_service,
         _mediator=mediator,
     )
+
+    get_ingestion_stats_query_handler = providers.Factory(
+        GetIngestionStatsQueryHandler,
+        _message_deduplicator=message_deduplicator,
+        _response_coalescer=response_coalescer,
+        _conversation_summarizer=conversation_summarizer,
+        _response_cache=response_cache,
+        _generation_scheduler=generation_scheduler,
+        _llm_endpoint_pool=llm_endpoint_pool,
+        _llm_generation_service=deepseek_generation_service,
+        _document_retrieval_service=document_retrieval_service,
+        _llm_http_client=llm_http_client,
+        _bot_lookup_cache=bot_lookup_cache,
+    )
@@ -3,7 +3,7 @@
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from src.core.models.base_entity import BaseEntity
@@ -29,10 +29,17 @@ class ConversationEntity(BaseEntity):
     participant: ParticipantInfo # VO for external user info
     bot_name: Optional[str] = None # Copied at creation? Or looked up?
     crm_catalog_id: Optional[int] = None
+    # Rolling summary of the messages up to summarized_until/summarized_until_uid;
+    # loaded messages start after that position
+    summary: Optional[str] = None
+    summarized_until: Optional[datetime] = None
+    summarized_until_uid: Optional[uuid.UUID] = None
 
     # --- Contained Entities ---
     # Use private attribute and provide controlled access methods
     _messages: List[MessageEntity]
+    # True when only the most recent window of messages was loaded
+    history_truncated: bool = False
 
     # --- Constructor ---
     def __init__(
@@ -46,9 +53,15 @@ class ConversationEntity(BaseEntity):
         updated_at: Optional[datetime] = None, # For BaseEntity
         bot_name: Optional[str] = None,
         crm_catalog_id: Optional[int] = None,
-        initial_messages: Optional[List[MessageEntity]] = None
+        initial_messages: Optional[List[MessageEntity]] = None,
+        history_truncated: bool = False,
+        summary: Optional[str] = None,
+        summarized_until: Optional[datetime] = None,
+        summarized_until_uid: Optional[uuid.UUID] = None
     ):
-        super().__init__(uid=uid)
+        # Keep persisted timestamps; fresh entities get the TimestampMixin defaults
+        timestamps = {k: v for k, v in (("created_at", created_at), ("updated_at", updated_at)) if v is not None}
+        super().__init__(uid=uid, **timestamps)
 
         if not owner_uid: raise ValueError("owner_uid cannot be empty.")
         if not bot_uid: raise ValueError("bot_uid cannot be empty.")
@@ -62,7 +75,11 @@ class ConversationEntity(BaseEntity):
         self.bot_name = bot_name
         self.crm_catalog_id = crm_catalog_id
         self._messages = sorted(initial_messages or [], key=lambda m: m.timestamp) # Keep sorted
-        logger.debug(f"ConversationEntity initialized (UID: {self.uid}) with {len(self._messages)} initial messages.")
+        self.history_truncated = history_truncated
+        self.summary = summary
+        self.summarized_until = summarized_until
+        self.summarized_until_uid = summarized_until_uid
+        logger.debug(f"ConversationEntity initialized (UID: {self.uid}) with {len(self._messages)} initial messages (truncated={history_truncated}).")
 
     # --- Properties / Accessors ---
     @property
@@ -88,6 +105,31 @@ class ConversationEntity(BaseEntity):
         self._messages.sort(key=lambda m: m.timestamp)
         self.update_timestamp() # Update conversation timestamp
 
+    def prompt_history(self, token_budget: Optional[int] = None) -> List[MessageEntity]:
+        """
+        Returns the loaded messages that fit into the token budget, newest first
+        when trimming. The latest message is always kept so the prompt is never empty.
+        """
+        if token_budget is None or not self._messages:
+            return list(self._messages)
+
+        window: List[MessageEntity] = []
+        used = 0
+        for message in reversed(self._messages):
+            used += message.estimated_tokens
+            if window and used > token_budget:
+                break
+            window.append(message)
+        window.reverse()
+        return window
+
+    @property
+    def summary_cursor(self) -> Optional[Tuple[datetime, uuid.UUID]]:
+        """(timestamp, uid) of the last message folded into the summary, if any."""
+        if self.summarized_until is None or self.summarized_until_uid is None:
+            return None
+        return self.summarized_until, self.summarized_until_uid
+
     def get_last_message(self) -> Optional[MessageEntity]:
         """Returns the most recent message, if any."""
         return self._messages[-1] if self._messages else None
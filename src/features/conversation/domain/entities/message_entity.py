@@ -9,6 +9,9 @@ from datetime import datetime, timezone
 from src.core.models.base_entity import BaseEntity # Adjust import path
 from src.features.conversation.domain.enums import MessageRole
 
+# Rough chars-per-token ratio used for prompt budgeting (no tokenizer dependency).
+# Keep in sync with the SQL estimate in ConversationRepositoryImpl.
+CHARS_PER_TOKEN = 4
 
 class MessageEntity(BaseEntity):
     """
@@ -21,6 +24,8 @@ class MessageEntity(BaseEntity):
     # Optional: Track token usage per message
     tokens_user: Optional[int] = 0
     tokens_ai: Optional[int] = 0
+    # Id of the message on the messenger platform, unique within a conversation
+    external_id: Optional[str] = None
     # Or use TokenUsage VO: token_usage: TokenUsage
 
     def __init__(
@@ -32,7 +37,8 @@ class MessageEntity(BaseEntity):
         created_at: Optional[datetime] = None, # For BaseEntity
         updated_at: Optional[datetime] = None, # For BaseEntity
         tokens_user: int = 0,
-        tokens_ai: int = 0
+        tokens_ai: int = 0,
+        external_id: Optional[str] = None,
         # token_usage: Optional[TokenUsage] = None # If using VO
     ):
         super().__init__(uid=uid)
@@ -45,6 +51,12 @@ class MessageEntity(BaseEntity):
         self.timestamp = timestamp or datetime.now(timezone.utc) # Ensure timezone aware
         self.tokens_user = tokens_user
         self.tokens_ai = tokens_ai
+        self.external_id = external_id
         # self.token_usage = token_usage or TokenUsage() # If using VO
 
+    @property
+    def estimated_tokens(self) -> int:
+        """Cheap token estimate of the content, used for history budgeting."""
+        return len(self.content) // CHARS_PER_TOKEN + 1
+
     # Add methods if needed (e.g., validation on content)
\ No newline at end of file
@@ -1,5 +1,29 @@
-
-
 # Define ConversationProcessingError if not already defined
 class ConversationProcessingError(RuntimeError): # Or inherit from AppException
-    pass
\ No newline at end of file
+    pass
+
+
+class DuplicateMessageError(ConversationProcessingError):
+    """A message with the same platform message id is already stored in the conversation."""
+
+    def __init__(self, conversation_uid, external_id: str):
+        super().__init__(f"Message {external_id} already stored in conversation {conversation_uid}")
+        self.conversation_uid = conversation_uid
+        self.external_id = external_id
+
+
+class TokenQuotaExhaustedError(ConversationProcessingError):
+    """The bot has no tokens left, so no reply is generated."""
+
+    def __init__(self, bot_uid):
+        super().__init__(f"Bot {bot_uid} has no tokens left")
+        self.bot_uid = bot_uid
+
+
+class ReplyInterruptedError(ConversationProcessingError):
+    """A streamed reply broke off before its final chunk; the text sent so far is not stored."""
+
+    def __init__(self, bot_uid, streamed_chars: int):
+        super().__init__(f"Reply stream of bot {bot_uid} broke off after {streamed_chars} characters")
+        self.bot_uid = bot_uid
+        self.streamed_chars = streamed_chars
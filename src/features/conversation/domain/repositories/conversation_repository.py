@@ -1,7 +1,8 @@
 # src/features/chat/domain/repositories/conversation_repository.py
 
 from abc import abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 # Import domain entity and related types
@@ -64,6 +65,21 @@ class IConversationRepository(BaseRepository[ConversationEntity]):
         """Finds conversations for specific bots filtered by platform."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_inbox_page(
+        self,
+        bot_uids: List[UUID],
+        limit: int,
+        platform: Optional[ChatPlatform] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        ) -> List[ConversationEntity]:
+        """
+        Returns up to `limit` conversations of the given bots, most recently updated
+        first, each carrying only its latest message. `after` is the (updated_at, uid)
+        of the last row of the previous page.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def find_single_by_bot_uid_and_platform(
         self,
@@ -78,8 +94,51 @@ class IConversationRepository(BaseRepository[ConversationEntity]):
             self,
             platform: str,
             sender_id: str,
-            bot_uid: UUID) -> Optional[
+            bot_uid: UUID,
+            history_limit: Optional[int] = None,
+            history_token_budget: Optional[int] = None) -> Optional[
         ConversationEntity]:
+        """
+        Finds the conversation of a sender with a bot.
+        With no history limits the full message list is loaded; otherwise only the
+        most recent messages within `history_limit` / `history_token_budget`.
+        """
+        raise NotImplementedError
+
+    async def find_uid_by_platform_and_sender_id(
+            self,
+            platform: str,
+            sender_id: str,
+            bot_uid: UUID) -> Optional[UUID]:
+        """Finds the uid of a sender's conversation with a bot without loading the conversation."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_summary(
+            self,
+            uid: UUID,
+            summary: str,
+            summarized_until: Tuple[datetime, UUID],
+            expected_cursor: Optional[Tuple[datetime, UUID]]) -> bool:
+        """
+        Stores a new rolling summary covering messages up to `summarized_until`,
+        unless the stored cursor has moved away from `expected_cursor` meanwhile.
+        Returns whether it was stored.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_conversation(
+            self,
+            entity: ConversationEntity,
+            history_limit: Optional[int] = None,
+            history_token_budget: Optional[int] = None) -> ConversationEntity:
+        """
+        Get-or-create of the conversation of `entity`'s sender with its bot, safe
+        against concurrent first messages and without locking an existing row. An
+        existing conversation is returned with its history loaded as in
+        `find_by_platform_and_sender_id`.
+        """
         raise NotImplementedError
 
 
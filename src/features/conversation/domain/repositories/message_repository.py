@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from src.features.conversation.domain.entities.message_entity import MessageEntity  # Adjust import path
@@ -25,4 +26,40 @@ class IMessageRepository(ABC):
         """Finds all messages associated with a given conversation UID."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_latest_by_conversation_uid(
+            self,
+            conversation_uid: UUID,
+            limit: int = 10,
+            before: Optional[Tuple[datetime, UUID]] = None,
+            after: Optional[Tuple[datetime, UUID]] = None) -> List[MessageEntity]:
+        """
+        Finds up to `limit` messages in chronological order: the latest ones, or
+        those strictly before/after a (timestamp, uid) position.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_between(
+            self,
+            conversation_uid: UUID,
+            before: Tuple[datetime, UUID],
+            after: Optional[Tuple[datetime, UUID]] = None,
+            limit: int = 100) -> List[MessageEntity]:
+        """
+        Finds the oldest `limit` messages strictly between two (timestamp, uid)
+        positions, in chronological order; without `after` from the first message.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_by_external_id(self, conversation_uid: UUID, external_id: str) -> Optional[MessageEntity]:
+        """Finds the message stored for a platform message id within a conversation."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def find_reply(self, conversation_uid: UUID, message: MessageEntity) -> Optional[MessageEntity]:
+        """Finds the first assistant message that follows `message` in its conversation."""
+        raise NotImplementedError
+
     # Add other methods as needed (e.g., delete)
\ No newline at end of file
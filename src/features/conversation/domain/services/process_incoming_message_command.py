@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
 from uuid import UUID
 
 from src.core.base.command import BaseCommand
@@ -13,4 +14,14 @@ class ProcessIncomingMessageCommand(BaseCommand):
     content: str
     timestamp: datetime
     sender_number: str
-    sender_nickname: str
\ No newline at end of file
+    sender_nickname: str
+    # When set, the response is generated with stream_response and every text
+    # delta is passed here as it arrives; the full message is still persisted once.
+    on_response_chunk: Optional[Callable[[str], Awaitable[None]]] = None
+    # When set and the bot has a coalescing window, the command returns once the
+    # user message is stored and the reply (a ProcessIncomingMessageResponseDTO)
+    # is delivered here after the window closes, covering every message of the burst.
+    on_deferred_response: Optional[Callable[[Any], Awaitable[None]]] = None
+    # Id of the message on the messenger platform. When given, a redelivery of the
+    # same message is not processed again: the earlier reply is returned instead.
+    external_message_id: Optional[str] = None
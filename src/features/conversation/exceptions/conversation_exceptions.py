@@ -8,4 +8,9 @@ class ConversationNotFoundError(AppException):
 class BotAccessDeniedError(AppException): # You might already have this in bot_exceptions.py
     message = "Not authorized to access the bot associated with this conversation."
     status_code = 403
-    error_code = "bot_access_denied"
\ No newline at end of file
+    error_code = "bot_access_denied"
+
+class InvalidCursorError(AppException):
+    message = "Invalid pagination cursor."
+    status_code = 400
+    error_code = "invalid_cursor"
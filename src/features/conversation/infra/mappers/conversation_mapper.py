@@ -4,6 +4,8 @@ from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from typing import Optional, Type, List
 
+from sqlalchemy import inspect
+
 # Import domain/infra classes
 from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
 from src.features.conversation.domain.entities.message_entity import MessageEntity
@@ -30,8 +32,17 @@ class ConversationMapper:
         self._message_mapper = MessageMapper(MessageEntity, MessageORM)
         logger.debug(f"ConversationMapper initialized for {entity_cls.__name__} and {orm_cls.__name__}")
 
-    def to_entity(self, orm_obj: ConversationORM) -> Optional[ConversationEntity]:
-        """Maps ORM object to Domain Entity."""
+    def to_entity(
+        self,
+        orm_obj: ConversationORM,
+        messages: Optional[List[MessageORM]] = None,
+        history_truncated: bool = False,
+    ) -> Optional[ConversationEntity]:
+        """
+        Maps ORM object to Domain Entity.
+        `messages` overrides the relationship (e.g. a windowed tail); otherwise the
+        relationship is used only if it was loaded, never triggering a lazy load.
+        """
         if not orm_obj: return None
         logger.debug(f"Mapping ConversationORM (UID: {orm_obj.uid}) to Entity.")
         try:
@@ -41,7 +52,9 @@ class ConversationMapper:
                 sender_nickname=orm_obj.sender_nickname
             )
             # Map messages using MessageMapper
-            message_entities = [self._message_mapper.to_entity(msg_orm) for msg_orm in orm_obj.messages if msg_orm]
+            if messages is None:
+                messages = [] if "messages" in inspect(orm_obj).unloaded else orm_obj.messages
+            message_entities = [self._message_mapper.to_entity(msg_orm) for msg_orm in messages if msg_orm]
 
             entity = self.entity_cls(
                 uid=orm_obj.uid,
@@ -53,7 +66,11 @@ class ConversationMapper:
                 participant=participant_info,
                 bot_name=orm_obj.bot_name,
                 crm_catalog_id=orm_obj.crm_catalog_id,
-                initial_messages=message_entities # Pass mapped messages
+                initial_messages=message_entities, # Pass mapped messages
+                history_truncated=history_truncated,
+                summary=orm_obj.summary,
+                summarized_until=orm_obj.summarized_until,
+                summarized_until_uid=orm_obj.summarized_until_uid
             )
             return entity
         except Exception as e:
@@ -77,6 +94,9 @@ class ConversationMapper:
                 "sender_nickname": entity.participant.sender_nickname,
                 "bot_name": entity.bot_name,
                 "crm_catalog_id": entity.crm_catalog_id,
+                "summary": entity.summary,
+                "summarized_until": entity.summarized_until,
+                "summarized_until_uid": entity.summarized_until_uid,
                 # Messages are usually handled via relationship, not direct mapping here
             }
             orm_instance = self.orm_cls(**orm_data)
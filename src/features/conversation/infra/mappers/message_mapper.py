@@ -37,7 +37,8 @@ class MessageMapper:
                 content=orm_obj.content,
                 timestamp=orm_obj.timestamp,
                 tokens_user=orm_obj.tokens_user or 0,
-                tokens_ai=orm_obj.tokens_ai or 0
+                tokens_ai=orm_obj.tokens_ai or 0,
+                external_id=orm_obj.external_id,
             )
             return entity
         except Exception as e:
@@ -59,6 +60,7 @@ class MessageMapper:
                 "timestamp": entity.timestamp,
                 "tokens_user": entity.tokens_user,
                 "tokens_ai": entity.tokens_ai,
+                "external_id": entity.external_id,
             }
             orm_instance = self.orm_cls(**orm_data)
             return orm_instance
@@ -5,7 +5,7 @@ import uuid
 from typing import List, TYPE_CHECKING
 from datetime import datetime
 
-from sqlalchemy import String, Text, Float, ForeignKey, Integer, Boolean, DateTime, func
+from sqlalchemy import String, Text, Float, ForeignKey, Integer, Boolean, DateTime, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,6 +20,12 @@ if TYPE_CHECKING:
 class ConversationORM(SQLAlchemyBase):
     """ORM Model for Conversations."""
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Keyset pagination of the inbox: newest activity first, uid breaks ties
+        Index("ix_conversations_bot_uid_updated_at_uid", "bot_uid", text("updated_at DESC"), text("uid DESC")),
+        # One conversation per sender and bot; the conflict target of upsert_conversation
+        Index("uq_conversations_bot_uid_platform_sender_id", "bot_uid", "platform", "sender_id", unique=True),
+    )
 
     # Foreign keys using internal UUIDs
     owner_uid: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.uid"), nullable=False, index=True)
@@ -36,13 +42,20 @@ class ConversationORM(SQLAlchemyBase):
     bot_name: Mapped[str | None] = mapped_column(String, nullable=True) # Denormalized?
     crm_catalog_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Rolling summary of every message up to and including (summarized_until, summarized_until_uid)
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summarized_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    summarized_until_uid: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
     # Relationship to messages
     messages: Mapped[List["MessageORM"]] = relationship(
         "src.features.conversation.infra.persistence.models.message.MessageORM", # Use full path
         back_populates="conversation",
 
         cascade="all, delete-orphan",
-        lazy="selectin", # Or another strategy
+        # Not eager: full history is requested explicitly via selectinload(),
+        # the message hot path loads a bounded window instead.
+        lazy="select",
         order_by="MessageORM.timestamp" # Keep messages ordered
     )
 
@@ -6,10 +6,10 @@ import uuid
 from typing import TYPE_CHECKING
 from datetime import datetime
 
-from sqlalchemy import String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func # For server_default timestamp
+from sqlalchemy.sql import func, text # For server_default timestamp
 
 from src.infra.persistence.models.sqlalchemy_base import SQLAlchemyBase # Adjust import path
 
@@ -19,6 +19,12 @@ if TYPE_CHECKING:
 class MessageORM(SQLAlchemyBase):
     """ORM Model for Messages."""
     __tablename__ = "messages"
+    __table_args__ = (
+        # Serves "latest N messages of a conversation" without sorting the whole history
+        Index("ix_messages_conversation_uid_timestamp_desc", "conversation_uid", text("timestamp DESC")),
+        # A platform message is stored once per conversation, however often it is delivered
+        UniqueConstraint("conversation_uid", "external_id", name="uq_messages_conversation_uid_external_id"),
+    )
 
     # Foreign key to Conversation ORM using internal UID
     conversation_uid: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("conversations.uid"), nullable=False, index=True)
@@ -29,6 +35,8 @@ class MessageORM(SQLAlchemyBase):
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True) # Use timezone-aware timestamp, default in DB
     tokens_user: Mapped[int | None] = mapped_column(Integer, default=0, nullable=True)
     tokens_ai: Mapped[int | None] = mapped_column(Integer, default=0, nullable=True)
+    # Platform message id of inbound messages; NULL for replies and playground messages
+    external_id: Mapped[str | None] = mapped_column(String, nullable=True)
 
     # Relationship back to conversation
     conversation: Mapped["ConversationORM"] = relationship(
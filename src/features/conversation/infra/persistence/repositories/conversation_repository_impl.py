@@ -2,21 +2,28 @@
 
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import func, true, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload  # Use selectinload for async relationships
+from sqlalchemy.orm import aliased, selectinload  # Use selectinload for async relationships
 
 from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.entities.message_entity import CHARS_PER_TOKEN
 from src.features.conversation.domain.enums import ChatPlatform
 # Import domain interface and entity
 from src.features.conversation.domain.repositories.conversation_repository import IConversationRepository
+from src.features.conversation.domain.value_objects.participant_info import ParticipantInfo
 from src.features.conversation.infra.mappers.conversation_mapper import ConversationMapper  # Assuming this exists
 # Import infrastructure components
 from src.features.conversation.infra.persistence.models.conversation import ConversationORM
+from src.features.conversation.infra.persistence.models.message import MessageORM
+from src.infra.persistence.returning import column_values, insert_returning, update_returning
 
 # Import custom exceptions if needed
 # from src.features.chat.domain.exceptions.chat_exceptions import ConversationNotFoundError, ConversationCreationError
@@ -43,15 +50,12 @@ class ConversationRepositoryImpl(IConversationRepository):
         if not orm_obj:
              raise ValueError("Failed to map ConversationEntity to ORM object.")
 
-        logger.debug(f"Adding Conversation ORM object to session (UID: {entity.uid})")
-        self._session.add(orm_obj)
+        logger.debug(f"Inserting Conversation (UID: {entity.uid})")
         try:
-            await self._session.flush()
-            # Refresh to get DB defaults like created_at/updated_at
-            await self._session.refresh(orm_obj)
-            logger.info(f"Successfully flushed creation for Conversation UID: {orm_obj.uid}")
-            # Map back the refreshed state, including potentially loaded messages if needed
-            # The mapper should handle mapping messages if the relationship loaded them
+            # RETURNING brings back DB defaults like created_at/updated_at in the same round trip
+            orm_obj = await insert_returning(self._session, orm_obj)
+            logger.info(f"Successfully created Conversation UID: {orm_obj.uid}")
+            # A new conversation has no stored messages; the mapper leaves the unloaded relationship alone
             return self._mapper.to_entity(orm_obj)
         except IntegrityError as e:
             logger.error(f"IntegrityError creating Conversation (UID: {entity.uid}): {e}", exc_info=True)
@@ -65,43 +69,64 @@ class ConversationRepositoryImpl(IConversationRepository):
     async def update(self, entity: ConversationEntity) -> ConversationEntity:
         """Updates an existing conversation."""
         logger.debug(f"Attempting to update Conversation with UID: {entity.uid}")
-        existing_orm = await self._session.get(ConversationORM, entity.uid)
-        if not existing_orm:
-            logger.warning(f"Conversation not found for update with UID: {entity.uid}")
-            raise ValueError(f"Conversation with UID {entity.uid} not found.") # Or ConversationNotFoundError
-
-        # Update attributes - be careful about what should be updatable
-        updated = False
-        if existing_orm.crm_catalog_id != entity.crm_catalog_id:
-             existing_orm.crm_catalog_id = entity.crm_catalog_id
-             updated = True
+        # Targeted UPDATE of the mutable columns, no read of the row first.
+        # Messages are persisted through the message repository, not here.
+        values = {
+            "crm_catalog_id": entity.crm_catalog_id,
+            "bot_name": entity.bot_name,
+            "sender_number": entity.participant.sender_number,
+            "sender_nickname": entity.participant.sender_nickname,
+        }
+        if entity.updated_at:
+            values["updated_at"] = entity.updated_at
 
-        if hasattr(entity, 'updated_at') and entity.updated_at:
-            existing_orm.updated_at = entity.updated_at
-            updated = True
-
-            # Update bot_name if it changed
-        if hasattr(existing_orm, 'bot_name') and existing_orm.bot_name != entity.bot_name:
-            existing_orm.bot_name = entity.bot_name
-            updated = True
-        # Add other updatable fields (e.g., bot_name if it can change)
-
-        # Note: Updating messages typically happens via adding/removing MessageEntities
-        # and relying on the ORM relationship cascade/management, not directly here.
+        try:
+            updated_orm = await update_returning(self._session, ConversationORM, entity.uid, values)
+        except Exception as e:
+            logger.error(f"Error during Conversation update (UID: {entity.uid}): {e}", exc_info=True)
+            await self._session.rollback()
+            raise
 
-        if not updated:
-             logger.debug(f"No updatable changes detected for conversation UID {entity.uid}.")
-             return entity # Return original if no changes
+        if not updated_orm:
+            logger.warning(f"Conversation not found for update with UID: {entity.uid}")
+            raise ValueError(f"Conversation with UID {entity.uid} not found.") # Or ConversationNotFoundError
+        logger.info(f"Successfully updated Conversation UID: {updated_orm.uid}")
+        return self._mapper.to_entity(updated_orm)
 
+    async def save_summary(
+            self,
+            uid: UUID,
+            summary: str,
+            summarized_until: Tuple[datetime, UUID],
+            expected_cursor: Optional[Tuple[datetime, UUID]]) -> bool:
+        """
+        Compare-and-set of the rolling summary: applied only while the stored cursor
+        still equals `expected_cursor`, so two summarizers cannot fold the same
+        messages twice. updated_at is kept, a summary is not inbox activity.
+        """
+        expected_until, expected_uid = expected_cursor or (None, None)
+        stmt = (
+            update(ConversationORM)
+            .where(
+                ConversationORM.uid == uid,
+                ConversationORM.summarized_until.is_not_distinct_from(expected_until),
+                ConversationORM.summarized_until_uid.is_not_distinct_from(expected_uid),
+            )
+            .values(
+                summary=summary,
+                summarized_until=summarized_until[0],
+                summarized_until_uid=summarized_until[1],
+                updated_at=ConversationORM.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
         try:
-            await self._session.flush()
-            await self._session.refresh(existing_orm)
-            logger.info(f"Successfully flushed update for Conversation UID: {existing_orm.uid}")
-            return self._mapper.to_entity(existing_orm)
+            result = await self._session.execute(stmt)
         except Exception as e:
-            logger.error(f"Error during Conversation update (UID: {entity.uid}): {e}", exc_info=True)
+            logger.error(f"Error saving summary of Conversation UID {uid}: {e}", exc_info=True)
             await self._session.rollback()
             raise
+        return result.rowcount == 1
 
     async def delete_by_uid(self, uid: UUID) -> None:
         """Deletes a conversation by its unique identifier."""
@@ -193,6 +218,48 @@ class ConversationRepositoryImpl(IConversationRepository):
             logger.error(f"Error finding conversations by bot UIDs and platform: {e}", exc_info=True)
             return []
 
+    async def find_inbox_page(
+        self,
+        bot_uids: List[UUID],
+        limit: int,
+        platform: Optional[ChatPlatform] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        ) -> List[ConversationEntity]:
+        """
+        One page of the inbox in a single statement. The latest message comes from a
+        LATERAL subquery (one index probe on ix_messages_conversation_uid_timestamp_desc
+        per row); the page itself is a keyset scan on (updated_at, uid), served by
+        ix_conversations_bot_uid_updated_at_uid, so deep pages cost the same as the first.
+        """
+        if not bot_uids: return []
+        latest = (
+            select(MessageORM)
+            .where(MessageORM.conversation_uid == ConversationORM.uid)
+            .order_by(MessageORM.timestamp.desc(), MessageORM.uid.desc())
+            .limit(1)
+            .lateral("last_message")
+        )
+        last_message = aliased(MessageORM, latest)
+        statement = (
+            select(ConversationORM, last_message)
+            .outerjoin(last_message, true())
+            .where(ConversationORM.bot_uid.in_(bot_uids))
+            .order_by(ConversationORM.updated_at.desc(), ConversationORM.uid.desc())
+            .limit(limit)
+        )
+        if platform is not None:
+            statement = statement.where(ConversationORM.platform == platform.value)
+        if after is not None:
+            statement = statement.where(tuple_(ConversationORM.updated_at, ConversationORM.uid) < tuple_(*after))
+
+        result = await self._session.execute(statement)
+        entities = [
+            self._mapper.to_entity(conversation, messages=[message] if message else [], history_truncated=True)
+            for conversation, message in result.all()
+        ]
+        logger.debug(f"Inbox page: {len(entities)} conversations for {len(bot_uids)} bot UIDs (after={after}).")
+        return entities
+
     async def find_single_by_bot_uid_and_platform(
         self,
         bot_uid: UUID,
@@ -221,19 +288,168 @@ class ConversationRepositoryImpl(IConversationRepository):
             logger.error(f"Error finding single conversation (Bot={bot_uid}, Platform='{platform_value}'): {e}", exc_info=True)
             return None
 
-    async def find_by_platform_and_sender_id(self, platform: str, sender_id: str, bot_uid: UUID) -> Optional[
-        ConversationEntity]:
-        """Finds a conversation by platform, sender_id and bot_uid, loading messages."""
+    async def find_by_platform_and_sender_id(
+            self,
+            platform: str,
+            sender_id: str,
+            bot_uid: UUID,
+            history_limit: Optional[int] = None,
+            history_token_budget: Optional[int] = None) -> Optional[ConversationEntity]:
+        """
+        Finds a conversation by platform, sender_id and bot_uid.
+        Without limits all messages are loaded; with a history window only the tail
+        is fetched (served by ix_messages_conversation_uid_timestamp_desc).
+        """
+        windowed = history_limit is not None or history_token_budget is not None
         stmt = (
             select(ConversationORM)
-            .options(selectinload(ConversationORM.messages))  # Eagerly load messages
             .where(
                 ConversationORM.platform == platform,
                 ConversationORM.sender_id == sender_id,  # Access sender_id via participant
                 ConversationORM.bot_uid == bot_uid
             )
         )
+        if not windowed:
+            stmt = stmt.options(selectinload(ConversationORM.messages))  # Eagerly load messages
         result = await self._session.execute(stmt)
         orm_obj = result.scalar_one_or_none()  # Use scalar_one_or_none
-        return self._mapper.to_entity(orm_obj) if orm_obj else None
+        if not orm_obj:
+            return None
+        if not windowed:
+            return self._mapper.to_entity(orm_obj)
+
+        window = await self._find_message_window(
+            orm_obj.uid, history_limit, history_token_budget, after=self._summary_cursor(orm_obj)
+        )
+        logger.debug(f"Loaded {len(window)} windowed messages for conversation {orm_obj.uid} "
+                     f"(limit={history_limit}, token_budget={history_token_budget})")
+        return self._mapper.to_entity(orm_obj, messages=window, history_truncated=True)
+
+    async def find_uid_by_platform_and_sender_id(
+            self,
+            platform: str,
+            sender_id: str,
+            bot_uid: UUID) -> Optional[UUID]:
+        """Finds the uid of a conversation by platform, sender_id and bot_uid; no messages are read."""
+        result = await self._session.execute(
+            select(ConversationORM.uid).where(
+                ConversationORM.platform == platform,
+                ConversationORM.sender_id == sender_id,
+                ConversationORM.bot_uid == bot_uid,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def upsert_conversation(
+            self,
+            entity: ConversationEntity,
+            history_limit: Optional[int] = None,
+            history_token_budget: Optional[int] = None) -> ConversationEntity:
+        """
+        SELECT, and only when nothing is found INSERT … ON CONFLICT DO NOTHING
+        RETURNING, falling back to the SELECT when a concurrent first message won.
+        No statement here takes a row lock on an existing conversation, so the
+        caller's transaction can stay open across a reply generation without
+        serializing the sender's other messages behind it.
+
+        Newer sender contact details and bot name are put on the returned entity;
+        `update` writes them together with the conversation's other changes.
+        """
+        orm_obj = self._mapper.from_entity(entity)
+        if not orm_obj:
+            raise ValueError("Failed to map ConversationEntity to ORM object.")
+
+        windowed = history_limit is not None or history_token_budget is not None
+        existing = await self._find_orm_by_sender(entity)
+        if existing is None:
+            stmt = pg_insert(ConversationORM).values(**column_values(orm_obj)).on_conflict_do_nothing(
+                index_elements=[ConversationORM.bot_uid, ConversationORM.platform, ConversationORM.sender_id],
+            ).returning(ConversationORM)
+            try:
+                created = (await self._session.execute(stmt)).scalar_one_or_none()
+            except IntegrityError as e:
+                logger.error(f"IntegrityError upserting Conversation (bot {entity.bot_uid}, sender {entity.participant.sender_id}): {e}", exc_info=True)
+                await self._session.rollback()
+                raise
+            if created is not None:
+                logger.info(f"Created new conversation with UID: {created.uid}")
+                return self._mapper.to_entity(created, messages=[], history_truncated=windowed)
+            # Inserted by a concurrent first message of the same sender since our SELECT
+            existing = await self._find_orm_by_sender(entity)
 
+        # Without limits the "window" is the whole history after the rolling summary
+        window = await self._find_message_window(
+            existing.uid, history_limit, history_token_budget, after=self._summary_cursor(existing)
+        )
+        conversation = self._mapper.to_entity(existing, messages=window, history_truncated=windowed)
+        conversation.participant = ParticipantInfo(
+            sender_id=conversation.participant.sender_id,
+            sender_number=entity.participant.sender_number or conversation.participant.sender_number,
+            sender_nickname=entity.participant.sender_nickname or conversation.participant.sender_nickname,
+        )
+        conversation.bot_name = entity.bot_name or conversation.bot_name
+        return conversation
+
+    async def _find_orm_by_sender(self, entity: ConversationEntity) -> Optional[ConversationORM]:
+        result = await self._session.execute(
+            select(ConversationORM).where(
+                ConversationORM.bot_uid == entity.bot_uid,
+                ConversationORM.platform == entity.platform.value,
+                ConversationORM.sender_id == entity.participant.sender_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def _summary_cursor(orm_obj: ConversationORM) -> Optional[Tuple[datetime, UUID]]:
+        if orm_obj.summarized_until is None or orm_obj.summarized_until_uid is None:
+            return None
+        return orm_obj.summarized_until, orm_obj.summarized_until_uid
+
+    async def _find_message_window(
+            self,
+            conversation_uid: UUID,
+            limit: Optional[int],
+            token_budget: Optional[int],
+            after: Optional[Tuple[datetime, UUID]] = None) -> List[MessageORM]:
+        """
+        Fetches the newest messages of a conversation, returned in chronological order.
+        `after` excludes everything up to that (timestamp, uid), i.e. what the rolling
+        summary already covers.
+        """
+        newest_first = (MessageORM.timestamp.desc(), MessageORM.uid.desc())
+        in_window = [MessageORM.conversation_uid == conversation_uid]
+        if after is not None:
+            in_window.append(tuple_(MessageORM.timestamp, MessageORM.uid) > tuple_(*after))
+        if token_budget is not None:
+            # Every message costs at least one token, so the budget also bounds the row count
+            limit = token_budget if limit is None else min(limit, token_budget)
+
+        if token_budget is None:
+            stmt = (
+                select(MessageORM)
+                .where(*in_window)
+                .order_by(*newest_first)
+                .limit(limit)
+            )
+        else:
+            # Same estimate as MessageEntity.estimated_tokens, accumulated newest-first
+            running_tokens = func.sum(
+                func.length(MessageORM.content) // CHARS_PER_TOKEN + 1
+            ).over(order_by=newest_first)
+            tail = (
+                select(MessageORM.uid.label("uid"), running_tokens.label("running_tokens"))
+                .where(*in_window)
+                .order_by(*newest_first)
+                .limit(limit)
+                .subquery()
+            )
+            stmt = (
+                select(MessageORM)
+                .join(tail, MessageORM.uid == tail.c.uid)
+                .where(tail.c.running_tokens <= token_budget)
+                .order_by(*newest_first)
+            )
+
+        result = await self._session.execute(stmt)
+        return list(reversed(result.scalars().all()))
@@ -2,17 +2,22 @@
 
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from src.features.conversation.domain.entities.message_entity import MessageEntity
+from src.features.conversation.domain.enums import MessageRole
+from src.features.conversation.domain.exceptions.chat_exceptions import DuplicateMessageError
 from src.features.conversation.domain.repositories.message_repository import IMessageRepository
 from src.features.conversation.infra.persistence.models.message import MessageORM
 from src.features.conversation.infra.mappers.message_mapper import MessageMapper
+from src.infra.persistence.returning import insert_returning, update_returning
 
 
 
@@ -20,6 +25,8 @@ from src.features.conversation.infra.mappers.message_mapper import MessageMapper
 class MessageRepositoryImpl(IMessageRepository):
     """Concrete implementation of the IMessageRepository using SQLAlchemy."""
 
+    EXTERNAL_ID_CONSTRAINT = "uq_messages_conversation_uid_external_id"
+
     def __init__(self, session: AsyncSession, mapper: MessageMapper):
         self._session = session
         self._mapper = mapper
@@ -36,15 +43,16 @@ class MessageRepositoryImpl(IMessageRepository):
         # Associate with the conversation
         orm_obj.conversation_uid = conversation_uid
 
-        self._session.add(orm_obj)
         try:
-            await self._session.flush()
-            await self._session.refresh(orm_obj)
+            orm_obj = await insert_returning(self._session, orm_obj)
             logger.info(f"Successfully created message {orm_obj.uid} for conversation {conversation_uid}")
             return self._mapper.to_entity(orm_obj)
         except IntegrityError as e:
-            logger.error(f"IntegrityError creating message {entity.uid}: {e}", exc_info=True)
             await self._session.rollback()
+            if entity.external_id is not None and self.EXTERNAL_ID_CONSTRAINT in str(e.orig):
+                logger.info(f"Message {entity.external_id} is already stored in conversation {conversation_uid}")
+                raise DuplicateMessageError(conversation_uid, entity.external_id) from e
+            logger.error(f"IntegrityError creating message {entity.uid}: {e}", exc_info=True)
             raise
         except Exception as e:
             logger.error(f"Error creating message {entity.uid}: {e}", exc_info=True)
@@ -55,37 +63,23 @@ class MessageRepositoryImpl(IMessageRepository):
         """Updates an existing Message record."""
         logger.debug(f"Updating message {entity.uid}")
 
-        existing_orm = await self._session.get(MessageORM, entity.uid)
-        if not existing_orm:
-            logger.warning(f"Message not found for update with UID: {entity.uid}")
-            raise ValueError(f"Message with UID {entity.uid} not found.")
-
-        # Update attributes - be careful about what should be updatable
-        updated = False
-        if existing_orm.role != entity.role.value:  # Assuming role is stored as string in DB
-            existing_orm.role = entity.role.value
-            updated = True
-        if existing_orm.content != entity.content:
-            existing_orm.content = entity.content
-            updated = True
-        if existing_orm.timestamp != entity.timestamp:
-            existing_orm.timestamp = entity.timestamp
-            updated = True
-
-        if not updated:
-            logger.debug(f"No updatable changes detected for message UID {entity.uid}.")
-            return entity
-
         try:
-            await self._session.flush()
-            await self._session.refresh(existing_orm)
-            logger.info(f"Successfully updated message {existing_orm.uid}")
-            return self._mapper.to_entity(existing_orm)
+            updated_orm = await update_returning(self._session, MessageORM, entity.uid, {
+                "role": entity.role.value,
+                "content": entity.content,
+                "timestamp": entity.timestamp,
+            })
         except Exception as e:
             logger.error(f"Error updating message {entity.uid}: {e}", exc_info=True)
             await self._session.rollback()
             raise
 
+        if not updated_orm:
+            logger.warning(f"Message not found for update with UID: {entity.uid}")
+            raise ValueError(f"Message with UID {entity.uid} not found.")
+        logger.info(f"Successfully updated message {updated_orm.uid}")
+        return self._mapper.to_entity(updated_orm)
+
     async def get(self, uid: UUID) -> Optional[MessageEntity]:
         """Retrieves a Message by its UID."""
         logger.debug(f"Finding message by UID: {uid}")
@@ -138,24 +132,85 @@ class MessageRepositoryImpl(IMessageRepository):
             logger.error(f"Error finding messages for conversation {conversation_uid}: {e}", exc_info=True)
             return []
 
-    async def find_latest_by_conversation_uid(self, conversation_uid: UUID, limit: int = 10) -> List[MessageEntity]:
-        """Finds the latest N messages for a conversation."""
-        logger.debug(f"Finding latest {limit} messages for conversation UID: {conversation_uid}")
+    async def find_latest_by_conversation_uid(
+            self,
+            conversation_uid: UUID,
+            limit: int = 10,
+            before: Optional[Tuple[datetime, UUID]] = None,
+            after: Optional[Tuple[datetime, UUID]] = None) -> List[MessageEntity]:
+        """
+        Finds up to `limit` messages of a conversation, returned in chronological order.
+        Without a cursor these are the latest ones; `before` pages back to older
+        messages and `after` forward to newer ones, both keyed on (timestamp, uid)
+        and served by ix_messages_conversation_uid_timestamp_desc.
+        """
+        if before is not None and after is not None:
+            raise ValueError("Only one of 'before' and 'after' can be given.")
+        logger.debug(f"Finding {limit} messages for conversation UID: {conversation_uid} "
+                     f"(before={before}, after={after})")
+
+        position = tuple_(MessageORM.timestamp, MessageORM.uid)
+        stmt = select(MessageORM).where(MessageORM.conversation_uid == conversation_uid).limit(limit)
+        if after is not None:
+            stmt = stmt.where(position > tuple_(*after)).order_by(MessageORM.timestamp, MessageORM.uid)
+        else:
+            stmt = stmt.order_by(MessageORM.timestamp.desc(), MessageORM.uid.desc())
+            if before is not None:
+                stmt = stmt.where(position < tuple_(*before))
 
         try:
-            stmt = (
-                select(MessageORM)
-                .where(MessageORM.conversation_uid == conversation_uid)
-                .order_by(MessageORM.timestamp.desc())
-                .limit(limit)
-            )
             result = await self._session.execute(stmt)
             orm_objects = result.scalars().all()
 
-            # Reverse to get chronological order
-            entities = [self._mapper.to_entity(orm) for orm in reversed(orm_objects)]
-            logger.debug(f"Found {len(entities)} latest messages for conversation {conversation_uid}")
+            # Newest-first pages are reversed to get chronological order
+            if after is None:
+                orm_objects = list(reversed(orm_objects))
+            entities = [self._mapper.to_entity(orm) for orm in orm_objects]
+            logger.debug(f"Found {len(entities)} messages for conversation {conversation_uid}")
             return entities
         except Exception as e:
             logger.error(f"Error finding latest messages for conversation {conversation_uid}: {e}", exc_info=True)
-            return []
\ No newline at end of file
+            return []
+
+    async def find_between(
+            self,
+            conversation_uid: UUID,
+            before: Tuple[datetime, UUID],
+            after: Optional[Tuple[datetime, UUID]] = None,
+            limit: int = 100) -> List[MessageEntity]:
+        """Oldest-first slice of a conversation between two (timestamp, uid) positions."""
+        position = tuple_(MessageORM.timestamp, MessageORM.uid)
+        stmt = (
+            select(MessageORM)
+            .where(MessageORM.conversation_uid == conversation_uid, position < tuple_(*before))
+            .order_by(MessageORM.timestamp, MessageORM.uid)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(position > tuple_(*after))
+        result = await self._session.execute(stmt)
+        return [self._mapper.to_entity(orm) for orm in result.scalars().all()]
+
+    async def find_by_external_id(self, conversation_uid: UUID, external_id: str) -> Optional[MessageEntity]:
+        """Finds the message stored for a platform message id (uq_messages_conversation_uid_external_id)."""
+        stmt = select(MessageORM).where(
+            MessageORM.conversation_uid == conversation_uid,
+            MessageORM.external_id == external_id,
+        )
+        result = await self._session.execute(stmt)
+        return self._mapper.to_entity(result.scalar_one_or_none())
+
+    async def find_reply(self, conversation_uid: UUID, message: MessageEntity) -> Optional[MessageEntity]:
+        """Finds the first assistant message after `message`, ordered by (timestamp, uid)."""
+        stmt = (
+            select(MessageORM)
+            .where(
+                MessageORM.conversation_uid == conversation_uid,
+                MessageORM.role == MessageRole.ASSISTANT.value,
+                tuple_(MessageORM.timestamp, MessageORM.uid) > tuple_(message.timestamp, message.uid),
+            )
+            .order_by(MessageORM.timestamp, MessageORM.uid)
+            .limit(1)
+        )
+        result = await self._session.execute(stmt)
+        return self._mapper.to_entity(result.scalar_one_or_none())
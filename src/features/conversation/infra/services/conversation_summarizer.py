@@ -0,0 +1,216 @@
+# src/features/conversation/infra/services/conversation_summarizer.py
+
+import asyncio
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional
+from uuid import UUID
+
+from src.features.bot.application.services.token_quota_service import TokenQuotaService
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.conversation.domain.entities.message_entity import CHARS_PER_TOKEN, MessageEntity
+from src.features.conversation.domain.uow.chat_unit_of_work import ConversationUnitOfWork
+from src.features.generation.application.services.generation_scheduler import (
+    GenerationOverloadedError,
+    GenerationPriority,
+    GenerationScheduler,
+)
+from src.features.generation.application.services.generation_service import IGenerationService, TokenUsage
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain the running summary of a chat between a user and an assistant. "
+    "Rewrite the current summary so that it also covers the new messages. Keep names, "
+    "facts, numbers, decisions, open questions and the user's preferences; drop greetings "
+    "and small talk. Reply with the summary text only."
+)
+
+
+class ConversationSummarizer:
+    """
+    Folds the older part of long conversations into a stored rolling summary.
+
+    Once `summarize_after_messages` messages follow the summary, a background job
+    takes everything but the newest half and asks the bot's generation service to
+    merge it into the existing summary. Only the previous summary and the newly
+    folded messages are sent, never the full history, and the result is stored with
+    a compare-and-set on the summary cursor so concurrent jobs cannot fold a message
+    twice. The prompt then carries the summary instead of those messages.
+
+    One job runs per conversation at a time; a request while it runs is dropped,
+    the next message asks again. Jobs queue for the LLM in the scheduler's
+    background class, behind every reply; a shed job is simply retried later.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], ConversationUnitOfWork],
+        available_generation_services: Dict[str, IGenerationService],
+        token_quota_service: Optional[TokenQuotaService] = None,
+        max_messages_per_run: int = 200,
+        max_summary_tokens: int = 400,
+        generation_scheduler: Optional[GenerationScheduler] = None,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._generation_services = available_generation_services
+        self._token_quota_service = token_quota_service
+        self._max_messages_per_run = max_messages_per_run
+        self._max_summary_tokens = max_summary_tokens
+        self._generation_scheduler = generation_scheduler
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+
+        self.requested = 0
+        self.skipped_running = 0
+        self.summaries = 0
+        self.conflicts = 0
+        self.failed = 0
+        self.shed = 0
+        self.folded_messages = 0
+        # Estimated prompt tokens the folded messages would have cost every later prompt,
+        # and what the summaries added in their place
+        self.folded_tokens = 0
+        self.summary_tokens_added = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "running": len(self._tasks),
+            "requested": self.requested,
+            "skipped_running": self.skipped_running,
+            "summaries": self.summaries,
+            "conflicts": self.conflicts,
+            "failed": self.failed,
+            "shed": self.shed,
+            "folded_messages": self.folded_messages,
+            "prompt_tokens_saved": self.folded_tokens - self.summary_tokens_added,
+        }
+
+    def request(self, conversation_uid: UUID, bot: BotEntity) -> None:
+        self.requested += 1
+        running = self._tasks.get(conversation_uid)
+        if running is not None and not running.done():
+            self.skipped_running += 1
+            return
+        self._tasks[conversation_uid] = asyncio.create_task(self._run(conversation_uid, bot))
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self, conversation_uid: UUID, bot: BotEntity) -> None:
+        task = asyncio.current_task()
+        try:
+            await self.summarize(conversation_uid, bot)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"ConversationSummarizer: summarizing {conversation_uid} failed: {e}", exc_info=True)
+        finally:
+            if self._tasks.get(conversation_uid) is task:
+                del self._tasks[conversation_uid]
+
+    async def summarize(self, conversation_uid: UUID, bot: BotEntity) -> bool:
+        """One folding step; True when a new summary was stored."""
+        threshold = bot.ai_settings.summarize_after_messages
+        if not threshold:
+            return False
+        keep = threshold // 2
+
+        uow = self._uow_factory()
+        async with uow:
+            conversation = await uow.conversation_repository.find_by_uid(conversation_uid)
+            if conversation is None:
+                return False
+            recent = await uow.message_repository.find_latest_by_conversation_uid(conversation_uid, limit=keep)
+            if len(recent) < keep:
+                return False
+            cursor = conversation.summary_cursor
+            folded = await uow.message_repository.find_between(
+                conversation_uid,
+                before=(recent[0].timestamp, recent[0].uid),
+                after=cursor,
+                limit=self._max_messages_per_run,
+            )
+        if len(folded) < threshold - keep:
+            return False
+
+        # The database session is not held while the model works
+        summary = await self._generate(bot, conversation.summary, folded)
+        if not summary:
+            return False
+
+        last = folded[-1]
+        async with uow:
+            stored = await uow.conversation_repository.save_summary(
+                conversation_uid, summary, (last.timestamp, last.uid), cursor
+            )
+        if not stored:
+            self.conflicts += 1
+            logger.info(f"ConversationSummarizer: summary of {conversation_uid} moved on meanwhile, dropped")
+            return False
+
+        self.summaries += 1
+        self.folded_messages += len(folded)
+        self.folded_tokens += sum(message.estimated_tokens for message in folded)
+        self.summary_tokens_added += self._estimate(summary) - self._estimate(conversation.summary)
+        logger.info(f"ConversationSummarizer: folded {len(folded)} messages of conversation {conversation_uid}")
+        return True
+
+    async def _generate(self, bot: BotEntity, previous: Optional[str], folded: List[MessageEntity]) -> Optional[str]:
+        generation_service = self._generation_services.get(bot.ai_settings.generation_model)
+        if generation_service is None:
+            raise LookupError(f"Generation service for '{bot.ai_settings.generation_model}' not available")
+
+        transcript = "\n".join(f"{message.role.value}: {message.content}" for message in folded)
+        prompt = f"Current summary:\n{previous or '(none yet)'}\n\nNew messages:\n{transcript}"
+        slot = (
+            self._generation_scheduler.slot(bot.uid, bot.user_uid, GenerationPriority.BACKGROUND)
+            if self._generation_scheduler is not None else nullcontext()
+        )
+        try:
+            async with slot:
+                summary = await self._call_model(generation_service, bot, prompt)
+        except GenerationOverloadedError:
+            self.shed += 1
+            logger.info(f"ConversationSummarizer: no generation capacity for bot {bot.uid}, summary postponed")
+            return None
+        if summary is None:
+            return None
+        summary = summary.strip()
+        if not summary:
+            self.failed += 1
+            logger.warning(f"ConversationSummarizer: the model returned an empty summary for bot {bot.uid}")
+        return summary or None
+
+    async def _call_model(self, generation_service: IGenerationService, bot: BotEntity, prompt: str) -> Optional[str]:
+        """The model's answer ("" when empty), paid from the bot's tokens; None when none are left."""
+        usage = TokenUsage()
+        reservation = None
+        if self._token_quota_service is not None:
+            estimate = len(SUMMARY_INSTRUCTIONS) // CHARS_PER_TOKEN + self._estimate(prompt) + self._max_summary_tokens
+            reservation = await self._token_quota_service.reserve(bot.uid, bot.quota.tokens_left, estimate)
+            if reservation is None:
+                logger.info(f"ConversationSummarizer: bot {bot.uid} has no tokens left, summary postponed")
+                return None
+        try:
+            summary = await generation_service.generate_response(
+                prompt_messages=[{"role": "user", "content": prompt}],
+                system_prompt=SUMMARY_INSTRUCTIONS,
+                config=replace(bot.ai_settings, max_response=self._max_summary_tokens),
+                quota=bot.quota,
+                last_user_message=prompt,
+                usage=usage,
+            )
+        finally:
+            if reservation is not None:
+                await self._token_quota_service.settle(reservation, usage.total_tokens)
+        return summary or ""
+
+    @staticmethod
+    def _estimate(text: Optional[str]) -> int:
+        return len(text) // CHARS_PER_TOKEN + 1 if text else 0
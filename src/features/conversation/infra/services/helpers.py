@@ -36,42 +36,37 @@ async def _get_or_create_conversation(
     bot_name: Optional[str], # Changed from str to Optional[str]
     sender_number: Optional[str],
     sender_nickname: Optional[str],
+    history_limit: Optional[int] = None,
+    history_token_budget: Optional[int] = None,
 ) -> ConversationEntity:
     """
     Helper function to get an existing conversation or create a new one.
-    Assumes messages are loaded by the repository method if the conversation exists.
+    Only the history window described by `history_limit` / `history_token_budget`
+    is loaded for an existing conversation (full history when both are None).
+    The repository upserts on (bot_uid, platform, sender_id), so concurrent first
+    messages from one sender end up in the same conversation; an existing row is
+    not locked, so the caller may keep its transaction open while generating.
     """
-    # This method should use the repository to find based on a unique key.
-    # Example: platform, sender_id, bot_uid, owner_uid (or a subset that defines uniqueness)
-    # The repository method find_by_platform_sender_bot_owner should handle loading messages.
-    conversation = await chat_uow.conversation_repository.find_by_platform_and_sender_id( # Example method name
-        platform=platform,
+    participant_info = ParticipantInfo(
         sender_id=sender_id,
-        bot_uid=bot_uid
+        sender_number=sender_number,
+        sender_nickname=sender_nickname,
     )
-
-    if not conversation:
-        logger.info(f"No existing conversation found for bot {bot_uid}, sender {sender_id}, platform {platform.value}. Creating new.")
-        participant_info = ParticipantInfo(
-            sender_id=sender_id,
-            sender_number=sender_number,
-            sender_nickname=sender_nickname,
-        )
-        conversation = ConversationEntity(
-            owner_uid=conversation_owner_uid,
-            bot_uid=bot_uid,
-            platform=platform,
-            participant=participant_info,
-            bot_name=bot_name, # Pass bot_name
-            initial_messages=[] # New conversation starts with no messages
-        )
-        # Persist the new conversation
-        conversation = await chat_uow.conversation_repository.create(conversation)
-        logger.info(f"Created new conversation with UID: {conversation.uid}")
-    else:
-        logger.info(f"Found existing conversation: {conversation.uid} with {len(conversation.messages)} messages.")
-        # Messages should already be loaded by the repository call above
-        # No need to re-add them here.
+    conversation = ConversationEntity(
+        owner_uid=conversation_owner_uid,
+        bot_uid=bot_uid,
+        platform=platform,
+        participant=participant_info,
+        bot_name=bot_name, # Pass bot_name
+        initial_messages=[] # New conversation starts with no messages
+    )
+    conversation = await chat_uow.conversation_repository.upsert_conversation(
+        conversation,
+        history_limit=history_limit,
+        history_token_budget=history_token_budget,
+    )
+    logger.info(f"Using conversation {conversation.uid} for bot {bot_uid}, sender {sender_id}, platform {platform.value} "
+                f"with {len(conversation.messages)} loaded messages{' (windowed)' if conversation.history_truncated else ''}.")
 
     return conversation
 
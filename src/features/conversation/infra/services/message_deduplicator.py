@@ -0,0 +1,103 @@
+# src/features/conversation/infra/services/message_deduplicator.py
+
+import json
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+class MessageDeduplicator:
+    """
+    Fast path for recognising redelivered platform messages.
+
+    The first delivery of a (platform, bot, sender, message id) claims a Redis
+    key with SET NX EX; once the reply is known it is stored under the same key,
+    so a redelivery inside the TTL is answered from Redis alone. The unique
+    constraint on messages (conversation_uid, external_id) stays the source of
+    truth for redeliveries after the TTL or while Redis is unavailable, which is
+    why a failing Redis lets the message through instead of rejecting it.
+    """
+
+    PENDING = "pending"
+
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,
+        key_prefix: str = "message_dedup:",
+        redis: Optional[Any] = None,
+    ) -> None:
+        if redis is None:
+            from src.infra.services.redis.redis_client import redis_client
+            redis = redis_client
+        self._redis = redis
+        self._ttl_seconds = ttl_seconds
+        self._key_prefix = key_prefix
+
+        self.checked = 0
+        self.claimed = 0
+        self.redis_hits = 0
+        self.db_hits = 0
+        self.released = 0
+        self.redis_errors = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "checked": self.checked,
+            "claimed": self.claimed,
+            "redis_hits": self.redis_hits,
+            "db_hits": self.db_hits,
+            "released": self.released,
+            "redis_errors": self.redis_errors,
+        }
+
+    def key(self, platform: str, bot_uid: UUID, sender_id: str, external_id: str) -> str:
+        return f"{self._key_prefix}{platform}:{bot_uid}:{sender_id}:{external_id}"
+
+    async def claim(self, key: str) -> bool:
+        """True for the first delivery of a message (or when Redis cannot tell), False for a redelivery."""
+        self.checked += 1
+        try:
+            claimed = await self._redis.set(key, self.PENDING, nx=True, ex=self._ttl_seconds)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"MessageDeduplicator: Redis claim failed for {key}, relying on the database: {e}")
+            return True
+        if claimed:
+            self.claimed += 1
+            return True
+        self.redis_hits += 1
+        return False
+
+    async def cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """The reply remembered for a claimed message; None while it is still pending."""
+        try:
+            raw = await self._redis.get(key)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"MessageDeduplicator: Redis lookup failed for {key}: {e}")
+            return None
+        if not raw or raw in (self.PENDING, self.PENDING.encode()):
+            return None
+        return json.loads(raw)
+
+    async def remember(self, key: str, response: Dict[str, Any]) -> None:
+        try:
+            await self._redis.set(key, json.dumps(response, default=str), xx=True, ex=self._ttl_seconds)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"MessageDeduplicator: Failed to store the reply for {key}: {e}")
+
+    async def release(self, key: str) -> None:
+        """Drops a claim whose processing failed, so a redelivery is processed again."""
+        try:
+            await self._redis.delete(key)
+            self.released += 1
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"MessageDeduplicator: Failed to release {key}: {e}")
+
+    def record_db_hit(self) -> None:
+        self.db_hits += 1
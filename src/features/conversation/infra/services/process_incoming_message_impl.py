@@ -2,25 +2,45 @@
 
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
+import asyncio
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Dict, Optional
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from src.core.base.command import BaseCommandHandler
 from src.core.mediator.mediator import Mediator
 from src.features.conversation.api.v1.dtos.process_incoming_message_dto import ProcessIncomingMessageResponseDTO
 from src.features.bot.domain.entities.bot_entity import BotEntity
 from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
-from src.features.conversation.domain.entities.message_entity import MessageEntity
-from src.features.conversation.domain.enums import MessageRole
+from src.features.conversation.domain.entities.message_entity import CHARS_PER_TOKEN, MessageEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
 from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
 from src.features.conversation.domain.uow.chat_unit_of_work import ConversationUnitOfWork
-from src.features.generation.application.services.generation_service import IGenerationService
+from src.features.generation.application.services.generation_scheduler import (
+    GenerationOverloadedError,
+    GenerationPriority,
+    GenerationScheduler,
+)
+from src.features.generation.application.services.generation_service import IGenerationService, TokenUsage
+from src.features.bot.application.services.document_retrieval_service import DocumentRetrievalService
+from src.features.bot.application.services.token_quota_service import TokenQuotaService
 from src.features.bot.exceptions.bot_exceptions import BotNotFoundError
-from src.features.conversation.domain.exceptions.chat_exceptions import ConversationProcessingError
+from src.features.conversation.domain.exceptions.chat_exceptions import (
+    ConversationProcessingError,
+    DuplicateMessageError,
+    ReplyInterruptedError,
+    TokenQuotaExhaustedError,
+)
 from src.features.conversation.infra.services.helpers import _get_or_create_conversation
 from src.features.conversation.domain.services.bot_lookup_service import BotLookupService
+from src.features.conversation.infra.services.message_deduplicator import MessageDeduplicator
+from src.features.conversation.infra.services.conversation_summarizer import ConversationSummarizer
+from src.features.conversation.infra.services.response_cache import ResponseCache
+from src.features.conversation.infra.services.response_coalescer import ResponseCoalescer
 
 
 
@@ -34,6 +54,18 @@ class ProcessIncomingMessageCommandHandler(
     bot_lookup_service: BotLookupService
     available_generation_services: Dict[str, IGenerationService]
     _mediator: Mediator
+    response_coalescer: Optional[ResponseCoalescer] = None
+    message_deduplicator: Optional[MessageDeduplicator] = None
+    token_quota_service: Optional[TokenQuotaService] = None
+    conversation_summarizer: Optional[ConversationSummarizer] = None
+    response_cache: Optional[ResponseCache] = None
+    generation_scheduler: Optional[GenerationScheduler] = None
+    document_retrieval_service: Optional[DocumentRetrievalService] = None
+    # Passages of the bot's documents added to the system prompt, and their total length
+    knowledge_top_k: int = 4
+    knowledge_max_chars: int = 4000
+    # Sent instead of a reply when the scheduler sheds the generation
+    overload_reply: str = "We are receiving a lot of messages right now. Please try again in a minute."
 
     async def __call__(
         self, command: ProcessIncomingMessageCommand
@@ -47,16 +79,29 @@ class ProcessIncomingMessageCommandHandler(
         ai_message_entity: Optional[MessageEntity] = None
         ai_response_generated = False
         ai_response_content: Optional[str] = None
+        dedup_key = self._dedup_key(command)
+        claimed_key: Optional[str] = None
 
         try:
             bot = await self.bot_lookup_service.get_bot(command.bot_uid)
             logger.debug(f"Found bot details: Name='{bot.name}', Owner='{bot.user_uid}'")
             conversation_owner_uid = bot.user_uid
 
+            if dedup_key is not None:
+                if not await self.message_deduplicator.claim(dedup_key):
+                    logger.info(f"Message {command.external_message_id} from {command.sender_id} was already received")
+                    cached = await self.message_deduplicator.cached_response(dedup_key)
+                    if cached is not None:
+                        return ProcessIncomingMessageResponseDTO.model_validate({**cached, "duplicate": True})
+                    return await self._previous_response(command)
+                claimed_key = dedup_key
+
             async with self.chat_uow:
                 conversation = await _get_or_create_conversation(
                     self.chat_uow, command.platform, command.sender_id, command.bot_uid,
-                    conversation_owner_uid, bot.name, command.sender_number, command.sender_nickname
+                    conversation_owner_uid, bot.name, command.sender_number, command.sender_nickname,
+                    history_limit=bot.ai_settings.history_window_messages,
+                    history_token_budget=bot.ai_settings.history_token_budget,
                 )
 
                 # Create and persist user message
@@ -64,7 +109,8 @@ class ProcessIncomingMessageCommandHandler(
                     uid=uuid4(),
                     role=MessageRole.USER,
                     content=command.content,
-                    timestamp=command.timestamp
+                    timestamp=command.timestamp,
+                    external_id=command.external_message_id,
                 )
 
                 # Add message to conversation entity (for in-memory state)
@@ -81,26 +127,42 @@ class ProcessIncomingMessageCommandHandler(
                     should_generate_response = False
                 logger.debug(f"Should generate AI response: {should_generate_response}")
 
-                if should_generate_response:
-                    model_type_key = getattr(bot.ai_settings, 'generation_model', 'stub')
-                    generation_service = self.available_generation_services.get(model_type_key)
+                if should_generate_response and self._should_coalesce(command, bot):
+                    await self.chat_uow.conversation_repository.update(conversation)
+                    # Any reply still pending or being generated for this conversation is superseded
+                    self.response_coalescer.schedule(
+                        conversation.uid,
+                        bot.ai_settings.coalesce_window_ms / 1000,
+                        partial(self._deferred_reply, command, bot, user_message_entity.uid),
+                    )
+                    logger.debug(f"Reply for conversation {conversation.uid} deferred by "
+                                 f"{bot.ai_settings.coalesce_window_ms} ms")
+                    return ProcessIncomingMessageResponseDTO(
+                        conversation_uid=conversation.uid,
+                        user_message_uid=user_message_entity.uid,
+                        response_deferred=True,
+                        message="Reply scheduled.",
+                    )
 
-                    if not generation_service:
-                        msg = f"Generation service for '{model_type_key}' not available for bot {bot.uid}."
-                        logger.error(msg)
-                        raise ConversationProcessingError(msg)
+                if should_generate_response:
+                    generation_service = self._generation_service_for(bot)
 
-                    message_history = [{"role": msg.role.value, "content": msg.content} for msg in conversation.messages]
+                    history = conversation.prompt_history(token_budget=bot.ai_settings.history_token_budget)
+                    message_history = [{"role": msg.role.value, "content": msg.content} for msg in history]
 
                     logger.debug(f"Calling generation service {generation_service.__class__.__name__} for conversation {conversation.uid}")
-                    ai_response_content = await generation_service.generate_response(
-                        prompt_messages=message_history,
-                        system_prompt=bot.ai_settings.instructions,
-                        config=bot.ai_settings,
-                        quota=bot.quota,
-                        last_user_message=user_message_entity.content
-                    )
-                    logger.debug(f"Generation service returned: '{ai_response_content[:50]}...'")
+                    try:
+                        ai_response_content, usage = await self._generate(
+                            generation_service, command, bot, message_history, user_message_entity.content,
+                            system_prompt=self._system_prompt(bot, conversation),
+                            summarized=bool(conversation.summary),
+                            stream=command.on_response_chunk is not None,
+                        )
+                    except (TokenQuotaExhaustedError, GenerationOverloadedError, ReplyInterruptedError) as e:
+                        logger.warning(f"No reply in conversation {conversation.uid}: {e}")
+                        await self.chat_uow.conversation_repository.update(conversation)
+                        return self._no_reply(conversation.uid, user_message_entity.uid, e)
+                    logger.debug(f"Generation service returned: '{(ai_response_content or '')[:50]}...'")
 
                     if ai_response_content:
                         ai_response_generated = True
@@ -109,6 +171,9 @@ class ProcessIncomingMessageCommandHandler(
                             role=MessageRole.ASSISTANT,
                             content=ai_response_content,
                             timestamp=datetime.now(timezone.utc),
+                            # Usage of the call that produced this reply: prompt and completion
+                            tokens_user=usage.prompt_tokens,
+                            tokens_ai=usage.completion_tokens,
                         )
                         # Add AI message to conversation entity (for in-memory state)
                         conversation.add_message(ai_message_entity)
@@ -134,8 +199,9 @@ class ProcessIncomingMessageCommandHandler(
 
                 await self.chat_uow.conversation_repository.update(conversation)
                 logger.info(f"Conversation {conversation.uid} updated with new messages.")
+            self._request_summary(conversation, bot)
 
-            return ProcessIncomingMessageResponseDTO(
+            response = ProcessIncomingMessageResponseDTO(
                 conversation_uid=conversation.uid,
                 user_message_uid=user_message_entity.uid,
                 ai_response_generated=ai_response_generated,
@@ -143,13 +209,352 @@ class ProcessIncomingMessageCommandHandler(
                 ai_response_content=ai_message_entity.content if ai_message_entity else None,
                 message="Message processed successfully."
             )
+            if claimed_key is not None:
+                await self.message_deduplicator.remember(claimed_key, response.model_dump(mode="json"))
+            return response
 
+        except DuplicateMessageError as e:
+            # Redis did not know the message (expired or unavailable); the unique constraint did
+            logger.info(f"Processing skipped: {e}")
+            if self.message_deduplicator is not None:
+                self.message_deduplicator.record_db_hit()
+            return await self._previous_response(command, e.conversation_uid)
         except BotNotFoundError as e:
             logger.error(f"Processing failed: Bot not found - {e}")
+            await self._release_claim(claimed_key)
             raise
         except ConversationProcessingError as e:
             logger.error(f"Processing failed: {e}")
+            await self._release_claim(claimed_key)
             raise
         except Exception as e:
             logger.error(f"Unhandled error processing incoming message: {e}", exc_info=True)
+            await self._release_claim(claimed_key)
             raise ConversationProcessingError(f"An unexpected error occurred: {e}") from e
+
+    def _dedup_key(self, command: ProcessIncomingMessageCommand) -> Optional[str]:
+        if self.message_deduplicator is None or not command.external_message_id:
+            return None
+        return self.message_deduplicator.key(
+            command.platform.value, command.bot_uid, command.sender_id, command.external_message_id
+        )
+
+    async def _release_claim(self, claimed_key: Optional[str]) -> None:
+        if claimed_key is not None:
+            await self.message_deduplicator.release(claimed_key)
+
+    async def _previous_response(
+        self, command: ProcessIncomingMessageCommand, conversation_uid: Optional[UUID] = None
+    ) -> ProcessIncomingMessageResponseDTO:
+        """
+        What the first delivery of the message produced, read back from the
+        database; the generation service is not called again.
+        """
+        user_message: Optional[MessageEntity] = None
+        ai_message: Optional[MessageEntity] = None
+        async with self.chat_uow:
+            if conversation_uid is None:
+                conversation_uid = await self.chat_uow.conversation_repository.find_uid_by_platform_and_sender_id(
+                    platform=command.platform, sender_id=command.sender_id, bot_uid=command.bot_uid,
+                )
+            if conversation_uid is not None:
+                user_message = await self.chat_uow.message_repository.find_by_external_id(
+                    conversation_uid, command.external_message_id
+                )
+            if user_message is not None:
+                ai_message = await self.chat_uow.message_repository.find_reply(conversation_uid, user_message)
+
+        return ProcessIncomingMessageResponseDTO(
+            conversation_uid=conversation_uid,
+            user_message_uid=user_message.uid if user_message else None,
+            ai_response_generated=ai_message is not None,
+            ai_message_uid=ai_message.uid if ai_message else None,
+            ai_response_content=ai_message.content if ai_message else None,
+            message="Message already processed." if user_message else "Message is already being processed.",
+            duplicate=True,
+        )
+
+    def _should_coalesce(self, command: ProcessIncomingMessageCommand, bot: BotEntity) -> bool:
+        return (
+            self.response_coalescer is not None
+            and command.on_deferred_response is not None
+            and bool(bot.ai_settings.coalesce_window_ms)
+        )
+
+    @staticmethod
+    def _system_prompt(bot: BotEntity, conversation: ConversationEntity) -> Optional[str]:
+        """The bot's instructions, followed by the rolling summary of what the history window no longer holds."""
+        if not conversation.summary:
+            return bot.ai_settings.instructions
+        summary = f"Summary of the earlier conversation:\n{conversation.summary}"
+        return f"{bot.ai_settings.instructions}\n\n{summary}" if bot.ai_settings.instructions else summary
+
+    def _request_summary(self, conversation: ConversationEntity, bot: BotEntity) -> None:
+        """Hands the conversation to the background summarizer once its loaded window reaches the bot's threshold."""
+        threshold = bot.ai_settings.summarize_after_messages
+        if self.conversation_summarizer is not None and threshold and len(conversation.messages) >= threshold:
+            self.conversation_summarizer.request(conversation.uid, bot)
+
+    def _no_reply(
+        self, conversation_uid: UUID, user_message_uid: UUID, reason: Exception
+    ) -> ProcessIncomingMessageResponseDTO:
+        """
+        The response when no reply was stored: quota exhausted (silent), load shed
+        (fallback reply) or a stream that broke off half-way.
+        """
+        if isinstance(reason, TokenQuotaExhaustedError):
+            return ProcessIncomingMessageResponseDTO(
+                conversation_uid=conversation_uid,
+                user_message_uid=user_message_uid,
+                quota_exhausted=True,
+                message="Token quota exhausted.",
+            )
+        if isinstance(reason, ReplyInterruptedError):
+            return ProcessIncomingMessageResponseDTO(
+                conversation_uid=conversation_uid,
+                user_message_uid=user_message_uid,
+                reply_interrupted=True,
+                message="The reply was interrupted. Please send your message again.",
+            )
+        return ProcessIncomingMessageResponseDTO(
+            conversation_uid=conversation_uid,
+            user_message_uid=user_message_uid,
+            overloaded=True,
+            message=self.overload_reply,
+        )
+
+    def _generation_slot(self, command: ProcessIncomingMessageCommand, bot: BotEntity):
+        """Admission through the generation scheduler; playground tests queue behind production traffic."""
+        if self.generation_scheduler is None:
+            return nullcontext()
+        priority = (
+            GenerationPriority.PLAYGROUND if command.platform == ChatPlatform.PLAYGROUND
+            else GenerationPriority.PRODUCTION
+        )
+        return self.generation_scheduler.slot(bot.uid, bot.user_uid, priority)
+
+    def _generation_service_for(self, bot: BotEntity) -> IGenerationService:
+        model_type_key = getattr(bot.ai_settings, 'generation_model', 'stub')
+        generation_service = self.available_generation_services.get(model_type_key)
+        if not generation_service:
+            msg = f"Generation service for '{model_type_key}' not available for bot {bot.uid}."
+            logger.error(msg)
+            raise ConversationProcessingError(msg)
+        return generation_service
+
+    async def _deferred_reply(
+        self, command: ProcessIncomingMessageCommand, bot: BotEntity, user_message_uid: UUID
+    ) -> None:
+        """
+        Runs once the coalescing window has closed: one generation over the history,
+        which by now holds every message of the burst. Until the reply is generated
+        this can be cancelled by a newer message; storing and delivering it cannot.
+        """
+        async with self.chat_uow:
+            # Created together with the first message of the burst; only its history is needed now
+            conversation = await self.chat_uow.conversation_repository.find_by_platform_and_sender_id(
+                command.platform, command.sender_id, command.bot_uid,
+                history_limit=bot.ai_settings.history_window_messages,
+                history_token_budget=bot.ai_settings.history_token_budget,
+            )
+        if conversation is None:
+            raise ConversationProcessingError(
+                f"Conversation of sender {command.sender_id} with bot {bot.uid} is gone; no deferred reply"
+            )
+        history = conversation.prompt_history(token_budget=bot.ai_settings.history_token_budget)
+        burst: List[str] = []
+        for msg in reversed(history):
+            if msg.role != MessageRole.USER:
+                break
+            burst.insert(0, msg.content)
+        logger.debug(f"Generating one reply for {len(burst)} coalesced messages in conversation {conversation.uid}")
+
+        try:
+            ai_response_content, usage = await self._generate(
+                self._generation_service_for(bot), command, bot,
+                [{"role": msg.role.value, "content": msg.content} for msg in history],
+                "\n".join(burst) or command.content,
+                system_prompt=self._system_prompt(bot, conversation),
+                summarized=bool(conversation.summary),
+            )
+        except (TokenQuotaExhaustedError, GenerationOverloadedError) as e:
+            logger.warning(f"No reply in conversation {conversation.uid}: {e}")
+            await command.on_deferred_response(self._no_reply(conversation.uid, user_message_uid, e))
+            return
+        await asyncio.shield(
+            self._store_deferred_reply(command, bot, conversation, user_message_uid, ai_response_content, usage)
+        )
+
+    async def _store_deferred_reply(
+        self,
+        command: ProcessIncomingMessageCommand,
+        bot: BotEntity,
+        conversation: ConversationEntity,
+        user_message_uid: UUID,
+        ai_response_content: Optional[str],
+        usage: TokenUsage,
+    ) -> None:
+        ai_message_entity: Optional[MessageEntity] = None
+        if ai_response_content:
+            ai_message_entity = MessageEntity(
+                uid=uuid4(),
+                role=MessageRole.ASSISTANT,
+                content=ai_response_content,
+                timestamp=datetime.now(timezone.utc),
+                tokens_user=usage.prompt_tokens,
+                tokens_ai=usage.completion_tokens,
+            )
+            conversation.add_message(ai_message_entity)
+            async with self.chat_uow:
+                ai_message_entity = await self.chat_uow.message_repository.create(ai_message_entity, conversation.uid)
+                await self.chat_uow.conversation_repository.update(conversation)
+            self._request_summary(conversation, bot)
+        else:
+            logger.warning(f"Generation service returned empty content for conversation {conversation.uid}")
+
+        await command.on_deferred_response(ProcessIncomingMessageResponseDTO(
+            conversation_uid=conversation.uid,
+            user_message_uid=user_message_uid,
+            ai_response_generated=ai_message_entity is not None,
+            ai_message_uid=ai_message_entity.uid if ai_message_entity else None,
+            ai_response_content=ai_message_entity.content if ai_message_entity else None,
+            message="Message processed successfully.",
+        ))
+
+    async def _generate(
+        self,
+        generation_service: IGenerationService,
+        command: ProcessIncomingMessageCommand,
+        bot: BotEntity,
+        message_history: List[Dict[str, str]],
+        last_user_message: str,
+        system_prompt: Optional[str] = None,
+        summarized: bool = False,
+        stream: bool = False,
+    ) -> Tuple[Optional[str], TokenUsage]:
+        """
+        One generation paid from the bot's token balance: an estimate is reserved
+        before the LLM is called (TokenQuotaExhaustedError when nothing is left)
+        and settled against the reported usage afterwards, also when it fails. A
+        call cancelled before its usage came back (e.g. superseded by a newer
+        message, or a stream that broke off) is charged the estimate, as the
+        backend may have spent it.
+        For bots with a response cache a repeated question is answered from it
+        first, without a call and without charging tokens. Otherwise the call
+        waits for a scheduler slot first (GenerationOverloadedError when shed),
+        so nothing is reserved while it is queued. Passages of the bot's documents
+        that match the message are added to the system prompt. A generated reply
+        is cached only if the prompt holds nothing the cache key leaves out;
+        `summarized` tells that the system prompt carries the conversation summary.
+        """
+        usage = TokenUsage()
+        cache_lookup = None
+        if self.response_cache is not None and bot.ai_settings.response_cache_ttl_seconds:
+            cache_lookup = await self.response_cache.lookup(bot, message_history, last_user_message, summarized)
+            if cache_lookup is not None and cache_lookup.response is not None:
+                logger.debug(f"Reply for bot {bot.uid} served from the response cache")
+                if stream:
+                    await command.on_response_chunk(cache_lookup.response.content)
+                return cache_lookup.response.content, usage
+        system_prompt = await self._with_knowledge(bot, system_prompt, last_user_message)
+        async with self._generation_slot(command, bot):
+            reservation = None
+            if self.token_quota_service is not None:
+                reservation = await self.token_quota_service.reserve(
+                    bot.uid, bot.quota.tokens_left, self._estimate_tokens(bot, system_prompt, message_history)
+                )
+                if reservation is None:
+                    raise TokenQuotaExhaustedError(bot.uid)
+            interrupted = False
+            try:
+                if stream:
+                    content = await self._stream_response(
+                        generation_service, command, bot, message_history, last_user_message, usage, system_prompt
+                    )
+                else:
+                    content = await generation_service.generate_response(
+                        prompt_messages=message_history,
+                        system_prompt=system_prompt,
+                        config=bot.ai_settings,
+                        quota=bot.quota,
+                        last_user_message=last_user_message,
+                        usage=usage,
+                    )
+            except (asyncio.CancelledError, ReplyInterruptedError):
+                interrupted = True
+                raise
+            finally:
+                if reservation is not None:
+                    used_tokens = usage.total_tokens
+                    if interrupted and not used_tokens:
+                        # The request was already sent; refunding would let cut-off replies go unpaid
+                        used_tokens = reservation.tokens
+                    await self.token_quota_service.settle(reservation, used_tokens)
+        if cache_lookup is not None and content:
+            await self.response_cache.store(cache_lookup, content, usage, bot.ai_settings.response_cache_ttl_seconds)
+        return content, usage
+
+    async def _with_knowledge(self, bot: BotEntity, system_prompt: Optional[str], query: str) -> Optional[str]:
+        """The system prompt followed by the document passages most similar to the user's message, if any."""
+        if self.document_retrieval_service is None or self.knowledge_top_k <= 0:
+            return system_prompt
+        chunks = await self.document_retrieval_service.retrieve(bot.uid, query, self.knowledge_top_k)
+        excerpts: List[str] = []
+        budget = self.knowledge_max_chars
+        for number, chunk in enumerate(chunks, start=1):
+            excerpt = f"[{number}] ({chunk.filename}) {chunk.text}"
+            if len(excerpt) > budget:
+                break
+            excerpts.append(excerpt)
+            budget -= len(excerpt)
+        if not excerpts:
+            return system_prompt
+        logger.debug(f"Added {len(excerpts)} document passages to the prompt of bot {bot.uid}")
+        knowledge = "Relevant excerpts from the bot's documents:\n" + "\n\n".join(excerpts)
+        return f"{system_prompt}\n\n{knowledge}" if system_prompt else knowledge
+
+    @staticmethod
+    def _estimate_tokens(bot: BotEntity, system_prompt: Optional[str], message_history: List[Dict[str, str]]) -> int:
+        """Upper-bound guess of a call's usage: the prompt plus the longest allowed reply."""
+        prompt_chars = len(system_prompt or "") + sum(len(m["content"]) for m in message_history)
+        return prompt_chars // CHARS_PER_TOKEN + len(message_history) + (bot.ai_settings.max_response or 250)
+
+    async def _stream_response(
+        self,
+        generation_service: IGenerationService,
+        command: ProcessIncomingMessageCommand,
+        bot: BotEntity,
+        message_history: List[Dict[str, str]],
+        last_user_message: str,
+        usage: TokenUsage,
+        system_prompt: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Forwards each streamed delta to the command's callback and returns the
+        assembled text, which the caller persists as a single message. A stream
+        that ends without its done chunk (or with an interrupted one) after text
+        was sent raises ReplyInterruptedError, so the fragment is not stored as a reply.
+        """
+        parts: List[str] = []
+        finished = False
+        started = time.perf_counter()
+        async for chunk in generation_service.stream_response(
+            prompt_messages=message_history,
+            system_prompt=system_prompt,
+            config=bot.ai_settings,
+            quota=bot.quota,
+            last_user_message=last_user_message,
+        ):
+            if chunk.done or chunk.interrupted:
+                finished = chunk.done
+                usage.prompt_tokens, usage.completion_tokens = chunk.prompt_tokens, chunk.completion_tokens
+            if not chunk.content:
+                continue
+            if not parts:
+                logger.info(
+                    f"Time to first token for bot {bot.uid}: {(time.perf_counter() - started) * 1000:.0f} ms")
+            parts.append(chunk.content)
+            await command.on_response_chunk(chunk.content)
+        if parts and not finished:
+            raise ReplyInterruptedError(bot.uid, sum(len(part) for part in parts))
+        return "".join(parts).strip() or None
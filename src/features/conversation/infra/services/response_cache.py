@@ -0,0 +1,220 @@
+# src/features/conversation/infra/services/response_cache.py
+
+import hashlib
+import json
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.generation.application.services.generation_service import TokenUsage
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+# KEYS[1] config version; ARGV: entry key prefix, digest. Returns {version, entry or nil}.
+_LOOKUP_SCRIPT = """
+local version = redis.call('get', KEYS[1]) or '0'
+local entry = redis.call('get', ARGV[1] .. version .. ':' .. ARGV[2])
+return {version, entry or false}
+"""
+
+# KEYS[1] entry count of the version, KEYS[2] entry; ARGV: payload, ttl, max entries.
+# Returns 1 when stored, 0 when the entry exists already, -1 when the version is full.
+_STORE_SCRIPT = """
+if redis.call('exists', KEYS[2]) == 1 then
+    return 0
+end
+local count = redis.call('incr', KEYS[1])
+if count == 1 then
+    redis.call('expire', KEYS[1], ARGV[2])
+end
+if count > tonumber(ARGV[3]) then
+    return -1
+end
+redis.call('set', KEYS[2], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t.,!?;:…¿¡\"'`"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+@dataclass(frozen=True)
+class ResponseCacheLookup:
+    """Where a reply is (or would be) cached; `response` is set on a hit."""
+    bot_uid: UUID
+    version: str
+    digest: str
+    response: Optional[CachedResponse] = None
+    # False when the prompt holds context the digest does not cover (older history, a summary)
+    storable: bool = True
+
+
+class ResponseCache:
+    """
+    Replies of bots that opted in (response_cache_ttl_seconds), shared by all
+    workers through Redis.
+
+    An entry is keyed by the bot's config version, a fingerprint of its AI
+    settings and the normalized last user message, plus the last
+    `response_cache_history_messages` messages before it when the bot sets that.
+    A reply is only stored when that key covers its whole prompt: no rolling
+    summary and no more history than those messages, so a reply shaped by one
+    conversation is never served to another.
+    The config version is a per-bot counter bumped on every BotConfigChangedEvent
+    (settings, services, documents), so a change makes all earlier entries
+    unreachable at once; they then expire with their TTL. Each version stores at
+    most `max_entries_per_bot` entries per TTL window and replies longer than
+    `max_response_chars` are not stored. A failing Redis is a miss, never an error.
+    """
+
+    def __init__(
+        self,
+        key_prefix: str = "response_cache:",
+        max_entries_per_bot: int = 1000,
+        max_response_chars: int = 4000,
+        redis: Optional[Any] = None,
+    ) -> None:
+        if redis is None:
+            from src.infra.services.redis.redis_client import redis_client
+            redis = redis_client
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._max_entries_per_bot = max_entries_per_bot
+        self._max_response_chars = max_response_chars
+
+        self.lookups = 0
+        self.hits = 0
+        self.stored = 0
+        self.skipped_too_long = 0
+        self.skipped_full = 0
+        self.skipped_context = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.lookups - self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "stored": self.stored,
+            "skipped_too_long": self.skipped_too_long,
+            "skipped_full": self.skipped_full,
+            "skipped_context": self.skipped_context,
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors,
+            "saved_prompt_tokens": self.saved_prompt_tokens,
+            "saved_completion_tokens": self.saved_completion_tokens,
+        }
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Case, Unicode width, inner whitespace and surrounding punctuation do not change the question."""
+        text = unicodedata.normalize("NFKC", text).casefold()
+        return _WHITESPACE.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+    @classmethod
+    def digest(cls, bot: BotEntity, message_history: List[Dict[str, str]], last_user_message: str) -> str:
+        history_size = bot.ai_settings.response_cache_history_messages or 0
+        # message_history ends with the message being answered
+        context = message_history[:-1][-history_size:] if history_size else []
+        material = {
+            # A worker still holding the previous settings cannot share entries with the new ones
+            "settings": asdict(bot.ai_settings),
+            "context": [[m["role"], cls.normalize(m["content"])] for m in context],
+            "message": cls.normalize(last_user_message),
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _version_key(self, bot_uid: UUID) -> str:
+        return f"{self._key_prefix}{bot_uid}:version"
+
+    def _entry_prefix(self, bot_uid: UUID) -> str:
+        return f"{self._key_prefix}{bot_uid}:v"
+
+    async def lookup(
+        self,
+        bot: BotEntity,
+        message_history: List[Dict[str, str]],
+        last_user_message: str,
+        summarized: bool = False,
+    ) -> Optional[ResponseCacheLookup]:
+        """
+        The cache slot of this question; None when Redis cannot be reached (nothing
+        is stored then). `summarized` tells that the prompt also carries the
+        conversation's rolling summary.
+        """
+        self.lookups += 1
+        digest = self.digest(bot, message_history, last_user_message)
+        try:
+            version, raw = await self._redis.eval(
+                _LOOKUP_SCRIPT, 1, self._version_key(bot.uid), self._entry_prefix(bot.uid), digest
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"ResponseCache: Lookup failed for bot {bot.uid}: {e}")
+            return None
+        version = version.decode() if isinstance(version, bytes) else str(version)
+        response = CachedResponse(**json.loads(raw)) if raw else None
+        if response is not None:
+            self.hits += 1
+            self.saved_prompt_tokens += response.prompt_tokens
+            self.saved_completion_tokens += response.completion_tokens
+        # message_history ends with the message being answered
+        storable = not summarized and len(message_history) - 1 <= (bot.ai_settings.response_cache_history_messages or 0)
+        return ResponseCacheLookup(
+            bot_uid=bot.uid, version=version, digest=digest, response=response, storable=storable
+        )
+
+    async def store(self, lookup: ResponseCacheLookup, content: str, usage: TokenUsage, ttl_seconds: int) -> bool:
+        """
+        Remembers a generated reply under the version it was looked up with, so
+        a reply generated while the config changed lands in the retired version.
+        """
+        if not lookup.storable:
+            self.skipped_context += 1
+            return False
+        if len(content) > self._max_response_chars:
+            self.skipped_too_long += 1
+            return False
+        payload = json.dumps(asdict(CachedResponse(
+            content=content, prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens,
+        )))
+        entry_key = f"{self._entry_prefix(lookup.bot_uid)}{lookup.version}:{lookup.digest}"
+        count_key = f"{self._entry_prefix(lookup.bot_uid)}{lookup.version}:count"
+        try:
+            result = int(await self._redis.eval(
+                _STORE_SCRIPT, 2, count_key, entry_key, payload, ttl_seconds, self._max_entries_per_bot
+            ))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"ResponseCache: Storing a reply failed for bot {lookup.bot_uid}: {e}")
+            return False
+        if result < 0:
+            self.skipped_full += 1
+            return False
+        if result > 0:
+            self.stored += 1
+        return result > 0
+
+    async def invalidate(self, bot_uid: UUID) -> None:
+        """Moves the bot to a new config version; the version key does not expire."""
+        try:
+            await self._redis.incr(self._version_key(bot_uid))
+            self.invalidations += 1
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"ResponseCache: Failed to invalidate the replies of bot {bot_uid}: {e}")
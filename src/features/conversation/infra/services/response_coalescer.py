@@ -0,0 +1,78 @@
+# src/features/conversation/infra/services/response_coalescer.py
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Set
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+class ResponseCoalescer:
+    """
+    Debounces reply generation per conversation.
+
+    schedule() starts a timer for the conversation and runs the job once the
+    window has passed without another schedule() for the same key. A newer
+    call supersedes the previous one whether it is still waiting or already
+    generating, so a burst of messages ends in a single generation that sees
+    all of them. Jobs that must not be interrupted half-way (persisting and
+    sending the reply) should shield that part themselves.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        # Tasks whose window has elapsed and that are now running their job
+        self._generating: Set[asyncio.Task] = set()
+
+        self.scheduled = 0
+        self.superseded_waiting = 0
+        self.superseded_generating = 0
+        self.completed = 0
+        self.failed = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._tasks),
+            "scheduled": self.scheduled,
+            "superseded_waiting": self.superseded_waiting,
+            "superseded_generating": self.superseded_generating,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def schedule(self, key: Hashable, delay: float, job: Callable[[], Awaitable[None]]) -> None:
+        previous = self._tasks.get(key)
+        if previous is not None and not previous.done():
+            if previous in self._generating:
+                self.superseded_generating += 1
+            else:
+                self.superseded_waiting += 1
+            previous.cancel()
+        self.scheduled += 1
+        task = asyncio.create_task(self._run(key, delay, job))
+        self._tasks[key] = task
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self, key: Hashable, delay: float, job: Callable[[], Awaitable[None]]) -> None:
+        task = asyncio.current_task()
+        try:
+            await asyncio.sleep(delay)
+            self._generating.add(task)
+            await job()
+            self.completed += 1
+        except asyncio.CancelledError:
+            logger.debug(f"ResponseCoalescer: reply for {key} superseded by a newer message.")
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"ResponseCoalescer: deferred reply for {key} failed: {e}", exc_info=True)
+        finally:
+            self._generating.discard(task)
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
@@ -3,33 +3,286 @@
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 import aiohttp
-from typing import List, Dict, Optional, Any
+import asyncio
+import json
+import time
+from typing import AsyncIterator, List, Dict, Optional, Any
 
-from src.features.generation.application.services.generation_service import IGenerationService
+from src.features.generation.application.services.generation_service import GenerationChunk, IGenerationService, TokenUsage
+from src.features.generation.application.services.micro_batcher import MicroBatcher
 from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings  # For config type hint
 from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota  # For quota type hint
 from src.config import Settings
+from src.infra.services.http.endpoint_pool import BackendCallError, EndpointPool, EndpointUnavailableError
+from src.infra.services.http.pooled_http_client import PooledHttpClient
 
 
 
 settings: Settings = Settings()
 
+
+def create_llm_endpoint_pool(settings: Settings, urls: Optional[str] = None) -> EndpointPool:
+    """Endpoints from `urls` or LLM_API_URLS (comma-separated), or else the single LLM_API_URL."""
+    raw_urls = settings.LLM_API_URLS if urls is None else urls
+    return EndpointPool(
+        [url.strip() for url in raw_urls.split(",") if url.strip()] or [settings.LLM_API_URL],
+        request_timeout=settings.LLM_REQUEST_TIMEOUT,
+        max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+        backoff_base=settings.LLM_RETRY_BACKOFF_BASE,
+        backoff_max=settings.LLM_RETRY_BACKOFF_MAX,
+        failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.LLM_CIRCUIT_RESET_TIMEOUT,
+        hedging=settings.LLM_HEDGE_ENABLED,
+        hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+    )
+
+
 class DeepSeekGenerationServiceImpl(IGenerationService):
     """
     Implementation of IGenerationService that interacts with a DeepSeek-compatible API.
+    All calls go through one shared, pooled HTTP session owned by the app lifespan,
+    spread over the backend endpoints of an EndpointPool. A chat completion has no
+    side effects on the backend, so failed calls are retried (and, if enabled,
+    hedged); a stream is only retried until its first chunk has been passed on.
+
+    With `batch_endpoints`, concurrent generate_response calls for the same model
+    are collected for up to `max_batch_wait` seconds (at most `max_batch_size`
+    of them) and sent as one request to the backend's batch API:
+
+        POST {"model": ..., "requests": [<chat payload>, ...]}
+        200  {"responses": [<chat response> | {"error": "..."}, ...]}  (in request order)
+
+    Streams are never batched.
     """
 
+    def __init__(
+            self,
+            http_client: Optional[PooledHttpClient] = None,
+            endpoints: Optional[EndpointPool] = None,
+            batch_endpoints: Optional[EndpointPool] = None,
+            max_batch_size: int = 16,
+            max_batch_wait: float = 0.005,
+    ):
+        self._http_client = http_client or PooledHttpClient(name="llm")
+        self._endpoints = endpoints or create_llm_endpoint_pool(settings)
+        self._batch_endpoints = batch_endpoints
+        self._batcher: Optional[MicroBatcher[Dict[str, Any], Dict[str, Any]]] = None
+        if batch_endpoints is not None:
+            self._batcher = MicroBatcher(self._send_batch, max_batch_size=max_batch_size, max_wait=max_batch_wait)
+
+    def batching_stats(self) -> Dict[str, Any]:
+        return self._batcher.stats() if self._batcher is not None else {}
+
+    async def close(self) -> None:
+        """Sends the requests still waiting for a batch; called by the app lifespan."""
+        if self._batcher is not None:
+            await self._batcher.close()
+
     async def generate_response(
             self,
             prompt_messages: List[Dict[str, str]],  # Expects [{"role": "user/assistant/system", "content": "..."}]
             system_prompt: Optional[str] = None,
             config: Optional[AIConfigurationSettings] = None,  # Bot's AI settings
             quota: Optional[BotQuota] = None,  # Bot's quota
-            last_user_message: Optional[str] = None  # Can be derived from prompt_messages
+            last_user_message: Optional[str] = None,  # Can be derived from prompt_messages
+            usage: Optional[TokenUsage] = None,
     ) -> Optional[str]:  # Returns the generated text content or None on failure
         """
         Generates a response using the DeepSeek API.
         """
+        payload = self._build_payload(prompt_messages, system_prompt, config, stream=False)
+        if payload is None:
+            return None
+        if self._batcher is not None:
+            return await self._generate_batched(payload, usage)
+
+        async def send(url: str) -> Dict[str, Any]:
+            http_session = await self._http_client.get_session()
+            logger.info(f"DeepSeek: Posting to {url}")
+            async with http_session.post(url, headers={"Content-Type": "application/json"}, json=payload) as resp:
+                logger.debug(f"DeepSeek: Received status {resp.status}")
+                if resp.status != 200:
+                    raise BackendCallError.from_status(url, resp.status, (await resp.text())[:500])
+                return await resp.json()
+
+        try:
+            response_data = await self._endpoints.call(send)
+        except (BackendCallError, EndpointUnavailableError) as e:
+            logger.error(f"DeepSeek API call failed: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"DeepSeek: Unexpected error in generate_response: {e}", exc_info=True)
+            return None
+        return self._read_reply(response_data, usage)
+
+    async def _generate_batched(self, payload: Dict[str, Any], usage: Optional[TokenUsage]) -> Optional[str]:
+        try:
+            response_data = await self._batcher.submit(
+                payload["model"], payload, timeout=self._batch_endpoints.request_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error("DeepSeek: Batched request timed out")
+            return None
+        except (BackendCallError, EndpointUnavailableError) as e:
+            logger.error(f"DeepSeek batched call failed: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"DeepSeek: Unexpected error in batched generate_response: {e}", exc_info=True)
+            return None
+        return self._read_reply(response_data, usage)
+
+    async def _send_batch(self, model: str, payloads: List[Dict[str, Any]]) -> List[Any]:
+        """One request for the whole batch; an item the backend reports as failed only fails its own caller."""
+        body = {"model": model, "requests": payloads}
+
+        async def send(url: str) -> Dict[str, Any]:
+            http_session = await self._http_client.get_session()
+            logger.info(f"DeepSeek: Posting a batch of {len(payloads)} to {url}")
+            async with http_session.post(url, headers={"Content-Type": "application/json"}, json=body) as resp:
+                if resp.status != 200:
+                    raise BackendCallError.from_status(url, resp.status, (await resp.text())[:500])
+                return await resp.json()
+
+        response_data = await self._batch_endpoints.call(send)
+        return [
+            BackendCallError(f"{model} batch item {index}", None, str(item["error"]), retryable=False)
+            if item.get("error") else item
+            for index, item in enumerate(response_data.get("responses", []))
+        ]
+
+    @staticmethod
+    def _read_reply(response_data: Dict[str, Any], usage: Optional[TokenUsage]) -> str:
+        assistant_text = response_data.get("message", {}).get("content", "").strip()
+        prompt_tokens: int = response_data.get("prompt_eval_count", 0)
+        completion_tokens: int = response_data.get("eval_count", 0)
+        total_used: int = prompt_tokens + completion_tokens
+        logger.info(
+            f"DeepSeek: Response received. Tokens used: {total_used} (P:{prompt_tokens}, C:{completion_tokens})")
+
+        if usage is not None:
+            usage.prompt_tokens, usage.completion_tokens = prompt_tokens, completion_tokens
+
+        return assistant_text
+
+    async def stream_response(
+            self,
+            prompt_messages: List[Dict[str, str]],
+            system_prompt: Optional[str] = None,
+            config: Optional[AIConfigurationSettings] = None,
+            quota: Optional[BotQuota] = None,
+            last_user_message: Optional[str] = None
+    ) -> AsyncIterator[GenerationChunk]:
+        """
+        Streams a response from the DeepSeek API. Accepts both NDJSON (one JSON object
+        per line, Ollama style) and SSE ("data: {...}" lines, OpenAI style) bodies.
+        The final chunk carries the token usage; it is only marked done when the
+        backend sent its end marker, a body that simply stops is reported as interrupted.
+        """
+        payload = self._build_payload(prompt_messages, system_prompt, config, stream=True)
+        if payload is None:
+            return
+
+        started = time.perf_counter()
+        first_token_at: Optional[float] = None
+        final_chunk = GenerationChunk()
+        # A stream that went silent for this long counts as failed
+        timeout = aiohttp.ClientTimeout(sock_read=self._endpoints.request_timeout)
+        for attempt in range(self._endpoints.max_attempts):
+            if attempt:
+                await asyncio.sleep(self._endpoints.backoff_delay(attempt))
+            try:
+                async with self._endpoints.attempt(record_latency=False) as endpoint:
+                    http_session = await self._http_client.get_session()
+                    logger.info(f"DeepSeek: Streaming from {endpoint.url}")
+                    async with http_session.post(
+                            endpoint.url,
+                            headers={"Content-Type": "application/json"},
+                            json=payload,
+                            timeout=timeout,
+                    ) as resp:
+                        if resp.status != 200:
+                            raise BackendCallError.from_status(endpoint.url, resp.status, (await resp.text())[:500])
+
+                        async for raw_line in resp.content:
+                            chunk = self._parse_stream_line(raw_line)
+                            if chunk is None:
+                                continue
+                            if chunk.content:
+                                if first_token_at is None:
+                                    first_token_at = time.perf_counter()
+                                    logger.debug(f"DeepSeek: First token after {(first_token_at - started) * 1000:.0f} ms")
+                                yield GenerationChunk(content=chunk.content)
+                            if chunk.prompt_tokens or chunk.completion_tokens:
+                                final_chunk.prompt_tokens = chunk.prompt_tokens
+                                final_chunk.completion_tokens = chunk.completion_tokens
+                            if chunk.done:
+                                final_chunk.done = True
+                                break
+                break
+            except (BackendCallError, EndpointUnavailableError) as e:
+                retryable = isinstance(e, EndpointUnavailableError) or e.retryable
+                # Text already passed on cannot be taken back, so a broken stream is not replayed
+                if first_token_at is not None or not retryable or attempt + 1 == self._endpoints.max_attempts:
+                    logger.error(f"DeepSeek streaming call failed: {e}")
+                    return
+                logger.warning(f"DeepSeek: Streaming attempt {attempt + 1} failed, retrying: {e}")
+            except Exception as e:
+                logger.error(f"DeepSeek: Unexpected error in stream_response: {e}", exc_info=True)
+                return
+
+        if not final_chunk.done:
+            # Closed cleanly but early (e.g. a proxy timeout); what was sent is not the whole reply
+            logger.warning(f"DeepSeek: Stream ended without its end marker after "
+                           f"{(time.perf_counter() - started) * 1000:.0f} ms")
+            final_chunk.interrupted = True
+            yield final_chunk
+            return
+        logger.info(
+            f"DeepSeek: Stream finished in {(time.perf_counter() - started) * 1000:.0f} ms. "
+            f"Tokens used: {final_chunk.total_tokens} (P:{final_chunk.prompt_tokens}, C:{final_chunk.completion_tokens})")
+        yield final_chunk
+
+    @staticmethod
+    def _parse_stream_line(raw_line: bytes) -> Optional[GenerationChunk]:
+        """Parses one NDJSON or SSE line into a chunk; returns None for lines without data."""
+        line = raw_line.decode("utf-8").strip()
+        if not line or line.startswith(":"):  # Blank keep-alive or SSE comment
+            return None
+        if line.startswith("data:"):
+            line = line[len("data:"):].strip()
+            if line == "[DONE]":
+                return GenerationChunk(done=True)
+        try:
+            data = json.loads(line)
+        except ValueError:
+            logger.warning(f"DeepSeek: Skipping unparsable stream line: '{line[:100]}'")
+            return None
+
+        if "choices" in data:  # OpenAI-compatible SSE
+            choices = data.get("choices") or [{}]
+            content = (choices[0].get("delta") or {}).get("content") or ""
+            usage = data.get("usage") or {}
+            return GenerationChunk(
+                content=content,
+                # Usage may follow the finish_reason chunk, so only "[DONE]" ends an SSE stream
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+            )
+        return GenerationChunk(  # Ollama-style NDJSON
+            content=(data.get("message") or {}).get("content", ""),
+            done=bool(data.get("done")),
+            prompt_tokens=data.get("prompt_eval_count", 0),
+            completion_tokens=data.get("eval_count", 0),
+        )
+
+    @staticmethod
+    def _build_payload(
+            prompt_messages: List[Dict[str, str]],
+            system_prompt: Optional[str],
+            config: Optional[AIConfigurationSettings],
+            stream: bool,
+    ) -> Optional[Dict[str, Any]]:
         if not config:
             logger.warning("DeepSeek: AIConfigurationSettings (config) not provided. Using defaults.")
             # Create default if needed, or rely on API defaults
@@ -67,64 +320,12 @@ class DeepSeekGenerationServiceImpl(IGenerationService):
         }
         logger.debug(f"DeepSeek: Using model '{model_name}' with options: {api_options}")
 
-        # --- 3. Make API Call ---
+        # --- 3. Build Payload ---
         payload = {
             "model": model_name,
             "messages": formatted_messages,
-            "stream": False,  # For non-streaming version
+            "stream": stream,
             "key": settings.LLM_API_KEY,  # Key from settings
             "options": api_options
         }
-
-        try:
-            async with aiohttp.ClientSession() as http_session:
-                logger.info(f"DeepSeek: Posting to {settings.LLM_API_URL}")
-                async with http_session.post(
-                        settings.LLM_API_URL,
-                        headers={"Content-Type": "application/json"},
-                        json=payload
-                ) as resp:
-                    logger.debug(f"DeepSeek: Received status {resp.status}")
-                    if resp.status != 200:
-                        error_content = await resp.text()
-                        logger.error(f"DeepSeek API call failed with status {resp.status}: {error_content}")
-                        # In a real app, raise a specific exception
-                        # raise AssistantProcessingError(f"DeepSeek API call failed with status {resp.status}")
-                        return None  # Or raise an exception
-
-                    response_data = await resp.json()
-                    assistant_text = response_data.get("message", {}).get("content", "").strip()
-                    prompt_tokens: int = response_data.get("prompt_eval_count", 0)
-                    completion_tokens: int = response_data.get("eval_count", 0)
-                    total_used: int = prompt_tokens + completion_tokens
-                    logger.info(
-                        f"DeepSeek: Response received. Tokens used: {total_used} (P:{prompt_tokens}, C:{completion_tokens})")
-
-                    # --- 4. Update Quota (if provided and mutable) ---
-                    if quota and hasattr(quota, 'deduct') and callable(quota.deduct):
-                        try:
-                            quota.deduct(amount=total_used)
-                            logger.info(
-                                f"DeepSeek: Deducted {total_used} tokens from quota. Remaining: {quota.tokens_left}")
-                        except ValueError as e:
-                            logger.warning(f"DeepSeek: Failed to deduct tokens from quota: {e}")
-                        except Exception as e:
-                            logger.error(f"DeepSeek: Unexpected error deducting tokens: {e}", exc_info=True)
-                    elif quota:
-                        logger.warning(
-                            "DeepSeek: Quota object provided but 'deduct' method is missing or not callable.")
-
-                    return assistant_text
-
-        except aiohttp.ClientError as e:
-            logger.error(f"DeepSeek: aiohttp.ClientError during API call: {e}", exc_info=True)
-            # raise AssistantProcessingError(f"Network error connecting to DeepSeek: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"DeepSeek: Unexpected error in generate_response: {e}", exc_info=True)
-            # raise AssistantProcessingError(f"Unexpected error during AI generation: {e}")
-            return None
-
-
-import asyncio  # Add for stream stub
-
+        return payload
@@ -0,0 +1,251 @@
+# src/features/generation/application/services/generation_scheduler.py
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from uuid import UUID
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+class GenerationPriority(IntEnum):
+    """Admission classes; a lower value is always served first."""
+    PRODUCTION = 0
+    PLAYGROUND = 1
+    BACKGROUND = 2
+
+
+class GenerationOverloadedError(Exception):
+    """No generation slot could be given within the class's queue deadline (or the queue is full)."""
+
+    def __init__(self, bot_uid: UUID, priority: GenerationPriority, reason: str):
+        self.bot_uid = bot_uid
+        self.priority = priority
+        self.reason = reason
+        super().__init__(f"Generation for bot {bot_uid} shed ({priority.name.lower()}, {reason})")
+
+
+@dataclass(eq=False)
+class _Waiter:
+    bot_uid: UUID
+    owner_uid: UUID
+    priority: GenerationPriority
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+@dataclass(eq=False)
+class _BotQueue:
+    owner_uid: UUID
+    weight: float = 1.0
+    active: int = 0
+    # Virtual finish time of the bot's last admitted request (start-time fair queueing)
+    finish: float = 0.0
+    waiting: Dict[GenerationPriority, Deque[_Waiter]] = field(
+        default_factory=lambda: {priority: deque() for priority in GenerationPriority}
+    )
+
+    def has_waiters(self) -> bool:
+        return any(self.waiting.values())
+
+
+@dataclass
+class _ClassStats:
+    waiting: int = 0
+    active: int = 0
+    admitted: int = 0
+    shed_timeout: int = 0
+    shed_full: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class GenerationScheduler:
+    """
+    Admission control in front of the generation services of this process.
+
+    At most `max_concurrency` LLM calls run at once, at most `max_per_bot` of
+    them for one bot and `max_per_owner` for the bots of one owner. Waiting
+    calls are served by priority class first; within a class the bot with the
+    smallest virtual finish time goes next, which shares the slots between busy
+    bots in proportion to their weights however many requests each of them
+    queues. A call still waiting after its class's deadline (or arriving at a
+    full queue) is shed with GenerationOverloadedError so the caller can answer
+    with a quick fallback instead of piling up.
+
+    Limits are per worker process, like the HTTP connection pool they protect.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_per_bot: int = 4,
+        max_per_owner: int = 8,
+        max_queued: int = 1000,
+        queue_timeouts: Optional[Dict[GenerationPriority, Optional[float]]] = None,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._max_per_bot = max_per_bot
+        self._max_per_owner = max_per_owner
+        self._max_queued = max_queued
+        # None waits without a deadline
+        self._queue_timeouts: Dict[GenerationPriority, Optional[float]] = {
+            GenerationPriority.PRODUCTION: 20.0,
+            GenerationPriority.PLAYGROUND: 10.0,
+            GenerationPriority.BACKGROUND: 120.0,
+            **(queue_timeouts or {}),
+        }
+        self._queues: Dict[UUID, _BotQueue] = {}
+        self._owner_active: Dict[UUID, int] = {}
+        self._active = 0
+        self._queued = 0
+        self._virtual_time = 0.0
+        self._classes: Dict[GenerationPriority, _ClassStats] = {priority: _ClassStats() for priority in GenerationPriority}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "max_concurrency": self._max_concurrency,
+            "bots_waiting": sum(1 for queue in self._queues.values() if queue.has_waiters()),
+            "classes": {
+                priority.name.lower(): {
+                    "waiting": stats.waiting,
+                    "active": stats.active,
+                    "admitted": stats.admitted,
+                    "shed_timeout": stats.shed_timeout,
+                    "shed_full": stats.shed_full,
+                    "avg_wait_ms": round(stats.wait_seconds_total / stats.admitted * 1000, 1) if stats.admitted else 0.0,
+                    "max_wait_ms": round(stats.wait_seconds_max * 1000, 1),
+                }
+                for priority, stats in self._classes.items()
+            },
+        }
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        bot_uid: UUID,
+        owner_uid: UUID,
+        priority: GenerationPriority = GenerationPriority.PRODUCTION,
+        weight: float = 1.0,
+    ) -> AsyncIterator[None]:
+        """Holds one generation slot for the body; raises GenerationOverloadedError when shed."""
+        waiter = await self._acquire(bot_uid, owner_uid, priority, weight)
+        try:
+            yield
+        finally:
+            self._release(waiter)
+
+    async def _acquire(self, bot_uid: UUID, owner_uid: UUID, priority: GenerationPriority, weight: float) -> _Waiter:
+        stats = self._classes[priority]
+        if self._queued >= self._max_queued:
+            stats.shed_full += 1
+            raise GenerationOverloadedError(bot_uid, priority, "queue full")
+
+        queue = self._queues.get(bot_uid)
+        if queue is None:
+            queue = self._queues[bot_uid] = _BotQueue(owner_uid=owner_uid)
+        # The latest call wins: a transferred bot counts against its new owner
+        queue.owner_uid, queue.weight = owner_uid, max(weight, 0.01)
+        waiter = _Waiter(bot_uid, owner_uid, priority, asyncio.get_running_loop().create_future())
+        queue.waiting[priority].append(waiter)
+        self._queued += 1
+        stats.waiting += 1
+        self._dispatch()
+
+        if not waiter.granted:
+            try:
+                await asyncio.wait((waiter.future,), timeout=self._queue_timeouts.get(priority))
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+            if not waiter.granted:
+                self._abandon(waiter)
+                stats.shed_timeout += 1
+                logger.warning(f"GenerationScheduler: shed {priority.name.lower()} request of bot {bot_uid} "
+                               f"after {time.monotonic() - waiter.enqueued_at:.1f}s in the queue")
+                raise GenerationOverloadedError(bot_uid, priority, "queue deadline")
+        return waiter
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Drops a waiter whose caller gave up; a slot granted meanwhile is given back."""
+        if waiter.granted:
+            self._release(waiter)
+            return
+        queue = self._queues.get(waiter.bot_uid)
+        if queue is not None:
+            queue.waiting[waiter.priority].remove(waiter)
+            self._queued -= 1
+            self._classes[waiter.priority].waiting -= 1
+            self._forget_if_idle(waiter.bot_uid, queue)
+
+    def _release(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.bot_uid]
+        queue.active -= 1
+        self._owner_active[waiter.owner_uid] -= 1
+        if not self._owner_active[waiter.owner_uid]:
+            del self._owner_active[waiter.owner_uid]
+        self._active -= 1
+        self._classes[waiter.priority].active -= 1
+        self._forget_if_idle(waiter.bot_uid, queue)
+        self._dispatch()
+
+    def _forget_if_idle(self, bot_uid: UUID, queue: _BotQueue) -> None:
+        # A bot that ran ahead of the virtual clock keeps its place until the others catch up
+        if not queue.active and not queue.has_waiters() and queue.finish <= self._virtual_time:
+            del self._queues[bot_uid]
+
+    def _dispatch(self) -> None:
+        while self._active < self._max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._grant(waiter)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        for priority in GenerationPriority:
+            best: Optional[_BotQueue] = None
+            best_key = None
+            for queue in self._queues.values():
+                waiting = queue.waiting[priority]
+                if not waiting or queue.active >= self._max_per_bot:
+                    continue
+                if self._owner_active.get(queue.owner_uid, 0) >= self._max_per_owner:
+                    continue
+                key = (max(queue.finish, self._virtual_time), waiting[0].enqueued_at)
+                if best_key is None or key < best_key:
+                    best, best_key = queue, key
+            if best is not None:
+                return best.waiting[priority][0]
+        return None
+
+    def _grant(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.bot_uid]
+        queue.waiting[waiter.priority].popleft()
+        start = max(queue.finish, self._virtual_time)
+        queue.finish = start + 1.0 / queue.weight
+        self._virtual_time = start
+        queue.active += 1
+        self._owner_active[waiter.owner_uid] = self._owner_active.get(waiter.owner_uid, 0) + 1
+        self._active += 1
+        self._queued -= 1
+
+        stats = self._classes[waiter.priority]
+        stats.waiting -= 1
+        stats.active += 1
+        stats.admitted += 1
+        waited = time.monotonic() - waiter.enqueued_at
+        stats.wait_seconds_total += waited
+        stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+        waiter.granted = True
+        if not waiter.future.done():
+            waiter.future.set_result(None)
@@ -1,11 +1,42 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Optional
 
 # Import necessary domain objects if needed for input/output types
 # (Using simple types for now)
 # from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
 # from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
 
+@dataclass
+class GenerationChunk:
+    """
+    One piece of a streamed response. `content` is the text delta; the last chunk
+    has `done=True` and carries the token usage reported for the whole response.
+    A stream the backend closed without its end marker finishes with an
+    `interrupted=True` chunk instead, with whatever usage was reported.
+    """
+    content: str = ""
+    done: bool = False
+    interrupted: bool = False
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+@dataclass
+class TokenUsage:
+    """Token counts the backend reported for one response; filled in by the generation service."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
 class IGenerationService(ABC):
     """Interface for AI response generation service."""
 
@@ -17,13 +48,29 @@ class IGenerationService(ABC):
         config: Optional[object] = None, # Placeholder for AIConfigurationSettings
         quota: Optional[object] = None, # Placeholder for BotQuota
         last_user_message: Optional[str] = None,
+        usage: Optional[TokenUsage] = None,
         # Add other necessary parameters like model_name, user_id etc.
     ) -> Optional[str]: # Returns the generated text content or None on failure
         """
         Generates a response based on the provided messages and configuration.
-        Handles interaction with the specific AI model API.
+        Handles interaction with the specific AI model API. When `usage` is given
+        it receives the token counts reported for the response; quota accounting
+        is left to the caller.
         """
         raise NotImplementedError
 
-
-
+    @abstractmethod
+    def stream_response(
+        self,
+        prompt_messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        config: Optional[object] = None,
+        quota: Optional[object] = None,
+        last_user_message: Optional[str] = None,
+    ) -> AsyncIterator[GenerationChunk]:
+        """
+        Streaming variant of generate_response: yields text deltas as the model
+        produces them, then a final chunk with done=True and the token usage.
+        On failure the stream ends early; callers treat an empty result as no response.
+        """
+        raise NotImplementedError
@@ -0,0 +1,149 @@
+# src/features/generation/application/services/micro_batcher.py
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar, Union
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+I = TypeVar("I")
+R = TypeVar("R")
+
+# Sends one batch; returns one result (or exception) per item, in order
+BatchSender = Callable[[Hashable, List[I]], Awaitable[List[Union[R, BaseException]]]]
+
+
+@dataclass(eq=False)
+class _PendingBatch(Generic[I]):
+    entries: List[Tuple[I, asyncio.Future]] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher(Generic[I, R]):
+    """
+    Collects concurrent submissions with the same key for up to `max_wait`
+    seconds (or until `max_batch_size` of them are waiting) and sends them as
+    one batch, then hands every caller its own result.
+
+    A caller that times out or is cancelled before its batch goes out is left
+    out of it; one failing item only fails its own caller, a failing batch
+    fails the callers in it.
+    """
+
+    # Number of recent batch latencies kept for the percentiles in stats()
+    LATENCY_SAMPLES = 1024
+
+    def __init__(self, send_batch: BatchSender, max_batch_size: int = 16, max_wait: float = 0.005) -> None:
+        self._send_batch = send_batch
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max_wait
+        self._pending: Dict[Hashable, _PendingBatch[I]] = {}
+        self._in_flight: Set[asyncio.Task] = set()
+        self._batch_latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._batches = 0
+        self._items = 0
+        self._max_size_seen = 0
+        self._full_batches = 0
+        self._item_errors = 0
+        self._batch_errors = 0
+        self._timeouts = 0
+        self._first_sent_at: Optional[float] = None
+        self._last_done_at: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self._batch_latencies)
+        busy = (self._last_done_at - self._first_sent_at) if self._first_sent_at and self._last_done_at else 0.0
+        return {
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "max_batch_size": self._max_size_seen,
+            "full_batches": self._full_batches,
+            "item_errors": self._item_errors,
+            "batch_errors": self._batch_errors,
+            "timeouts": self._timeouts,
+            "batch_latency_p50_ms": round(self._percentile(samples, 0.50) * 1000, 1),
+            "batch_latency_p99_ms": round(self._percentile(samples, 0.99) * 1000, 1),
+            "items_per_second": round(self._items / busy, 1) if busy > 0 else 0.0,
+        }
+
+    @staticmethod
+    def _percentile(samples: List[float], fraction: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    async def submit(self, key: Hashable, item: I, timeout: Optional[float] = None) -> R:
+        """Adds `item` to the next batch for `key` and waits for its result."""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingBatch()
+            pending.timer = asyncio.get_running_loop().call_later(self._max_wait, self._flush, key)
+        pending.entries.append((item, future))
+        if len(pending.entries) >= self._max_batch_size:
+            self._full_batches += 1
+            self._flush(key)
+
+        try:
+            # wait_for cancels the future on timeout, which keeps a not yet sent item out of its batch
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+
+    async def close(self) -> None:
+        """Sends whatever is still pending and waits for the batches in flight."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _flush(self, key: Hashable) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        entries = [(item, future) for item, future in pending.entries if not future.done()]
+        if not entries:
+            return
+        task = asyncio.ensure_future(self._send(key, entries))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, key: Hashable, entries: List[Tuple[I, asyncio.Future]]) -> None:
+        started = time.monotonic()
+        if self._first_sent_at is None:
+            self._first_sent_at = started
+        self._batches += 1
+        self._items += len(entries)
+        self._max_size_seen = max(self._max_size_seen, len(entries))
+
+        try:
+            results = await self._send_batch(key, [item for item, _ in entries])
+            if len(results) != len(entries):
+                raise ValueError(f"Batch of {len(entries)} items came back with {len(results)} results")
+        except Exception as e:
+            self._batch_errors += 1
+            logger.warning(f"MicroBatcher: batch of {len(entries)} items for {key!r} failed: {e}")
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._last_done_at = time.monotonic()
+            self._batch_latencies.append(self._last_done_at - started)
+
+        for (_, future), result in zip(entries, results):
+            if future.done():  # The caller stopped waiting
+                continue
+            if isinstance(result, BaseException):
+                self._item_errors += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -3,10 +3,11 @@
 
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
-from typing import List, Dict, Optional
+import asyncio
+from typing import AsyncIterator, List, Dict, Optional
 
 # Import the interface
-from src.features.generation.application.services.generation_service import IGenerationService
+from src.features.generation.application.services.generation_service import GenerationChunk, IGenerationService, TokenUsage
 
 
 
@@ -22,7 +23,8 @@ class StubGenerationServiceImpl(IGenerationService):
         system_prompt: Optional[str] = None,
         config: Optional[object] = None, # Ignored by stub
         quota: Optional[object] = None, # Ignored by stub
-        last_user_message: Optional[str] = None
+        last_user_message: Optional[str] = None,
+        usage: Optional[TokenUsage] = None, # Left at zero by stub
     ) -> Optional[str]:
         """Returns a predefined stub response."""
         logger.info(f"StubGenerationServiceImpl called. Input messages count: {len(prompt_messages)}")
@@ -43,4 +45,22 @@ class StubGenerationServiceImpl(IGenerationService):
         #     except Exception as e:
         #          logger.warning(f"Stub failed to simulate token deduction: {e}")
 
-        return stub_response
\ No newline at end of file
+        return stub_response
+
+    async def stream_response(
+        self,
+        prompt_messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        config: Optional[object] = None, # Ignored by stub
+        quota: Optional[object] = None, # Ignored by stub
+        last_user_message: Optional[str] = None
+    ) -> AsyncIterator[GenerationChunk]:
+        """Streams the stub response word by word, then a final chunk without token usage."""
+        stub_response = await self.generate_response(
+            prompt_messages, system_prompt, config, quota, last_user_message
+        )
+        words = stub_response.split(" ")
+        for index, word in enumerate(words):
+            yield GenerationChunk(content=word if index == 0 else f" {word}")
+            await asyncio.sleep(0) # Let the consumer forward each chunk
+        yield GenerationChunk(done=True)
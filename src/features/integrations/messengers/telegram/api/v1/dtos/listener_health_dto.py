@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TelegramListenerHealthDTO(BaseModel):
+    link_uid: uuid.UUID = Field(..., description="Telegram account link the listener belongs to.")
+    bot_uid: uuid.UUID
+    service_uid: uuid.UUID
+    state: str = Field(..., description="starting, connected, backoff, unauthorized or stopped.")
+    failed_attempts: int = Field(..., description="Consecutive failed connection attempts.")
+    reconnects: int = Field(..., description="Reconnections since this worker started supervising the link.")
+    last_connected_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    next_retry_at: Optional[datetime] = None
+
+
+class TelegramListenersHealthResponseDTO(BaseModel):
+    """Listeners supervised by the worker that served the request."""
+    worker_id: Optional[str] = Field(None, description="Lease owner id of this worker; None without Redis leases.")
+    total: int
+    connected: int
+    listeners: List[TelegramListenerHealthDTO]
+    profile_cache: Dict[str, int] = Field(
+        default_factory=dict, description="Hit/miss counters of the own-identity and sender profile caches."
+    )
+    ingestion_queue: Dict[str, float] = Field(
+        default_factory=dict, description="Depth, throughput and wait times of the message ingestion queue."
+    )
@@ -0,0 +1,25 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, status
+
+from src.core.mediator.mediator import Mediator
+from src.features.identity.dependencies import get_role_checker
+from src.features.integrations.messengers.telegram.api.v1.dtos.listener_health_dto import \
+    TelegramListenersHealthResponseDTO
+from src.features.integrations.messengers.telegram.application.queries.get_listener_health.get_listener_health_query import \
+    GetTelegramListenerHealthQuery
+
+listener_health_router = APIRouter()
+
+
+@listener_health_router.get(
+    "/listeners/health",
+    response_model=TelegramListenersHealthResponseDTO,
+    status_code=status.HTTP_200_OK,
+    summary="State of the Telegram listeners supervised by this worker.",
+    dependencies=[Depends(get_role_checker(["admin"]))],
+)
+@inject
+async def get_telegram_listener_health(
+    mediator: Mediator = Depends(Provide["mediator"]),
+) -> TelegramListenersHealthResponseDTO:
+    return await mediator.query(GetTelegramListenerHealthQuery())
@@ -10,12 +10,10 @@ from src.core.mediator.mediator import Mediator
 from src.features.integrations.messengers.telegram.api.v1.dtos.reassign_telegram_link_dto import \
     TelegramAccountLinkResponseDTO
 from src.features.bot.application.services.bot_access_service import BotAccessService
-from src.features.integrations.messengers.telegram.application.services.telegram_event_handler_service import \
-    TelegramEventHandlerService
-from src.features.integrations.messengers.telegram.application.services.telethon_client_service import \
-    TelethonClientService
 from src.features.integrations.messengers.telegram.domain.uow.telegram_unit_of_work import TelegramUnitOfWork
 from src.features.integrations.messengers.telegram.application.commands.reassign_telegram_link.reassign_telegram_link_command import ReassignTelegramLinkCommand
+from src.features.integrations.messengers.telegram.infra.services.telegram_listener_supervisor import \
+    TelegramListenerSupervisor
 from src.features.integrations.messengers.telegram.exceptions.telegram_exceptions import (
     TelegramResourceNotFoundError, TelegramAuthError
 )
@@ -28,8 +26,7 @@ class ReassignTelegramLinkCommandHandler(BaseCommandHandler[ReassignTelegramLink
     _bot_access_service: BotAccessService
     _allowed_roles: list[str]
     _mediator: Mediator
-    _telethon_service: TelethonClientService
-    _event_handler_service: TelegramEventHandlerService
+    _listener_supervisor: TelegramListenerSupervisor
 
 
     async def __call__(self, command: ReassignTelegramLinkCommand) -> TelegramAccountLinkResponseDTO:
@@ -77,21 +74,8 @@ class ReassignTelegramLinkCommandHandler(BaseCommandHandler[ReassignTelegramLink
             await self._unit_of_work.account_link_repository.update(existing_link)
             logger.info(f"Telegram link {command.link_uid} successfully reassigned from {existing_link.bot_uid} to {command.new_bot_uid}.")
 
-            # 5. Handle active sessions/listeners (CRITICAL)
-            # If the link is active and attached to an old bot, you might need to:
-            # - Stop the old Telethon client listener associated with the OLD bot.
-            # - Start a new Telethon client listener associated with the NEW bot.
-            # This would involve injecting TelethonClientService here and adding methods for stop/start.
-            # For simplicity, I'm omitting this complex part, but it's important for live systems.
-            # Example:
-            if existing_link.is_active:
-                await self._telethon_service.stop_message_listener(service_uid=service_uid)
-                await self._telethon_service.start_message_listener(
-                    session_string=existing_link.session_string,
-                    bot_uid=new_bot_entity.uid,
-                    service_uid=service_uid,
-                    event_handler_service=self._event_handler_service, # Need to inject this too
-                )
-
+        # 5. Move the live listener to the new bot (the supervisor restarts it with the new bot_uid)
+        if existing_link.is_active:
+            await self._listener_supervisor.watch(existing_link)
 
         return TelegramAccountLinkResponseDTO.from_entity(existing_link)
\ No newline at end of file
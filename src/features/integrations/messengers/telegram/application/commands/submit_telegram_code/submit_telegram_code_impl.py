@@ -12,9 +12,9 @@ from src.features.conversation.domain.enums import ChatPlatform
 from src.features.integrations.messengers.telegram.application.commands.submit_telegram_code.submit_telegram_code_command import SubmitTelegramCodeCommand
 from src.features.integrations.messengers.telegram.api.v1.dtos.telegram_auth_dtos import SubmitTelegramCodeResponseDTO
 from src.features.integrations.messengers.telegram.application.services.telethon_client_service import TelethonClientService
-from src.features.integrations.messengers.telegram.application.services.telegram_event_handler_service import TelegramEventHandlerService
 from src.features.integrations.messengers.telegram.domain.uow.telegram_unit_of_work import TelegramUnitOfWork
 from src.features.bot.application.services.bot_platform_linker_service import BotPlatformLinkerService
+from src.features.integrations.messengers.telegram.infra.services.telegram_listener_supervisor import TelegramListenerSupervisor
 from src.features.integrations.messengers.telegram.exceptions.telegram_exceptions import TelegramAuthError, TelegramGenericError, TelegramResourceNotFoundError
 
 
@@ -24,7 +24,7 @@ from src.features.integrations.messengers.telegram.exceptions.telegram_exception
 class SubmitTelegramCodeCommandHandler(BaseCommandHandler[SubmitTelegramCodeCommand, SubmitTelegramCodeResponseDTO]):
     _unit_of_work: TelegramUnitOfWork
     _telethon_service: TelethonClientService
-    _event_handler_service: TelegramEventHandlerService
+    _listener_supervisor: TelegramListenerSupervisor
     _bot_platform_linker_service: BotPlatformLinkerService
     _bot_access_service: BotAccessService
     _mediator: Mediator
@@ -81,12 +81,7 @@ class SubmitTelegramCodeCommandHandler(BaseCommandHandler[SubmitTelegramCodeComm
             )
 
             if final_session_string:
-                await self._telethon_service.start_message_listener(
-                    session_string=final_session_string,
-                    bot_uid=target_bot_entity.uid,
-                    service_uid=service.uid,
-                    event_handler_service=self._event_handler_service,
-                )
+                await self._listener_supervisor.watch(link, service_uid=service.uid)
 
             return SubmitTelegramCodeResponseDTO(
                 telegram_user_id=telegram_api_user_id_str,
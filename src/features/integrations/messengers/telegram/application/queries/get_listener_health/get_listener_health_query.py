@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+from src.core.base.query import BaseQuery
+
+
+@dataclass
+class GetTelegramListenerHealthQuery(BaseQuery):
+    pass
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from src.core.base.query import BaseQueryHandler
+from src.features.integrations.messengers.telegram.api.v1.dtos.listener_health_dto import (
+    TelegramListenerHealthDTO,
+    TelegramListenersHealthResponseDTO,
+)
+from src.features.integrations.messengers.telegram.application.services.telegram_event_handler_service import \
+    TelegramEventHandlerService
+from src.features.integrations.messengers.telegram.infra.services.telegram_listener_supervisor import (
+    ListenerState,
+    TelegramListenerSupervisor,
+)
+from src.infra.services.queue.work_queue import WorkQueue
+from .get_listener_health_query import GetTelegramListenerHealthQuery
+
+
+@dataclass
+class GetTelegramListenerHealthQueryHandler(
+    BaseQueryHandler[GetTelegramListenerHealthQuery, TelegramListenersHealthResponseDTO]
+):
+    _listener_supervisor: TelegramListenerSupervisor
+    _event_handler_service: TelegramEventHandlerService
+    _ingestion_queue: Optional[WorkQueue]
+
+    async def __call__(self, query: GetTelegramListenerHealthQuery) -> TelegramListenersHealthResponseDTO:
+        listeners = [
+            TelegramListenerHealthDTO(
+                link_uid=health.link_uid,
+                bot_uid=health.bot_uid,
+                service_uid=health.service_uid,
+                state=health.state.value,
+                failed_attempts=health.failed_attempts,
+                reconnects=health.reconnects,
+                last_connected_at=health.last_connected_at,
+                last_error=health.last_error,
+                next_retry_at=health.next_retry_at,
+            )
+            for health in self._listener_supervisor.health()
+        ]
+        return TelegramListenersHealthResponseDTO(
+            worker_id=self._listener_supervisor.owner_id,
+            total=len(listeners),
+            connected=sum(1 for listener in listeners if listener.state == ListenerState.CONNECTED.value),
+            listeners=listeners,
+            profile_cache=self._event_handler_service.stats(),
+            ingestion_queue=self._ingestion_queue.stats() if self._ingestion_queue is not None else {},
+        )
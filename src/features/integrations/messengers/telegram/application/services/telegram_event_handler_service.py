@@ -2,9 +2,48 @@ from abc import ABC, abstractmethod
 from typing import Optional, Callable, Any, Dict, Awaitable # Import Awaitable
 from uuid import UUID
 
+from src.features.integrations.messengers.telegram.infra.services.sender_profile_cache import SenderProfile
+
 # Interface for the service that processes raw Telethon events
 class TelegramEventHandlerService(ABC):
     @abstractmethod
     async def handle_new_telethon_message(self, event: Any, telethon_client_instance: Any, associated_bot_uid: UUID, service_uid: UUID):
         """Processes a raw new message event from Telethon."""
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    @abstractmethod
+    async def process_queued_message(self, key: str, payload: Dict[str, Any]) -> None:
+        """Runs a message taken off the ingestion queue and replies to it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def register_client(self, service_uid: UUID, telethon_client_instance: Any) -> None:
+        """Makes the listener's client available to queue workers, including for jobs replayed after a restart."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remember_identity(self, service_uid: UUID, me: Any) -> None:
+        """Caches the listener account's own identity (the result of client.get_me())."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_own_telegram_id(
+        self, service_uid: UUID, telethon_client_instance: Any, refresh: bool = False
+    ) -> Optional[str]:
+        """The listener account's Telegram user id, cached per service; refresh=True reads it from Telegram again."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_sender_profile(self, event: Any, telethon_client_instance: Any, refresh: bool = False) -> SenderProfile:
+        """Username and phone of the event's sender, cached by sender id; refresh=True fetches the user from Telegram."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def forget_identity(self, service_uid: UUID) -> None:
+        """Drops the cached identity and the registered client once the listener for service_uid stops."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Identity and sender profile cache counters."""
+        raise NotImplementedError
@@ -1,7 +1,8 @@
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
-from datetime import timezone
-from typing import Any, Optional
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 from src.core.mediator.mediator import Mediator
@@ -14,6 +15,10 @@ from src.features.integrations.messengers.telegram.application.services.telegram
     TelegramEventHandlerService
 from src.features.integrations.messengers.telegram.application.services.telethon_client_service import \
     TelethonClientService
+from src.infra.services.queue.exceptions import WorkNotReadyError, WorkQueueFullError
+from src.infra.services.queue.work_queue import WorkQueue
+from src.features.integrations.messengers.telegram.infra.services.sender_profile_cache import SenderProfile, \
+    SenderProfileCache
 
 
 
@@ -26,11 +31,84 @@ class TelegramEventHandlerServiceHandler(TelegramEventHandlerService):
         self,
         telethon_service: TelethonClientService,
         mediator: Mediator,
+        sender_profile_cache: Optional[SenderProfileCache] = None,
+        work_queue: Optional[WorkQueue] = None,
     ):
         self._telethon_service = telethon_service
         self._mediator = mediator
+        self._sender_profiles = sender_profile_cache or SenderProfileCache()
+        # Without a queue messages are processed inline on the Telethon update handler
+        self._work_queue = work_queue
+        # Live client per service_uid, used by queue workers to send replies
+        self._clients: Dict[UUID, Any] = {}
+        # Telegram user id of each listener's own account, keyed by service_uid
+        self._identities: Dict[UUID, str] = {}
+        self._identity_hits = 0
+        self._identity_misses = 0
         logger.debug("TelegramEventHandlerServiceImpl initialized.")
 
+    def register_client(self, service_uid: UUID, telethon_client_instance: Any) -> None:
+        self._clients[service_uid] = telethon_client_instance
+
+    def remember_identity(self, service_uid: UUID, me: Any) -> None:
+        if me is not None:
+            self._identities[service_uid] = str(me.id)
+
+    def forget_identity(self, service_uid: UUID) -> None:
+        self._identities.pop(service_uid, None)
+        self._clients.pop(service_uid, None)
+
+    def stats(self) -> Dict[str, int]:
+        sender_stats = self._sender_profiles.stats()
+        return {
+            "identities": len(self._identities),
+            "identity_hits": self._identity_hits,
+            "identity_misses": self._identity_misses,
+            "sender_profiles": sender_stats["size"],
+            "sender_profile_hits": sender_stats["hits"],
+            "sender_profile_misses": sender_stats["misses"],
+            "sender_profile_evictions": sender_stats["evictions"],
+        }
+
+    async def get_own_telegram_id(
+        self, service_uid: UUID, telethon_client_instance: Any, refresh: bool = False
+    ) -> Optional[str]:
+        telegram_id = None if refresh else self._identities.get(service_uid)
+        if telegram_id is not None:
+            self._identity_hits += 1
+            return telegram_id
+        # Normally filled when the listener starts; this covers clients started elsewhere
+        self._identity_misses += 1
+        me = await telethon_client_instance.get_me()
+        self.remember_identity(service_uid, me)
+        return self._identities.get(service_uid)
+
+    async def get_sender_profile(
+        self, event: Any, telethon_client_instance: Any, refresh: bool = False
+    ) -> SenderProfile:
+        sender_id = str(event.sender_id)
+        if not refresh:
+            profile = self._sender_profiles.get(sender_id)
+            if profile is not None:
+                return profile
+        try:
+            if refresh:
+                # get_sender() would answer from the update or Telethon's own cache; this asks Telegram
+                sender_entity = await telethon_client_instance.get_entity(event.sender_id)
+            else:
+                # Telethon often already has the sender from the update itself; only fetch when it does not
+                sender_entity = getattr(event, "sender", None) or await event.get_sender()
+        except Exception as e_get_sender:
+            logger.warning(f"Error getting sender info for sender ID {sender_id}: {e_get_sender}")
+            return SenderProfile()
+        profile = SenderProfile(
+            username=getattr(sender_entity, "username", None),
+            phone=getattr(sender_entity, "phone", None),
+        )
+        if sender_entity is not None:
+            self._sender_profiles.set(sender_id, profile)
+        return profile
+
     async def handle_new_telethon_message(
         self,
         event: Any,  # telethon.events.NewMessage.Event
@@ -58,22 +136,14 @@ class TelegramEventHandlerServiceHandler(TelegramEventHandlerService):
                 return
 
             sender_id_tele = str(event.sender_id)
-            sender_nickname: Optional[str] = None
-            sender_phone: Optional[str] = None
+            sender_profile = await self.get_sender_profile(event, telethon_client_instance)
+            sender_nickname: Optional[str] = sender_profile.username
+            sender_phone: Optional[str] = sender_profile.phone
 
-            try:
-                sender_entity = await event.get_sender()
-                if sender_entity:
-                    sender_nickname = getattr(sender_entity, "username", None)
-                    sender_phone = getattr(sender_entity, "phone", None)
-            except Exception as e_get_sender:
-                logger.warning(f"Error getting sender info for sender ID {sender_id_tele}: {e_get_sender}")
-
-            me = await telethon_client_instance.get_me()
-            if not me:
+            our_bot_telegram_user_id = await self.get_own_telegram_id(service_uid, telethon_client_instance)
+            if not our_bot_telegram_user_id:
                 logger.error("Could not determine 'me' (bot's own TG account). Cannot process.")
                 return
-            our_bot_telegram_user_id = str(me.id)
 
             logger.info(
                 f"Telegram Handler (Bot: {associated_bot_uid}, Service: {service_uid}, TG Account: {our_bot_telegram_user_id}): "
@@ -86,36 +156,93 @@ class TelegramEventHandlerServiceHandler(TelegramEventHandlerService):
             else:
                 message_timestamp = message_timestamp.astimezone(timezone.utc)
 
-            # Create the command to send via mediator
+            # Normally registered when the listener starts; this covers clients started elsewhere
+            self.register_client(service_uid, telethon_client_instance)
+            payload = {
+                "service_uid": str(service_uid),
+                "bot_uid": str(associated_bot_uid),
+                "sender_id": sender_id_tele,
+                "chat_id": event.chat_id,
+                "message_id": event.id,
+                "content": message_text,
+                "timestamp": message_timestamp.isoformat(),
+                "sender_nickname": sender_nickname,
+                "sender_phone": sender_phone,
+            }
+            key = f"{associated_bot_uid}:{sender_id_tele}"
+            if self._work_queue is None:
+                await self.process_queued_message(key, payload)
+                return
+
+            try:
+                # Returns once queued; the LLM call and the reply happen on a queue worker
+                await self._work_queue.submit(key, payload)
+            except WorkQueueFullError:
+                logger.warning(f"Ingestion queue full, rejecting message {event.id} from sender {sender_id_tele}.")
+                await event.reply("I'm receiving a lot of messages right now. Please try again in a moment.")
+
+        except Exception as unexpected_error:
+            logger.error(f"Unexpected error for sender {getattr(event, 'sender_id', 'Unknown')}: {unexpected_error}", exc_info=True)
+            await event.reply("An unexpected error occurred. Our team has been notified.")
+
+    async def process_queued_message(self, key: str, payload: Dict[str, Any]) -> None:
+        """Runs one queued message through ProcessIncomingMessageCommand and replies to it."""
+        service_uid = UUID(payload["service_uid"])
+        sender_id_tele = payload["sender_id"]
+        if service_uid not in self._clients:
+            # Replayed before the listener is back, or the listener stopped here after the message was queued.
+            # Answering now would spend tokens on a reply nobody gets; the queue retries it, then dead-letters it.
+            raise WorkNotReadyError(f"No Telegram client for service {service_uid}; message {payload['message_id']} not processed yet.")
+        try:
             command = ProcessIncomingMessageCommand(
                 platform=ChatPlatform.TELEGRAM,
                 sender_id=sender_id_tele,
-                bot_uid=associated_bot_uid,
-                content=message_text,
-                timestamp=message_timestamp,
-                sender_nickname=sender_nickname,
-                sender_number=sender_phone,
+                bot_uid=UUID(payload["bot_uid"]),
+                content=payload["content"],
+                timestamp=datetime.fromisoformat(payload["timestamp"]),
+                sender_nickname=payload["sender_nickname"],
+                sender_number=payload["sender_phone"],
+                # Used when the bot coalesces bursts: the reply then arrives after the window
+                on_deferred_response=partial(self._deliver_response, service_uid, payload),
+                # Telegram redelivers updates after reconnects; those must not be answered twice
+                external_message_id=str(payload["message_id"]),
             )
 
             response_data: ProcessIncomingMessageResponseDTO = await self._mediator.execute(command)
-
-            # Reply to the Telegram message if AI response generated
-            if response_data.ai_response_generated and response_data.ai_response_content:
-                await event.reply(response_data.ai_response_content)
-            elif response_data.message:
-                await event.reply(response_data.message)
-            elif response_data.ai_response_generated and not response_data.ai_response_content:
-                logger.warning(
-                    f"AI response generated but content missing. Msg UID: {response_data.ai_message_uid}"
-                )
+            if response_data.duplicate:
+                logger.info(f"Message {payload['message_id']} from {sender_id_tele} was already handled; not replying again.")
+            elif not response_data.response_deferred:
+                await self._deliver_response(service_uid, payload, response_data)
 
             logger.debug(f"Message from {sender_id_tele} dispatched via mediator.")
 
         except (ConversationProcessingError, BotNotFoundError) as core_processing_error:
             logger.error(f"Core processing error for sender {sender_id_tele}: {core_processing_error}", exc_info=True)
-            await event.reply("I'm having a little trouble processing that. Please try again soon.")
+            await self._reply(service_uid, payload, "I'm having a little trouble processing that. Please try again soon.")
         except Exception as unexpected_error:
             logger.error(f"Unexpected error for sender {sender_id_tele}: {unexpected_error}", exc_info=True)
-            await event.reply("An unexpected error occurred. Our team has been notified.")
-        except Exception as outer_e:
-            logger.error(f"Critical outer error for sender {getattr(event, 'sender_id', 'Unknown')}: {outer_e}", exc_info=True)
+            await self._reply(service_uid, payload, "An unexpected error occurred. Our team has been notified.")
+
+    async def _deliver_response(
+        self, service_uid: UUID, payload: Dict[str, Any], response_data: ProcessIncomingMessageResponseDTO
+    ) -> None:
+        if response_data.quota_exhausted:
+            # The bot owner has to top up; the customer is not told about it
+            logger.warning(f"Bot quota exhausted; message {payload['message_id']} left unanswered.")
+            return
+        # Reply to the Telegram message if AI response generated
+        if response_data.ai_response_generated and response_data.ai_response_content:
+            await self._reply(service_uid, payload, response_data.ai_response_content)
+        elif response_data.message:
+            await self._reply(service_uid, payload, response_data.message)
+        elif response_data.ai_response_generated and not response_data.ai_response_content:
+            logger.warning(
+                f"AI response generated but content missing. Msg UID: {response_data.ai_message_uid}"
+            )
+
+    async def _reply(self, service_uid: UUID, payload: Dict[str, Any], text: str) -> None:
+        client = self._clients.get(service_uid)
+        if client is None:
+            logger.error(f"No Telegram client for service {service_uid}; dropping reply to message {payload['message_id']}.")
+            return
+        await client.send_message(payload["chat_id"], text, reply_to=payload["message_id"])
@@ -221,6 +221,10 @@ class TelethonClientServiceImpl(TelethonClientService):
                 await client.disconnect()
                 raise TelegramAuthError("Client not authorized to start listener.")
             logger.debug(f"Client connected and authorized for listener (service_uid: {service_uid}).")
+            # Read again on every (re)connect, so a changed account is picked up; messages reuse it
+            await event_handler_service.get_own_telegram_id(service_uid, client, refresh=True)
+            # Before any update arrives, so jobs replayed or handed over after a restart find it
+            event_handler_service.register_client(service_uid, client)
 
             # Handlers are attached to this specific client instance, now associated with service_uid
             # The previous check getattr(client, "_event_handlers_attached_for_bot_uid")
@@ -265,6 +269,7 @@ class TelethonClientServiceImpl(TelethonClientService):
                             logger.error(
                                 f"Error disconnecting client for service_uid {current_service_uid} in listener finally block: {disconn_e}")
 
+                    event_handler_service.forget_identity(current_service_uid)
                     # Clean up from global dicts using service_uid
                     _active_clients.pop(current_service_uid, None)
                     _active_listener_tasks.pop(current_service_uid, None)
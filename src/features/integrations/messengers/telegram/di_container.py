@@ -1,3 +1,5 @@
+from typing import Optional
+
 from dependency_injector import containers, providers
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,6 +13,8 @@ from src.features.integrations.messengers.telegram.application.commands.request_
 from src.features.integrations.messengers.telegram.application.commands.submit_telegram_code.submit_telegram_code_impl import \
     SubmitTelegramCodeCommandHandler
 from src.features.integrations.messengers.telegram.application.event_handlers.stop_telegram_listener_event_handler import StopTelegramListenerHandler
+from src.features.integrations.messengers.telegram.application.queries.get_listener_health.get_listener_health_query_handler import \
+    GetTelegramListenerHealthQueryHandler
 from src.features.integrations.messengers.telegram.application.services.telegram_event_handler_service_impl import \
     TelegramEventHandlerServiceHandler
 from src.features.integrations.messengers.telegram.application.services.telethon_client_service_impl import \
@@ -18,7 +22,14 @@ from src.features.integrations.messengers.telegram.application.services.telethon
 from src.features.integrations.messengers.telegram.domain.uow.telegram_unit_of_work import TelegramUnitOfWork
 from src.features.integrations.messengers.telegram.infra.persistence.uow.telegram_unit_of_work_impl import \
     SQLAlchemyTelegramUnitOfWork
+from src.features.integrations.messengers.telegram.infra.services.sender_profile_cache import SenderProfileCache
+from src.features.integrations.messengers.telegram.infra.services.telegram_listener_supervisor import \
+    TelegramListenerSupervisor
 from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
+from src.infra.services.queue.keyed_work_queue import KeyedWorkQueue
+from src.infra.services.queue.redis_stream_work_queue import RedisStreamWorkQueue
+from src.infra.services.queue.work_queue import WorkQueue
+from src.infra.services.redis.redis_lease import RedisLeaseManager
 
 
 
@@ -48,10 +59,71 @@ class TelegramContainer(containers.DeclarativeContainer):
         settings=config.provided,
     )
 
+    sender_profile_cache = providers.Singleton(
+        SenderProfileCache,
+        ttl_seconds=config.provided.TELEGRAM_SENDER_PROFILE_TTL_SECONDS,
+        max_size=config.provided.TELEGRAM_SENDER_PROFILE_CACHE_SIZE,
+    )
+
+    @staticmethod
+    def create_ingestion_queue(settings: Settings) -> Optional[WorkQueue]:
+        if settings.TELEGRAM_INGESTION_BACKEND == "inline":
+            return None
+        if settings.TELEGRAM_INGESTION_BACKEND == "redis":
+            return RedisStreamWorkQueue(
+                name="telegram_ingestion",
+                stream_prefix=settings.TELEGRAM_INGESTION_STREAM_PREFIX,
+                namespace=settings.TELEGRAM_INGESTION_STREAM_NAMESPACE,
+                partitions=settings.TELEGRAM_INGESTION_WORKERS,
+                max_pending_per_partition=settings.TELEGRAM_INGESTION_MAX_PENDING_PER_PARTITION,
+                # Replies go out through the account's client, which lives in one process
+                route_by="service_uid",
+                route_ttl_seconds=settings.TELEGRAM_INGESTION_ROUTE_TTL_SECONDS,
+                submit_timeout=settings.TELEGRAM_INGESTION_SUBMIT_TIMEOUT,
+            )
+        return KeyedWorkQueue(
+            name="telegram_ingestion",
+            workers=settings.TELEGRAM_INGESTION_WORKERS,
+            max_pending=settings.TELEGRAM_INGESTION_MAX_PENDING,
+            max_pending_per_key=settings.TELEGRAM_INGESTION_MAX_PENDING_PER_CONVERSATION,
+            submit_timeout=settings.TELEGRAM_INGESTION_SUBMIT_TIMEOUT,
+        )
+
+    ingestion_queue = providers.Singleton(create_ingestion_queue, settings=config.provided)
+
     telegram_event_handler_service = providers.Singleton(
         TelegramEventHandlerServiceHandler,
         telethon_service=telethon_service,
         mediator=mediator,
+        sender_profile_cache=sender_profile_cache,
+        work_queue=ingestion_queue,
+    )
+
+    @staticmethod
+    def create_listener_lease_manager(use_redis: bool, ttl_seconds: int) -> Optional[RedisLeaseManager]:
+        if not use_redis:
+            return None
+        return RedisLeaseManager(key_prefix="telegram:listener:", ttl_seconds=ttl_seconds)
+
+    listener_lease_manager = providers.Singleton(
+        create_listener_lease_manager,
+        use_redis=config.provided.TELEGRAM_LISTENER_USE_REDIS_LEASES,
+        ttl_seconds=config.provided.TELEGRAM_LISTENER_LEASE_TTL_SECONDS,
+    )
+
+    listener_supervisor = providers.Singleton(
+        TelegramListenerSupervisor,
+        telethon_service=telethon_service,
+        event_handler_service=telegram_event_handler_service,
+        unit_of_work_factory=telegram_unit_of_work.provider,
+        bot_platform_linker_service=bot_platform_linker_service,
+        lease_manager=listener_lease_manager,
+        batch_size=config.provided.TELEGRAM_LISTENER_RESTORE_BATCH_SIZE,
+        max_concurrent_starts=config.provided.TELEGRAM_LISTENER_MAX_CONCURRENT_STARTS,
+        backoff_base=config.provided.TELEGRAM_LISTENER_BACKOFF_BASE,
+        backoff_max=config.provided.TELEGRAM_LISTENER_BACKOFF_MAX,
+        stable_after=config.provided.TELEGRAM_LISTENER_STABLE_AFTER,
+        sync_interval=config.provided.TELEGRAM_LISTENER_SYNC_INTERVAL,
     )
 
     # === Commands ===
@@ -70,7 +142,7 @@ class TelegramContainer(containers.DeclarativeContainer):
         _unit_of_work=telegram_unit_of_work,
         _telethon_service=telethon_service,
         _bot_platform_linker_service=bot_platform_linker_service,
-        _event_handler_service=telegram_event_handler_service,
+        _listener_supervisor=listener_supervisor,
         _bot_access_service=bot_access_service,
         _mediator=mediator,
         _allowed_roles=["admin", "owner"],
@@ -81,11 +153,19 @@ class TelegramContainer(containers.DeclarativeContainer):
         _unit_of_work=telegram_unit_of_work,
         _bot_access_service=bot_access_service,
         _mediator=mediator,
-        _telethon_service=telethon_service,
-        _event_handler_service=telegram_event_handler_service,
+        _listener_supervisor=listener_supervisor,
         _allowed_roles=["admin", "owner"],
     )
 
+    # === Queries ===
+
+    get_listener_health_query_handler = providers.Factory(
+        GetTelegramListenerHealthQueryHandler,
+        _listener_supervisor=listener_supervisor,
+        _event_handler_service=telegram_event_handler_service,
+        _ingestion_queue=ingestion_queue,
+    )
+
     # === Events ===
 
     stop_telegram_event_handler = providers.Factory(
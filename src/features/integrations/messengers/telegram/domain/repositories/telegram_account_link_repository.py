@@ -1,6 +1,7 @@
 # src/features/integrations/telegram/domain/repositories/telegram_account_link_repository.py
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
@@ -39,4 +40,17 @@ class TelegramAccountLinkRepository(BaseRepository[TelegramAccountLinkEntity]):
         """Finds all account links with active sessions, for session resumption."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_active_sessions_page(self, after_uid: Optional[UUID], limit: int) -> List[TelegramAccountLinkEntity]:
+        """
+        Like find_all_active_sessions, one batch at a time: up to `limit` links
+        ordered by uid, starting after `after_uid`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mark_connected(self, uid: UUID, connected_at: datetime) -> None:
+        """Records when the listener of a link last connected, without loading the link."""
+        raise NotImplementedError
+
     # create, update, delete_by_uid, find_by_uid are inherited from BaseRepository
@@ -2,13 +2,14 @@
 
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
+from datetime import datetime
 from uuid import UUID
 from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy import delete # Import delete
+from sqlalchemy import delete, update # Import delete
 
 # Import domain interface and entity
 from src.features.integrations.messengers.telegram.domain.repositories.telegram_account_link_repository import TelegramAccountLinkRepository
@@ -17,6 +18,7 @@ from src.features.integrations.messengers.telegram.domain.entities.telegram_acco
 # Import infrastructure components
 from src.features.integrations.messengers.telegram.infra.persistence.models.telegram_account_link import TelegramAccountLinkORM
 from src.features.integrations.messengers.telegram.infra.mappers.telegram_account_link_mapper import TelegramAccountLinkMapper
+from src.infra.persistence.returning import insert_returning
 
 # Import custom exceptions if needed
 from src.features.integrations.messengers.telegram.exceptions.telegram_exceptions import TelegramLinkNotFoundError, TelegramLinkAlreadyExistsError # Define these
@@ -38,10 +40,8 @@ class SQLAlchemyTelegramAccountLinkRepository(TelegramAccountLinkRepository):
         orm_obj = self._mapper.from_entity(entity)
         if not orm_obj:
              raise ValueError("Failed to map TelegramAccountLinkEntity to ORM for creation.")
-        self._session.add(orm_obj)
         try:
-            await self._session.flush()
-            await self._session.refresh(orm_obj) # Get DB defaults
+            orm_obj = await insert_returning(self._session, orm_obj) # DB defaults come back via RETURNING
             logger.info(f"Created TelegramAccountLink for bot {entity.bot_uid}, phone {entity.phone_number}")
             return self._mapper.to_entity(orm_obj)
         except IntegrityError as e:
@@ -124,3 +124,21 @@ class SQLAlchemyTelegramAccountLinkRepository(TelegramAccountLinkRepository):
         result = await self._session.execute(stmt)
         return [self._mapper.to_entity(orm) for orm in result.scalars().all() if orm]
 
+    async def find_active_sessions_page(self, after_uid: Optional[UUID], limit: int) -> List[TelegramAccountLinkEntity]:
+        stmt = (
+            select(TelegramAccountLinkORM)
+            .where(TelegramAccountLinkORM.is_active == True, TelegramAccountLinkORM.session_string.isnot(None))
+            .order_by(TelegramAccountLinkORM.uid)
+            .limit(limit)
+        )
+        if after_uid is not None:
+            stmt = stmt.where(TelegramAccountLinkORM.uid > after_uid)
+        result = await self._session.execute(stmt)
+        return [self._mapper.to_entity(orm) for orm in result.scalars().all() if orm]
+
+    async def mark_connected(self, uid: UUID, connected_at: datetime) -> None:
+        await self._session.execute(
+            update(TelegramAccountLinkORM)
+            .where(TelegramAccountLinkORM.uid == uid)
+            .values(last_connected_at=connected_at)
+        )
@@ -0,0 +1,59 @@
+# src/features/integrations/messengers/telegram/infra/services/sender_profile_cache.py
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class SenderProfile:
+    username: Optional[str] = None
+    phone: Optional[str] = None
+
+
+class SenderProfileCache:
+    """
+    Bounded in-process LRU of Telegram sender profiles keyed by sender_id.
+
+    Profiles rarely change, so a hit saves a get_sender() round trip on the
+    incoming message path; entries expire after `ttl_seconds` so a renamed user
+    is picked up eventually. Telegram ids are global, so every listener in the
+    process shares one cache.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, max_size: int = 10000) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, SenderProfile]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, sender_id: str) -> Optional[SenderProfile]:
+        entry = self._entries.get(sender_id)
+        if entry is not None:
+            expires_at, profile = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(sender_id)
+                self.hits += 1
+                return profile
+            del self._entries[sender_id]
+        self.misses += 1
+        return None
+
+    def set(self, sender_id: str, profile: SenderProfile) -> None:
+        self._entries[sender_id] = (time.monotonic() + self._ttl_seconds, profile)
+        self._entries.move_to_end(sender_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
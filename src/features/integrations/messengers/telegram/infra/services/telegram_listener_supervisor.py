@@ -0,0 +1,310 @@
+# src/features/integrations/messengers/telegram/infra/services/telegram_listener_supervisor.py
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Set
+from uuid import UUID
+
+from src.features.bot.application.services.bot_platform_linker_service import BotPlatformLinkerService
+from src.features.conversation.domain.enums import ChatPlatform
+from src.features.integrations.messengers.telegram.application.services.telegram_event_handler_service import \
+    TelegramEventHandlerService
+from src.features.integrations.messengers.telegram.application.services.telethon_client_service import \
+    TelethonClientService
+from src.features.integrations.messengers.telegram.domain.entities.telegram_account_link_entity import \
+    TelegramAccountLinkEntity
+from src.features.integrations.messengers.telegram.domain.uow.telegram_unit_of_work import TelegramUnitOfWork
+from src.features.integrations.messengers.telegram.exceptions.telegram_exceptions import TelegramAuthError
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.redis.redis_lease import RedisLeaseManager
+
+logger = async_logger
+
+
+class ListenerState(str, Enum):
+    STARTING = "starting"
+    CONNECTED = "connected"
+    BACKOFF = "backoff"
+    UNAUTHORIZED = "unauthorized"
+    STOPPED = "stopped"
+
+
+@dataclass
+class ListenerHealth:
+    link_uid: UUID
+    bot_uid: UUID
+    service_uid: UUID
+    state: ListenerState = ListenerState.STARTING
+    failed_attempts: int = 0  # Consecutive, reset once a connection stays up
+    reconnects: int = 0
+    last_connected_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    next_retry_at: Optional[datetime] = None
+
+
+@dataclass
+class _SupervisedListener:
+    link: TelegramAccountLinkEntity
+    health: ListenerHealth
+    task: Optional[asyncio.Task] = None
+
+
+class TelegramListenerSupervisor:
+    """
+    Keeps a Telethon listener running for every active Telegram account link.
+
+    A periodic sync walks the active links in batches and starts the ones that
+    are not supervised yet, never more than `max_concurrent_starts` connecting
+    at once. Every listener runs inside its own loop that reconnects with
+    jittered exponential backoff and records last_connected_at. With several
+    workers, each link is guarded by a Redis lease, so an account is listened to
+    by exactly one process; leases are renewed on every sync and picked up by
+    another worker when their owner stops renewing them. A renewal that fails
+    because Redis is unreachable keeps the listener only until the lease TTL has
+    passed since the last successful renewal, since by then another worker may
+    have taken the link over.
+    """
+
+    def __init__(
+        self,
+        telethon_service: TelethonClientService,
+        event_handler_service: TelegramEventHandlerService,
+        unit_of_work_factory: Callable[[], TelegramUnitOfWork],
+        bot_platform_linker_service: BotPlatformLinkerService,
+        lease_manager: Optional[RedisLeaseManager] = None,
+        batch_size: int = 100,
+        max_concurrent_starts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        stable_after: float = 60.0,
+        sync_interval: float = 15.0,
+    ) -> None:
+        self._telethon_service = telethon_service
+        self._event_handler_service = event_handler_service
+        self._unit_of_work_factory = unit_of_work_factory
+        self._bot_platform_linker_service = bot_platform_linker_service
+        self._lease_manager = lease_manager
+        self._batch_size = batch_size
+        self._start_slots = asyncio.Semaphore(max_concurrent_starts)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._stable_after = stable_after
+        self._sync_interval = sync_interval
+        self._listeners: Dict[UUID, _SupervisedListener] = {}
+        self._renewed_at: Dict[UUID, float] = {}  # monotonic time of the last successful acquire/renew
+        self._sync_task: Optional[asyncio.Task] = None
+
+    @property
+    def owner_id(self) -> Optional[str]:
+        return self._lease_manager.owner_id if self._lease_manager else None
+
+    async def start(self) -> None:
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+            logger.info("TelegramListenerSupervisor: started.")
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+            self._sync_task = None
+        for link_uid in list(self._listeners):
+            await self.unwatch(link_uid)
+        logger.info("TelegramListenerSupervisor: stopped.")
+
+    def health(self) -> List[ListenerHealth]:
+        return [replace(listener.health) for listener in self._listeners.values()]
+
+    async def watch(self, link: TelegramAccountLinkEntity, service_uid: Optional[UUID] = None) -> bool:
+        """
+        Supervises the listener of a link in this process, replacing one that runs
+        with an outdated session or bot. Returns False if another worker holds the link.
+        """
+        current = self._listeners.get(link.uid)
+        if current is not None:
+            if self._is_current(current, link) and current.health.state != ListenerState.UNAUTHORIZED:
+                return True
+            await self.unwatch(link.uid)
+
+        if not await self._acquire(link.uid):
+            logger.debug(f"TelegramListenerSupervisor: link {link.uid} is held by another worker.")
+            return False
+
+        if service_uid is None:
+            service_uids = await self._bot_platform_linker_service.find_active_service_uids(
+                ChatPlatform.TELEGRAM, [link.uid]
+            )
+            service_uid = service_uids.get(link.uid, link.uid)
+
+        listener = _SupervisedListener(
+            link=link,
+            health=ListenerHealth(link_uid=link.uid, bot_uid=link.bot_uid, service_uid=service_uid),
+        )
+        listener.task = asyncio.create_task(self._supervise(listener))
+        self._listeners[link.uid] = listener
+        return True
+
+    async def unwatch(self, link_uid: UUID) -> None:
+        """Stops supervising a link here and gives up its lease."""
+        listener = self._listeners.pop(link_uid, None)
+        self._renewed_at.pop(link_uid, None)
+        if listener is None:
+            return
+        if listener.task is not None and not listener.task.done():
+            listener.task.cancel()
+            await asyncio.gather(listener.task, return_exceptions=True)
+        if self._lease_manager is not None:
+            await self._lease_manager.release(str(link_uid))
+
+    async def sync(self) -> None:
+        """
+        One pass over the active links: start the unsupervised ones, restart those
+        whose session changed, renew leases and drop links that are no longer active.
+        """
+        seen: Set[UUID] = set()
+        after_uid: Optional[UUID] = None
+        while True:
+            async with self._unit_of_work_factory() as uow:
+                links = await uow.account_link_repository.find_active_sessions_page(after_uid, self._batch_size)
+            if not links:
+                break
+            after_uid = links[-1].uid
+            seen.update(link.uid for link in links)
+
+            pending = [
+                link for link in links
+                if link.uid not in self._listeners or not self._is_current(self._listeners[link.uid], link)
+            ]
+            if pending:
+                service_uids = await self._bot_platform_linker_service.find_active_service_uids(
+                    ChatPlatform.TELEGRAM, [link.uid for link in pending]
+                )
+                for link in pending:
+                    await self.watch(link, service_uids.get(link.uid, link.uid))
+            if len(links) < self._batch_size:
+                break
+
+        for link_uid in list(self._listeners):
+            if link_uid not in seen:
+                logger.info(f"TelegramListenerSupervisor: link {link_uid} is no longer active, stopping its listener.")
+                await self.unwatch(link_uid)
+            elif not await self._renew(link_uid):
+                logger.warning(f"TelegramListenerSupervisor: lost the lease on link {link_uid}, stopping its listener.")
+                self._listeners[link_uid].task.cancel()
+                self._listeners.pop(link_uid, None)
+                self._renewed_at.pop(link_uid, None)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"TelegramListenerSupervisor: sync failed: {e}", exc_info=True)
+            # Jittered so that workers started together do not sync in lockstep
+            await asyncio.sleep(self._sync_interval * random.uniform(0.8, 1.2))
+
+    async def _supervise(self, listener: _SupervisedListener) -> None:
+        link, health = listener.link, listener.health
+        try:
+            while True:
+                connected_since: Optional[float] = None
+                try:
+                    async with self._start_slots:
+                        health.state = ListenerState.STARTING
+                        listener_task = await self._telethon_service.start_message_listener(
+                            service_uid=health.service_uid,
+                            session_string=link.session_string,
+                            bot_uid=link.bot_uid,
+                            event_handler_service=self._event_handler_service,
+                        )
+                    connected_since = time.monotonic()
+                    await self._on_connected(health)
+                    # Returns once the client disconnects or its run loop crashes
+                    await listener_task
+                    health.last_error = "disconnected"
+                except TelegramAuthError as e:
+                    health.state = ListenerState.UNAUTHORIZED
+                    health.last_error = str(e)
+                    logger.error(f"TelegramListenerSupervisor: link {link.uid} is not authorized, giving up: {e}")
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    health.last_error = str(e)
+
+                if connected_since is not None and time.monotonic() - connected_since >= self._stable_after:
+                    health.failed_attempts = 0
+                health.failed_attempts += 1
+                delay = self._backoff_delay(health.failed_attempts)
+                health.state = ListenerState.BACKOFF
+                health.next_retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                logger.warning(
+                    f"TelegramListenerSupervisor: listener for link {link.uid} stopped ({health.last_error}); "
+                    f"reconnecting in {delay:.1f}s (attempt {health.failed_attempts})"
+                )
+                await asyncio.sleep(delay)
+        finally:
+            if health.state != ListenerState.UNAUTHORIZED:
+                health.state = ListenerState.STOPPED
+            try:
+                await self._telethon_service.stop_message_listener(health.service_uid)
+            except Exception as e:
+                logger.error(f"TelegramListenerSupervisor: failed to stop listener for link {link.uid}: {e}")
+
+    async def _on_connected(self, health: ListenerHealth) -> None:
+        if health.last_connected_at is not None:
+            health.reconnects += 1
+        health.state = ListenerState.CONNECTED
+        health.last_connected_at = datetime.now(timezone.utc)
+        health.last_error = None
+        health.next_retry_at = None
+        try:
+            async with self._unit_of_work_factory() as uow:
+                await uow.account_link_repository.mark_connected(health.link_uid, health.last_connected_at)
+        except Exception as e:
+            logger.warning(f"TelegramListenerSupervisor: failed to record last_connected_at for {health.link_uid}: {e}")
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter: uniform in [cap / 2, cap]."""
+        cap = min(self._backoff_max, self._backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(cap / 2, cap)
+
+    @staticmethod
+    def _is_current(listener: _SupervisedListener, link: TelegramAccountLinkEntity) -> bool:
+        return listener.link.session_string == link.session_string and listener.link.bot_uid == link.bot_uid
+
+    async def _acquire(self, link_uid: UUID) -> bool:
+        if self._lease_manager is None:
+            return True
+        try:
+            acquired = await self._lease_manager.acquire(str(link_uid))
+        except Exception as e:
+            logger.warning(f"TelegramListenerSupervisor: lease acquisition failed for {link_uid}: {e}")
+            return False
+        if acquired:
+            self._renewed_at[link_uid] = time.monotonic()
+        return acquired
+
+    async def _renew(self, link_uid: UUID) -> bool:
+        if self._lease_manager is None:
+            return True
+        try:
+            renewed = await self._lease_manager.renew(str(link_uid))
+        except Exception as e:
+            # Redis being briefly unreachable should not tear down healthy listeners, but once
+            # the lease TTL has run out since the last renewal the lease may belong to another worker
+            elapsed = time.monotonic() - self._renewed_at.get(link_uid, float("-inf"))
+            logger.warning(
+                f"TelegramListenerSupervisor: lease renewal failed for {link_uid} "
+                f"({elapsed:.1f}s since the last renewal): {e}"
+            )
+            return elapsed < self._lease_manager.ttl_seconds
+        if renewed:
+            self._renewed_at[link_uid] = time.monotonic()
+        return renewed
@@ -33,5 +33,5 @@ class PaymentORM(SQLAlchemyBase):
     bot: Mapped["BotORM"] = relationship(
          "src.features.bot.infra.persistence.models.bot.BotORM",
         back_populates="payments",
-        lazy="selectin"
+        lazy="raise"
     )
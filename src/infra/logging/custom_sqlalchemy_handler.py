@@ -2,13 +2,16 @@
 
 import asyncio
 import logging
+import sys
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional, Union
+from typing import Deque, Dict, List, Optional, Union
 
 from aiologger.formatters.base import Formatter  # Aiologger's base formatter
 from aiologger.handlers.base import Handler  # Base handler from aiologger
 from aiologger.levels import LogLevel
 from aiologger.records import LogRecord
+from sqlalchemy import insert
 
 # Assuming your async session maker is here
 from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
@@ -16,15 +19,16 @@ from src.infra.persistence.connection.sqlalchemy_engine import AsyncSessionLocal
 from src.infra.persistence.models.log_orm import LogEntryORM
 
 
-# Assuming your async engine is here (passed to handler)
-
 class CustomSQLAlchemyHandler(Handler):
     """
     A custom asynchronous logging handler that writes log records to a database
     using SQLAlchemy's asyncio capabilities.
 
-    This implementation uses AsyncSessionLocal to get a new session for each log entry,
-    ensuring non-blocking and isolated database writes.
+    emit() never touches the database: formatted records are appended to a bounded
+    in-memory buffer and a single background writer task flushes them with one
+    multi-row INSERT once `batch_size` records are pending or every
+    `flush_interval` seconds. When the buffer is full new records are dropped and
+    counted, so logging can never block or fail a request. close() drains the rest.
     """
 
     def __init__(
@@ -33,9 +37,9 @@ class CustomSQLAlchemyHandler(Handler):
         formatter: Optional[Formatter] = None,
         # We need the async session maker to create sessions for logging
         async_session_maker=AsyncSessionLocal, # Use the imported AsyncSessionLocal as default
-        # No need to explicitly pass engine if session_maker is already bound to it,
-        # but could be useful if you wanted to pass a different engine for logging.
-        # engine: AsyncEngine = global_async_engine # Example if passing engine separately
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer_size: int = 10_000,
     ) -> None:
         super().__init__(level=level)
         self.async_session_maker = async_session_maker
@@ -44,57 +48,126 @@ class CustomSQLAlchemyHandler(Handler):
         else:
             self.formatter = formatter
 
-        self._initialization_lock = asyncio.Lock() # For potential future persistent connection needs
-        self._initialized = False # Tracks if any setup (like connection check) has run
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+
+        self._buffer: Deque[Dict] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+        self._initialized = False # True while the background writer is running
+
+        # Counters, exposed via stats()
+        self.written_records = 0
+        self.dropped_records = 0
+        self.failed_batches = 0
 
     @property
     def initialized(self) -> bool:
         """Indicates if the handler is ready to emit logs."""
         return self._initialized
 
+    def stats(self) -> Dict[str, int]:
+        """Buffer and write counters of the sink."""
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written_records,
+            "dropped": self.dropped_records,
+            "failed_batches": self.failed_batches,
+        }
+
     async def emit(self, record: LogRecord) -> None:
         """
-        Asynchronously writes the log record to the database.
+        Buffers the log record; the background writer persists it.
         """
         if not self.filter(record): # Apply filters first
             return
 
-        # Acquire a new asynchronous session for this log entry
-        async with self.async_session_maker() as session:
-            try:
-                formatted_message = self.formatter.format(record)
-                log_entry = LogEntryORM(
-                    log_level=record.levelname,
-                    source=record.name or record.module,
-                    message=formatted_message,
-                    timestamp=datetime.fromtimestamp(record.created, tz=timezone.utc)
-                )
+        if self._closing or len(self._buffer) >= self.max_buffer_size:
+            self.dropped_records += 1
+            return
 
-                session.add(log_entry)
+        try:
+            formatted_message = self.formatter.format(record)
+        except Exception as exc:
+            await self.handle_error(record, exc)
+            return
 
-                # YOU MUST UNCOMMENT THIS LINE TO SAVE THE LOG
-                await session.commit()
+        self._buffer.append({
+            "log_level": record.levelname,
+            "source": record.name or record.module,
+            "message": formatted_message,
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc),
+        })
+
+        self._ensure_writer()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
 
+    def _ensure_writer(self) -> None:
+        """Starts the background writer on first use, inside the running event loop."""
+        if self._writer_task is not None and not self._writer_task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._writer_task = asyncio.get_running_loop().create_task(self._run_writer())
+        self._initialized = True
+
+    async def _run_writer(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._write_pending()
+
+    async def _write_pending(self) -> None:
+        """Writes everything buffered so far, `batch_size` rows per INSERT."""
+        if self._write_lock is None:
+            return
+        async with self._write_lock:
+            while self._buffer:
+                batch: List[Dict] = [
+                    self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: List[Dict]) -> None:
+        async with self.async_session_maker() as session:
+            try:
+                # executemany-style insert is sent as multi-row INSERT statements
+                await session.execute(insert(LogEntryORM), batch)
+                await session.commit()
+                self.written_records += len(batch)
             except Exception as exc:
                 await session.rollback()
-                # Handle the error, typically by logging to stderr or another fallback handler
-                await self.handle_error(record, exc)
+                self.failed_batches += 1
+                self.dropped_records += len(batch)
+                # Can't log through ourselves here; report on stderr like aiologger's fallback
+                sys.stderr.write(f"CustomSQLAlchemyHandler: failed to write {len(batch)} log records: {exc!r}\n")
 
     async def flush(self) -> None:
         """
-        No explicit flush needed for per-request session model.
+        Writes all buffered records immediately.
         """
-        pass # The commit takes care of flushing
+        await self._write_pending()
 
     async def close(self) -> None:
         """
-        Clean up resources.
+        Stops the writer and drains the buffer.
         """
-        # For a per-session handler, there's no long-lived connection to close here.
-        # The sessions are closed automatically by the 'async with' block.
-        # If there were a persistent connection pool managed by the handler, it would be closed here.
+        self._closing = True
+        if self._writer_task is not None and not self._writer_task.done():
+            self._wakeup.set()
+            try:
+                await self._writer_task
+            except Exception as exc:
+                sys.stderr.write(f"CustomSQLAlchemyHandler: writer task failed: {exc!r}\n")
+        await self._write_pending()
         self._initialized = False # Reset state
         # Remove the handler from the root logger's list if it's still there
         if self in logging.getLogger().handlers:
             logging.getLogger().removeHandler(self)
-
@@ -1,5 +1,6 @@
 # src/infra/logging/setup_async_logging.py
 
+import asyncio
 import logging
 # Import the custom handler
 from src.infra.logging.custom_sqlalchemy_handler import CustomSQLAlchemyHandler
@@ -16,17 +17,29 @@ from aiologger.levels import LogLevel
 async_logger = Logger(name='', level=LogLevel.NOTSET)
 
 
-def setup_async_logging(external_library_level_log: str, log_level: str):
+def setup_async_logging(
+    external_library_level_log: str,
+    log_level: str,
+    db_batch_size: int = 500,
+    db_flush_interval: float = 1.0,
+    db_max_buffer_size: int = 10_000,
+):
     """
     Sets up the asynchronous database logging handler using your CustomSQLAlchemyHandler,
     and configures aiologger's Logger instance.
     Args:
         external_library_level_log: Log level for external libraries (e.g., 'WARNING').
         log_level: Global log level for internal application logs (e.g., 'INFO').
+        db_batch_size: Max rows per INSERT written by the database handler.
+        db_flush_interval: Seconds between flushes of a partially filled buffer.
+        db_max_buffer_size: Records kept in memory before new ones are dropped.
     """
     # Instantiate your custom handler
     db_handler = CustomSQLAlchemyHandler(
         level=logging.getLevelName(log_level), # Set the minimum level for this handler
+        batch_size=db_batch_size,
+        flush_interval=db_flush_interval,
+        max_buffer_size=db_max_buffer_size,
     )
 
     # Add the handler to the aiologger instance
@@ -63,3 +76,13 @@ def setup_async_logging(external_library_level_log: str, log_level: str):
     # logging.getLogger().propagate = False # Disable propagation to root logger if you want full aiologger control
 
     async_logger.info("FastAPI: Custom Async Database Logging Handler Prepared.")
+
+
+async def shutdown_async_logging():
+    """
+    Flushes and closes the aiologger handlers; the database handler drains its buffer.
+    Call this last during application shutdown.
+    """
+    # Let log calls made just before shutdown reach the handler's buffer first
+    await asyncio.sleep(0)
+    await async_logger.shutdown()
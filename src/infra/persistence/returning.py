@@ -0,0 +1,63 @@
+# src/infra/persistence/returning.py
+
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import insert, inspect, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ORMType = TypeVar("ORMType")
+
+
+def column_values(orm_obj: Any) -> Dict[str, Any]:
+    """
+    The column attributes of a transient ORM instance, as INSERT parameters.
+
+    None is dropped for columns that have a default or server default, the same
+    way a flush leaves them out, so uid/created_at/updated_at are generated.
+    """
+    mapper = inspect(type(orm_obj))
+    values: Dict[str, Any] = {}
+    for attr in mapper.column_attrs:
+        value = getattr(orm_obj, attr.key, None)
+        column = attr.columns[0]
+        if value is None and (column.default is not None or column.server_default is not None):
+            continue
+        values[attr.key] = value
+    return values
+
+
+async def insert_returning(session: AsyncSession, orm_obj: ORMType) -> ORMType:
+    """INSERT … RETURNING: persists one row and loads its server state in the same round trip."""
+    orm_cls = type(orm_obj)
+    statement = insert(orm_cls).values(**column_values(orm_obj)).returning(orm_cls)
+    return (await session.scalars(statement)).one()
+
+
+async def insert_many_returning(session: AsyncSession, orm_objs: Sequence[ORMType]) -> List[ORMType]:
+    """Bulk INSERT … RETURNING for rows of one ORM class, in input order."""
+    if not orm_objs:
+        return []
+    orm_cls = type(orm_objs[0])
+    # Rows with different key sets are batched separately by the ORM bulk INSERT
+    rows = [column_values(orm_obj) for orm_obj in orm_objs]
+    result = await session.scalars(insert(orm_cls).returning(orm_cls, sort_by_parameter_order=True), rows)
+    return list(result.all())
+
+
+async def update_returning(
+    session: AsyncSession, orm_cls: Type[ORMType], uid: UUID, values: Dict[str, Any]
+) -> Optional[ORMType]:
+    """
+    Targeted UPDATE … RETURNING by primary key, without reading the row first.
+
+    Column onupdate defaults (updated_at) apply as in a flush. None means no row
+    has that uid.
+    """
+    statement = (
+        update(orm_cls)
+        .where(orm_cls.uid == uid)
+        .values(**values)
+        .returning(orm_cls)
+    )
+    return (await session.scalars(statement)).one_or_none()
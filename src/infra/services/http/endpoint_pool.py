@@ -0,0 +1,339 @@
+# src/infra/services/http/endpoint_pool.py
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Collection, Deque, Dict, List, Optional, Sequence, TypeVar
+
+import aiohttp
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+T = TypeVar("T")
+
+# Statuses worth trying again, possibly on another endpoint
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class EndpointUnavailableError(Exception):
+    """No endpoint can take a request right now: every circuit is open."""
+
+
+class BackendCallError(Exception):
+    """One call to an endpoint failed; `retryable` tells whether another attempt may succeed."""
+
+    def __init__(self, url: str, status: Optional[int], detail: str, retryable: bool):
+        self.url = url
+        self.status = status
+        self.detail = detail
+        self.retryable = retryable
+        super().__init__(f"{url} failed ({status if status is not None else 'no response'}): {detail}")
+
+    @classmethod
+    def from_status(cls, url: str, status: int, detail: str) -> "BackendCallError":
+        return cls(url, status, detail, retryable=status in RETRYABLE_STATUSES)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops sending to an endpoint after `failure_threshold` consecutive failures.
+    After `reset_timeout` seconds a single probe request is let through: its
+    success closes the circuit again, its failure keeps it open for another
+    `reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; in half-open state this claims the one probe."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state is not CircuitState.OPEN:
+                self.times_opened += 1
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """Gives back a probe whose request ended without a verdict (e.g. it was cancelled)."""
+        self._probing = False
+
+
+class Endpoint:
+    """One backend URL with its circuit breaker and health figures."""
+
+    # Weight of the newest sample in the moving averages
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, url: str, breaker: CircuitBreaker) -> None:
+        self.url = url
+        self.breaker = breaker
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency_ewma: Optional[float] = None
+        # Moving share of successful calls, 1.0 for a healthy endpoint
+        self.success_ewma = 1.0
+
+    def score(self, default_latency: float) -> float:
+        """Expected cost of sending one more request here; lower is better."""
+        latency = self.latency_ewma if self.latency_ewma is not None else default_latency
+        return (latency + 0.001) * (self.in_flight + 1) / max(self.success_ewma, 0.05)
+
+    def record_success(self, latency: Optional[float]) -> None:
+        self.breaker.record_success()
+        self.success_ewma += self.EWMA_ALPHA * (1.0 - self.success_ewma)
+        if latency is not None:
+            self.latency_ewma = latency if self.latency_ewma is None else \
+                self.latency_ewma + self.EWMA_ALPHA * (latency - self.latency_ewma)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.breaker.record_failure()
+        self.success_ewma -= self.EWMA_ALPHA * self.success_ewma
+
+
+class EndpointPool:
+    """
+    Spreads calls over interchangeable backend endpoints.
+
+    Each call goes to the endpoint with the lowest score (recent latency times
+    requests in flight, penalised by the recent error share) among those whose
+    circuit lets it through. call() retries retryable failures with full-jitter
+    exponential backoff, and with hedging enabled fires a second request at
+    another endpoint when the first has not answered within the recent p95
+    latency (or `hedge_min_delay`, if that is set and longer), keeping
+    whichever answers first. Only idempotent calls may be
+    retried or hedged; the caller says which calls are.
+
+    Health and latency figures are per worker process.
+    """
+
+    # Number of recent successful latencies kept for the hedging delay
+    LATENCY_SAMPLES = 512
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        request_timeout: float = 60.0,
+        max_attempts: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedging: bool = False,
+        hedge_min_delay: float = 0.0,
+        hedge_min_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not urls:
+            raise ValueError("EndpointPool needs at least one URL")
+        self.endpoints: List[Endpoint] = [
+            Endpoint(url, CircuitBreaker(failure_threshold, reset_timeout, clock)) for url in dict.fromkeys(urls)
+        ]
+        self.request_timeout = request_timeout
+        self.max_attempts = max(1, max_attempts)
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._hedging = hedging
+        self._hedge_min_delay = hedge_min_delay
+        self._hedge_min_samples = hedge_min_samples
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._retries = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._exhausted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self._retries,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+            "exhausted": self._exhausted,
+            "latency_p95_ms": round(self._percentile(0.95) * 1000, 1),
+            "endpoints": {
+                endpoint.url: {
+                    "state": endpoint.breaker.state.value,
+                    "in_flight": endpoint.in_flight,
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "circuit_opened": endpoint.breaker.times_opened,
+                    "latency_ewma_ms": round((endpoint.latency_ewma or 0.0) * 1000, 1),
+                }
+                for endpoint in self.endpoints
+            },
+        }
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2^(attempt - 1))] before retry number `attempt`."""
+        return random.uniform(0.0, min(self._backoff_max, self._backoff_base * 2 ** (attempt - 1)))
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long the first request may run before a hedge is sent; None until enough latencies are known."""
+        if not self._hedging or len(self._latencies) < self._hedge_min_samples:
+            return None
+        return max(self._percentile(0.95), self._hedge_min_delay)
+
+    def _percentile(self, fraction: float) -> float:
+        if not self._latencies:
+            return 0.0
+        samples = sorted(self._latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    def _pick(self, exclude: Collection[Endpoint] = ()) -> Endpoint:
+        """The best-scored endpoint whose circuit lets a request through; `exclude` only goes last."""
+        # An endpoint without latency samples yet is assumed to be as fast as the others
+        known = [endpoint.latency_ewma for endpoint in self.endpoints if endpoint.latency_ewma is not None]
+        default_latency = sum(known) / len(known) if known else 0.0
+        # Shuffle first so endpoints with equal scores share the load
+        candidates = random.sample(self.endpoints, len(self.endpoints))
+        candidates.sort(key=lambda endpoint: (endpoint in exclude, endpoint.score(default_latency)))
+        for endpoint in candidates:
+            if endpoint.breaker.allow():
+                return endpoint
+        raise EndpointUnavailableError(f"All {len(self.endpoints)} endpoints have an open circuit")
+
+    @asynccontextmanager
+    async def attempt(self, exclude: Collection[Endpoint] = (), record_latency: bool = True) -> AsyncIterator[Endpoint]:
+        """
+        Picks an endpoint for one request made in the body and books its outcome.
+        Transport errors and timeouts are re-raised as retryable BackendCallError;
+        they and any other error from the body count against the endpoint's
+        circuit, only cancellation gives the probe back without a verdict. Streaming
+        callers pass record_latency=False so stream lengths stay out of the
+        latency figures.
+        """
+        endpoint = self._pick(exclude)
+        endpoint.in_flight += 1
+        endpoint.requests += 1
+        started = time.monotonic()
+        try:
+            yield endpoint
+        except BackendCallError as e:
+            if e.retryable:
+                endpoint.record_failure()
+            else:
+                endpoint.record_success(None)  # The endpoint answered; the request itself was refused
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            endpoint.record_failure()
+            raise BackendCallError(endpoint.url, None, repr(e), retryable=True) from e
+        except Exception:
+            # E.g. a body that is not valid JSON: the endpoint answered, but not usefully
+            endpoint.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (a hedge lost, the caller gave up) or the reader closed the stream early
+            endpoint.breaker.release()
+            raise
+        else:
+            latency = time.monotonic() - started
+            endpoint.record_success(latency if record_latency else None)
+            if record_latency:
+                self._latencies.append(latency)
+        finally:
+            endpoint.in_flight -= 1
+
+    async def call(self, send: Callable[[str], Awaitable[T]], idempotent: bool = True) -> T:
+        """
+        Runs send(url) against the pool. send raises BackendCallError for bad
+        responses; transport errors and timeouts count as retryable failures.
+        Raises the last error once the attempts are used up.
+        """
+        attempts = self.max_attempts if idempotent else 1
+        last_error: Exception = EndpointUnavailableError("No attempt was made")
+        # Endpoints this call already went to; retries and hedges prefer the others
+        tried: List[Endpoint] = []
+        for attempt in range(attempts):
+            if attempt:
+                self._retries += 1
+                await asyncio.sleep(self.backoff_delay(attempt))
+            try:
+                if idempotent and self.hedge_delay() is not None:
+                    return await self._hedged(send, tried)
+                return await self._send_once(send, tried)
+            except BackendCallError as e:
+                if not e.retryable:
+                    raise
+                last_error = e
+            except EndpointUnavailableError as e:
+                last_error = e
+            logger.warning(f"EndpointPool: attempt {attempt + 1}/{attempts} failed: {last_error}")
+        self._exhausted += 1
+        raise last_error
+
+    async def _send_once(self, send: Callable[[str], Awaitable[T]], tried: List[Endpoint]) -> T:
+        async with self.attempt(exclude=tried) as endpoint:
+            tried.append(endpoint)
+            return await asyncio.wait_for(send(endpoint.url), self.request_timeout)
+
+    async def _hedged(self, send: Callable[[str], Awaitable[T]], tried: List[Endpoint]) -> T:
+        hedge: Optional[asyncio.Future] = None
+        tasks = {asyncio.ensure_future(self._send_once(send, tried))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if not done:
+                # Prefers another endpoint, but a single-endpoint pool hedges on a fresh connection
+                self._hedges += 1
+                hedge = asyncio.ensure_future(self._send_once(send, tried))
+                tasks.add(hedge)
+
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
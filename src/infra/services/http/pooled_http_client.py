@@ -0,0 +1,162 @@
+# src/infra/services/http/pooled_http_client.py
+
+import asyncio
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Deque, Dict, Optional
+
+import aiohttp
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+
+class PooledHttpClient:
+    """
+    Long-lived aiohttp session with a bounded connection pool.
+
+    One instance is shared by every caller of the same upstream so TCP/TLS
+    connections are kept alive and reused, and the number of concurrent
+    connections per host is capped. The session is opened with start() and
+    closed with close(), both driven by the application lifespan.
+
+    Pool metrics (see metrics()) are collected through aiohttp trace hooks:
+    requests in flight, requests queued waiting for a free connection, and the
+    time spent acquiring a connection. connections_in_use is read from the
+    connector: a request is in flight from its start until its response headers
+    arrive, while its connection stays taken until the body has been read.
+    """
+
+    # Number of recent acquire latencies kept for the percentiles in metrics()
+    LATENCY_SAMPLES = 1024
+
+    def __init__(
+        self,
+        name: str,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        total_timeout: float = 120.0,
+    ) -> None:
+        self.name = name
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._dns_cache_ttl = dns_cache_ttl
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._start_lock = asyncio.Lock()
+
+        self._in_flight = 0
+        self._queued = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._acquire_latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def start(self) -> None:
+        """Opens the session. Safe to call more than once."""
+        async with self._start_lock:
+            if not self.closed:
+                return
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=self._dns_cache_ttl,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+                trace_configs=[self._build_trace_config()],
+            )
+            logger.info(
+                f"PooledHttpClient[{self.name}]: Session opened "
+                f"(limit={self._limit}, limit_per_host={self._limit_per_host}).")
+
+    async def close(self) -> None:
+        if self.closed:
+            return
+        await self._session.close()
+        self._session = None
+        logger.info(f"PooledHttpClient[{self.name}]: Session closed.")
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared session, opening it on first use if the lifespan
+        has not done so (e.g. in scripts or workers without the FastAPI app).
+        """
+        if self.closed:
+            await self.start()
+        return self._session
+
+    def metrics(self) -> Dict[str, float]:
+        samples = sorted(self._acquire_latencies)
+        return {
+            "requests_in_flight": self._in_flight,
+            "connections_in_use": self._connections_in_use(),
+            "queued": self._queued,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+            "acquire_latency_p50_ms": self._percentile(samples, 0.50) * 1000,
+            "acquire_latency_p99_ms": self._percentile(samples, 0.99) * 1000,
+            "acquire_latency_max_ms": (samples[-1] if samples else 0.0) * 1000,
+        }
+
+    def _connections_in_use(self) -> int:
+        # aiohttp has no public counter of the connections handed out by its connector
+        if self.closed:
+            return 0
+        return len(getattr(self._session.connector, "_acquired", ()))
+
+    @staticmethod
+    def _percentile(samples, fraction: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    # --- aiohttp trace hooks ---
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_done)
+        trace_config.on_request_exception.append(self._on_request_done)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        return trace_config
+
+    async def _on_request_start(self, session, ctx: SimpleNamespace, params) -> None:
+        self._in_flight += 1
+        ctx.acquire_started = time.perf_counter()
+
+    async def _on_request_done(self, session, ctx: SimpleNamespace, params) -> None:
+        self._in_flight -= 1
+
+    async def _on_queued_start(self, session, ctx: SimpleNamespace, params) -> None:
+        self._queued += 1
+
+    async def _on_queued_end(self, session, ctx: SimpleNamespace, params) -> None:
+        self._queued -= 1
+
+    async def _on_connection_created(self, session, ctx: SimpleNamespace, params) -> None:
+        self._connections_created += 1
+        self._record_acquired(ctx)
+
+    async def _on_connection_reused(self, session, ctx: SimpleNamespace, params) -> None:
+        self._connections_reused += 1
+        self._record_acquired(ctx)
+
+    def _record_acquired(self, ctx: SimpleNamespace) -> None:
+        started = getattr(ctx, "acquire_started", None)
+        if started is not None:
+            self._acquire_latencies.append(time.perf_counter() - started)
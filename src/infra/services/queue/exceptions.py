@@ -0,0 +1,13 @@
+from src.core.base.exception import AppException
+
+
+class WorkQueueFullError(AppException):
+    message = "The work queue is full. Try again later."
+    status_code = 503
+    error_code = "work_queue_full"
+
+
+class WorkNotReadyError(AppException):
+    message = "The job cannot run in this process yet."
+    status_code = 503
+    error_code = "work_not_ready"
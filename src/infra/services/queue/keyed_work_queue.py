@@ -0,0 +1,150 @@
+# src/infra/services/queue/keyed_work_queue.py
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.queue.exceptions import WorkQueueFullError
+from src.infra.services.queue.work_queue import WorkHandler, WorkQueue
+
+logger = async_logger
+
+
+class KeyedWorkQueue(WorkQueue):
+    """
+    In-process WorkQueue.
+
+    Every key has its own FIFO of pending jobs. A key is handed to at most one
+    worker at a time; after running one job the worker puts the key back at the
+    end of the ready queue, so a busy conversation cannot starve the others.
+    Depth is bounded globally and per key, and submit() waits up to
+    `submit_timeout` for room before raising WorkQueueFullError.
+    """
+
+    # Number of recent queue wait times kept for the percentiles in stats()
+    LATENCY_SAMPLES = 1024
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = 16,
+        max_pending: int = 1000,
+        max_pending_per_key: int = 50,
+        submit_timeout: float = 2.0,
+    ) -> None:
+        self.name = name
+        self._worker_count = workers
+        self._max_pending = max_pending
+        self._max_pending_per_key = max_pending_per_key
+        self._submit_timeout = submit_timeout
+
+        self._pending: Dict[str, Deque[Tuple[float, Dict[str, Any]]]] = {}
+        self._ready: "asyncio.Queue[str]" = asyncio.Queue()
+        self._active: Set[str] = set()
+        self._size = 0
+        self._space = asyncio.Condition()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._handler: Optional[WorkHandler] = None
+        self._workers: List[asyncio.Task] = []
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_times: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+
+    async def start(self, handler: WorkHandler) -> None:
+        if self._workers:
+            return
+        self._handler = handler
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._worker_count)]
+        logger.info(f"KeyedWorkQueue '{self.name}': started {self._worker_count} workers.")
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"KeyedWorkQueue '{self.name}': dropping {self._size} pending jobs on shutdown.")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info(f"KeyedWorkQueue '{self.name}': stopped.")
+
+    async def submit(self, key: str, payload: Dict[str, Any]) -> None:
+        async with self._space:
+            try:
+                await asyncio.wait_for(self._space.wait_for(lambda: self._has_room(key)), timeout=self._submit_timeout)
+            except asyncio.TimeoutError:
+                self._rejected += 1
+                raise WorkQueueFullError(f"Work queue '{self.name}' is full ({self._size} pending).")
+
+            jobs = self._pending.setdefault(key, deque())
+            jobs.append((time.monotonic(), payload))
+            self._size += 1
+            self._submitted += 1
+            self._idle.clear()
+            # A key is scheduled when its first job arrives; an active key is re-scheduled by its worker
+            if len(jobs) == 1 and key not in self._active:
+                self._ready.put_nowait(key)
+
+    def stats(self) -> Dict[str, float]:
+        waits = sorted(self._wait_times)
+        oldest = min((jobs[0][0] for jobs in self._pending.values() if jobs), default=None)
+        return {
+            "workers": len(self._workers),
+            "pending": self._size,
+            "max_pending": self._max_pending,
+            "pending_keys": sum(1 for jobs in self._pending.values() if jobs),
+            "active_keys": len(self._active),
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "oldest_pending_seconds": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+            "wait_p50_ms": self._percentile(waits, 0.50),
+            "wait_p95_ms": self._percentile(waits, 0.95),
+        }
+
+    def _has_room(self, key: str) -> bool:
+        jobs = self._pending.get(key)
+        return self._size < self._max_pending and (jobs is None or len(jobs) < self._max_pending_per_key)
+
+    async def _worker(self) -> None:
+        while True:
+            key = await self._ready.get()
+            jobs = self._pending[key]
+            enqueued_at, payload = jobs.popleft()
+            self._active.add(key)
+            self._wait_times.append(time.monotonic() - enqueued_at)
+            async with self._space:
+                self._size -= 1
+                self._space.notify_all()
+            try:
+                await self._handler(key, payload)
+                self._completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"KeyedWorkQueue '{self.name}': job for key {key} failed: {e}", exc_info=True)
+            finally:
+                self._active.discard(key)
+                if jobs:
+                    self._ready.put_nowait(key)
+                else:
+                    self._pending.pop(key, None)
+                    if self._size == 0 and not self._active:
+                        self._idle.set()
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], fraction: float) -> float:
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+        return round(sorted_values[index] * 1000, 3)
@@ -0,0 +1,383 @@
+# src/infra/services/queue/redis_stream_work_queue.py
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional
+
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.queue.exceptions import WorkNotReadyError, WorkQueueFullError
+from src.infra.services.queue.work_queue import WorkHandler, WorkQueue
+
+logger = async_logger
+
+
+class RedisStreamWorkQueue(WorkQueue):
+    """
+    WorkQueue backed by Redis Streams, so accepted jobs survive a restart.
+
+    Keys are hashed onto `partitions` streams and each stream is consumed by a
+    single task, which keeps per-key order while different partitions run in
+    parallel. Streams are namespaced per process (the namespace is also the
+    consumer name), so a job is processed by the process that accepted it;
+    acknowledged entries are deleted, so XLEN is the backlog used for
+    backpressure. A process started again under the same explicit namespace
+    first replays entries it had read but not acknowledged.
+
+    With `route_by`, jobs belong to whichever process last accepted a job with
+    the same value of that payload field (for Telegram: the process holding the
+    account's client). A job whose owner has moved to another live process is
+    forwarded there instead of being run. Every process keeps a heartbeat; the
+    streams of a process whose heartbeat expired are adopted by a live one,
+    which moves each entry to its current owner. Route keys expire after
+    `route_ttl_seconds` without a new job.
+
+    Forwarded and adopted entries land on the owner's handoff stream of the
+    partition, which its consumer drains before taking the next new entry, and
+    a process that has just taken a route over first waits (up to
+    `handover_timeout`) until the previous owner holds no entries of the same
+    key. Either way a key's jobs still run in the order they were accepted.
+
+    A handler raising WorkNotReadyError is retried in place with exponential
+    backoff, which holds back the partition; once `max_attempts` are used up,
+    and for any other failure, the entry is moved to the `<prefix>dead` stream.
+    """
+
+    GROUP = "workers"
+
+    def __init__(
+        self,
+        name: str,
+        stream_prefix: str,
+        namespace: Optional[str] = None,
+        partitions: int = 16,
+        max_pending_per_partition: int = 100,
+        submit_timeout: float = 2.0,
+        block_ms: int = 1000,
+        route_by: Optional[str] = None,
+        heartbeat_seconds: float = 5.0,
+        route_ttl_seconds: float = 86400.0,
+        handover_timeout: Optional[float] = None,
+        max_attempts: int = 5,
+        retry_backoff: float = 0.5,
+        dead_letter_maxlen: int = 10000,
+        redis: Optional[Any] = None,
+    ) -> None:
+        if redis is None:
+            from src.infra.services.redis.redis_client import redis_client
+            redis = redis_client
+        self.name = name
+        self._redis = redis
+        # Unique per process: two processes reading one stream would share a consumer
+        self._namespace = namespace or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._prefix = stream_prefix
+        self._stream_prefix = f"{stream_prefix}{self._namespace}:"
+        self._route_by = route_by
+        self._heartbeat_seconds = heartbeat_seconds
+        self._route_ttl_ms = int(route_ttl_seconds * 1000)
+        # Long enough for a dead owner's heartbeat to expire and its streams to be adopted
+        self._handover_timeout = handover_timeout if handover_timeout is not None else heartbeat_seconds * 6
+        self._max_attempts = max(1, max_attempts)
+        self._retry_backoff = retry_backoff
+        self._dead_letter_maxlen = dead_letter_maxlen
+        self._maintainer: Optional[asyncio.Task] = None
+        self._partitions = partitions
+        self._max_pending_per_partition = max_pending_per_partition
+        self._submit_timeout = submit_timeout
+        self._block_ms = block_ms
+        self._handler: Optional[WorkHandler] = None
+        self._consumers: List[asyncio.Task] = []
+        self._busy = 0
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._forwarded = 0
+        self._adopted = 0
+        self._retried = 0
+        self._dead_lettered = 0
+        self._backlog = 0
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    async def start(self, handler: WorkHandler) -> None:
+        if self._consumers:
+            return
+        self._handler = handler
+        for partition in range(self._partitions):
+            try:
+                await self._redis.xgroup_create(self._stream(partition), self.GROUP, id="0", mkstream=True)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        await self._heartbeat()
+        self._consumers = [asyncio.create_task(self._consume(partition)) for partition in range(self._partitions)]
+        self._maintainer = asyncio.create_task(self._maintain())
+        logger.info(f"RedisStreamWorkQueue '{self.name}': consuming {self._partitions} streams as {self._namespace}.")
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        # Unprocessed entries stay in Redis and are picked up on the next start
+        tasks = self._consumers + ([self._maintainer] if self._maintainer else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._consumers = []
+        self._maintainer = None
+        logger.info(f"RedisStreamWorkQueue '{self.name}': stopped.")
+
+    async def submit(self, key: str, payload: Dict[str, Any]) -> None:
+        stream = self._stream(zlib.crc32(key.encode()) % self._partitions)
+        deadline = time.monotonic() + self._submit_timeout
+        while await self._redis.xlen(stream) >= self._max_pending_per_partition:
+            if time.monotonic() >= deadline:
+                self._rejected += 1
+                raise WorkQueueFullError(f"Work queue '{self.name}' is full (stream {stream}).")
+            await asyncio.sleep(0.05)
+        await self._redis.xadd(stream, {"key": key, "payload": json.dumps(payload)})
+        self._submitted += 1
+        route = self._route_value(payload)
+        if route is not None:
+            # Jobs of this route now belong here, including ones still queued elsewhere
+            previous = await self._redis.set(self._route_key(route), self._namespace, px=self._route_ttl_ms, get=True)
+            previous = self._decode(previous) if previous is not None else None
+            if previous is not None and previous != self._namespace:
+                # Until they are handed over, that process may still hold older jobs of this route
+                await self._redis.set(self._handover_key(route), previous,
+                                      px=int(self._handover_timeout * 1000))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "workers": len(self._consumers),
+            "active_keys": self._busy,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "forwarded": self._forwarded,
+            "adopted": self._adopted,
+            "retried": self._retried,
+            "dead_lettered": self._dead_lettered,
+            # Refreshed by the consumers; approximate between reads
+            "pending": self._backlog,
+        }
+
+    async def _consume(self, partition: int) -> None:
+        stream = self._stream(partition)
+        # "0" first replays what this consumer read before a restart but never acknowledged
+        last_id = "0"
+        while True:
+            try:
+                response = await self._redis.xreadgroup(
+                    self.GROUP, self._namespace, {stream: last_id}, count=10, block=self._block_ms
+                )
+                entries = response[0][1] if response else []
+                await self._drain_handoff(partition)
+                if last_id == "0" and not entries:
+                    last_id = ">"
+                    continue
+                for entry_id, fields in entries:
+                    # Handed-over entries were accepted before anything new of their route
+                    await self._drain_handoff(partition)
+                    await self._run(stream, entry_id, fields)
+                if partition == 0:
+                    self._backlog = sum([await self._redis.xlen(self._stream(p)) for p in range(self._partitions)])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"RedisStreamWorkQueue '{self.name}': reading {stream} failed: {e}", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    async def _run(self, stream: str, entry_id: Any, fields: Dict[Any, Any]) -> None:
+        await self._process(entry_id, fields, handed_over=False)
+        await self._redis.xack(stream, self.GROUP, entry_id)
+        await self._redis.xdel(stream, entry_id)
+
+    async def _drain_handoff(self, partition: int) -> None:
+        stream = self._handoff_stream(self._namespace, partition)
+        while True:
+            entries = await self._redis.xrange(stream, count=10)
+            if not entries:
+                return
+            for entry_id, fields in entries:
+                await self._process(entry_id, fields, handed_over=True)
+                await self._redis.xdel(stream, entry_id)
+
+    async def _process(self, entry_id: Any, fields: Dict[Any, Any], handed_over: bool) -> None:
+        self._busy += 1
+        try:
+            key = self._decode(fields.get(b"key", fields.get("key")))
+            payload = json.loads(self._decode(fields.get(b"payload", fields.get("payload"))))
+            owner = await self._owner(payload)
+            if owner is not None and owner != self._namespace and await self._alive(owner):
+                # The route moved to another process since this job was accepted
+                await self._forward(owner, key, fields)
+                self._forwarded += 1
+                return
+            if not handed_over:
+                await self._await_handover(key, payload)
+            await self._handle(entry_id, key, payload, fields)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._failed += 1
+            logger.error(f"RedisStreamWorkQueue '{self.name}': job {entry_id} failed: {e}", exc_info=True)
+        finally:
+            self._busy -= 1
+
+    async def _handle(self, entry_id: Any, key: str, payload: Dict[str, Any], fields: Dict[Any, Any]) -> None:
+        for attempt in range(self._max_attempts):
+            try:
+                await self._handler(key, payload)
+                self._completed += 1
+                return
+            except WorkNotReadyError as e:
+                if attempt + 1 == self._max_attempts:
+                    await self._dead_letter(entry_id, fields, e)
+                    return
+                self._retried += 1
+                await asyncio.sleep(self._retry_backoff * 2 ** attempt)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"RedisStreamWorkQueue '{self.name}': job {entry_id} failed: {e}", exc_info=True)
+                await self._dead_letter(entry_id, fields, e)
+                return
+
+    async def _dead_letter(self, entry_id: Any, fields: Dict[Any, Any], error: Exception) -> None:
+        self._dead_lettered += 1
+        logger.warning(f"RedisStreamWorkQueue '{self.name}': job {entry_id} moved to the dead-letter stream: {error}")
+        await self._redis.xadd(self._dead_letter_stream(), {
+            "key": self._decode(fields.get(b"key", fields.get("key"))),
+            "payload": self._decode(fields.get(b"payload", fields.get("payload"))),
+            "error": str(error),
+            "namespace": self._namespace,
+        }, maxlen=self._dead_letter_maxlen, approximate=True)
+
+    async def _await_handover(self, key: str, payload: Dict[str, Any]) -> None:
+        """Waits while the process this route was taken from still holds entries of `key`."""
+        route = self._route_value(payload)
+        if route is None:
+            return
+        previous = await self._redis.get(self._handover_key(route))
+        if previous is None:
+            return
+        previous = self._decode(previous)
+        partition = zlib.crc32(key.encode()) % self._partitions
+        deadline = time.monotonic() + self._handover_timeout
+        while await self._holds_key(previous, partition, key):
+            if time.monotonic() >= deadline:
+                logger.warning(f"RedisStreamWorkQueue '{self.name}': {previous} still holds jobs of {key}; running a newer one")
+                return
+            # The previous owner forwards them here (or they are adopted), onto the handoff stream
+            await self._drain_handoff(partition)
+            await asyncio.sleep(0.05)
+        await self._drain_handoff(partition)
+
+    async def _holds_key(self, namespace: str, partition: int, key: str) -> bool:
+        for stream in (f"{self._prefix}{namespace}:{partition}", self._handoff_stream(namespace, partition)):
+            for _, fields in await self._redis.xrange(stream, count=self._max_pending_per_partition):
+                if self._decode(fields.get(b"key", fields.get("key"))) == key:
+                    return True
+        return False
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self._heartbeat_seconds)
+            try:
+                await self._heartbeat()
+                await self._adopt_orphans()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"RedisStreamWorkQueue '{self.name}': maintenance failed: {e}", exc_info=True)
+
+    async def _heartbeat(self) -> None:
+        await self._redis.set(self._alive_key(self._namespace), b"1", px=int(self._heartbeat_seconds * 3000))
+        await self._redis.sadd(self._registry_key(), self._namespace)
+
+    async def _adopt_orphans(self) -> None:
+        """Moves the entries of processes whose heartbeat expired to the current owner of each job."""
+        for member in await self._redis.smembers(self._registry_key()):
+            namespace = self._decode(member)
+            if namespace == self._namespace or await self._alive(namespace):
+                continue
+            # One adopter per dead process at a time
+            if not await self._redis.set(f"{self._alive_key(namespace)}:adopter", self._namespace,
+                                         nx=True, px=int(self._heartbeat_seconds * 3000)):
+                continue
+            left = 0
+            streams = [stream for partition in range(self._partitions) for stream in (
+                # Its handoff stream holds the older jobs of a partition, so it goes first
+                self._handoff_stream(namespace, partition), f"{self._prefix}{namespace}:{partition}",
+            )]
+            for stream in streams:
+                for entry_id, fields in await self._redis.xrange(stream, count=1000):
+                    key = self._decode(fields.get(b"key", fields.get("key")))
+                    payload = json.loads(self._decode(fields.get(b"payload", fields.get("payload"))))
+                    owner = await self._owner(payload) or self._namespace
+                    if owner != self._namespace and not await self._alive(owner):
+                        # Its owner is gone too; wait until the route is claimed again
+                        left += 1
+                        continue
+                    await self._forward(owner, key, fields)
+                    await self._redis.xdel(stream, entry_id)
+                    self._adopted += 1
+                left += await self._redis.xlen(stream)
+            if not left:
+                await self._redis.delete(*streams)
+                await self._redis.srem(self._registry_key(), namespace)
+                logger.info(f"RedisStreamWorkQueue '{self.name}': adopted the streams of {namespace}.")
+
+    async def _forward(self, namespace: str, key: str, fields: Dict[Any, Any]) -> None:
+        partition = zlib.crc32(key.encode()) % self._partitions
+        await self._redis.xadd(self._handoff_stream(namespace, partition), {
+            "key": key, "payload": self._decode(fields.get(b"payload", fields.get("payload"))),
+        })
+
+    async def _owner(self, payload: Dict[str, Any]) -> Optional[str]:
+        route = self._route_value(payload)
+        if route is None:
+            return None
+        owner = await self._redis.get(self._route_key(route))
+        return self._decode(owner) if owner is not None else None
+
+    async def _alive(self, namespace: str) -> bool:
+        return bool(await self._redis.exists(self._alive_key(namespace)))
+
+    def _route_value(self, payload: Dict[str, Any]) -> Optional[str]:
+        if self._route_by is None or payload.get(self._route_by) is None:
+            return None
+        return str(payload[self._route_by])
+
+    def _route_key(self, route: str) -> str:
+        return f"{self._prefix}route:{route}"
+
+    def _handover_key(self, route: str) -> str:
+        return f"{self._prefix}handover:{route}"
+
+    def _handoff_stream(self, namespace: str, partition: int) -> str:
+        return f"{self._prefix}{namespace}:{partition}:handoff"
+
+    def _dead_letter_stream(self) -> str:
+        return f"{self._prefix}dead"
+
+    def _alive_key(self, namespace: str) -> str:
+        return f"{self._prefix}alive:{namespace}"
+
+    def _registry_key(self) -> str:
+        return f"{self._prefix}namespaces"
+
+    def _stream(self, partition: int) -> str:
+        return f"{self._stream_prefix}{partition}"
+
+    @staticmethod
+    def _decode(value: Any) -> str:
+        return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,33 @@
+# src/infra/services/queue/work_queue.py
+
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict
+
+# Receives the ordering key and the payload that was submitted with it
+WorkHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class WorkQueue(ABC):
+    """
+    Queue of jobs partitioned by key: jobs sharing a key run one at a time in
+    submission order, jobs with different keys run concurrently on a bounded
+    pool of workers. Payloads must be JSON-serializable so that backends other
+    than the in-process one can store them.
+    """
+
+    @abstractmethod
+    async def start(self, handler: WorkHandler) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def submit(self, key: str, payload: Dict[str, Any]) -> None:
+        """Enqueues a job, waiting for room; raises WorkQueueFullError if none frees up in time."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, float]:
+        raise NotImplementedError
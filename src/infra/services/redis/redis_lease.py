@@ -0,0 +1,71 @@
+# src/infra/services/redis/redis_lease.py
+
+import os
+import socket
+from typing import Any, Optional
+from uuid import uuid4
+
+from src.infra.logging.setup_async_logging import async_logger
+
+logger = async_logger
+
+# Renew / release only while the lease still carries our token
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLeaseManager:
+    """
+    Time-limited, owner-scoped leases in Redis (SET NX PX plus token-checked
+    renew/release scripts). A lease that is not renewed within its TTL expires,
+    so the work it guards moves to another process when its owner dies.
+    """
+
+    def __init__(
+        self,
+        key_prefix: str,
+        ttl_seconds: int = 30,
+        redis: Optional[Any] = None,
+        owner_id: Optional[str] = None,
+    ) -> None:
+        if redis is None:
+            from src.infra.services.redis.redis_client import redis_client
+            redis = redis_client
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self.owner_id = owner_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_ms / 1000
+
+    async def acquire(self, name: str) -> bool:
+        """Takes the lease if nobody holds it (or we already do)."""
+        key = self._key(name)
+        if await self._redis.set(key, self.owner_id, nx=True, px=self._ttl_ms):
+            return True
+        return await self.renew(name)
+
+    async def renew(self, name: str) -> bool:
+        """Extends a lease we hold; False if it expired or belongs to someone else."""
+        return bool(await self._redis.eval(_RENEW_SCRIPT, 1, self._key(name), self.owner_id, self._ttl_ms))
+
+    async def release(self, name: str) -> None:
+        try:
+            await self._redis.eval(_RELEASE_SCRIPT, 1, self._key(name), self.owner_id)
+        except Exception as e:
+            logger.warning(f"RedisLeaseManager: Failed to release lease {name}: {e}")
+
+    def _key(self, name: str) -> str:
+        return f"{self._key_prefix}{name}"
@@ -1,7 +1,11 @@
-from typing import Protocol
+from typing import AsyncIterator, Iterable, Optional, Protocol
 from fastapi import UploadFile
 
 
 class S3UploaderService(Protocol):
     async def upload_file(self, file_data: bytes, filename: str, content_type: str) -> dict: ...
-    async def download_file(self, file_name: str) -> tuple[bytes, str]: ...
\ No newline at end of file
+    async def download_file(self, file_name: str) -> tuple[bytes, str]: ...
+    async def upload_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: str) -> dict: ...
+    async def file_exists(self, key: str) -> bool: ...
+    def stream_file(self, key: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]: ...
+    async def delete_files(self, keys: Iterable[str]) -> None: ...
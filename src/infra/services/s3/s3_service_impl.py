@@ -3,6 +3,7 @@
 import aioboto3
 import uuid
 import magic
+from typing import AsyncIterator, Iterable, List, Optional
 from src.infra.logging.setup_async_logging import async_logger
 logger = async_logger
 from fastapi import UploadFile, HTTPException, status
@@ -15,6 +16,10 @@ aws_settings = Settings()
 
 
 MB = 1024 * 1024
+# S3 rejects multipart parts smaller than 5 MB (except the last one)
+MIN_MULTIPART_PART_SIZE = 5 * MB
+# DeleteObjects accepts at most this many keys per request
+DELETE_BATCH_SIZE = 1000
 SUPPORTED_FILE_TYPES = {
     "image/png": "png",
     "image/jpeg": "jpg",
@@ -22,6 +27,10 @@ SUPPORTED_FILE_TYPES = {
 }
 
 class S3UploaderServiceHandler(S3UploaderService):
+    def __init__(self, multipart_part_size: int = 8 * MB, download_chunk_size: int = 1 * MB):
+        self._part_size = max(multipart_part_size, MIN_MULTIPART_PART_SIZE)
+        self._download_chunk_size = download_chunk_size
+
     async def _get_s3_client(self):
         session = aioboto3.Session()
         return session.client(
@@ -97,3 +106,114 @@ class S3UploaderServiceHandler(S3UploaderService):
             except ClientError as err:
                 logger.error(str(err))
                 raise HTTPException(status_code=404, detail="File not found")
+
+
+    async def upload_stream(self, key: str, chunks: AsyncIterator[bytes], content_type: str) -> dict:
+        """
+        Uploads a stream of byte chunks under `key` without holding the whole file in memory.
+
+        At most one part (`multipart_part_size`) is buffered. A stream that ends
+        before the first part fills is sent with a single PutObject; anything larger
+        goes through a multipart upload, which is aborted if any part fails.
+
+        Returns:
+            A dictionary with the object key and the number of bytes stored.
+        """
+        s3, bucket = await self._get_s3_client()
+        buffer = bytearray()
+        total_size = 0
+        upload_id: Optional[str] = None
+        parts: List[dict] = []
+
+        async with s3 as client:
+            try:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    buffer.extend(chunk)
+                    total_size += len(chunk)
+                    while len(buffer) >= self._part_size:
+                        if upload_id is None:
+                            response = await client.create_multipart_upload(
+                                Bucket=bucket, Key=key, ContentType=content_type
+                            )
+                            upload_id = response["UploadId"]
+                        part = bytes(buffer[:self._part_size])
+                        del buffer[:self._part_size]
+                        parts.append(await self._upload_part(client, bucket, key, upload_id, len(parts) + 1, part))
+
+                if upload_id is None:
+                    await client.put_object(Bucket=bucket, Key=key, Body=bytes(buffer), ContentType=content_type)
+                else:
+                    if buffer:
+                        parts.append(await self._upload_part(client, bucket, key, upload_id, len(parts) + 1, bytes(buffer)))
+                    await client.complete_multipart_upload(
+                        Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+                    )
+            except Exception as err:
+                if upload_id is not None:
+                    try:
+                        await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+                    except ClientError as abort_err:
+                        logger.warning(f"Failed to abort multipart upload {upload_id} for {key}: {abort_err}")
+                logger.error(f"S3 streaming upload of {key} failed: {err}")
+                raise
+
+        logger.debug(f"Stored {key} in S3 ({total_size} bytes, {len(parts) or 1} part(s))")
+        return {"key": key, "file_size": total_size}
+
+    @staticmethod
+    async def _upload_part(client, bucket: str, key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = await client.upload_part(
+            Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    async def file_exists(self, key: str) -> bool:
+        """HEADs the object, so a missing file is known before a response is started."""
+        s3, bucket = await self._get_s3_client()
+        async with s3 as client:
+            try:
+                await client.head_object(Bucket=bucket, Key=key)
+            except ClientError as err:
+                if err.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    return False
+                raise
+        return True
+
+    async def stream_file(self, key: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yields the object under `key` in chunks; the S3 client stays open until the stream ends."""
+        s3, bucket = await self._get_s3_client()
+        chunk_size = chunk_size or self._download_chunk_size
+
+        async with s3 as client:
+            try:
+                response = await client.get_object(Bucket=bucket, Key=key)
+            except ClientError as err:
+                # The response headers may already be out; callers check file_exists first
+                logger.error(str(err))
+                raise FileNotFoundError(key) from err
+
+            body = response["Body"]
+            try:
+                while True:
+                    chunk = await body.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                body.close()
+
+    async def delete_files(self, keys: Iterable[str]) -> None:
+        keys = [key for key in keys if key]
+        if not keys:
+            return
+        s3, bucket = await self._get_s3_client()
+
+        async with s3 as client:
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                batch = keys[start:start + DELETE_BATCH_SIZE]
+                await client.delete_objects(
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
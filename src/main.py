@@ -31,7 +31,10 @@ logging.getLogger(__name__).info("All ORM models imported successfully before lo
 # This must be done BEFORE creating the FastAPI app and using the logger.
 setup_async_logging(
     external_library_level_log=_settings.EXTERNAL_LIBRARY_LEVEL_LOG,
-    log_level=_settings.LOG_LEVEL
+    log_level=_settings.LOG_LEVEL,
+    db_batch_size=_settings.LOG_DB_BATCH_SIZE,
+    db_flush_interval=_settings.LOG_DB_FLUSH_INTERVAL,
+    db_max_buffer_size=_settings.LOG_DB_MAX_BUFFER,
 )
 logger = async_logger # Assign the configured async_logger
 logger.info("Initial logging setup complete and async_logger configured.")
@@ -39,22 +42,18 @@ logger.info("Initial logging setup complete and async_logger configured.")
 
 # 4. Register Middleware
 # Middleware must be added BEFORE the FastAPI application instance is created.
-app = FastAPI(title="NeEro-WoRkErs") # Create app instance first
+# The lifespan is passed here so its shutdown half (which drains the log buffer) runs.
+app = FastAPI(title="NeEro-WoRkErs", lifespan=lifespan) # Create app instance first
 register_middleware(app) # Register middleware here
 logger.info("Middleware registered to FastAPI app.")
 
 
-# 5. Assign Lifespan to the app instance
-app.add_event_handler("startup", lifespan(app).__aenter__)
-app.add_event_handler("shutdown", lifespan(app).__aexit__)
-
-
-# 6. Register Custom Exception Handlers
+# 5. Register Custom Exception Handlers
 app.exception_handler(AppException)(app_exception_handler)
 app.exception_handler(RequestValidationError)(custom_validation_exception_handler)
 logger.info("Custom exception handlers registered.")
 
-# 7. Include Main API Router
+# 6. Include Main API Router
 app.include_router(main_api_router)
 logger.info("Main API router included.")
 
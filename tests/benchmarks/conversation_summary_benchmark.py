@@ -0,0 +1,90 @@
+# tests/benchmarks/conversation_summary_benchmark.py
+"""
+Prompt tokens per reply on a long chat, with the plain history window vs. a
+rolling summary (summarize_after_messages) plus the recent window. Runs the
+real message handler on in-memory repositories and a stub model.
+
+    python -m tests.benchmarks.conversation_summary_benchmark --turns 200 --window 40 --summarize-after 20
+"""
+
+import argparse
+import asyncio
+import uuid
+from typing import List, Optional
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No database log handler is configured here
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.domain.enums import ChatPlatform
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.conversation_summarizer import ConversationSummarizer
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from tests.src.features.conversation.test_conversation_summarizer import (
+    _GenerationService,
+    _prompt_tokens,
+    _Store,
+    _UnitOfWork,
+)
+
+
+class _BotLookup:
+    def __init__(self, bot: BotEntity):
+        self._bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self._bot
+
+
+async def _prompt_sizes(turns: int, window: int, summarize_after: Optional[int]) -> List[int]:
+    bot = BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(
+            generation_model="stub", instructions="Be helpful.",
+            history_window_messages=window, summarize_after_messages=summarize_after,
+        ),
+    )
+    store, generation = _Store(), _GenerationService()
+    summarizer = ConversationSummarizer(lambda: _UnitOfWork(store), {"stub": generation}) if summarize_after else None
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_BotLookup(bot),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        conversation_summarizer=summarizer,
+    )
+    for turn in range(turns):
+        await handler(ProcessIncomingMessageCommand(
+            bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42",
+            content=f"turn {turn}: " + "some details about my order " * 4,
+            timestamp=store.tick(), sender_number=None, sender_nickname=None,
+        ))
+        while summarizer is not None and summarizer.stats()["running"]:
+            await asyncio.sleep(0)
+    if summarizer is not None:
+        print(f"summarizer stats: {summarizer.stats()}")
+    return [_prompt_tokens(*prompt) for prompt in generation.reply_prompts]
+
+
+def _report(label: str, sizes: List[int]) -> None:
+    late = sizes[len(sizes) // 2:]
+    print(f"{label:<18} total={sum(sizes):8d} tokens  mean={sum(sizes) / len(sizes):7.1f}  "
+          f"mean(2nd half)={sum(late) / len(late):7.1f}  max={max(sizes):5d}")
+
+
+async def main(turns: int, window: int, summarize_after: int) -> None:
+    _report("window only", await _prompt_sizes(turns, window, None))
+    _report("summary + window", await _prompt_sizes(turns, window, summarize_after))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--window", type=int, default=40)
+    parser.add_argument("--summarize-after", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns, args.window, args.summarize_after))
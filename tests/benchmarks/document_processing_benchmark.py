@@ -0,0 +1,77 @@
+# tests/benchmarks/document_processing_benchmark.py
+"""
+Throughput of document processing (extraction, normalization, hashing,
+chunking, embedding) at growing worker counts, and how long the event loop
+stalls meanwhile. workers=0 runs the work in a thread of the event loop
+process, where it competes with the loop for the GIL. Documents are
+synthetic HTML pages; worker start-up is left out.
+
+    python -m tests.benchmarks.document_processing_benchmark --documents 64 --workers 0,1,2,4
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from src.features.bot.infra.services.document_processing_pool import DocumentProcessingPool
+
+WORDS = [f"term{i}" for i in range(20_000)]
+
+
+def _document(rng: random.Random, paragraphs: int) -> bytes:
+    body = "".join(f"<p>{' '.join(rng.choices(WORDS, k=rng.randint(40, 120)))}.</p>\n" for _ in range(paragraphs))
+    return f"<html><head><style>p {{}}</style></head><body>{body}</body></html>".encode()
+
+
+async def _loop_stalls(stop: asyncio.Event, samples: List[float]) -> None:
+    """Lateness of a 5 ms timer, i.e. how long other requests would wait for the loop."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append(time.perf_counter() - started - 0.005)
+
+
+async def _run(documents: List[bytes], workers: int, dim: int) -> None:
+    pool = DocumentProcessingPool("hashing", dim, workers=workers)
+    try:
+        async def load(data: bytes = documents[0]) -> bytes:
+            return data
+
+        await pool.process(load, "text/html", "warm-up.html")  # Start the workers
+
+        stop, stalls = asyncio.Event(), []
+        watcher = asyncio.create_task(_loop_stalls(stop, stalls))
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            pool.process(lambda data=data: load(data), "text/html", f"doc-{i}.html")
+            for i, data in enumerate(documents)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await watcher
+
+        stalls.sort()
+        megabytes = sum(len(data) for data in documents) / 1024 / 1024
+        print(f"workers={workers:>2}  {len(documents) / elapsed:7.1f} docs/s  {megabytes / elapsed:6.2f} MB/s  "
+              f"loop stall p50={stalls[len(stalls) // 2] * 1000:7.2f} ms  max={stalls[-1] * 1000:7.2f} ms")
+    finally:
+        pool.close()
+
+
+def main(documents: int, paragraphs: int, workers: List[int], dim: int) -> None:
+    rng = random.Random(7)
+    corpus = [_document(rng, paragraphs) for _ in range(documents)]
+    for count in workers:
+        asyncio.run(_run(corpus, count, dim))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=64)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--workers", default="0,1,2,4")
+    parser.add_argument("--dim", type=int, default=1024)
+    args = parser.parse_args()
+    main(args.documents, args.paragraphs, [int(count) for count in args.workers.split(",")], args.dim)
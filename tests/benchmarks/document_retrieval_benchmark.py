@@ -0,0 +1,95 @@
+# tests/benchmarks/document_retrieval_benchmark.py
+"""
+Latency of one bot's document search against its memory-mapped vector index
+at growing index sizes: the vectorized top-k search the message handler uses,
+and, for scale, scoring the same rows one at a time in Python. Passages are
+synthetic hashed texts, so building a million-row index takes a while.
+
+    python -m tests.benchmarks.document_retrieval_benchmark --sizes 10000,100000,1000000 --dim 1024
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from src.features.bot.infra.services.document_vector_index import DocumentVectorIndexStore
+from src.features.bot.infra.services.text_embedder import HashingTextEmbedder
+
+WORDS = [f"term{i}" for i in range(20_000)]
+BATCH = 10_000
+
+
+def _passage(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(60, 140)))
+
+
+def _build(store: DocumentVectorIndexStore, embedder: HashingTextEmbedder, size: int, rng: random.Random) -> float:
+    index = store.get("bot")
+    started = time.perf_counter()
+    for document, start in enumerate(range(0, size, BATCH)):
+        texts = [_passage(rng) for _ in range(min(BATCH, size - start))]
+        index.add(f"doc-{document}", f"doc-{document}.txt", embedder.embed(texts), texts)
+    return time.perf_counter() - started
+
+
+def _percentiles(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    return f"p50={p50:8.2f} ms  p99={p99:8.2f} ms"
+
+
+def _python_loop_ms(vectors: np.ndarray, query: np.ndarray, rows: int) -> float:
+    """Per-row cosine in Python over `rows` rows; what a naive search costs per row."""
+    candidates = vectors[:rows].tolist()
+    q = query.tolist()
+    started = time.perf_counter()
+    scored = [(sum(a * b for a, b in zip(row, q)), i) for i, row in enumerate(candidates)]
+    scored.sort(reverse=True)
+    return (time.perf_counter() - started) * 1000 / rows
+
+
+def main(sizes: List[int], dim: int, queries: int, top_k: int) -> None:
+    rng = random.Random(7)
+    embedder = HashingTextEmbedder(dim)
+    query_texts = [" ".join(rng.choices(WORDS, k=8)) for _ in range(queries)]
+
+    for size in sizes:
+        root = tempfile.mkdtemp(prefix="retrieval-benchmark-")
+        try:
+            store = DocumentVectorIndexStore(root, dim, embedder.name, embedder.term_weighted)
+            build_seconds = _build(store, embedder, size, rng)
+            index = store.get("bot")
+
+            # A fresh reader maps the files the way another worker would
+            reader = DocumentVectorIndexStore(root, dim, embedder.name, embedder.term_weighted).get("bot")
+            query_vectors = embedder.embed(query_texts)
+            reader.search(query_vectors[0], top_k)  # Page the matrix in
+
+            latencies = []
+            for vector in query_vectors:
+                started = time.perf_counter()
+                reader.search(vector, top_k)
+                latencies.append(time.perf_counter() - started)
+
+            per_row_ms = _python_loop_ms(index._vectors, query_vectors[0], min(size, 2_000))
+            print(f"{size:>9} chunks  dim={dim}  build={build_seconds:7.1f} s  "
+                  f"vectorized {_percentiles(latencies)}  "
+                  f"python loop ~{per_row_ms * size:10.1f} ms")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=4)
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.dim, args.queries, args.top_k)
@@ -0,0 +1,117 @@
+# tests/benchmarks/llm_batching_benchmark.py
+"""
+Throughput and latency of concurrent generate_response calls against a local
+stub model server that runs one forward pass at a time, where a pass costs
+`--pass-ms` plus `--item-ms` per prompt in it: one request per call vs. calls
+micro-batched into the server's batch API.
+
+    python -m tests.benchmarks.llm_batching_benchmark --requests 500 --concurrency 64 --max-batch-size 16
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+from aiohttp import web
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No database log handler is configured here
+async_logger.disabled = True
+
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.generation.application.services.deepseek_generation_service_impl import DeepSeekGenerationServiceImpl
+from src.infra.services.http.endpoint_pool import EndpointPool
+from src.infra.services.http.pooled_http_client import PooledHttpClient
+
+CONFIG = AIConfigurationSettings(generation_model="stub")
+
+
+def _reply(payload: dict) -> dict:
+    return {"message": {"role": "assistant", "content": "ok"}, "prompt_eval_count": 10, "eval_count": 2}
+
+
+async def _start_stub_server(pass_seconds: float, item_seconds: float) -> Tuple[web.AppRunner, str]:
+    # One model instance: forward passes run one after another
+    model = asyncio.Lock()
+
+    async def chat(request: web.Request) -> web.Response:
+        payload = await request.json()
+        async with model:
+            await asyncio.sleep(pass_seconds + item_seconds)
+        return web.json_response(_reply(payload))
+
+    async def batch(request: web.Request) -> web.Response:
+        body = await request.json()
+        async with model:
+            await asyncio.sleep(pass_seconds + item_seconds * len(body["requests"]))
+        return web.json_response({"responses": [_reply(payload) for payload in body["requests"]]})
+
+    app = web.Application()
+    app.router.add_post("/api/chat", chat)
+    app.router.add_post("/api/chat/batch", batch)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/chat"
+
+
+async def _run(service: DeepSeekGenerationServiceImpl, total: int, concurrency: int) -> Tuple[List[float], float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await service.generate_response([{"role": "user", "content": f"question {i}"}], config=CONFIG)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return sorted(latencies), time.perf_counter() - started
+
+
+def _report(label: str, result: Tuple[List[float], float]) -> None:
+    latencies, elapsed = result
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:<14} {len(latencies) / elapsed:8.1f} req/s  p50={p50:8.2f} ms  p99={p99:8.2f} ms  n={len(latencies)}")
+
+
+async def main(total: int, concurrency: int, max_batch_size: int, max_wait_ms: float,
+               pass_ms: float, item_ms: float) -> None:
+    runner, url = await _start_stub_server(pass_ms / 1000, item_ms / 1000)
+    client = PooledHttpClient(name="benchmark", limit_per_host=concurrency)
+    await client.start()
+    try:
+        unbatched = DeepSeekGenerationServiceImpl(http_client=client, endpoints=EndpointPool([url]))
+        batched = DeepSeekGenerationServiceImpl(
+            http_client=client,
+            endpoints=EndpointPool([url]),
+            batch_endpoints=EndpointPool([f"{url}/batch"]),
+            max_batch_size=max_batch_size,
+            max_batch_wait=max_wait_ms / 1000,
+        )
+        _report("unbatched", await _run(unbatched, total, concurrency))
+        _report("micro-batched", await _run(batched, total, concurrency))
+        print(f"batching stats: {batched.batching_stats()}")
+        await batched.close()
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--pass-ms", type=float, default=20.0)
+    parser.add_argument("--item-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.max_batch_size, args.max_wait_ms,
+                     args.pass_ms, args.item_ms))
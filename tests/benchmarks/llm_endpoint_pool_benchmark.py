@@ -0,0 +1,119 @@
+# tests/benchmarks/llm_endpoint_pool_benchmark.py
+"""
+Success rate and tail latency of LLM calls against two local stub backends that
+inject failures (503) and latency spikes: one endpoint without retries (the old
+DeepSeekGenerationServiceImpl behaviour) vs. the EndpointPool with retries, and
+with retries plus hedging.
+
+    python -m tests.benchmarks.llm_endpoint_pool_benchmark --requests 1000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Optional, Tuple
+
+from aiohttp import web
+
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.http.endpoint_pool import BackendCallError, EndpointPool
+from src.infra.services.http.pooled_http_client import PooledHttpClient
+
+# No database log handler is configured here
+async_logger.disabled = True
+
+STUB_REPLY = {"message": {"role": "assistant", "content": "ok"}, "prompt_eval_count": 10, "eval_count": 2}
+PAYLOAD = {"model": "stub", "messages": [{"role": "user", "content": "hi"}], "stream": False}
+
+
+def _chat_handler(failure_rate: float, spike_rate: float, base_delay: float, spike_delay: float):
+    async def chat(request: web.Request) -> web.Response:
+        await request.json()
+        if random.random() < failure_rate:
+            return web.Response(status=503, text="injected failure")
+        await asyncio.sleep(spike_delay if random.random() < spike_rate else base_delay)
+        return web.json_response(STUB_REPLY)
+    return chat
+
+
+async def _start_stub_server(**faults) -> Tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_post("/api/chat", _chat_handler(**faults))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/chat"
+
+
+async def _run(call, total: int, concurrency: int) -> Tuple[List[float], int]:
+    latencies: List[float] = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            if await call() is None:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return sorted(latencies), failures
+
+
+def _report(label: str, result: Tuple[List[float], int]) -> None:
+    latencies, failures = result
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    success = 100.0 * (len(latencies) - failures) / len(latencies)
+    print(f"{label:<22} success={success:6.2f}%  p50={p50:7.2f} ms  p99={p99:7.2f} ms  n={len(latencies)}")
+
+
+async def main(total: int, concurrency: int, failure_rate: float, spike_rate: float) -> None:
+    faults = dict(failure_rate=failure_rate, spike_rate=spike_rate, base_delay=0.05, spike_delay=1.0)
+    servers = [await _start_stub_server(**faults) for _ in range(2)]
+    urls = [url for _, url in servers]
+    client = PooledHttpClient(name="benchmark", limit_per_host=concurrency)
+    await client.start()
+    try:
+        async def send(url: str) -> dict:
+            session = await client.get_session()
+            async with session.post(url, json=PAYLOAD) as resp:
+                if resp.status != 200:
+                    raise BackendCallError.from_status(url, resp.status, await resp.text())
+                return await resp.json()
+
+        def through(pool: EndpointPool):
+            async def call() -> Optional[dict]:
+                try:
+                    return await pool.call(send)
+                except Exception:
+                    return None
+            return call
+
+        single = EndpointPool(urls[:1], max_attempts=1, failure_threshold=total + 1)
+        retrying = EndpointPool(urls, backoff_base=0.01)
+        hedging = EndpointPool(urls, backoff_base=0.01, hedging=True, hedge_min_delay=0.1)
+
+        _report("single, no retry", await _run(through(single), total, concurrency))
+        _report("pool + retries", await _run(through(retrying), total, concurrency))
+        _report("pool + retries + hedge", await _run(through(hedging), total, concurrency))
+        print(f"hedging pool: {hedging.stats()}")
+    finally:
+        await client.close()
+        for runner, _ in servers:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--spike-rate", type=float, default=0.03)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.failure_rate, args.spike_rate))
@@ -0,0 +1,92 @@
+# tests/benchmarks/llm_http_pool_benchmark.py
+"""
+Per-message latency against a local stub LLM server: a new aiohttp session per
+call (the old DeepSeekGenerationServiceImpl behaviour) vs. the shared PooledHttpClient.
+
+    python -m tests.benchmarks.llm_http_pool_benchmark --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+import aiohttp
+from aiohttp import web
+
+from src.infra.logging.setup_async_logging import async_logger
+from src.infra.services.http.pooled_http_client import PooledHttpClient
+
+# No database log handler is configured here
+async_logger.disabled = True
+
+STUB_REPLY = {"message": {"role": "assistant", "content": "ok"}, "prompt_eval_count": 10, "eval_count": 2}
+PAYLOAD = {"model": "stub", "messages": [{"role": "user", "content": "hi"}], "stream": False}
+
+
+async def _chat(request: web.Request) -> web.Response:
+    await request.json()
+    return web.json_response(STUB_REPLY)
+
+
+async def _start_stub_server() -> Tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_post("/api/chat", _chat)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/chat"
+
+
+async def _run(call, total: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return sorted(latencies)
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:<22} p50={p50:7.2f} ms  p99={p99:7.2f} ms  n={len(latencies)}")
+
+
+async def main(total: int, concurrency: int) -> None:
+    runner, url = await _start_stub_server()
+    try:
+        async def session_per_call():
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, json=PAYLOAD) as resp:
+                    await resp.json()
+
+        client = PooledHttpClient(name="benchmark", limit_per_host=concurrency)
+        await client.start()
+
+        async def pooled_call():
+            session = await client.get_session()
+            async with session.post(url, json=PAYLOAD) as resp:
+                await resp.json()
+
+        _report("session per call", await _run(session_per_call, total, concurrency))
+        _report("pooled session", await _run(pooled_call, total, concurrency))
+        print(f"pool metrics: {client.metrics()}")
+        await client.close()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
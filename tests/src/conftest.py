@@ -0,0 +1,59 @@
+"""
+Fixtures shared by the tests under tests/src.
+
+Tests that need a real database use a disposable PostgreSQL database given by
+TEST_DATABASE_URL (asyncpg URL); the tables listed by the `database_tables`
+fixture of the test's package or module are created and dropped around every
+test.
+"""
+
+import os
+from typing import List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.infra.persistence.models.sqlalchemy_base import Base
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+requires_database = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(database_tables):
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=database_tables))
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.drop_all(sync_conn, tables=database_tables))
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(engine) -> List[str]:
+    """Collects every SQL statement sent through the engine."""
+    captured: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def select_statements(statements: List[str]) -> List[str]:
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT")]
@@ -0,0 +1,44 @@
+"""
+Fixtures for bot tests that need a real database: the bot tables for the
+shared `engine` fixture (see tests/src/conftest.py) and bot units of work on it.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.infra.persistence.models.bot import BotORM
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.features.bot.infra.persistence.models.bot_participant import BotParticipantORM
+from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
+from src.features.bot.infra.persistence.repositories.bot_document_repository_impl import BotDocumentRepositoryImpl
+from src.features.bot.infra.persistence.repositories.bot_participant_repository_impl import BotParticipantRepositoryImpl
+from src.features.bot.infra.persistence.repositories.bot_repository_impl import BotRepositoryImpl
+from src.features.bot.infra.persistence.repositories.bot_service_repository_impl import BotServiceRepositoryImpl
+from src.features.bot.infra.persistence.uow.bot_unit_of_work_impl import BotUnitOfWorkImpl
+from src.features.identity.infra.persistence.models.user import UserORM
+from src.features.payments.infra.persistence.models.payment import PaymentORM
+
+
+@pytest.fixture
+def database_tables():
+    return [t.__table__ for t in (UserORM, BotORM, BotServiceORM, BotParticipantORM, BotDocumentORM, PaymentORM)]
+
+
+@pytest.fixture
+def make_uow(engine):
+    def factory() -> BotUnitOfWorkImpl:
+        session = async_sessionmaker(bind=engine, expire_on_commit=False)()
+        return BotUnitOfWorkImpl(
+            session=session,
+            bot_repository=BotRepositoryImpl(session),
+            bot_service_repository=BotServiceRepositoryImpl(session),
+            bot_participant_repository=BotParticipantRepositoryImpl(session),
+            bot_document_repository=BotDocumentRepositoryImpl(session),
+        )
+    return factory
+
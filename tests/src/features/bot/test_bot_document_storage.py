@@ -0,0 +1,277 @@
+"""
+Bot document blob tier: streaming S3 upload/download (against an in-memory S3
+stand-in) and the inline-bytes migration tool.
+"""
+
+import hashlib
+import os
+import uuid
+from typing import AsyncIterator, Dict, List
+
+import pytest
+from botocore.exceptions import ClientError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.application.services.bot_document_storage_service import (
+    BotDocumentStorageService,
+    StoredDocumentBlob,
+)
+from src.features.bot.infra.services.bot_document_storage_service_handler import BotDocumentStorageServiceHandler
+from src.features.bot.infra.services.document_blob_migrator import BotDocumentBlobMigrator
+from src.infra.services.s3.s3_service_impl import MB, S3UploaderServiceHandler
+
+pytestmark = pytest.mark.anyio
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+
+class _FakeBody:
+    def __init__(self, data: bytes):
+        self._data = data
+        self._offset = 0
+        self.read_sizes: List[int] = []
+
+    async def read(self, amt: int = -1) -> bytes:
+        self.read_sizes.append(amt)
+        if amt < 0:
+            amt = len(self._data) - self._offset
+        chunk = self._data[self._offset:self._offset + amt]
+        self._offset += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        pass
+
+
+class FakeS3Client:
+    """The subset of the aioboto3 S3 client used by S3UploaderServiceHandler, kept in memory."""
+
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.aborted: List[str] = []
+        self.put_calls = 0
+        self.fail_on_part = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def put_object(self, Bucket, Key, Body, ContentType, **kwargs):
+        self.put_calls += 1
+        self.objects[Key] = Body
+
+    async def create_multipart_upload(self, Bucket, Key, ContentType):
+        upload_id = str(uuid.uuid4())
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if self.fail_on_part == PartNumber:
+            raise RuntimeError("part upload failed")
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+
+    async def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[Key])}
+
+    async def get_object(self, Bucket, Key):
+        self.last_body = _FakeBody(self.objects[Key])
+        return {"Body": self.last_body, "ContentType": "application/octet-stream"}
+
+    async def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+
+
+@pytest.fixture
+def fake_s3(monkeypatch) -> FakeS3Client:
+    client = FakeS3Client()
+
+    async def get_client(self):
+        return client, "test-bucket"
+
+    monkeypatch.setattr(S3UploaderServiceHandler, "_get_s3_client", get_client)
+    return client
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def test_small_document_is_stored_with_single_put(fake_s3):
+    storage = BotDocumentStorageServiceHandler(S3UploaderServiceHandler(multipart_part_size=5 * MB))
+    bot_uid, document_uid = uuid.uuid4(), uuid.uuid4()
+    data = b"hello document" * 1000
+
+    blob = await storage.store(bot_uid, document_uid, _chunks(data, 4096), "application/pdf")
+
+    assert blob.storage_key == f"bot_documents/{bot_uid}/{document_uid}"
+    assert blob.file_size == len(data)
+    assert blob.checksum == hashlib.sha256(data).hexdigest()
+    assert fake_s3.put_calls == 1
+    assert fake_s3.objects[blob.storage_key] == data
+
+
+async def test_large_document_uses_multipart_upload(fake_s3):
+    storage = BotDocumentStorageServiceHandler(S3UploaderServiceHandler(multipart_part_size=5 * MB))
+    data = os.urandom(12 * MB + 123)
+
+    blob = await storage.store(uuid.uuid4(), uuid.uuid4(), _chunks(data, 1 * MB), None)
+
+    assert fake_s3.put_calls == 0
+    assert fake_s3.objects[blob.storage_key] == data
+    assert blob.checksum == hashlib.sha256(data).hexdigest()
+
+
+async def test_failed_part_aborts_multipart_upload(fake_s3):
+    storage = BotDocumentStorageServiceHandler(S3UploaderServiceHandler(multipart_part_size=5 * MB))
+    fake_s3.fail_on_part = 2
+
+    with pytest.raises(RuntimeError):
+        await storage.store(uuid.uuid4(), uuid.uuid4(), _chunks(os.urandom(11 * MB), 1 * MB), None)
+
+    assert len(fake_s3.aborted) == 1
+    assert fake_s3.objects == {}
+
+
+async def test_download_streams_in_chunks(fake_s3):
+    s3_service = S3UploaderServiceHandler(download_chunk_size=64 * 1024)
+    storage = BotDocumentStorageServiceHandler(s3_service)
+    data = os.urandom(300 * 1024)
+    blob = await storage.store(uuid.uuid4(), uuid.uuid4(), _chunks(data, 8192), None)
+
+    received = [chunk async for chunk in storage.open_stream(blob.storage_key)]
+
+    assert b"".join(received) == data
+    assert max(len(chunk) for chunk in received) == 64 * 1024
+    assert set(fake_s3.last_body.read_sizes) == {64 * 1024}
+
+
+async def test_missing_blob_is_reported_before_streaming(fake_s3):
+    storage = BotDocumentStorageServiceHandler(S3UploaderServiceHandler())
+    blob = await storage.store(uuid.uuid4(), uuid.uuid4(), _chunks(b"x" * 10, 10), None)
+
+    assert await storage.exists(blob.storage_key)
+    assert not await storage.exists("bot_documents/gone")
+
+
+async def test_download_of_missing_blob_fails_before_the_response(fake_s3, mocker):
+    from src.features.bot.application.queries.bot_documents.download_document.download_document_impl import \
+        DownloadBotDocumentQueryHandler
+    from src.features.bot.application.queries.bot_documents.download_document.download_document_query import \
+        DownloadBotDocumentQuery
+    from src.features.bot.exceptions.bot_exceptions import DocumentNotFoundError
+
+    bot_uid, document_uid = uuid.uuid4(), uuid.uuid4()
+    document = mocker.Mock(uid=document_uid, storage_key=f"bot_documents/{bot_uid}/{document_uid}")
+    uow = mocker.AsyncMock()
+    uow.__aenter__.return_value = uow
+    uow.bot_document_repository.find_by_uids_and_bot_uid.return_value = [document]
+    access = mocker.AsyncMock()
+    access.check_single_bot_access.return_value = mocker.Mock(uid=bot_uid)
+    storage = BotDocumentStorageServiceHandler(S3UploaderServiceHandler())
+    handler = DownloadBotDocumentQueryHandler(
+        _bot_uow=uow, _access_service=access, _document_storage=storage, _allowed_roles=["owner"],
+    )
+
+    with pytest.raises(DocumentNotFoundError):
+        await handler(DownloadBotDocumentQuery(user_uid=uuid.uuid4(), bot_uid=bot_uid, document_uid=document_uid))
+    assert not hasattr(fake_s3, "last_body")  # no GetObject was issued
+
+
+async def test_delete_removes_blobs(fake_s3):
+    storage = BotDocumentStorageServiceHandler(S3UploaderServiceHandler())
+    blob = await storage.store(uuid.uuid4(), uuid.uuid4(), _chunks(b"x" * 10, 10), None)
+
+    await storage.delete([blob.storage_key])
+
+    assert fake_s3.objects == {}
+
+
+class InMemoryDocumentStorage(BotDocumentStorageService):
+    def __init__(self):
+        self.blobs: Dict[str, bytes] = {}
+
+    async def store(self, bot_uid, document_uid, chunks, content_type) -> StoredDocumentBlob:
+        data = b"".join([chunk async for chunk in chunks])
+        key = f"bot_documents/{bot_uid}/{document_uid}"
+        self.blobs[key] = data
+        return StoredDocumentBlob(key, len(data), hashlib.sha256(data).hexdigest(), content_type)
+
+    async def exists(self, storage_key) -> bool:
+        return storage_key in self.blobs
+
+    async def open_stream(self, storage_key):
+        yield self.blobs[storage_key]
+
+    async def delete(self, storage_keys) -> None:
+        for key in storage_keys:
+            self.blobs.pop(key, None)
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+async def test_migrator_moves_inline_bytes_in_batches():
+    from src.features.bot.infra.persistence.models.bot import BotORM
+    from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+    from src.features.identity.infra.persistence.models.user import UserORM
+    from src.infra.persistence.models.sqlalchemy_base import Base
+
+    tables = [UserORM.__table__, BotORM.__table__, BotDocumentORM.__table__]
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+    try:
+        user_uid, bot_uid = uuid.uuid4(), uuid.uuid4()
+        payloads = {uuid.uuid4(): os.urandom(2048 + i) for i in range(7)}
+        async with engine.begin() as conn:
+            await conn.execute(insert(UserORM).values(uid=user_uid, email=f"{user_uid}@test.local"))
+            await conn.execute(insert(BotORM).values(uid=bot_uid, user_uid=user_uid, bot_type="assistant"))
+            await conn.execute(insert(BotDocumentORM), [
+                {"uid": uid, "bot_uid": bot_uid, "filename": f"{uid}.txt", "file_data": data}
+                for uid, data in payloads.items()
+            ])
+
+        storage = InMemoryDocumentStorage()
+        migrator = BotDocumentBlobMigrator(async_sessionmaker(bind=engine), storage, batch_size=3, chunk_size=1000)
+        stats = await migrator.run()
+
+        assert stats.migrated == len(payloads)
+        assert stats.failed_uids == []
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(
+                BotDocumentORM.uid, BotDocumentORM.storage_key, BotDocumentORM.file_size,
+                BotDocumentORM.checksum, BotDocumentORM.file_data,
+            ))).all()
+        for uid, storage_key, file_size, checksum, file_data in rows:
+            assert file_data is None
+            assert storage.blobs[storage_key] == payloads[uid]
+            assert file_size == len(payloads[uid])
+            assert checksum == hashlib.sha256(payloads[uid]).hexdigest()
+
+        # A second run finds nothing left to move
+        assert (await migrator.run()).migrated == 0
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.drop_all(sync_conn, tables=tables))
+        await engine.dispose()
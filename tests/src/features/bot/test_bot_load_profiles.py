@@ -0,0 +1,256 @@
+"""
+Query-count regression tests for BotLoadProfile.
+
+Every relationship on BotORM is lazy="raise", so the number of statements a
+handler emits is decided only by the profile it asks for. These tests pin those
+numbers. They need TEST_DATABASE_URL (see tests/src/conftest.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from src.features.bot.application.services.bot_access_service import BotAccessService
+from src.features.bot.domain.enums import BotLoadProfile
+from src.features.bot.infra.persistence.models.bot import BotORM
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.features.bot.infra.persistence.models.bot_participant import BotParticipantORM
+from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
+from src.features.identity.infra.persistence.models.user import UserORM
+from tests.src.conftest import requires_database, select_statements
+
+pytestmark = [pytest.mark.anyio, requires_database]
+
+
+@pytest.fixture
+async def seeded_bot(engine):
+    """One bot with two services, two participants and two documents carrying 1 MB blobs."""
+    owner_uid, member_uid, bot_uid = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(insert(UserORM), [
+            {"uid": owner_uid, "email": f"{owner_uid}@test.local"},
+            {"uid": member_uid, "email": f"{member_uid}@test.local"},
+        ])
+        await conn.execute(insert(BotORM).values(uid=bot_uid, user_uid=owner_uid, bot_type="assistant", name="bot"))
+        await conn.execute(insert(BotServiceORM), [
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "platform": platform, "status": "reserved"}
+            for platform in ("telegram", "whatsapp")
+        ])
+        await conn.execute(insert(BotParticipantORM), [
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "user_uid": owner_uid, "role": "owner"},
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "user_uid": member_uid, "role": "editor"},
+        ])
+        await conn.execute(insert(BotDocumentORM), [
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "filename": f"doc{i}.pdf", "file_data": b"x" * 1_000_000}
+            for i in range(2)
+        ])
+    return {"bot_uid": bot_uid, "owner_uid": owner_uid, "member_uid": member_uid}
+
+
+@pytest.mark.parametrize(
+    "profile, expected_statements",
+    [
+        (BotLoadProfile.MINIMAL, 1),
+        (BotLoadProfile.WITH_SERVICES, 2),
+        (BotLoadProfile.WITH_PARTICIPANTS, 2),
+        (BotLoadProfile.FULL_WITHOUT_BLOBS, 4),
+    ],
+)
+async def test_find_by_uid_statement_count(make_uow, seeded_bot, statements, profile, expected_statements):
+    uow = make_uow()
+    async with uow:
+        statements.clear()
+        bot = await uow.bot_repository.find_by_uid(seeded_bot["bot_uid"], profile=profile)
+
+    assert bot is not None
+    assert len(statements) == expected_statements
+    assert not any("file_data" in statement for statement in statements)
+    assert (bot.services is not None) == (profile in (BotLoadProfile.WITH_SERVICES, BotLoadProfile.FULL_WITHOUT_BLOBS))
+    assert (bot.participants is not None) == (
+        profile in (BotLoadProfile.WITH_PARTICIPANTS, BotLoadProfile.FULL_WITHOUT_BLOBS)
+    )
+    if profile == BotLoadProfile.FULL_WITHOUT_BLOBS:
+        assert len(bot.documents) == 2
+        assert all(doc.file_data is None for doc in bot.documents)
+
+
+@pytest.mark.parametrize(
+    "user_key, allowed_roles, expected_statements",
+    [
+        ("owner_uid", ["owner", "admin"], 1),   # owner: the bot row is enough
+        ("member_uid", ["owner", "editor"], 2),  # participant: plus one role lookup
+    ],
+)
+async def test_access_check_statement_count(make_uow, seeded_bot, statements, user_key, allowed_roles, expected_statements):
+    access_service = BotAccessService(make_uow())
+    statements.clear()
+
+    await access_service.check_single_bot_access(
+        user_uid=seeded_bot[user_key],
+        bot_uid=seeded_bot["bot_uid"],
+        allowed_roles=allowed_roles,
+    )
+
+    assert len(select_statements(statements)) == expected_statements
+
+
+async def test_build_bot_response_uses_loaded_collections(make_uow, seeded_bot, statements, mocker):
+    # Imported here: the module builds a DTO mapper that logs at import time, which needs a running loop
+    from src.features.bot.utils import build_bot_response
+
+    uow = make_uow()
+    user_lookup_service = mocker.AsyncMock()
+    user_lookup_service.get_users_by_uids.return_value = []
+
+    async with uow:
+        bot = await uow.bot_repository.find_by_uid(seeded_bot["bot_uid"], profile=BotLoadProfile.FULL_WITHOUT_BLOBS)
+        statements.clear()
+        bot_dto = await build_bot_response(bot=bot, bot_uow=uow, user_lookup_service=user_lookup_service)
+
+    assert bot_dto is not None
+    assert len(bot_dto.bot_services) == 2
+    assert len(bot_dto.documents) == 2
+    assert select_statements(statements) == []
+
+
+async def test_minimal_profile_never_touches_relationships(make_uow, seeded_bot, statements):
+    uow = make_uow()
+    async with uow:
+        bot = await uow.bot_repository.find_by_uid(seeded_bot["bot_uid"])
+
+    assert bot.services is None and bot.participants is None and bot.documents is None
+    assert len(statements) == 1
+
+
+# Bot query handlers, each run by the bot owner: the access check loads the
+# bot with the minimal profile and the handler adds one query per collection it
+# returns. The user lookup and the blob store are not part of the count.
+
+async def test_get_services_statement_count(make_uow, seeded_bot, statements):
+    from src.features.bot.application.queries.bot_services.get_services.get_services_impl import \
+        GetServicesQueryHandler
+    from src.features.bot.application.queries.bot_services.get_services.get_services_query import GetServicesQuery
+
+    handler = GetServicesQueryHandler(
+        _bot_uow=make_uow(), _access_service=BotAccessService(make_uow()), _allowed_roles=["owner"],
+    )
+    statements.clear()
+
+    response = await handler(GetServicesQuery(user_uid=seeded_bot["owner_uid"], bot_uid=seeded_bot["bot_uid"]))
+
+    assert len(response.services) == 2
+    assert len(select_statements(statements)) == 2  # bot, services
+
+
+async def test_get_participants_statement_count(make_uow, seeded_bot, statements, mocker):
+    from src.features.bot.application.queries.bot_participants.get_participants.get_bot_participants_impl import \
+        GetBotParticipantsQueryHandler
+    from src.features.bot.application.queries.bot_participants.get_participants.get_bot_participants_query import \
+        GetBotParticipantsQuery
+
+    user_lookup_service = mocker.AsyncMock()
+    user_lookup_service.get_users_by_uids.return_value = []
+    handler = GetBotParticipantsQueryHandler(
+        _bot_uow=make_uow(), _user_lookup_service=user_lookup_service, _access_service=BotAccessService(make_uow()),
+        _mediator=mocker.Mock(), _allowed_roles=["owner"],
+    )
+    statements.clear()
+
+    response = await handler(GetBotParticipantsQuery(
+        bot_uid=seeded_bot["bot_uid"], current_user_uid=seeded_bot["owner_uid"],
+    ))
+
+    assert len(response.participants) == 2
+    assert len(select_statements(statements)) == 2  # bot, participants
+
+
+@pytest.mark.parametrize(
+    "storage_key, expected_statements",
+    [
+        ("bots/documents/stored.pdf", 2),  # bot, document metadata; bytes come from the blob store
+        (None, 3),                         # not migrated yet: plus the inline file_data
+    ],
+)
+async def test_download_document_statement_count(
+    engine, make_uow, seeded_bot, statements, mocker, storage_key, expected_statements
+):
+    from src.features.bot.application.queries.bot_documents.download_document.download_document_impl import \
+        DownloadBotDocumentQueryHandler
+    from src.features.bot.application.queries.bot_documents.download_document.download_document_query import \
+        DownloadBotDocumentQuery
+
+    document_uid = uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(insert(BotDocumentORM).values(
+            uid=document_uid, bot_uid=seeded_bot["bot_uid"], filename="download.pdf",
+            storage_key=storage_key, file_data=None if storage_key else b"x" * 1_000_000,
+        ))
+    handler = DownloadBotDocumentQueryHandler(
+        _bot_uow=make_uow(), _access_service=BotAccessService(make_uow()),
+        _document_storage=mocker.Mock(exists=mocker.AsyncMock(return_value=True)), _allowed_roles=["owner"],
+    )
+    statements.clear()
+
+    await handler(DownloadBotDocumentQuery(
+        user_uid=seeded_bot["owner_uid"], bot_uid=seeded_bot["bot_uid"], document_uid=document_uid,
+    ))
+
+    selects = select_statements(statements)
+    assert len(selects) == expected_statements
+    assert sum("file_data" in statement for statement in selects) == (0 if storage_key else 1)
+
+
+@pytest.mark.parametrize(
+    "user_key, expected_statements",
+    [
+        ("owner_uid", 5),   # owned bots, participations, then services, participants, documents
+        ("member_uid", 6),  # plus the bots the user takes part in
+    ],
+)
+async def test_get_user_bots_statement_count(make_uow, seeded_bot, statements, mocker, user_key, expected_statements):
+    # Imported here: the module builds a DTO mapper that logs at import time, which needs a running loop
+    from src.features.bot.application.queries.bot_management.get_user_bots.get_user_bots_impl import \
+        GetUserBotsQueryHandler
+    from src.features.bot.application.queries.bot_management.get_user_bots.get_user_bots_query import GetUserBotsQuery
+
+    user_lookup_service = mocker.AsyncMock()
+    user_lookup_service.get_users_by_uids.return_value = []
+    handler = GetUserBotsQueryHandler(
+        _bot_uow=make_uow(), _user_lookup_service=user_lookup_service, _access_service=BotAccessService(make_uow()),
+        _mediator=mocker.Mock(), _allowed_roles=["owner", "editor"],
+    )
+    statements.clear()
+
+    response = await handler(GetUserBotsQuery(user_uid=seeded_bot[user_key]))
+
+    assert len(response.bots) == 1
+    assert len(select_statements(statements)) == expected_statements
+    assert not any("file_data" in statement for statement in statements)
+
+
+@pytest.mark.parametrize(
+    "user_key, expected_statements",
+    [
+        ("owner_uid", 2),   # owned bots, participations
+        ("member_uid", 3),  # plus the bots the user takes part in
+    ],
+)
+async def test_get_last_active_bots_statement_count(
+    make_uow, seeded_bot, statements, mocker, user_key, expected_statements
+):
+    from src.features.bot.application.queries.bot_management.get_last_active_bots.get_last_active_bots_impl import \
+        GetLastActiveBotsQueryHandler
+    from src.features.bot.application.queries.bot_management.get_last_active_bots.get_last_active_bots_query import \
+        GetLastActiveBotsQuery
+
+    handler = GetLastActiveBotsQueryHandler(
+        _unit_of_work=make_uow(), _access_service=BotAccessService(make_uow()),
+        _user_lookup_service=mocker.AsyncMock(), _mediator=mocker.Mock(), _allowed_roles=["owner", "editor"],
+    )
+    statements.clear()
+
+    response = await handler(GetLastActiveBotsQuery(user_uid=seeded_bot[user_key]))
+
+    assert len(response.bots) == 1
+    assert len(select_statements(statements)) == expected_statements
@@ -0,0 +1,116 @@
+"""
+Bot config cache across workers: an invalidation in one worker is published
+on a Redis channel and drops the entry in every other worker's local cache.
+"""
+
+import asyncio
+import uuid
+from typing import Dict, List
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.bot.infra.services.bot_lookup_cache import BotLookupCache
+
+pytestmark = pytest.mark.anyio
+
+CHANNEL = "bot_config:invalidated"
+
+
+class _PubSub:
+    def __init__(self, redis: "_FakeRedis"):
+        self._redis = redis
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self.channels: List[str] = []
+
+    async def subscribe(self, channel):
+        self.channels.append(channel)
+        self._redis.subscribers.setdefault(channel, []).append(self._messages)
+        await self._messages.put({"type": "subscribe", "channel": channel.encode(), "data": 1})
+
+    async def listen(self):
+        while True:
+            yield await self._messages.get()
+
+    async def aclose(self):
+        for channel in self.channels:
+            self._redis.subscribers[channel].remove(self._messages)
+
+
+class _FakeRedis:
+    """Just the pub/sub part of redis.asyncio.Redis."""
+
+    def __init__(self):
+        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    def pubsub(self):
+        return _PubSub(self)
+
+    async def publish(self, channel, message):
+        queues = self.subscribers.get(channel, [])
+        for queue in queues:
+            await queue.put({"type": "message", "channel": channel.encode(), "data": message.encode()})
+        return len(queues)
+
+
+def _bot() -> BotEntity:
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(generation_model="stub"),
+    )
+
+
+async def _until(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+async def test_invalidation_reaches_every_worker():
+    redis = _FakeRedis()
+    first, second = (BotLookupCache(invalidation_channel=CHANNEL, redis=redis) for _ in range(2))
+    await first.start()
+    await second.start()
+    await _until(lambda: len(redis.subscribers.get(CHANNEL, [])) == 2)
+    try:
+        bot = _bot()
+        await first.set(bot)
+        await second.set(bot)
+
+        await first.invalidate(bot.uid)
+        await _until(lambda: second.stats()["remote_invalidations"] == 1)
+
+        assert await first.get(bot.uid) is None
+        assert await second.get(bot.uid) is None
+    finally:
+        await first.stop()
+        await second.stop()
+    assert redis.subscribers[CHANNEL] == []
+
+
+async def test_without_a_channel_invalidation_stays_in_process():
+    redis = _FakeRedis()
+    listener = BotLookupCache(invalidation_channel=CHANNEL, redis=redis)
+    local = BotLookupCache(redis=redis)
+    await listener.start()
+    await local.start()
+    await _until(lambda: len(redis.subscribers.get(CHANNEL, [])) == 1)
+    try:
+        bot = _bot()
+        await listener.set(bot)
+        await local.invalidate(bot.uid)
+        await asyncio.sleep(0.01)
+
+        assert (await listener.get(bot.uid)).uid == bot.uid
+        assert listener.stats()["remote_invalidations"] == 0
+    finally:
+        await listener.stop()
+        await local.stop()
@@ -0,0 +1,55 @@
+"""
+BotRepository.update leaves bots.tokens_left to the token quota write-back
+unless the token limit changes. Needs TEST_DATABASE_URL (see tests/src/conftest.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from src.features.bot.domain.enums import BotLoadProfile
+from src.features.bot.infra.persistence.models.bot import BotORM
+from src.features.identity.infra.persistence.models.user import UserORM
+from tests.src.conftest import requires_database
+
+pytestmark = [pytest.mark.anyio, requires_database]
+
+
+@pytest.fixture
+async def bot_uid(engine):
+    owner_uid, bot_uid = uuid.uuid4(), uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(insert(UserORM).values(uid=owner_uid, email=f"{owner_uid}@test.local"))
+        await conn.execute(insert(BotORM).values(
+            uid=bot_uid, user_uid=owner_uid, bot_type="assistant", name="bot", token_limit=1000, tokens_left=1000,
+        ))
+    return bot_uid
+
+
+async def _tokens_left(engine, bot_uid) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(BotORM.tokens_left).where(BotORM.uid == bot_uid))).scalar_one()
+
+
+async def test_edit_does_not_overwrite_a_concurrent_balance_write_back(engine, make_uow, bot_uid):
+    async with make_uow() as uow:
+        bot = await uow.bot_repository.find_by_uid(bot_uid, profile=BotLoadProfile.MINIMAL)
+    # The quota write-back lands between the edit's read and its save
+    async with engine.begin() as conn:
+        await conn.execute(update(BotORM).where(BotORM.uid == bot_uid).values(tokens_left=400))
+
+    bot.name = "renamed"
+    async with make_uow() as uow:
+        await uow.bot_repository.update(bot)
+
+    assert await _tokens_left(engine, bot_uid) == 400
+
+
+async def test_new_token_limit_resets_the_balance(engine, make_uow, bot_uid):
+    async with make_uow() as uow:
+        bot = await uow.bot_repository.find_by_uid(bot_uid, profile=BotLoadProfile.MINIMAL)
+        bot.update_token_limit(5000)
+        await uow.bot_repository.update(bot)
+
+    assert await _tokens_left(engine, bot_uid) == 5000
@@ -0,0 +1,65 @@
+"""
+build_bot_responses must issue the same number of statements for one bot as for
+many: one IN query per relation plus a single user lookup. Needs
+TEST_DATABASE_URL (see tests/src/conftest.py).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from src.features.bot.infra.persistence.models.bot import BotORM
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.features.bot.infra.persistence.models.bot_participant import BotParticipantORM
+from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
+from src.features.identity.infra.persistence.models.user import UserORM
+from tests.src.conftest import requires_database, select_statements
+
+pytestmark = [pytest.mark.anyio, requires_database]
+
+
+async def _seed_bots(engine, count: int):
+    owner_uid = uuid.uuid4()
+    bot_uids = [uuid.uuid4() for _ in range(count)]
+    async with engine.begin() as conn:
+        await conn.execute(insert(UserORM).values(uid=owner_uid, email=f"{owner_uid}@test.local"))
+        await conn.execute(insert(BotORM), [
+            {"uid": bot_uid, "user_uid": owner_uid, "bot_type": "assistant", "name": f"bot{i}"}
+            for i, bot_uid in enumerate(bot_uids)
+        ])
+        await conn.execute(insert(BotServiceORM), [
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "platform": "telegram", "status": "reserved"}
+            for bot_uid in bot_uids
+        ])
+        await conn.execute(insert(BotParticipantORM), [
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "user_uid": owner_uid, "role": "owner"}
+            for bot_uid in bot_uids
+        ])
+        await conn.execute(insert(BotDocumentORM), [
+            {"uid": uuid.uuid4(), "bot_uid": bot_uid, "filename": "doc.pdf", "file_data": b"x" * 1024}
+            for bot_uid in bot_uids
+        ])
+    return owner_uid
+
+
+@pytest.mark.parametrize("bot_count", [1, 10])
+async def test_statement_count_does_not_grow_with_bots(engine, make_uow, statements, mocker, bot_count):
+    # Imported here: the module builds a DTO mapper that logs at import time, which needs a running loop
+    from src.features.bot.utils import build_bot_responses
+
+    owner_uid = await _seed_bots(engine, bot_count)
+    uow = make_uow()
+    user_lookup_service = mocker.AsyncMock()
+    user_lookup_service.get_users_by_uids.return_value = []
+
+    async with uow:
+        bots = await uow.bot_repository.findall_by_user_uid(owner_uid)
+        statements.clear()
+        bot_dtos = await build_bot_responses(bots=bots, bot_uow=uow, user_lookup_service=user_lookup_service)
+
+    assert len(bot_dtos) == bot_count
+    assert all(len(dto.bot_services) == 1 and len(dto.documents) == 1 for dto in bot_dtos)
+    assert len(select_statements(statements)) == 3
+    assert not any("file_data" in statement for statement in statements)
+    user_lookup_service.get_users_by_uids.assert_awaited_once()
@@ -0,0 +1,339 @@
+"""
+Retrieval over bot documents: text extraction, normalization and chunking,
+the memory-mapped per-bot vector index (append, tombstones, compaction,
+growth, other readers), processing uploads in worker processes with their
+status on the document row, and the passages the incoming message handler
+adds to the system prompt.
+"""
+
+import asyncio
+import io
+import uuid
+import zipfile
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.application.services.document_retrieval_service import DocumentRetrievalService, RetrievedChunk
+from src.features.bot.domain.entities.bot_document_entity import BotDocumentEntity
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.enums import BotDocumentStatus
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.bot.exceptions.bot_exceptions import UnsupportedDocumentTypeError
+from src.features.bot.infra.services.document_knowledge_base import DocumentKnowledgeBase
+from src.features.bot.infra.services.document_processing_pool import DocumentProcessingPool
+from src.features.bot.infra.services.document_text_extractor import chunk_text, extract_text, normalize_text
+from src.features.bot.infra.services.document_vector_index import DocumentVectorIndexStore
+from src.features.bot.infra.services.text_embedder import HashingTextEmbedder
+from src.features.conversation.domain.enums import ChatPlatform
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from tests.src.features.conversation.test_conversation_summarizer import _GenerationService, _Store, _UnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+DIM = 1024
+REFUNDS = "Refunds are paid back to the original card within 14 days of the return arriving at our warehouse."
+SHIPPING = "Orders ship from Almaty. Delivery to Astana takes two working days; other cities take up to five."
+
+
+
+def _store(root, **kwargs) -> DocumentVectorIndexStore:
+    return DocumentVectorIndexStore(str(root), DIM, "hashing", term_weighted=True, **kwargs)
+
+
+def _filler(n: int, tag: str) -> List[str]:
+    return [f"{tag} paragraph {i} about product line {i % 7} and colour {i % 5}." for i in range(n)]
+
+
+def _processed(pool: DocumentProcessingPool, data: bytes, content_type: str, filename: str):
+    async def load():
+        return data
+
+    return asyncio.run(pool.process(load, content_type, filename))
+
+
+def test_chunks_respect_the_size_and_overlap_at_sentence_boundaries():
+    sentences = [f"Sentence number {i} says something short." for i in range(40)]
+    chunks = chunk_text(" ".join(sentences), max_chars=200, overlap_chars=60)
+
+    assert len(chunks) > 1 and all(len(chunk) <= 200 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        # The next passage starts with the last sentence of the previous one
+        assert previous.endswith(current.split(". ")[0] + ".")
+    assert chunk_text("x" * 450, max_chars=200) == ["x" * 200, "x" * 200, "x" * 50]
+    assert chunk_text("  \n\n ") == []
+
+
+def test_text_is_extracted_from_html_json_and_docx():
+    html = b"<html><head><style>p{}</style><script>var x=1</script></head><body><p>Hello</p><p>World</p></body></html>"
+    assert extract_text(html, "text/html", "page.html").split() == ["Hello", "World"]
+    assert "answer: 42" in extract_text(b'{"faq": [{"answer": 42}], "ok": true}', None, "faq.json")
+
+    body = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            '<w:p><w:r><w:t>First </w:t></w:r><w:r><w:t>paragraph</w:t></w:r></w:p>'
+            '<w:p><w:r><w:t>Second</w:t></w:r></w:p></w:body></w:document>')
+    docx = io.BytesIO()
+    with zipfile.ZipFile(docx, "w") as archive:
+        archive.writestr("word/document.xml", body)
+    assert extract_text(docx.getvalue(), None, "manual.docx") == "First paragraph\n\nSecond"
+
+    with pytest.raises(UnsupportedDocumentTypeError):
+        extract_text(b"\x89PNG", "image/png", "logo.png")
+
+
+def test_normalized_text_and_its_hash_do_not_depend_on_the_source_format():
+    assert normalize_text("\ufb01ne\u00a0 day\u200b!\r\n\r\n\r\n  Second\tline \x00\n  more  ") == (
+        "fine day!\n\nSecond line\nmore"
+    )
+    html = f"<html><body><p>{REFUNDS}</p>\n<p>{SHIPPING}</p></body></html>".encode()
+    text = f"\ufeff{REFUNDS}  \r\n\r\n{SHIPPING}\r\n".encode()
+    # A thread instead of worker processes; the work is the same
+    pool = DocumentProcessingPool("hashing", DIM, workers=0)
+    from_html = _processed(pool, html, "text/html", "faq.html")
+    from_text = _processed(pool, text, "text/plain", "faq.txt")
+    assert from_html.content_hash == from_text.content_hash and from_html.chunks == from_text.chunks
+
+
+def test_documents_are_processed_in_worker_processes():
+    pool = DocumentProcessingPool("hashing", DIM, workers=1)
+    try:
+        processed = _processed(pool, f"{REFUNDS}\n\n{SHIPPING}".encode(), "text/plain", "faq.txt")
+        with pytest.raises(UnsupportedDocumentTypeError):
+            _processed(pool, b"\x89PNG", "image/png", "logo.png")
+    finally:
+        pool.close()
+
+    assert processed.chunks == [f"{REFUNDS} {SHIPPING}"]
+    assert processed.vectors.shape == (1, DIM)
+    assert (processed.vectors == HashingTextEmbedder(DIM).embed(processed.chunks)).all()
+    assert pool.stats()["processed"] == 1 and pool.stats()["failed"] == 1
+
+
+def test_index_finds_the_matching_passage_and_forgets_removed_documents(tmp_path):
+    embedder = HashingTextEmbedder(DIM)
+    index = _store(tmp_path).get("bot")
+    faq, manual = str(uuid.uuid4()), str(uuid.uuid4())
+    filler = _filler(100, "Catalogue")  # More rows than the initial capacity
+    index.add(manual, "manual.txt", embedder.embed(filler), filler)
+    index.add(faq, "faq.txt", embedder.embed([REFUNDS, SHIPPING]), [REFUNDS, SHIPPING])
+
+    (best, *_) = index.search(embedder.embed(["How soon are refunds paid?"])[0], top_k=3)
+    assert best[:3] == (faq, "faq.txt", REFUNDS)
+    assert index.size() == (102, 2)
+
+    # A second process sees the same files
+    other = _store(tmp_path).get("bot")
+    assert other.search(embedder.embed(["delivery to Astana"])[0], top_k=1)[0][2] == SHIPPING
+
+    # Removing most rows compacts the files; the survivors keep their texts
+    assert index.remove([manual]) == 100
+    assert index.size() == (2, 1)
+    assert [row[2] for row in other.search(embedder.embed(["refunds"])[0], top_k=5)] == [REFUNDS]
+
+    assert index.remove([faq]) == 2
+    assert not index.exists() and index.search(embedder.embed(["refunds"])[0], top_k=1) == []
+
+
+def test_reindexing_a_document_replaces_its_passages(tmp_path):
+    embedder = HashingTextEmbedder(DIM)
+    index = _store(tmp_path).get("bot")
+    uid = str(uuid.uuid4())
+    index.add(uid, "faq.txt", embedder.embed([REFUNDS]), [REFUNDS])
+    index.add(uid, "faq.txt", embedder.embed([SHIPPING]), [SHIPPING])
+
+    assert index.size() == (1, 1)
+    assert all(row[2] == SHIPPING for row in index.search(embedder.embed(["refunds to the card"])[0], top_k=5))
+
+
+def test_index_built_with_another_embedder_is_not_used(tmp_path):
+    embedder = HashingTextEmbedder(DIM)
+    _store(tmp_path).get("bot").add("doc", "faq.txt", embedder.embed([REFUNDS]), [REFUNDS])
+
+    other = DocumentVectorIndexStore(str(tmp_path), 512, "hashing", term_weighted=True).get("bot")
+    assert other.search(HashingTextEmbedder(512).embed(["refunds"])[0], top_k=1) == []
+
+
+class _Storage:
+    def __init__(self, blobs: Dict[str, bytes]):
+        self.blobs = blobs
+
+    async def open_stream(self, storage_key: str) -> AsyncIterator[bytes]:
+        data = self.blobs[storage_key]
+        for start in range(0, len(data), 16):
+            yield data[start:start + 16]
+
+
+class _DocumentRepository:
+    def __init__(self, documents: List[BotDocumentEntity], legacy: Dict[uuid.UUID, bytes]):
+        self.documents = documents
+        self.legacy = legacy
+        self.deleted: Set[uuid.UUID] = set()
+
+    async def claim_for_processing(self, document_uids, bot_uid):
+        claimed = [d for d in self.documents if d.uid in document_uids and d.bot_uid == bot_uid
+                   and d.status == BotDocumentStatus.PENDING]
+        for document in claimed:
+            document.status = BotDocumentStatus.PROCESSING
+        return claimed
+
+    async def set_processing_result(self, uid, status, chunk_count=None, content_hash=None, error=None):
+        if uid in self.deleted:
+            return False
+        document = next(d for d in self.documents if d.uid == uid)
+        document.status, document.chunk_count, document.content_hash = status, chunk_count, content_hash
+        document.status_error = error
+        return True
+
+    async def find_legacy_file_data(self, uid):
+        return self.legacy.get(uid)
+
+
+class _BotUnitOfWork:
+    def __init__(self, repository: _DocumentRepository):
+        self.bot_document_repository = repository
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Mediator:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, events):
+        self.events.extend(events)
+        return []
+
+
+async def test_uploaded_documents_are_indexed_and_retrieved(tmp_path):
+    bot_uid = uuid.uuid4()
+    faq = BotDocumentEntity(uid=uuid.uuid4(), bot_uid=bot_uid, filename="faq.md", content_type="text/markdown",
+                            storage_key="faq", file_size=len(REFUNDS))
+    legacy = BotDocumentEntity(uid=uuid.uuid4(), bot_uid=bot_uid, filename="shipping.txt", content_type="text/plain")
+    huge = BotDocumentEntity(uid=uuid.uuid4(), bot_uid=bot_uid, filename="huge.txt", content_type="text/plain",
+                             storage_key="huge", file_size=10_000)
+    repository = _DocumentRepository([faq, legacy, huge], {legacy.uid: SHIPPING.encode()})
+    mediator = _Mediator()
+    knowledge = DocumentKnowledgeBase(
+        index_store=_store(tmp_path),
+        embedder=HashingTextEmbedder(DIM),
+        uow_factory=lambda: _BotUnitOfWork(repository),
+        document_storage=_Storage({"faq": REFUNDS.encode(), "huge": b"x" * 10_000, "gone": SHIPPING.encode()}),
+        processing_pool=DocumentProcessingPool("hashing", DIM, workers=0),
+        max_document_bytes=5_000,
+        mediator=mediator,
+    )
+
+    assert await knowledge.retrieve(bot_uid, "refunds", top_k=2) == []
+    assert await knowledge.index_documents(bot_uid, [faq.uid, legacy.uid, huge.uid]) == 2
+    assert [d.status for d in (faq, legacy, huge)] == [
+        BotDocumentStatus.READY, BotDocumentStatus.READY, BotDocumentStatus.FAILED
+    ]
+    assert faq.chunk_count == 1 and len(faq.content_hash) == 64 and faq.status_error is None
+    assert "indexing limit" in huge.status_error
+    # Already claimed documents are not processed twice
+    assert await knowledge.index_documents(bot_uid, [faq.uid, legacy.uid]) == 0
+
+    # Deleted while it was processed: its passages don't stay in the index
+    gone = BotDocumentEntity(uid=uuid.uuid4(), bot_uid=bot_uid, filename="gone.txt", content_type="text/plain",
+                             storage_key="gone", file_size=len(SHIPPING))
+    repository.documents.append(gone)
+    repository.deleted.add(gone.uid)
+    assert await knowledge.index_documents(bot_uid, [gone.uid]) == 0
+    # Cached replies were generated without the new documents (or with the deleted one)
+    assert [(e.bot_uid, e.reason) for e in mediator.events] == [
+        (str(bot_uid), "document indexed"), (str(bot_uid), "document indexed"),
+        (str(bot_uid), "deleted document removed from the index"),
+    ]
+    assert (await knowledge.retrieve(bot_uid, "delivery to Astana", top_k=1))[0].document_uid == legacy.uid
+
+    chunks = await knowledge.retrieve(bot_uid, "When do I get my refund?", top_k=2)
+    assert chunks[0] == RetrievedChunk(document_uid=faq.uid, filename="faq.md", text=REFUNDS, score=chunks[0].score)
+    assert (await knowledge.retrieve(bot_uid, "delivery to Astana", top_k=1))[0].document_uid == legacy.uid
+    assert await knowledge.retrieve(uuid.uuid4(), "refunds", top_k=2) == []
+
+    assert await knowledge.remove_documents(bot_uid, [faq.uid, legacy.uid]) == 2
+    assert mediator.events[-1].reason == "documents removed from the index"
+    assert await knowledge.retrieve(bot_uid, "refunds", top_k=2) == []
+    stats = knowledge.stats()
+    assert stats["documents_indexed"] == 2 and stats["index_failures"] == 1 and stats["chunks_removed"] == 2
+
+
+class _Retrieval(DocumentRetrievalService):
+    def __init__(self, chunks: List[RetrievedChunk]):
+        self.chunks = chunks
+        self.queries: List[str] = []
+
+    async def retrieve(self, bot_uid, query, top_k):
+        self.queries.append(query)
+        return self.chunks[:top_k]
+
+    async def index_documents(self, bot_uid, document_uids):
+        return 0
+
+    async def remove_documents(self, bot_uid, document_uids):
+        return 0
+
+
+def _bot(instructions: Optional[str]) -> BotEntity:
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(generation_model="stub", instructions=instructions),
+    )
+
+
+class _Bots:
+    def __init__(self, bot: BotEntity):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+async def test_matching_passages_are_added_to_the_system_prompt():
+    bot = _bot("Answer shop questions.")
+    retrieval = _Retrieval([
+        RetrievedChunk(document_uid=uuid.uuid4(), filename="faq.md", text=REFUNDS, score=0.6),
+        RetrievedChunk(document_uid=uuid.uuid4(), filename="shipping.txt", text=SHIPPING, score=0.2),
+        RetrievedChunk(document_uid=uuid.uuid4(), filename="big.txt", text="y" * 5000, score=0.1),
+    ])
+    store, generation = _Store(), _GenerationService()
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_Bots(bot),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        document_retrieval_service=retrieval,
+        knowledge_top_k=3,
+        knowledge_max_chars=1000,
+    )
+
+    await handler(ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42", content="How do refunds work?",
+        timestamp=store.tick(), sender_number=None, sender_nickname=None,
+    ))
+
+    system_prompt, _ = generation.reply_prompts[0]
+    assert retrieval.queries == ["How do refunds work?"]
+    assert system_prompt == (
+        "Answer shop questions.\n\nRelevant excerpts from the bot's documents:\n"
+        f"[1] (faq.md) {REFUNDS}\n\n[2] (shipping.txt) {SHIPPING}"
+    )
+
+    # Nothing found: the prompt stays as it was
+    retrieval.chunks = []
+    await handler(ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42", content="Hi",
+        timestamp=store.tick(), sender_number=None, sender_nickname=None,
+    ))
+    assert generation.reply_prompts[1][0] == "Answer shop questions."
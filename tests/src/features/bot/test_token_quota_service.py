@@ -0,0 +1,251 @@
+"""
+Token quota accounting: reservations against a Redis balance cannot overspend,
+settling refunds what was not used, balances are written back in batches, and
+an exhausted bot gets no LLM call at all.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.bot.infra.services import redis_token_quota_service as quota_module
+from src.features.bot.infra.services.redis_token_quota_service import RedisTokenQuotaService
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+
+pytestmark = pytest.mark.anyio
+
+
+
+class FakeRedis:
+    """Runs the quota scripts as their Python equivalents; each call is atomic like a Lua script."""
+
+    def __init__(self):
+        self.values: Dict[str, int] = {}
+
+    async def eval(self, script, numkeys, key, *args):
+        await asyncio.sleep(0)
+        if script == quota_module._RESERVE_SCRIPT:
+            wanted, seed, _ttl = (int(a) for a in args)
+            current = self.values.get(key, seed)
+            if current <= 0:
+                self.values[key] = current
+                return -1
+            reserved = min(wanted, current)
+            self.values[key] = current - reserved
+            return reserved
+        if script == quota_module._SETTLE_SCRIPT:
+            reserved, used, _ttl = (int(a) for a in args)
+            if key not in self.values:
+                return None
+            self.values[key] = max(self.values[key] + reserved - used, 0)
+            return self.values[key]
+        raise AssertionError("unknown script")
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = int(value)
+
+    async def mget(self, keys):
+        return [None if self.values.get(key) is None else str(self.values[key]) for key in keys]
+
+
+class FakeSession:
+    def __init__(self, executed: List):
+        self._executed = executed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params):
+        self._executed.append(params)
+
+    async def commit(self):
+        pass
+
+
+def _service(redis, executed=None, batch_size=500):
+    executed = executed if executed is not None else []
+    return RedisTokenQuotaService(
+        session_maker=lambda: FakeSession(executed), redis=redis, flush_batch_size=batch_size
+    )
+
+
+async def test_concurrent_reservations_cannot_overspend():
+    redis = FakeRedis()
+    service = _service(redis)
+    bot_uid = uuid.uuid4()
+
+    reservations = await asyncio.gather(*(service.reserve(bot_uid, 1000, 300) for _ in range(10)))
+
+    granted = [r for r in reservations if r is not None]
+    assert sum(r.tokens for r in granted) == 1000
+    assert len(granted) == 4 and service.stats()["rejected"] == 6
+    assert redis.values[f"bot_tokens:{bot_uid}"] == 0
+
+
+async def test_settle_refunds_unused_tokens_and_never_goes_negative():
+    redis = FakeRedis()
+    service = _service(redis)
+    bot_uid = uuid.uuid4()
+
+    reservation = await service.reserve(bot_uid, 1000, 300)
+    assert await service.settle(reservation, 120) == 880
+
+    reservation = await service.reserve(bot_uid, 1000, 2000)
+    assert reservation.tokens == 880
+    assert await service.settle(reservation, 5000) == 0
+    assert await service.reserve(bot_uid, 1000, 1) is None
+
+
+async def test_flush_writes_balances_back_in_batches():
+    redis, executed = FakeRedis(), []
+    service = _service(redis, executed, batch_size=2)
+    bot_uids = [uuid.uuid4() for _ in range(3)]
+    for bot_uid in bot_uids:
+        await service.settle(await service.reserve(bot_uid, 500, 100), 40)
+
+    assert await service.flush() == 3
+
+    assert [len(batch) for batch in executed] == [2, 1]
+    written = {p["b_uid"]: p["b_tokens_left"] for batch in executed for p in batch}
+    assert written == {bot_uid: 460 for bot_uid in bot_uids}
+    assert await service.flush() == 0  # Nothing changed since
+
+
+async def test_reset_overwrites_the_balance():
+    redis = FakeRedis()
+    service = _service(redis)
+    bot_uid = uuid.uuid4()
+    await service.reserve(bot_uid, 10, 10)
+
+    await service.reset(bot_uid, 5000)
+
+    assert (await service.reserve(bot_uid, 10, 100)).tokens == 100
+
+
+class _Store:
+    def __init__(self):
+        self.conversations: Dict[tuple, ConversationEntity] = {}
+        self.messages: Dict[uuid.UUID, List] = {}
+
+
+class _ConversationRepository:
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def find_by_platform_and_sender_id(self, platform, sender_id, bot_uid, history_limit=None,
+                                             history_token_budget=None):
+        return self._store.conversations.get((platform, sender_id, bot_uid))
+
+    async def create(self, conversation):
+        conversation.uid = conversation.uid or uuid.uuid4()
+        self._store.conversations[(conversation.platform, conversation.participant.sender_id, conversation.bot_uid)] = conversation
+        self._store.messages[conversation.uid] = []
+        return conversation
+
+    async def update(self, conversation):
+        return conversation
+
+    async def upsert_conversation(self, conversation, history_limit=None, history_token_budget=None):
+        existing = await self.find_by_platform_and_sender_id(
+            conversation.platform, conversation.participant.sender_id, conversation.bot_uid,
+        )
+        return existing or await self.create(conversation)
+
+
+class _MessageRepository:
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def create(self, message, conversation_uid):
+        self._store.messages[conversation_uid].append(message)
+        return message
+
+
+class _UnitOfWork:
+    def __init__(self, store: _Store):
+        self.conversation_repository = _ConversationRepository(store)
+        self.message_repository = _MessageRepository(store)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _GenerationService:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_response(self, prompt_messages, system_prompt, config, quota, last_user_message=None,
+                                usage=None):
+        self.calls += 1
+        usage.prompt_tokens, usage.completion_tokens = 30, 12
+        return "reply"
+
+
+class _BotLookup:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+async def _handle(bot, service, store, generation):
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_BotLookup(bot),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        token_quota_service=service,
+    )
+    return await handler(ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42", content="hi",
+        timestamp=datetime.now(timezone.utc), sender_number=None, sender_nickname=None,
+    ))
+
+
+async def test_reply_usage_is_charged_and_recorded_on_the_message():
+    redis, store, generation = FakeRedis(), _Store(), _GenerationService()
+    service = _service(redis)
+    bot = BotEntity(user_uid=uuid.uuid4(), bot_type="assistant", name="bot",
+                    ai_settings=AIConfigurationSettings(generation_model="stub"), quota=BotQuota(tokens_left=1000))
+
+    response = await _handle(bot, service, store, generation)
+
+    assert response.ai_response_generated
+    assert redis.values[f"bot_tokens:{bot.uid}"] == 1000 - 42
+    reply = next(iter(store.messages.values()))[-1]
+    assert reply.role == MessageRole.ASSISTANT
+    assert (reply.tokens_user, reply.tokens_ai) == (30, 12)
+
+
+async def test_exhausted_bot_is_not_sent_to_the_llm():
+    redis, store, generation = FakeRedis(), _Store(), _GenerationService()
+    service = _service(redis)
+    bot = BotEntity(user_uid=uuid.uuid4(), bot_type="assistant", name="bot",
+                    ai_settings=AIConfigurationSettings(generation_model="stub"), quota=BotQuota(tokens_left=0))
+
+    response = await _handle(bot, service, store, generation)
+
+    assert response.quota_exhausted and not response.ai_response_generated
+    assert generation.calls == 0
+    assert [m.role for m in next(iter(store.messages.values()))] == [MessageRole.USER]
@@ -0,0 +1,137 @@
+"""
+Paged message history of a single conversation: walking back and forth with
+before/after cursors, and orjson serialization of the response.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi.responses import ORJSONResponse
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_impl import (
+    GetSingleBotConversationQueryHandler,
+)
+from src.features.conversation.application.queries.get_single_conversation.get_single_conversation_query import (
+    GetSingleBotConversationQuery,
+)
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.entities.message_entity import MessageEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.value_objects.participant_info import ParticipantInfo
+from src.features.conversation.exceptions.conversation_exceptions import InvalidCursorError
+
+pytestmark = pytest.mark.anyio
+
+_START = datetime(2026, 10, 18, 9, 0, tzinfo=timezone.utc)
+
+
+
+class _InMemoryMessages:
+    """find_latest_by_conversation_uid over a list, with the same keyset rules as the SQL query."""
+
+    def __init__(self, messages):
+        self._messages = sorted(messages, key=lambda m: (m.timestamp, m.uid))
+        self.limits = []
+
+    async def find_latest_by_conversation_uid(self, conversation_uid, limit=10, before=None, after=None):
+        self.limits.append(limit)
+        if after is not None:
+            return [m for m in self._messages if (m.timestamp, m.uid) > after][:limit]
+        rows = [m for m in self._messages if before is None or (m.timestamp, m.uid) < before]
+        return rows[-limit:]
+
+
+class _FakeConversations:
+    def __init__(self, conversation):
+        self._conversation = conversation
+
+    async def find_by_uid(self, uid, load_messages=False):
+        assert not load_messages
+        return self._conversation if uid == self._conversation.uid else None
+
+
+class _FakeUnitOfWork:
+    def __init__(self, conversation, messages):
+        self.conversation_repository = _FakeConversations(conversation)
+        self.message_repository = _InMemoryMessages(messages)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+async def history(mocker):
+    conversation = ConversationEntity(
+        uid=uuid.uuid4(),
+        owner_uid=uuid.uuid4(),
+        bot_uid=uuid.uuid4(),
+        platform=ChatPlatform.TELEGRAM,
+        participant=ParticipantInfo(sender_id="42"),
+        bot_name="bot",
+    )
+    # Pairs share a timestamp so the uid tie-breaker is exercised
+    messages = [
+        MessageEntity(uid=uuid.uuid4(), role=MessageRole.USER, content=f"m{i}", timestamp=_START + timedelta(seconds=i // 2))
+        for i in range(9)
+    ]
+    uow = _FakeUnitOfWork(conversation, messages)
+    handler = GetSingleBotConversationQueryHandler(
+        _unit_of_work=uow,
+        _bot_access_service=mocker.AsyncMock(),
+        _mediator=mocker.Mock(),
+    )
+    chronological = [m.uid for m in sorted(messages, key=lambda m: (m.timestamp, m.uid))]
+    return handler, conversation, chronological, uow
+
+
+async def test_walks_history_back_and_forth(history):
+    handler, conversation, chronological, uow = history
+
+    def query(**kwargs):
+        return GetSingleBotConversationQuery(conversation_uid=conversation.uid, user_uid=uuid.uuid4(), limit=4, **kwargs)
+
+    pages = [await handler(query())]
+    while pages[-1].has_more_before:
+        pages.append(await handler(query(before=pages[-1].before_cursor)))
+
+    assert [[m.uid for m in p.conversation.messages] for p in pages] == [
+        chronological[5:], chronological[1:5], chronological[:1]
+    ]
+    assert not pages[0].has_more_after and pages[1].has_more_after
+    assert set(uow.message_repository.limits) == {5}
+
+    forward = await handler(query(after=pages[-1].after_cursor))
+    assert [m.uid for m in forward.conversation.messages] == chronological[1:5]
+    assert forward.has_more_before and forward.has_more_after
+
+
+async def test_before_and_after_are_exclusive(history):
+    handler, conversation, _, _ = history
+    first = await handler(GetSingleBotConversationQuery(conversation_uid=conversation.uid, user_uid=uuid.uuid4()))
+
+    with pytest.raises(InvalidCursorError):
+        await handler(GetSingleBotConversationQuery(
+            conversation_uid=conversation.uid, user_uid=uuid.uuid4(),
+            before=first.before_cursor, after=first.after_cursor,
+        ))
+
+
+async def test_response_serializes_with_orjson(history):
+    handler, conversation, chronological, _ = history
+    page = await handler(GetSingleBotConversationQuery(conversation_uid=conversation.uid, user_uid=uuid.uuid4()))
+
+    body = orjson.loads(ORJSONResponse(content=page.model_dump()).body)
+
+    assert body["conversation"]["conversation_uid"] == str(conversation.uid)
+    assert [m["uid"] for m in body["conversation"]["messages"]] == [str(uid) for uid in chronological]
+    assert body["has_more_before"] is False
@@ -0,0 +1,202 @@
+"""
+Keyset-paginated conversation inbox: cursor encoding, page walking in the query
+handler, and the single-statement repository query (needs TEST_DATABASE_URL).
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.conversation.application.pagination import decode_cursor, encode_cursor
+from src.features.conversation.application.queries.get_all_conversations.get_all_conversations_impl import (
+    GetAllConversationsQueryHandler,
+)
+from src.features.conversation.application.queries.get_all_conversations.get_all_conversations_query import (
+    GetAllConversationsQuery,
+)
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.entities.message_entity import MessageEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.value_objects.participant_info import ParticipantInfo
+from src.features.conversation.exceptions.conversation_exceptions import InvalidCursorError
+
+pytestmark = pytest.mark.anyio
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+_NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+
+def test_cursor_round_trip():
+    position = (datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc), uuid.uuid4())
+    assert decode_cursor(encode_cursor(position)) == position
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor((_NOW, uuid.uuid4()))[:-4]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+class _InMemoryInbox:
+    """find_inbox_page over a list, with the same ordering and keyset rule as the SQL query."""
+
+    def __init__(self, conversations: List[ConversationEntity]):
+        self._conversations = conversations
+        self.calls = []
+
+    async def find_inbox_page(self, bot_uids, limit, platform=None, after=None):
+        self.calls.append({"limit": limit, "platform": platform, "after": after})
+        rows = [
+            c for c in self._conversations
+            if c.bot_uid in bot_uids and (platform is None or c.platform == platform)
+        ]
+        rows.sort(key=lambda c: (c.updated_at, c.uid), reverse=True)
+        if after is not None:
+            rows = [c for c in rows if (c.updated_at, c.uid) < after]
+        return rows[:limit]
+
+
+class _FakeUnitOfWork:
+    def __init__(self, repository):
+        self.conversation_repository = repository
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _conversation(bot_uid, updated_at, platform=ChatPlatform.TELEGRAM) -> ConversationEntity:
+    last_message = MessageEntity(role=MessageRole.USER, content=f"hi at {updated_at}", timestamp=updated_at)
+    return ConversationEntity(
+        uid=uuid.uuid4(),
+        owner_uid=uuid.uuid4(),
+        bot_uid=bot_uid,
+        platform=platform,
+        participant=ParticipantInfo(sender_id=str(uuid.uuid4())),
+        updated_at=updated_at,
+        initial_messages=[last_message],
+        history_truncated=True,
+    )
+
+
+def _handler(mocker, bot_uids, repository) -> GetAllConversationsQueryHandler:
+    access_service = mocker.AsyncMock()
+    access_service.get_accessible_bots.return_value = [mocker.Mock(uid=uid) for uid in bot_uids]
+    return GetAllConversationsQueryHandler(
+        _unit_of_work=_FakeUnitOfWork(repository),
+        _mediator=mocker.Mock(),
+        _bot_access_service=access_service,
+    )
+
+
+async def test_pages_cover_every_conversation_once(mocker):
+    bot_uid = uuid.uuid4()
+    # Pairs share a timestamp so the uid tie-breaker is exercised
+    conversations = [_conversation(bot_uid, _NOW - timedelta(minutes=i // 2)) for i in range(11)]
+    repository = _InMemoryInbox(conversations)
+    handler = _handler(mocker, [bot_uid], repository)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = await handler(GetAllConversationsQuery(user=uuid.uuid4(), platform_filter=None, cursor=cursor, limit=4))
+        seen.extend(page.conversations)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert [dto.conversation_uid for dto in seen] == [
+        c.uid for c in sorted(conversations, key=lambda c: (c.updated_at, c.uid), reverse=True)
+    ]
+    assert all(dto.last_message is not None for dto in seen)
+    assert {call["limit"] for call in repository.calls} == {5}
+
+
+async def test_platform_filter_is_pushed_down(mocker):
+    bot_uid = uuid.uuid4()
+    repository = _InMemoryInbox([
+        _conversation(bot_uid, _NOW, ChatPlatform.TELEGRAM),
+        _conversation(bot_uid, _NOW, ChatPlatform.WHATSAPP),
+    ])
+    handler = _handler(mocker, [bot_uid], repository)
+
+    page = await handler(GetAllConversationsQuery(user=uuid.uuid4(), platform_filter="whatsapp"))
+
+    assert [dto.platform for dto in page.conversations] == ["whatsapp"]
+    assert page.next_cursor is None
+    assert repository.calls[0]["platform"] == ChatPlatform.WHATSAPP
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+async def test_inbox_page_is_one_statement_with_latest_message():
+    from src.features.bot.infra.persistence.models.bot import BotORM
+    from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+    from src.features.bot.infra.persistence.models.bot_participant import BotParticipantORM
+    from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
+    from src.features.conversation.infra.persistence.models.conversation import ConversationORM
+    from src.features.conversation.infra.persistence.models.message import MessageORM
+    from src.features.conversation.infra.persistence.repositories.conversation_repository_impl import (
+        ConversationRepositoryImpl,
+    )
+    from src.features.identity.infra.persistence.models.user import UserORM
+    from src.features.payments.infra.persistence.models.payment import PaymentORM
+    from src.infra.persistence.models.sqlalchemy_base import Base
+
+    tables = [t.__table__ for t in (
+        UserORM, BotORM, BotServiceORM, BotParticipantORM, BotDocumentORM, PaymentORM, ConversationORM, MessageORM
+    )]
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+    try:
+        user_uid, bot_uid = uuid.uuid4(), uuid.uuid4()
+        conversation_uids = [uuid.uuid4() for _ in range(5)]
+        async with engine.begin() as conn:
+            await conn.execute(insert(UserORM).values(uid=user_uid, email=f"{user_uid}@test.local"))
+            await conn.execute(insert(BotORM).values(uid=bot_uid, user_uid=user_uid, bot_type="assistant"))
+            await conn.execute(insert(ConversationORM), [
+                {"uid": uid, "owner_uid": user_uid, "bot_uid": bot_uid, "platform": "telegram",
+                 "sender_id": str(i), "updated_at": _NOW - timedelta(minutes=i)}
+                for i, uid in enumerate(conversation_uids)
+            ])
+            await conn.execute(insert(MessageORM), [
+                {"uid": uuid.uuid4(), "conversation_uid": uid, "role": "user", "content": f"{uid}:{n}",
+                 "timestamp": _NOW - timedelta(hours=1) + timedelta(seconds=n)}
+                for uid in conversation_uids for n in range(20)
+            ])
+
+        statements: List[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        async with async_sessionmaker(bind=engine)() as session:
+            repository = ConversationRepositoryImpl(session)
+            first = await repository.find_inbox_page([bot_uid], limit=3)
+            second = await repository.find_inbox_page(
+                [bot_uid], limit=3, after=(first[-1].updated_at, first[-1].uid)
+            )
+
+        assert len(statements) == 2
+        assert [c.uid for c in first + second] == conversation_uids
+        for conversation in first + second:
+            assert len(conversation.messages) == 1
+            assert conversation.get_last_message().content == f"{conversation.uid}:19"
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.drop_all(sync_conn, tables=tables))
+        await engine.dispose()
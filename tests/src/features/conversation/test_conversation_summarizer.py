@@ -0,0 +1,267 @@
+"""
+Rolling conversation summaries: older messages are folded into the stored
+summary incrementally, the prompt becomes instructions + summary + recent
+window, and long chats send measurably fewer prompt tokens.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.entities.message_entity import CHARS_PER_TOKEN, MessageEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.domain.value_objects.participant_info import ParticipantInfo
+from src.features.conversation.infra.services.conversation_summarizer import SUMMARY_INSTRUCTIONS, ConversationSummarizer
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+
+pytestmark = pytest.mark.anyio
+
+_START = datetime(2026, 10, 18, 9, 0, tzinfo=timezone.utc)
+
+
+
+def _position(message):
+    return message.timestamp, message.uid
+
+
+class _Store:
+    def __init__(self):
+        self.conversations: Dict[uuid.UUID, ConversationEntity] = {}
+        self.messages: Dict[uuid.UUID, List[MessageEntity]] = {}
+        self.clock = _START
+
+    def tick(self) -> datetime:
+        self.clock += timedelta(seconds=1)
+        return self.clock
+
+
+class _ConversationRepository:
+    """Windowed loads that start after the summary cursor, and compare-and-set of the summary."""
+
+    def __init__(self, store: _Store):
+        self._store = store
+
+    def _load(self, stored, history_limit):
+        messages = self._store.messages[stored.uid]
+        if stored.summary_cursor is not None:
+            messages = [m for m in messages if _position(m) > stored.summary_cursor]
+        if history_limit is not None:
+            messages = messages[-history_limit:] if history_limit else []
+        return ConversationEntity(
+            uid=stored.uid, owner_uid=stored.owner_uid, bot_uid=stored.bot_uid, platform=stored.platform,
+            participant=stored.participant, initial_messages=list(messages), history_truncated=history_limit is not None,
+            summary=stored.summary, summarized_until=stored.summarized_until,
+            summarized_until_uid=stored.summarized_until_uid,
+        )
+
+    async def upsert_conversation(self, conversation, history_limit=None, history_token_budget=None):
+        for stored in self._store.conversations.values():
+            if (stored.bot_uid, stored.participant.sender_id) == (conversation.bot_uid, conversation.participant.sender_id):
+                return self._load(stored, history_limit)
+        conversation.uid = conversation.uid or uuid.uuid4()
+        self._store.conversations[conversation.uid] = conversation
+        self._store.messages[conversation.uid] = []
+        return conversation
+
+    async def find_by_uid(self, uid, load_messages=False):
+        stored = self._store.conversations.get(uid)
+        return self._load(stored, 0) if stored else None
+
+    async def save_summary(self, uid, summary, summarized_until, expected_cursor):
+        stored = self._store.conversations[uid]
+        if stored.summary_cursor != expected_cursor:
+            return False
+        stored.summary = summary
+        stored.summarized_until, stored.summarized_until_uid = summarized_until
+        return True
+
+    async def update(self, conversation):
+        return conversation
+
+
+class _MessageRepository:
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def create(self, message, conversation_uid):
+        message.uid = message.uid or uuid.uuid4()
+        message.timestamp = self._store.tick()  # Strictly increasing positions
+        self._store.messages[conversation_uid].append(message)
+        return message
+
+    async def find_latest_by_conversation_uid(self, conversation_uid, limit=10, before=None, after=None):
+        return self._store.messages[conversation_uid][-limit:]
+
+    async def find_between(self, conversation_uid, before, after=None, limit=100):
+        rows = [m for m in self._store.messages[conversation_uid]
+                if _position(m) < before and (after is None or _position(m) > after)]
+        return rows[:limit]
+
+
+class _UnitOfWork:
+    def __init__(self, store: _Store):
+        self.conversation_repository = _ConversationRepository(store)
+        self.message_repository = _MessageRepository(store)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _GenerationService:
+    """Replies echo the user; summary calls return a short digest and record what they were sent."""
+
+    def __init__(self):
+        self.reply_prompts: List[tuple] = []
+        self.summary_prompts: List[str] = []
+
+    async def generate_response(self, prompt_messages, system_prompt, config, quota, last_user_message=None,
+                                usage=None):
+        if system_prompt == SUMMARY_INSTRUCTIONS:
+            self.summary_prompts.append(prompt_messages[0]["content"])
+            return f"digest #{len(self.summary_prompts)}"
+        self.reply_prompts.append((system_prompt, prompt_messages))
+        return f"You said: {last_user_message}"
+
+
+def _bot(summarize_after: Optional[int]) -> BotEntity:
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(
+            generation_model="stub", instructions="Be helpful.",
+            history_window_messages=40, summarize_after_messages=summarize_after,
+        ),
+    )
+
+
+async def _seed(store: _Store, bot: BotEntity, count: int) -> ConversationEntity:
+    uow = _UnitOfWork(store)
+    conversation = await uow.conversation_repository.upsert_conversation(ConversationEntity(
+        owner_uid=bot.user_uid, bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, participant=ParticipantInfo(sender_id="42"),
+    ))
+    await _add(store, conversation.uid, count)
+    return conversation
+
+
+async def _add(store: _Store, conversation_uid, count: int, start: int = 0) -> None:
+    repository = _MessageRepository(store)
+    for i in range(start, start + count):
+        role = MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT
+        await repository.create(MessageEntity(role=role, content=f"message {i}"), conversation_uid)
+
+
+async def test_older_messages_are_folded_and_the_newest_half_kept():
+    store, generation = _Store(), _GenerationService()
+    bot = _bot(summarize_after=10)
+    conversation = await _seed(store, bot, 16)
+    summarizer = ConversationSummarizer(lambda: _UnitOfWork(store), {"stub": generation})
+
+    assert await summarizer.summarize(conversation.uid, bot)
+
+    stored = store.conversations[conversation.uid]
+    assert stored.summary == "digest #1"
+    assert stored.summarized_until_uid == store.messages[conversation.uid][10].uid  # 11 folded, 5 kept
+    assert "message 0" in generation.summary_prompts[0] and "message 10" in generation.summary_prompts[0]
+    assert "message 11" not in generation.summary_prompts[0]
+    assert summarizer.stats()["folded_messages"] == 11
+
+
+async def test_summary_is_updated_incrementally():
+    store, generation = _Store(), _GenerationService()
+    bot = _bot(summarize_after=10)
+    conversation = await _seed(store, bot, 16)
+    summarizer = ConversationSummarizer(lambda: _UnitOfWork(store), {"stub": generation})
+    await summarizer.summarize(conversation.uid, bot)
+
+    assert not await summarizer.summarize(conversation.uid, bot)  # Only 5 new messages: below the threshold
+    await _add(store, conversation.uid, 6, start=16)
+    assert await summarizer.summarize(conversation.uid, bot)
+
+    second = generation.summary_prompts[1]
+    assert "digest #1" in second
+    assert "message 10" not in second and "message 11" in second and "message 16" in second
+    assert "message 17" not in second
+    assert store.conversations[conversation.uid].summary == "digest #2"
+
+
+async def test_summary_written_meanwhile_wins():
+    store, generation = _Store(), _GenerationService()
+    bot = _bot(summarize_after=10)
+    conversation = await _seed(store, bot, 16)
+    summarizer = ConversationSummarizer(lambda: _UnitOfWork(store), {"stub": generation})
+
+    original = generation.generate_response
+
+    async def racing_generate(*args, **kwargs):
+        stored = store.conversations[conversation.uid]
+        stored.summary, stored.summarized_until, stored.summarized_until_uid = (
+            "other worker", *_position(store.messages[conversation.uid][3]))
+        return await original(*args, **kwargs)
+
+    generation.generate_response = racing_generate
+
+    assert not await summarizer.summarize(conversation.uid, bot)
+    assert store.conversations[conversation.uid].summary == "other worker"
+    assert summarizer.stats()["conflicts"] == 1
+
+
+async def _chat(bot: BotEntity, turns: int, summarizer_enabled: bool):
+    store, generation = _Store(), _GenerationService()
+    summarizer = ConversationSummarizer(lambda: _UnitOfWork(store), {"stub": generation}) if summarizer_enabled else None
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=type("_BotLookup", (), {"get_bot": staticmethod(lambda uid: asyncio.sleep(0, bot))})(),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        conversation_summarizer=summarizer,
+    )
+    for turn in range(turns):
+        await handler(ProcessIncomingMessageCommand(
+            bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42",
+            content=f"turn {turn}: " + "some details about my order " * 4,
+            timestamp=store.tick(), sender_number=None, sender_nickname=None,
+        ))
+        while summarizer is not None and summarizer.stats()["running"]:
+            await asyncio.sleep(0)
+    return generation, summarizer
+
+
+def _prompt_tokens(system_prompt, prompt_messages) -> int:
+    return (len(system_prompt or "") + sum(len(m["content"]) for m in prompt_messages)) // CHARS_PER_TOKEN
+
+
+async def test_prompt_is_instructions_summary_and_recent_window():
+    generation, summarizer = await _chat(_bot(summarize_after=20), turns=30, summarizer_enabled=True)
+
+    system_prompt, prompt_messages = generation.reply_prompts[-1]
+    assert system_prompt.startswith("Be helpful.\n\nSummary of the earlier conversation:\ndigest #")
+    assert len(prompt_messages) < 20
+    assert prompt_messages[-1]["content"].startswith("turn 29:")
+    assert summarizer.stats()["summaries"] >= 1
+
+
+async def test_summarization_reduces_prompt_tokens_on_long_chats():
+    with_summary, summarizer = await _chat(_bot(summarize_after=20), turns=60, summarizer_enabled=True)
+    without_summary, _ = await _chat(_bot(summarize_after=None), turns=60, summarizer_enabled=False)
+
+    late = slice(30, None)  # Once both histories are past the window size
+    summarized = sum(_prompt_tokens(*p) for p in with_summary.reply_prompts[late])
+    windowed = sum(_prompt_tokens(*p) for p in without_summary.reply_prompts[late])
+
+    assert summarized < windowed * 0.6
+    assert summarizer.stats()["prompt_tokens_saved"] > 0
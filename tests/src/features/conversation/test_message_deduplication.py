@@ -0,0 +1,262 @@
+"""
+Idempotent ingestion: a redelivered platform message is answered with the
+reply of its first delivery, from Redis while the claim lives and from the
+messages unique constraint after it, without generating again.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.exceptions.chat_exceptions import (
+    ConversationProcessingError,
+    DuplicateMessageError,
+)
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.message_deduplicator import MessageDeduplicator
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+
+pytestmark = pytest.mark.anyio
+
+
+
+class FakeRedis:
+    """SET NX/XX, GET and DEL of redis.asyncio; `down` makes every call fail."""
+
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("redis is down")
+
+    async def set(self, key, value, nx=False, xx=False, ex=None):
+        self._check()
+        if (nx and key in self.values) or (xx and key not in self.values):
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        self._check()
+        return self.values.get(key)
+
+    async def delete(self, key):
+        self._check()
+        self.values.pop(key, None)
+
+
+class _Store:
+    def __init__(self):
+        self.conversations: Dict[tuple, ConversationEntity] = {}
+        self.messages: Dict[uuid.UUID, List] = {}
+
+
+class _ConversationRepository:
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def find_by_platform_and_sender_id(self, platform, sender_id, bot_uid, history_limit=None,
+                                             history_token_budget=None):
+        stored = self._store.conversations.get((platform, sender_id, bot_uid))
+        if stored is None:
+            return None
+        return ConversationEntity(
+            uid=stored.uid, owner_uid=stored.owner_uid, bot_uid=bot_uid, platform=platform,
+            participant=stored.participant, initial_messages=list(self._store.messages[stored.uid]),
+        )
+
+    async def find_uid_by_platform_and_sender_id(self, platform, sender_id, bot_uid):
+        stored = self._store.conversations.get((platform, sender_id, bot_uid))
+        return stored.uid if stored else None
+
+    async def create(self, conversation):
+        conversation.uid = conversation.uid or uuid.uuid4()
+        self._store.conversations[(conversation.platform, conversation.participant.sender_id, conversation.bot_uid)] = conversation
+        self._store.messages[conversation.uid] = []
+        return conversation
+
+    async def update(self, conversation):
+        return conversation
+
+    async def upsert_conversation(self, conversation, history_limit=None, history_token_budget=None):
+        existing = await self.find_by_platform_and_sender_id(
+            conversation.platform, conversation.participant.sender_id, conversation.bot_uid,
+        )
+        return existing or await self.create(conversation)
+
+
+class _MessageRepository:
+    """Enforces (conversation_uid, external_id) uniqueness like uq_messages_conversation_uid_external_id."""
+
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def create(self, message, conversation_uid):
+        messages = self._store.messages[conversation_uid]
+        if message.external_id is not None and any(m.external_id == message.external_id for m in messages):
+            raise DuplicateMessageError(conversation_uid, message.external_id)
+        messages.append(message)
+        return message
+
+    async def find_by_external_id(self, conversation_uid, external_id):
+        return next((m for m in self._store.messages[conversation_uid] if m.external_id == external_id), None)
+
+    async def find_reply(self, conversation_uid, message):
+        messages = self._store.messages[conversation_uid]
+        later = messages[messages.index(message) + 1:]
+        return next((m for m in later if m.role == MessageRole.ASSISTANT), None)
+
+
+class _UnitOfWork:
+    def __init__(self, store: _Store):
+        self.conversation_repository = _ConversationRepository(store)
+        self.message_repository = _MessageRepository(store)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _GenerationService:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def generate_response(self, prompt_messages, system_prompt, config, quota, last_user_message=None,
+                                usage=None):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("backend unavailable")
+        return f"reply {self.calls} to: {last_user_message}"
+
+
+class _BotLookup:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+@pytest.fixture
+async def bot():
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot",
+        ai_settings=AIConfigurationSettings(generation_model="stub"), quota=BotQuota(),
+    )
+
+
+def _handler(store, bot, generation, deduplicator):
+    return ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_BotLookup(bot),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        message_deduplicator=deduplicator,
+    )
+
+
+def _command(bot, text, external_message_id):
+    return ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42", content=text,
+        timestamp=datetime.now(timezone.utc), sender_number=None, sender_nickname=None,
+        external_message_id=external_message_id,
+    )
+
+
+async def test_redelivery_is_answered_from_redis(bot):
+    store, generation, redis = _Store(), _GenerationService(), FakeRedis()
+    deduplicator = MessageDeduplicator(redis=redis)
+    handler = _handler(store, bot, generation, deduplicator)
+
+    first = await handler(_command(bot, "hello", "1001"))
+    second = await handler(_command(bot, "hello", "1001"))
+
+    assert generation.calls == 1
+    assert not first.duplicate and second.duplicate
+    assert second.ai_response_content == first.ai_response_content == "reply 1 to: hello"
+    assert second.ai_message_uid == first.ai_message_uid
+    assert len(next(iter(store.messages.values()))) == 2
+    assert deduplicator.stats()["redis_hits"] == 1 and deduplicator.stats()["db_hits"] == 0
+
+
+async def test_redelivery_after_claim_expired_is_caught_by_the_database(bot):
+    store, generation, redis = _Store(), _GenerationService(), FakeRedis()
+    deduplicator = MessageDeduplicator(redis=redis)
+    handler = _handler(store, bot, generation, deduplicator)
+
+    first = await handler(_command(bot, "hello", "1001"))
+    redis.values.clear()  # TTL passed
+    second = await handler(_command(bot, "hello", "1001"))
+
+    assert generation.calls == 1
+    assert second.duplicate
+    assert second.user_message_uid == first.user_message_uid
+    assert second.ai_response_content == first.ai_response_content
+    assert deduplicator.stats()["db_hits"] == 1
+
+
+async def test_pending_claim_falls_back_to_stored_messages(bot):
+    store, generation, redis = _Store(), _GenerationService(), FakeRedis()
+    deduplicator = MessageDeduplicator(redis=redis)
+    handler = _handler(store, bot, generation, deduplicator)
+    await redis.set(deduplicator.key("telegram", bot.uid, "42", "1001"), MessageDeduplicator.PENDING)
+
+    response = await handler(_command(bot, "hello", "1001"))
+
+    assert response.duplicate
+    assert response.user_message_uid is None and not response.ai_response_generated
+    assert generation.calls == 0
+
+
+async def test_failed_processing_releases_the_claim(bot):
+    store, generation, redis = _Store(), _GenerationService(), FakeRedis()
+    deduplicator = MessageDeduplicator(redis=redis)
+    generation.fail = True
+
+    with pytest.raises(ConversationProcessingError):
+        await _handler(store, bot, generation, deduplicator)(_command(bot, "hello", "1001"))
+
+    assert redis.values == {}
+    assert deduplicator.stats()["released"] == 1
+
+
+async def test_messages_go_through_when_redis_is_down(bot):
+    store, generation, redis = _Store(), _GenerationService(), FakeRedis()
+    redis.down = True
+    deduplicator = MessageDeduplicator(redis=redis)
+    handler = _handler(store, bot, generation, deduplicator)
+
+    first = await handler(_command(bot, "hello", "1001"))
+    second = await handler(_command(bot, "hello", "1001"))
+
+    assert not first.duplicate and second.duplicate
+    assert generation.calls == 1
+    assert deduplicator.stats()["redis_errors"] > 0 and deduplicator.stats()["db_hits"] == 1
+
+
+async def test_messages_without_platform_id_are_not_deduplicated(bot):
+    store, generation, redis = _Store(), _GenerationService(), FakeRedis()
+    handler = _handler(store, bot, generation, MessageDeduplicator(redis=redis))
+
+    await handler(_command(bot, "hello", None))
+    await handler(_command(bot, "hello", None))
+
+    assert generation.calls == 2
+    assert redis.values == {}
@@ -0,0 +1,220 @@
+"""
+Round-trip counts on the message path: every create and update of a
+conversation or message is a single INSERT/UPDATE … RETURNING, with no
+refresh SELECT after a flush and no read before an update, and get-or-create
+of a conversation is race-free without locking an existing row. The whole
+message path is measured through ProcessIncomingMessageCommandHandler. They
+need TEST_DATABASE_URL (see tests/src/conftest.py).
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.bot.infra.persistence.models.bot import BotORM
+from src.features.bot.infra.persistence.models.bot_document import BotDocumentORM
+from src.features.bot.infra.persistence.models.bot_participant import BotParticipantORM
+from src.features.bot.infra.persistence.models.bot_service import BotServiceORM
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.entities.message_entity import MessageEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.exceptions.chat_exceptions import DuplicateMessageError
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.domain.value_objects.participant_info import ParticipantInfo
+from src.features.conversation.infra.persistence.models.conversation import ConversationORM
+from src.features.conversation.infra.persistence.models.message import MessageORM
+from src.features.conversation.infra.persistence.uow.chat_unit_of_work_impl import ConversationUnitOfWorkImpl
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from src.features.identity.infra.persistence.models.user import UserORM
+from src.features.payments.infra.persistence.models.payment import PaymentORM
+from tests.src.conftest import requires_database
+from tests.src.features.conversation.test_conversation_summarizer import _GenerationService
+
+pytestmark = [pytest.mark.anyio, requires_database]
+
+
+@pytest.fixture
+def database_tables():
+    return [t.__table__ for t in (
+        UserORM, BotORM, BotServiceORM, BotParticipantORM, BotDocumentORM, PaymentORM, ConversationORM, MessageORM,
+    )]
+
+
+@pytest.fixture
+async def conversation(engine):
+    owner_uid, bot_uid = uuid.uuid4(), uuid.uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(insert(UserORM).values(uid=owner_uid, email=f"{owner_uid}@test.local"))
+        await conn.execute(insert(BotORM).values(uid=bot_uid, user_uid=owner_uid, bot_type="assistant", name="bot"))
+    return ConversationEntity(
+        owner_uid=owner_uid, bot_uid=bot_uid, platform=ChatPlatform.TELEGRAM,
+        participant=ParticipantInfo(sender_id="42"), bot_name="bot",
+    )
+
+
+def _uow(engine) -> ConversationUnitOfWorkImpl:
+    return ConversationUnitOfWorkImpl(async_sessionmaker(bind=engine, expire_on_commit=False)())
+
+
+def _message(role: MessageRole, content: str, external_id=None, uid=None) -> MessageEntity:
+    return MessageEntity(
+        uid=uid, role=role, content=content, timestamp=datetime.now(timezone.utc), external_id=external_id,
+    )
+
+
+def _sql(statements: List[str]) -> List[str]:
+    return [s.lstrip().split(None, 1)[0].upper() for s in statements if not s.lstrip().upper().startswith(("BEGIN", "COMMIT"))]
+
+
+async def test_each_write_on_the_message_path_is_one_statement(engine, statements, conversation):
+    uow = _uow(engine)
+    async with uow:
+        statements.clear()
+        stored = await uow.conversation_repository.create(conversation)
+        user_message = await uow.message_repository.create(_message(MessageRole.USER, "hi", "1001"), stored.uid)
+        await uow.conversation_repository.update(stored)
+        await uow.message_repository.create(_message(MessageRole.ASSISTANT, "hello"), stored.uid)
+        await uow.conversation_repository.update(stored)
+
+    assert _sql(statements) == ["INSERT", "INSERT", "UPDATE", "INSERT", "UPDATE"]
+    assert all("RETURNING" in s for s in statements if s.lstrip().upper().startswith(("INSERT", "UPDATE")))
+    assert stored.created_at is not None and user_message.uid is not None
+
+
+class _Bots:
+    def __init__(self, bot: BotEntity):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+async def _process(engine, conversation: ConversationEntity, content: str):
+    bot = BotEntity(
+        uid=conversation.bot_uid, user_uid=conversation.owner_uid, bot_type="assistant", name="bot",
+        quota=BotQuota(), ai_settings=AIConfigurationSettings(generation_model="stub", history_window_messages=20),
+    )
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_uow(engine),
+        bot_lookup_service=_Bots(bot),
+        available_generation_services={"stub": _GenerationService()},
+        _mediator=None,
+    )
+    return await handler(ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=conversation.platform, sender_id=conversation.participant.sender_id,
+        content=content, timestamp=datetime.now(timezone.utc), sender_number=None, sender_nickname=None,
+    ))
+
+
+async def test_incoming_message_round_trips(engine, statements, conversation):
+    statements.clear()
+    first = await _process(engine, conversation, "hello")
+    # Conversation lookup, then the conversation, the message, the reply and the closing update
+    assert _sql(statements) == ["SELECT", "INSERT", "INSERT", "INSERT", "UPDATE"]
+
+    statements.clear()
+    second = await _process(engine, conversation, "and again")
+    # Conversation lookup and its message window instead of the insert
+    assert _sql(statements) == ["SELECT", "SELECT", "INSERT", "INSERT", "UPDATE"]
+
+    assert first.ai_response_generated and second.conversation_uid == first.conversation_uid
+    assert second.ai_response_content == "You said: and again"
+
+
+async def test_update_without_a_row_is_reported(engine, conversation):
+    uow = _uow(engine)
+    async with uow:
+        with pytest.raises(ValueError):
+            await uow.message_repository.update(_message(MessageRole.USER, "missing", uid=uuid.uuid4()))
+
+
+async def test_message_update_returns_the_stored_state(engine, statements, conversation):
+    uow = _uow(engine)
+    async with uow:
+        stored = await uow.conversation_repository.create(conversation)
+        message = await uow.message_repository.create(_message(MessageRole.USER, "draft"), stored.uid)
+        message.content = "final"
+        statements.clear()
+        updated = await uow.message_repository.update(message)
+
+    assert _sql(statements) == ["UPDATE"]
+    assert updated.content == "final" and updated.updated_at >= message.updated_at
+
+
+async def test_duplicate_external_id_still_raises(engine, conversation):
+    uow = _uow(engine)
+    async with uow:
+        stored = await uow.conversation_repository.create(conversation)
+
+    uow = _uow(engine)
+    async with uow:
+        await uow.message_repository.create(_message(MessageRole.USER, "hi", "1001"), stored.uid)
+        with pytest.raises(DuplicateMessageError):
+            await uow.message_repository.create(_message(MessageRole.USER, "hi", "1001"), stored.uid)
+
+
+async def test_upsert_creates_a_conversation_after_one_lookup(engine, statements, conversation):
+    uow = _uow(engine)
+    async with uow:
+        statements.clear()
+        created = await uow.conversation_repository.upsert_conversation(conversation, history_limit=20)
+
+    assert _sql(statements) == ["SELECT", "INSERT"]
+    assert created.uid is not None and created.messages == []
+
+
+async def test_upsert_returns_the_existing_conversation_with_its_window(engine, conversation):
+    uow = _uow(engine)
+    async with uow:
+        first = await uow.conversation_repository.upsert_conversation(conversation)
+        for i in range(3):
+            await uow.message_repository.create(_message(MessageRole.USER, f"m{i}"), first.uid)
+
+    uow = _uow(engine)
+    async with uow:
+        again = await uow.conversation_repository.upsert_conversation(conversation, history_limit=2)
+
+    assert again.uid == first.uid
+    assert [m.content for m in again.messages] == ["m1", "m2"] and again.history_truncated
+
+
+async def test_upsert_does_not_lock_an_existing_conversation(engine, conversation):
+    uow = _uow(engine)
+    async with uow:
+        await uow.conversation_repository.upsert_conversation(conversation)
+
+    holder = _uow(engine)
+    async with holder:
+        # The transaction of a message whose reply is still being generated
+        await holder.conversation_repository.upsert_conversation(conversation)
+
+        other = _uow(engine)
+        async with other:
+            found = await asyncio.wait_for(other.conversation_repository.upsert_conversation(conversation), timeout=5)
+            await asyncio.wait_for(other.conversation_repository.update(found), timeout=5)
+
+
+async def test_concurrent_first_messages_share_one_conversation(engine, conversation):
+    async def get_or_create():
+        uow = _uow(engine)
+        async with uow:
+            return await uow.conversation_repository.upsert_conversation(conversation)
+
+    results = await asyncio.gather(*(get_or_create() for _ in range(5)))
+
+    assert len({c.uid for c in results}) == 1
+    async with engine.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(ConversationORM)) == 1
@@ -0,0 +1,212 @@
+"""
+Reply coalescing: a burst of messages inside the bot's window is stored
+message by message but answered by a single generation, and a newer message
+supersedes a reply that is still pending or being generated.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.application.services.token_quota_service import QuotaReservation
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.domain.entities.conversation_entity import ConversationEntity
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from src.features.conversation.infra.services.response_coalescer import ResponseCoalescer
+
+pytestmark = pytest.mark.anyio
+
+
+
+class _Store:
+    """Conversations and messages shared by every unit of work, like the database would be."""
+
+    def __init__(self):
+        self.conversations: Dict[tuple, ConversationEntity] = {}
+        self.messages: Dict[uuid.UUID, List] = {}
+
+
+class _ConversationRepository:
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def find_by_platform_and_sender_id(self, platform, sender_id, bot_uid, history_limit=None,
+                                             history_token_budget=None):
+        stored = self._store.conversations.get((platform, sender_id, bot_uid))
+        if stored is None:
+            return None
+        return ConversationEntity(
+            uid=stored.uid, owner_uid=stored.owner_uid, bot_uid=bot_uid, platform=platform,
+            participant=stored.participant, initial_messages=list(self._store.messages[stored.uid]),
+        )
+
+    async def create(self, conversation):
+        conversation.uid = conversation.uid or uuid.uuid4()
+        self._store.conversations[(conversation.platform, conversation.participant.sender_id, conversation.bot_uid)] = conversation
+        self._store.messages[conversation.uid] = []
+        return conversation
+
+    async def update(self, conversation):
+        return conversation
+
+    async def upsert_conversation(self, conversation, history_limit=None, history_token_budget=None):
+        existing = await self.find_by_platform_and_sender_id(
+            conversation.platform, conversation.participant.sender_id, conversation.bot_uid,
+        )
+        return existing or await self.create(conversation)
+
+
+class _MessageRepository:
+    def __init__(self, store: _Store):
+        self._store = store
+
+    async def create(self, message, conversation_uid):
+        self._store.messages[conversation_uid].append(message)
+        return message
+
+
+class _UnitOfWork:
+    def __init__(self, store: _Store):
+        self.conversation_repository = _ConversationRepository(store)
+        self.message_repository = _MessageRepository(store)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _GenerationService:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.prompts: List[List[dict]] = []
+        self.started = 0
+
+    async def generate_response(self, prompt_messages, system_prompt, config, quota, last_user_message=None,
+                                usage=None):
+        self.started += 1
+        await asyncio.sleep(self.delay)
+        self.prompts.append(prompt_messages)
+        return f"reply to: {last_user_message}"
+
+
+class _TokenQuota:
+    def __init__(self):
+        self.settled: List[tuple] = []  # (reserved, used)
+
+    async def reserve(self, bot_uid, known_tokens_left, estimated_tokens):
+        return QuotaReservation(bot_uid=bot_uid, tokens=estimated_tokens)
+
+    async def settle(self, reservation, used_tokens):
+        self.settled.append((reservation.tokens, used_tokens))
+        return None
+
+
+class _BotLookup:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+async def _make_bot(window_ms):
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot",
+        ai_settings=AIConfigurationSettings(generation_model="stub", coalesce_window_ms=window_ms),
+        quota=BotQuota(),
+    )
+
+
+def _handler(store, bot, generation, coalescer, token_quota=None):
+    return ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_BotLookup(bot),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        response_coalescer=coalescer,
+        token_quota_service=token_quota,
+    )
+
+
+def _command(bot, text, replies):
+    async def on_reply(response):
+        replies.append(response)
+
+    return ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42", content=text,
+        timestamp=datetime.now(timezone.utc), sender_number=None, sender_nickname=None,
+        on_deferred_response=on_reply,
+    )
+
+
+async def test_burst_inside_window_gets_one_reply():
+    store, generation, coalescer, replies = _Store(), _GenerationService(), ResponseCoalescer(), []
+    bot = await _make_bot(window_ms=50)
+
+    for text in ("hi", "I have a question", "about my order"):
+        response = await _handler(store, bot, generation, coalescer)(_command(bot, text, replies))
+        assert response.response_deferred
+    await asyncio.sleep(0.15)
+
+    assert generation.started == 1
+    assert [m["content"] for m in generation.prompts[0]] == ["hi", "I have a question", "about my order"]
+    assert len(replies) == 1
+    assert replies[0].ai_response_content == "reply to: hi\nI have a question\nabout my order"
+    conversation_messages = next(iter(store.messages.values()))
+    assert [m.role for m in conversation_messages] == [MessageRole.USER] * 3 + [MessageRole.ASSISTANT]
+    assert coalescer.stats()["superseded_waiting"] == 2
+
+
+async def test_new_message_supersedes_generation_in_flight():
+    store, generation, coalescer, replies = _Store(), _GenerationService(delay=0.1), ResponseCoalescer(), []
+    bot = await _make_bot(window_ms=10)
+
+    await _handler(store, bot, generation, coalescer)(_command(bot, "first", replies))
+    await asyncio.sleep(0.05)  # window closed, generation running
+    await _handler(store, bot, generation, coalescer)(_command(bot, "second", replies))
+    await asyncio.sleep(0.25)
+
+    assert generation.started == 2
+    assert len(replies) == 1
+    assert replies[0].ai_response_content == "reply to: first\nsecond"
+    assert coalescer.stats()["superseded_generating"] == 1
+
+
+async def test_superseded_generation_stays_charged():
+    store, generation, coalescer, replies = _Store(), _GenerationService(delay=0.1), ResponseCoalescer(), []
+    token_quota = _TokenQuota()
+    bot = await _make_bot(window_ms=10)
+
+    await _handler(store, bot, generation, coalescer, token_quota)(_command(bot, "first", replies))
+    await asyncio.sleep(0.05)  # window closed, the call is out
+    await _handler(store, bot, generation, coalescer, token_quota)(_command(bot, "second", replies))
+    await asyncio.sleep(0.25)
+
+    superseded, completed = token_quota.settled
+    assert superseded[1] == superseded[0] > 0  # the estimate, not a refund
+    assert completed[1] == 0  # the stub reports no usage
+
+
+async def test_bots_without_window_reply_inline():
+    store, generation, coalescer, replies = _Store(), _GenerationService(), ResponseCoalescer(), []
+    bot = await _make_bot(window_ms=None)
+
+    response = await _handler(store, bot, generation, coalescer)(_command(bot, "hello", replies))
+
+    assert not response.response_deferred
+    assert response.ai_response_content == "reply to: hello"
+    assert replies == []
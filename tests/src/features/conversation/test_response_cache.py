@@ -0,0 +1,242 @@
+"""
+Per-bot response cache: a repeated (normalized) question is answered without an
+LLM call or token charge, config changes retire earlier replies, and entries
+are bounded in size and number.
+"""
+
+import asyncio
+import json
+import uuid
+from dataclasses import replace
+from typing import Dict
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.events.bot_events import BotConfigChangedEvent
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.application.event_handlers.response_cache_invalidation_handler import \
+    ResponseCacheInvalidationHandler
+from src.features.conversation.domain.enums import ChatPlatform
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services import response_cache as cache_module
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from src.features.conversation.infra.services.response_cache import ResponseCache
+from tests.src.features.conversation.test_conversation_summarizer import _GenerationService, _Store, _UnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+
+class FakeRedis:
+    """Runs the cache scripts as their Python equivalents; TTLs are not simulated."""
+
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+        self.fail = False
+
+    async def eval(self, script, numkeys, *args):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("redis is down")
+        if script == cache_module._LOOKUP_SCRIPT:
+            version_key, entry_prefix, digest = args
+            version = self.values.get(version_key, "0")
+            return [version.encode(), self.values.get(f"{entry_prefix}{version}:{digest}")]
+        if script == cache_module._STORE_SCRIPT:
+            count_key, entry_key, payload, _ttl, max_entries = args
+            if entry_key in self.values:
+                return 0
+            self.values[count_key] = str(int(self.values.get(count_key, 0)) + 1)
+            if int(self.values[count_key]) > int(max_entries):
+                return -1
+            self.values[entry_key] = payload
+            return 1
+        raise AssertionError("unknown script")
+
+    async def incr(self, key):
+        if self.fail:
+            raise ConnectionError("redis is down")
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+
+class _MeteredGeneration(_GenerationService):
+    async def generate_response(self, prompt_messages, system_prompt, config, quota, last_user_message=None,
+                                usage=None):
+        usage.prompt_tokens, usage.completion_tokens = 120, 30
+        return await super().generate_response(prompt_messages, system_prompt, config, quota, last_user_message, usage)
+
+
+def _bot(ttl=3600, history=None) -> BotEntity:
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(
+            generation_model="stub", instructions="Answer FAQ.",
+            response_cache_ttl_seconds=ttl, response_cache_history_messages=history,
+        ),
+    )
+
+
+class _Bots:
+    def __init__(self, bot: BotEntity):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+def _handler(bot: BotEntity, cache: ResponseCache):
+    store, generation = _Store(), _MeteredGeneration()
+    bots = _Bots(bot)
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=bots,
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        response_cache=cache,
+    )
+
+    async def send(content: str, sender_id: str = "42"):
+        return await handler(ProcessIncomingMessageCommand(
+            bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id=sender_id, content=content,
+            timestamp=store.tick(), sender_number=None, sender_nickname=None,
+        ))
+
+    return send, generation, bots, store
+
+
+async def test_repeated_question_is_served_from_the_cache():
+    cache = ResponseCache(redis=FakeRedis())
+    send, generation, _, store = _handler(_bot(), cache)
+
+    first = await send("What are your opening hours?")
+    second = await send("  what are your   OPENING hours ", sender_id="43")
+
+    assert len(generation.reply_prompts) == 1
+    assert second.ai_response_content == first.ai_response_content
+    cached_reply = store.messages[second.conversation_uid][-1]
+    assert (cached_reply.tokens_user, cached_reply.tokens_ai) == (0, 0)  # Nothing was spent on it
+    stats = cache.stats()
+    assert (stats["lookups"], stats["hits"], stats["hit_rate"]) == (2, 1, 0.5)
+    assert (stats["saved_prompt_tokens"], stats["saved_completion_tokens"]) == (120, 30)
+
+
+async def test_bots_without_a_ttl_do_not_use_the_cache():
+    redis = FakeRedis()
+    cache = ResponseCache(redis=redis)
+    send, generation, _, _ = _handler(_bot(ttl=None), cache)
+
+    await send("hours?")
+    await send("hours?")
+
+    assert len(generation.reply_prompts) == 2
+    assert cache.stats()["lookups"] == 0 and not redis.values
+
+
+async def test_config_change_retires_cached_replies():
+    cache = ResponseCache(redis=FakeRedis())
+    bot = _bot()
+    send, generation, _, _ = _handler(bot, cache)
+    await send("hours?")
+
+    await ResponseCacheInvalidationHandler(_response_cache=cache).handle(
+        BotConfigChangedEvent(bot_uid=str(bot.uid), reason="documents uploaded")
+    )
+    await send("hours?", sender_id="43")
+    await send("hours?", sender_id="44")
+
+    assert len(generation.reply_prompts) == 2  # Once per config version
+    assert cache.stats()["invalidations"] == 1
+
+
+async def test_new_settings_do_not_share_entries_with_the_old_ones():
+    cache = ResponseCache(redis=FakeRedis())
+    send, generation, bots, _ = _handler(_bot(), cache)
+    await send("hours?")
+
+    # A worker that already sees the new instructions, before any invalidation arrived
+    bots.bot.ai_settings = replace(bots.bot.ai_settings, instructions="Answer FAQ in French.")
+    await send("hours?", sender_id="43")
+
+    assert len(generation.reply_prompts) == 2
+
+
+async def test_history_messages_are_part_of_the_key():
+    cache = ResponseCache(redis=FakeRedis())
+    send, generation, _, _ = _handler(_bot(history=2), cache)
+
+    await send("I ordered a blue chair", sender_id="1")
+    await send("when does it arrive?", sender_id="1")
+    await send("I ordered a red table", sender_id="2")
+    await send("when does it arrive?", sender_id="2")
+    await send("I ordered a blue chair", sender_id="3")
+    await send("When does it arrive", sender_id="3")
+
+    # Sender 3 repeats both of sender 1's messages, sender 2 only the question
+    assert len(generation.reply_prompts) == 4
+    assert cache.stats()["hits"] == 2
+
+
+async def test_replies_shaped_by_uncovered_context_are_not_stored():
+    cache = ResponseCache(redis=FakeRedis())
+    send, generation, _, _ = _handler(_bot(history=None), cache)
+
+    await send("I ordered a blue chair", sender_id="1")
+    await send("when does it arrive?", sender_id="1")  # Answered with sender 1's order in the prompt
+    await send("when does it arrive?", sender_id="2")
+
+    assert len(generation.reply_prompts) == 3
+    assert cache.stats()["hits"] == 0
+    assert (cache.stats()["stored"], cache.stats()["skipped_context"]) == (2, 1)
+
+
+async def test_summarized_conversations_are_not_stored():
+    cache = ResponseCache(redis=FakeRedis())
+    bot = _bot()
+    send, generation, _, store = _handler(bot, cache)
+    first = await send("I live in Lyon", sender_id="1")
+    # Everything so far is folded into the summary; the prompt only holds the next message
+    conversation, last = store.conversations[first.conversation_uid], store.messages[first.conversation_uid][-1]
+    conversation.summary = "The customer lives in Lyon."
+    conversation.summarized_until, conversation.summarized_until_uid = last.timestamp, last.uid
+    await send("where do you deliver?", sender_id="1")
+    await send("where do you deliver?", sender_id="2")
+
+    assert len(generation.reply_prompts) == 3
+    assert (cache.stats()["stored"], cache.stats()["skipped_context"]) == (2, 1)
+
+
+async def test_long_replies_and_full_versions_are_not_stored():
+    redis = FakeRedis()
+    cache = ResponseCache(redis=redis, max_entries_per_bot=2, max_response_chars=40)
+    send, generation, _, _ = _handler(_bot(), cache)
+
+    await send("tell me everything about the delivery options please")  # Reply is longer than 40 chars
+    for sender_id, question in enumerate(("a?", "b?", "c?")):
+        await send(question, sender_id=str(sender_id))
+
+    stats = cache.stats()
+    assert (stats["stored"], stats["skipped_too_long"], stats["skipped_full"]) == (2, 1, 1)
+    entries = [json.loads(v) for k, v in redis.values.items() if not k.endswith((":count", ":version"))]
+    assert [e["content"] for e in entries] == ["You said: a?", "You said: b?"]
+
+
+async def test_unavailable_redis_falls_back_to_generation():
+    redis = FakeRedis()
+    redis.fail = True
+    cache = ResponseCache(redis=redis)
+    send, generation, _, _ = _handler(_bot(), cache)
+
+    response = await send("hours?")
+    await send("hours?")
+
+    assert response.ai_response_generated
+    assert len(generation.reply_prompts) == 2
+    assert cache.stats()["redis_errors"] == 2
@@ -0,0 +1,127 @@
+"""
+Streamed replies: chunks are forwarded as they arrive and the assembled text
+is stored once the final chunk came; a stream that breaks off half-way is not
+stored as a reply.
+"""
+
+import uuid
+from typing import List
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.application.services.token_quota_service import QuotaReservation
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.domain.enums import ChatPlatform, MessageRole
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from src.features.generation.application.services.generation_service import GenerationChunk
+from tests.src.features.conversation.test_conversation_summarizer import _Store, _UnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+
+class _StreamingGeneration:
+    """Streams the given deltas, then the usage chunk unless the stream is cut off (or reported interrupted)."""
+
+    def __init__(self, deltas: List[str], complete: bool = True, interrupted: bool = False):
+        self.deltas = deltas
+        self.complete = complete
+        self.interrupted = interrupted
+
+    async def stream_response(self, prompt_messages, system_prompt=None, config=None, quota=None,
+                              last_user_message=None):
+        for delta in self.deltas:
+            yield GenerationChunk(content=delta)
+        if self.interrupted:
+            yield GenerationChunk(interrupted=True, prompt_tokens=40)
+        elif self.complete:
+            yield GenerationChunk(done=True, prompt_tokens=40, completion_tokens=len(self.deltas))
+
+
+class _TokenQuota:
+    def __init__(self):
+        self.settled: List[tuple] = []  # (reserved, used)
+
+    async def reserve(self, bot_uid, known_tokens_left, estimated_tokens):
+        return QuotaReservation(bot_uid=bot_uid, tokens=estimated_tokens)
+
+    async def settle(self, reservation, used_tokens):
+        self.settled.append((reservation.tokens, used_tokens))
+        return None
+
+
+class _Bots:
+    def __init__(self, bot: BotEntity):
+        self.bot = bot
+
+    async def get_bot(self, bot_uid):
+        return self.bot
+
+
+def _bot() -> BotEntity:
+    return BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(generation_model="stub"),
+    )
+
+
+async def _send(generation: _StreamingGeneration, token_quota: _TokenQuota):
+    store, bot, chunks = _Store(), _bot(), []
+
+    async def on_chunk(chunk: str) -> None:
+        chunks.append(chunk)
+
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_Bots(bot),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        token_quota_service=token_quota,
+    )
+    response = await handler(ProcessIncomingMessageCommand(
+        bot_uid=bot.uid, platform=ChatPlatform.PLAYGROUND, sender_id="42", content="hello",
+        timestamp=store.tick(), sender_number=None, sender_nickname=None, on_response_chunk=on_chunk,
+    ))
+    return response, chunks, next(iter(store.messages.values()))
+
+
+async def test_complete_stream_is_stored_as_one_reply():
+    token_quota = _TokenQuota()
+
+    response, chunks, messages = await _send(_StreamingGeneration(["Hel", "lo ", "there"]), token_quota)
+
+    assert chunks == ["Hel", "lo ", "there"]
+    assert response.ai_response_generated and response.ai_response_content == "Hello there"
+    assert [m.role for m in messages] == [MessageRole.USER, MessageRole.ASSISTANT]
+    assert token_quota.settled[0][1] == 43
+
+
+async def test_broken_stream_is_not_stored_as_a_reply():
+    token_quota = _TokenQuota()
+
+    response, chunks, messages = await _send(_StreamingGeneration(["Hel", "lo "], complete=False), token_quota)
+
+    assert chunks == ["Hel", "lo "]
+    assert response.reply_interrupted and not response.ai_response_generated
+    assert response.ai_response_content is None
+    assert [m.role for m in messages] == [MessageRole.USER]
+    reserved, used = token_quota.settled[0]
+    assert used == reserved > 0  # no usage came back, so the estimate stays charged
+
+
+async def test_stream_reported_interrupted_is_not_stored_as_a_reply():
+    token_quota = _TokenQuota()
+
+    response, _, messages = await _send(_StreamingGeneration(["Hel", "lo "], interrupted=True), token_quota)
+
+    assert response.reply_interrupted and not response.ai_response_generated
+    assert [m.role for m in messages] == [MessageRole.USER]
+    assert token_quota.settled[0][1] == 40  # the usage that did come back
@@ -0,0 +1,211 @@
+"""
+Generation admission: global, per-bot and per-owner caps hold, a busy bot
+cannot starve a quiet one, production goes before playground, and calls
+waiting past their deadline are shed with a fallback reply.
+"""
+
+import asyncio
+import uuid
+from typing import List, Tuple
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.entities.bot_entity import BotEntity
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.bot.domain.value_objects.bot_quota_vo import BotQuota
+from src.features.conversation.domain.enums import ChatPlatform
+from src.features.conversation.domain.services.process_incoming_message_command import ProcessIncomingMessageCommand
+from src.features.conversation.infra.services.process_incoming_message_impl import ProcessIncomingMessageCommandHandler
+from src.features.generation.application.services.generation_scheduler import (
+    GenerationOverloadedError,
+    GenerationPriority,
+    GenerationScheduler,
+)
+from tests.src.features.conversation.test_conversation_summarizer import _GenerationService, _Store, _UnitOfWork
+
+pytestmark = pytest.mark.anyio
+
+
+
+class _Backend:
+    """Records which bot got each slot and how many calls overlapped."""
+
+    def __init__(self):
+        self.order: List[str] = []
+        self.running = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+
+    async def call(self, scheduler: GenerationScheduler, name: str, bot_uid, owner_uid,
+                   priority=GenerationPriority.PRODUCTION, weight=1.0, hold=False):
+        async with scheduler.slot(bot_uid, owner_uid, priority, weight):
+            self.order.append(name)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            if hold:
+                await self.release.wait()
+            else:
+                await asyncio.sleep(0)
+            self.running -= 1
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _bots(count: int) -> List[Tuple[uuid.UUID, uuid.UUID]]:
+    return [(uuid.uuid4(), uuid.uuid4()) for _ in range(count)]
+
+
+async def test_global_and_per_bot_limits_hold():
+    scheduler = GenerationScheduler(max_concurrency=3, max_per_bot=2)
+    backend = _Backend()
+    (a, owner_a), (b, owner_b) = _bots(2)
+
+    calls = [asyncio.create_task(backend.call(scheduler, "a", a, owner_a, hold=True)) for _ in range(4)]
+    calls += [asyncio.create_task(backend.call(scheduler, "b", b, owner_b, hold=True)) for _ in range(4)]
+    await _settle()
+
+    assert backend.running == 3 and sorted(backend.order) == ["a", "a", "b"]
+    assert scheduler.stats()["queued"] == 5
+    backend.release.set()
+    await asyncio.gather(*calls)
+    assert backend.peak == 3 and scheduler.stats()["active"] == 0
+
+
+async def test_owner_limit_spans_the_owners_bots():
+    scheduler = GenerationScheduler(max_concurrency=10, max_per_bot=5, max_per_owner=3)
+    backend = _Backend()
+    owner = uuid.uuid4()
+    bot_uids = [uuid.uuid4() for _ in range(3)]
+
+    calls = [asyncio.create_task(backend.call(scheduler, str(i), bot_uids[i % 3], owner, hold=True)) for i in range(9)]
+    await _settle()
+
+    assert backend.running == 3
+    backend.release.set()
+    await asyncio.gather(*calls)
+
+
+async def test_a_busy_bot_does_not_starve_a_quiet_one():
+    scheduler = GenerationScheduler(max_concurrency=1, max_per_bot=1)
+    backend = _Backend()
+    (busy, owner_busy), (quiet, owner_quiet) = _bots(2)
+
+    calls = [asyncio.create_task(backend.call(scheduler, "busy", busy, owner_busy)) for _ in range(20)]
+    await asyncio.sleep(0)
+    calls += [asyncio.create_task(backend.call(scheduler, "quiet", quiet, owner_quiet)) for _ in range(3)]
+    await asyncio.gather(*calls)
+
+    # Once the quiet bot queues, the slot alternates instead of waiting out the busy bot's 20 calls
+    assert backend.order[:8] == ["busy", "busy", "quiet", "busy", "quiet", "busy", "quiet", "busy"]
+
+
+async def test_weights_share_slots_proportionally():
+    scheduler = GenerationScheduler(max_concurrency=1, max_per_bot=1)
+    backend = _Backend()
+    (heavy, owner_heavy), (light, owner_light) = _bots(2)
+
+    calls = [asyncio.create_task(backend.call(scheduler, "heavy", heavy, owner_heavy, weight=2.0)) for _ in range(30)]
+    calls += [asyncio.create_task(backend.call(scheduler, "light", light, owner_light)) for _ in range(30)]
+    await asyncio.gather(*calls)
+
+    first_30 = backend.order[:30]
+    assert 19 <= first_30.count("heavy") <= 21
+
+
+async def test_production_is_served_before_playground():
+    scheduler = GenerationScheduler(max_concurrency=1)
+    backend = _Backend()
+    bots = _bots(3)
+
+    holder = asyncio.create_task(backend.call(scheduler, "holder", *bots[0], hold=True))
+    await _settle()
+    playground = asyncio.create_task(backend.call(scheduler, "playground", *bots[1], GenerationPriority.PLAYGROUND))
+    await _settle()
+    production = asyncio.create_task(backend.call(scheduler, "production", *bots[2]))
+    await _settle()
+    backend.release.set()
+    await asyncio.gather(holder, playground, production)
+
+    assert backend.order == ["holder", "production", "playground"]
+
+
+async def test_calls_past_their_deadline_are_shed():
+    scheduler = GenerationScheduler(
+        max_concurrency=1, max_queued=2, queue_timeouts={GenerationPriority.PRODUCTION: 0.05},
+    )
+    backend = _Backend()
+    bots = _bots(4)
+    holder = asyncio.create_task(backend.call(scheduler, "holder", *bots[0], hold=True))
+    await _settle()
+
+    waiting = [asyncio.create_task(backend.call(scheduler, f"w{i}", *bots[i + 1])) for i in range(2)]
+    await _settle()
+    with pytest.raises(GenerationOverloadedError, match="queue full"):
+        await backend.call(scheduler, "rejected", *bots[3])
+    results = await asyncio.gather(*waiting, return_exceptions=True)
+
+    assert all(isinstance(r, GenerationOverloadedError) for r in results)
+    production = scheduler.stats()["classes"]["production"]
+    assert (production["shed_timeout"], production["shed_full"], production["waiting"]) == (2, 1, 0)
+    backend.release.set()
+    await holder
+    assert scheduler.stats()["queued"] == 0 and scheduler.stats()["active"] == 0
+
+
+async def test_cancelled_waiters_leave_the_queue():
+    scheduler = GenerationScheduler(max_concurrency=1)
+    backend = _Backend()
+    bots = _bots(2)
+    holder = asyncio.create_task(backend.call(scheduler, "holder", *bots[0], hold=True))
+    await _settle()
+    waiter = asyncio.create_task(backend.call(scheduler, "waiter", *bots[1]))
+    await _settle()
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    backend.release.set()
+    await holder
+
+    assert backend.order == ["holder"]
+    assert scheduler.stats()["queued"] == 0 and scheduler.stats()["active"] == 0
+
+
+async def test_shed_message_gets_the_fallback_reply():
+    scheduler = GenerationScheduler(max_concurrency=1, queue_timeouts={GenerationPriority.PRODUCTION: 0.01})
+    bot = BotEntity(
+        user_uid=uuid.uuid4(), bot_type="assistant", name="bot", quota=BotQuota(),
+        ai_settings=AIConfigurationSettings(generation_model="stub"),
+    )
+    store, generation = _Store(), _GenerationService()
+
+    class _Bots:
+        async def get_bot(self, bot_uid):
+            return bot
+
+    handler = ProcessIncomingMessageCommandHandler(
+        chat_uow=_UnitOfWork(store),
+        bot_lookup_service=_Bots(),
+        available_generation_services={"stub": generation},
+        _mediator=None,
+        generation_scheduler=scheduler,
+        overload_reply="Busy, try again soon.",
+    )
+    other = uuid.uuid4()
+    async with scheduler.slot(other, other):  # The only slot is taken
+        response = await handler(ProcessIncomingMessageCommand(
+            bot_uid=bot.uid, platform=ChatPlatform.TELEGRAM, sender_id="42", content="hi",
+            timestamp=store.tick(), sender_number=None, sender_nickname=None,
+        ))
+
+    assert response.overloaded and not response.ai_response_generated
+    assert response.message == "Busy, try again soon."
+    assert generation.reply_prompts == []
+    assert len(store.messages[response.conversation_uid]) == 1  # The user's message is kept
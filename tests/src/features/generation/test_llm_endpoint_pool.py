@@ -0,0 +1,273 @@
+"""
+LLM calls over several backend endpoints, against local stub servers that
+inject failures and latency: retries move to a healthy endpoint, a failing
+endpoint's circuit opens and later closes through a probe, slow calls are
+hedged, and streams are only retried before their first chunk.
+"""
+
+import asyncio
+import json
+from typing import List, Optional
+
+import pytest
+from aiohttp import web
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.generation.application.services.deepseek_generation_service_impl import DeepSeekGenerationServiceImpl
+from src.features.generation.application.services.generation_service import TokenUsage
+from src.infra.services.http.endpoint_pool import BackendCallError, CircuitBreaker, CircuitState, EndpointPool
+from src.infra.services.http.pooled_http_client import PooledHttpClient
+
+pytestmark = pytest.mark.anyio
+
+CONFIG = AIConfigurationSettings(generation_model="stub")
+PROMPT = [{"role": "user", "content": "hi"}]
+
+
+
+class _StubBackend:
+    """One local LLM endpoint; `fail_status`/`fail_times` and `delay` inject faults, `hold` pauses a stream."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail_status: Optional[int] = None, fail_times: int = 0,
+                 drop_after_first_chunk: bool = False, end_without_done: bool = False,
+                 hold: Optional[asyncio.Event] = None):
+        self.name = name
+        self.delay = delay
+        self.fail_status = fail_status
+        self.fail_times = fail_times
+        self.drop_after_first_chunk = drop_after_first_chunk
+        self.end_without_done = end_without_done
+        self.hold = hold
+        self.hits = 0
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> "_StubBackend":
+        app = web.Application()
+        app.router.add_post("/api/chat", self._chat)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api/chat"
+        return self
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+    async def _chat(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        self.hits += 1
+        if self.fail_status is not None and (self.fail_times < 0 or self.hits <= self.fail_times):
+            return web.Response(status=self.fail_status, text="injected failure")
+        await asyncio.sleep(self.delay)
+        if not payload["stream"]:
+            return web.json_response({
+                "message": {"role": "assistant", "content": f"from {self.name}"},
+                "prompt_eval_count": 10, "eval_count": 2,
+            })
+
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(json.dumps({"message": {"content": "Hel"}, "done": False}).encode() + b"\n")
+        if self.drop_after_first_chunk:
+            request.transport.close()
+            return response
+        if self.hold is not None:
+            await self.hold.wait()
+        await response.write(json.dumps({"message": {"content": "lo"}, "done": False}).encode() + b"\n")
+        if self.end_without_done:
+            await response.write_eof()
+            return response
+        await response.write(json.dumps({"done": True, "prompt_eval_count": 10, "eval_count": 2}).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+
+@pytest.fixture
+async def http_client():
+    client = PooledHttpClient(name="test-llm")
+    await client.start()
+    yield client
+    await client.close()
+
+
+async def _backends(*backends: _StubBackend) -> List[_StubBackend]:
+    return [await backend.start() for backend in backends]
+
+
+def _service(http_client, backends, **pool_options) -> DeepSeekGenerationServiceImpl:
+    pool_options.setdefault("backoff_base", 0.001)
+    pool = EndpointPool([backend.url for backend in backends], **pool_options)
+    return DeepSeekGenerationServiceImpl(http_client=http_client, endpoints=pool)
+
+
+async def test_failed_calls_are_retried_on_a_healthy_endpoint(http_client):
+    broken, healthy = await _backends(_StubBackend("broken", fail_status=503, fail_times=-1), _StubBackend("healthy"))
+    service = _service(http_client, [broken, healthy], failure_threshold=3)
+    try:
+        usage = TokenUsage()
+        replies = await asyncio.gather(*(
+            service.generate_response(PROMPT, config=CONFIG, usage=usage) for _ in range(50)
+        ))
+        hits_when_open = broken.hits
+        replies += [await service.generate_response(PROMPT, config=CONFIG) for _ in range(10)]
+    finally:
+        await broken.stop()
+        await healthy.stop()
+
+    assert replies == ["from healthy"] * 60
+    assert usage.total_tokens == 12
+    stats = service._endpoints.stats()
+    assert stats["endpoints"][broken.url]["state"] == "open" and stats["exhausted"] == 0
+    # The broken endpoint is not tried again while its circuit is open
+    assert broken.hits == hits_when_open < 50
+
+
+async def test_refused_requests_are_not_retried(http_client):
+    (backend,) = await _backends(_StubBackend("strict", fail_status=400, fail_times=-1))
+    service = _service(http_client, [backend], failure_threshold=1)
+    try:
+        reply = await service.generate_response(PROMPT, config=CONFIG)
+    finally:
+        await backend.stop()
+
+    assert reply is None and backend.hits == 1
+    # A 400 is the request's fault, not the endpoint's
+    assert service._endpoints.stats()["endpoints"][backend.url]["state"] == "closed"
+
+
+async def test_all_endpoints_down_gives_up_after_the_attempts(http_client):
+    (backend,) = await _backends(_StubBackend("down", fail_status=502, fail_times=-1))
+    service = _service(http_client, [backend], max_attempts=3)
+    try:
+        reply = await service.generate_response(PROMPT, config=CONFIG)
+    finally:
+        await backend.stop()
+
+    assert reply is None and backend.hits == 3
+    assert service._endpoints.stats()["retries"] == 2 and service._endpoints.stats()["exhausted"] == 1
+
+
+def test_open_circuit_lets_one_probe_through_after_the_cooldown():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN and not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.allow() and not breaker.allow()  # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED and breaker.times_opened == 2
+
+
+async def test_timeouts_and_bad_answers_count_against_the_circuit_but_cancellation_does_not():
+    pool = EndpointPool(["http://backend"], request_timeout=0.01, max_attempts=1, failure_threshold=2)
+    breaker = pool.endpoints[0].breaker
+
+    async def hang(url):
+        await asyncio.sleep(1.0)
+
+    async def garbage(url):
+        raise json.JSONDecodeError("Expecting value", "<html>", 0)
+
+    task = asyncio.ensure_future(pool.call(hang))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert breaker.state is CircuitState.CLOSED and pool.endpoints[0].failures == 0
+
+    with pytest.raises(BackendCallError):
+        await pool.call(hang)  # Timed out
+    with pytest.raises(json.JSONDecodeError):
+        await pool.call(garbage)
+    assert breaker.state is CircuitState.OPEN and pool.endpoints[0].failures == 2
+
+
+async def test_pool_metrics_count_connections_held_by_an_open_body(http_client):
+    finish = asyncio.Event()
+    (backend,) = await _backends(_StubBackend("stream", hold=finish))
+    try:
+        session = await http_client.get_session()
+        async with session.post(backend.url, json={"stream": True}) as resp:
+            await resp.content.readline()
+            held = http_client.metrics()
+            finish.set()
+            await resp.read()
+        released = http_client.metrics()
+    finally:
+        await backend.stop()
+
+    # The request was answered, but its connection stays taken until the body is read
+    assert held["requests_in_flight"] == 0 and held["connections_in_use"] == 1
+    assert released["connections_in_use"] == 0
+
+
+async def test_slow_calls_are_hedged_on_another_endpoint(http_client):
+    first, second = await _backends(_StubBackend("first"), _StubBackend("second"))
+    service = _service(http_client, [first, second], hedging=True, hedge_min_delay=0.02, hedge_min_samples=10)
+    try:
+        for _ in range(10):  # Learn the normal latency
+            await service.generate_response(PROMPT, config=CONFIG)
+        first.delay = second.delay = 1.0
+        # Whichever endpoint the call goes to first turns fast once the hedge is due
+        asyncio.get_running_loop().call_later(0.01, lambda: setattr(first, "delay", 0.0))
+        asyncio.get_running_loop().call_later(0.01, lambda: setattr(second, "delay", 0.0))
+        started = asyncio.get_running_loop().time()
+        reply = await service.generate_response(PROMPT, config=CONFIG)
+        elapsed = asyncio.get_running_loop().time() - started
+    finally:
+        await first.stop()
+        await second.stop()
+
+    assert reply in ("from first", "from second")
+    assert elapsed < 0.5
+    stats = service._endpoints.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+async def test_streams_are_retried_only_before_the_first_chunk(http_client):
+    (flaky,) = await _backends(_StubBackend("flaky", fail_status=503, fail_times=1))
+    service = _service(http_client, [flaky])
+    try:
+        chunks = [chunk async for chunk in service.stream_response(PROMPT, config=CONFIG)]
+    finally:
+        await flaky.stop()
+
+    assert "".join(chunk.content for chunk in chunks) == "Hello"
+    assert chunks[-1].done and chunks[-1].total_tokens == 12
+    assert flaky.hits == 2
+
+    (dropping,) = await _backends(_StubBackend("dropping", drop_after_first_chunk=True))
+    service = _service(http_client, [dropping])
+    try:
+        chunks = [chunk async for chunk in service.stream_response(PROMPT, config=CONFIG)]
+    finally:
+        await dropping.stop()
+
+    # The first chunk was already passed on, so the broken stream is not replayed
+    assert [chunk.content for chunk in chunks] == ["Hel"]
+    assert dropping.hits == 1
+
+
+async def test_stream_closed_without_its_end_marker_is_not_done(http_client):
+    (backend,) = await _backends(_StubBackend("cut", end_without_done=True))
+    service = _service(http_client, [backend])
+    try:
+        chunks = [chunk async for chunk in service.stream_response(PROMPT, config=CONFIG)]
+    finally:
+        await backend.stop()
+
+    assert "".join(chunk.content for chunk in chunks) == "Hello"
+    assert chunks[-1].interrupted and not any(chunk.done for chunk in chunks)
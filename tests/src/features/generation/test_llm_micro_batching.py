@@ -0,0 +1,148 @@
+"""
+Micro-batched LLM calls against a local stub batch server: concurrent calls
+for one model share a request, every caller gets its own reply and usage, a
+failed item or a slow batch only fails the callers concerned.
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+from aiohttp import web
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.features.bot.domain.value_objects.ai_configuration_vo import AIConfigurationSettings
+from src.features.generation.application.services.deepseek_generation_service_impl import DeepSeekGenerationServiceImpl
+from src.features.generation.application.services.generation_service import TokenUsage
+from src.features.generation.application.services.micro_batcher import MicroBatcher
+from src.infra.services.http.endpoint_pool import EndpointPool
+from src.infra.services.http.pooled_http_client import PooledHttpClient
+
+pytestmark = pytest.mark.anyio
+
+
+
+class _StubBatchServer:
+    """Echoes every prompt back; prompts containing "bad" fail, `delay` slows whole batches."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batch_sizes: List[int] = []
+        self.url = ""
+        self._runner = None
+
+    async def start(self) -> "_StubBatchServer":
+        app = web.Application()
+        app.router.add_post("/api/chat/batch", self._batch)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api/chat/batch"
+        return self
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+    async def _batch(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.batch_sizes.append(len(body["requests"]))
+        await asyncio.sleep(self.delay)
+        responses = []
+        for payload in body["requests"]:
+            prompt = payload["messages"][-1]["content"]
+            if "bad" in prompt:
+                responses.append({"error": "prompt rejected"})
+            else:
+                responses.append({
+                    "message": {"role": "assistant", "content": f"echo: {prompt}"},
+                    "prompt_eval_count": len(prompt), "eval_count": 1,
+                })
+        return web.json_response({"responses": responses})
+
+
+@pytest.fixture
+async def server():
+    stub = await _StubBatchServer().start()
+    yield stub
+    await stub.stop()
+
+
+@pytest.fixture
+async def http_client():
+    client = PooledHttpClient(name="test-llm")
+    await client.start()
+    yield client
+    await client.close()
+
+
+def _service(http_client, server, max_batch_size=4, request_timeout=5.0) -> DeepSeekGenerationServiceImpl:
+    return DeepSeekGenerationServiceImpl(
+        http_client=http_client,
+        endpoints=EndpointPool(["http://127.0.0.1:1/unused"]),
+        batch_endpoints=EndpointPool([server.url], request_timeout=request_timeout, max_attempts=1),
+        max_batch_size=max_batch_size,
+        max_batch_wait=0.01,
+    )
+
+
+async def _ask(service, prompt: str):
+    usage = TokenUsage()
+    reply = await service.generate_response(
+        [{"role": "user", "content": prompt}], config=AIConfigurationSettings(generation_model="stub"), usage=usage,
+    )
+    return reply, usage
+
+
+async def test_concurrent_calls_share_batches_and_get_their_own_replies(http_client, server):
+    service = _service(http_client, server, max_batch_size=4)
+
+    results = await asyncio.gather(*(_ask(service, f"question {i}") for i in range(10)))
+
+    assert [reply for reply, _ in results] == [f"echo: question {i}" for i in range(10)]
+    assert [usage.prompt_tokens for _, usage in results] == [len(f"question {i}") for i in range(10)]
+    assert server.batch_sizes == [4, 4, 2]
+    stats = service.batching_stats()
+    assert (stats["batches"], stats["items"], stats["full_batches"], stats["max_batch_size"]) == (3, 10, 2, 4)
+
+
+async def test_a_failed_item_only_fails_its_own_caller(http_client, server):
+    service = _service(http_client, server)
+
+    results = await asyncio.gather(_ask(service, "good one"), _ask(service, "bad one"), _ask(service, "good two"))
+
+    assert [reply for reply, _ in results] == ["echo: good one", None, "echo: good two"]
+    assert server.batch_sizes == [3]
+    assert service.batching_stats()["item_errors"] == 1
+
+
+async def test_slow_batches_time_out_per_request(http_client, server):
+    server.delay = 0.5
+    service = _service(http_client, server, request_timeout=0.05)
+
+    results = await asyncio.gather(_ask(service, "a"), _ask(service, "b"))
+
+    assert [reply for reply, _ in results] == [None, None]
+    assert service.batching_stats()["timeouts"] == 2
+
+
+async def test_callers_that_give_up_before_the_flush_are_left_out():
+    sent: List[List[str]] = []
+
+    async def send_batch(key, items):
+        sent.append(items)
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(send_batch, max_batch_size=10, max_wait=0.05)
+    quitter = asyncio.ensure_future(batcher.submit("model", "quitter"))
+    stayer = asyncio.ensure_future(batcher.submit("model", "stayer"))
+    other_model = asyncio.ensure_future(batcher.submit("other", "solo"))
+    await asyncio.sleep(0)
+    quitter.cancel()
+
+    assert await stayer == "STAYER" and await other_model == "SOLO"
+    assert sorted(sent) == [["solo"], ["stayer"]]
@@ -0,0 +1,275 @@
+"""
+TelegramListenerSupervisor against in-memory Telethon, unit of work and lease
+stand-ins: restore, reconnect with backoff, auth failures and lease ownership.
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+
+async def _import_telegram_package():
+    # The package __init__ pulls in the API routes, whose auth dependencies log at import time
+    import src.features.integrations.messengers  # noqa: F401
+
+
+asyncio.run(_import_telegram_package())
+
+from src.features.integrations.messengers.telegram.domain.entities.telegram_account_link_entity import \
+    TelegramAccountLinkEntity
+from src.features.integrations.messengers.telegram.exceptions.telegram_exceptions import TelegramAuthError
+from src.features.integrations.messengers.telegram.infra.services.telegram_listener_supervisor import (
+    ListenerState,
+    TelegramListenerSupervisor,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+
+class FakeTelethonService:
+    def __init__(self, start_delay: float = 0.0):
+        self.start_delay = start_delay
+        self.starts: Dict[uuid.UUID, int] = {}
+        self.unauthorized: set = set()
+        self.disconnects: Dict[uuid.UUID, asyncio.Event] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def start_message_listener(self, service_uid, session_string, bot_uid, event_handler_service):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.start_delay)
+        finally:
+            self.in_flight -= 1
+        if service_uid in self.unauthorized:
+            raise TelegramAuthError("session revoked")
+        self.starts[service_uid] = self.starts.get(service_uid, 0) + 1
+        disconnected = self.disconnects[service_uid] = asyncio.Event()
+        return asyncio.create_task(disconnected.wait())
+
+    async def stop_message_listener(self, service_uid):
+        pass
+
+    def disconnect(self, service_uid):
+        self.disconnects[service_uid].set()
+
+
+class FakeLinkRepository:
+    def __init__(self, links: List[TelegramAccountLinkEntity]):
+        self.links = links
+        self.connected: Dict[uuid.UUID, object] = {}
+        self.pages = 0
+
+    async def find_active_sessions_page(self, after_uid, limit):
+        self.pages += 1
+        ordered = sorted((link for link in self.links if link.is_active), key=lambda link: link.uid)
+        if after_uid is not None:
+            ordered = [link for link in ordered if link.uid > after_uid]
+        return ordered[:limit]
+
+    async def mark_connected(self, uid, connected_at):
+        self.connected[uid] = connected_at
+
+
+class FakeUnitOfWork:
+    def __init__(self, repository: FakeLinkRepository):
+        self.account_link_repository = repository
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeLinkerService:
+    async def find_active_service_uids(self, platform, linked_account_uids):
+        return {}
+
+
+class FakeLeaseManager:
+    """Leases shared by every manager built on the same `held` dict."""
+
+    def __init__(self, held: Dict[str, str], owner_id: str, ttl_seconds: float = 45.0):
+        self.held = held
+        self.owner_id = owner_id
+        self.ttl_seconds = ttl_seconds
+        self.unreachable = False
+
+    async def acquire(self, name):
+        if self.held.setdefault(name, self.owner_id) == self.owner_id:
+            return True
+        return False
+
+    async def renew(self, name):
+        if self.unreachable:
+            raise ConnectionError("redis is unreachable")
+        return self.held.get(name) == self.owner_id
+
+    async def release(self, name):
+        if self.held.get(name) == self.owner_id:
+            del self.held[name]
+
+
+async def _make_link(**kwargs) -> TelegramAccountLinkEntity:
+    return TelegramAccountLinkEntity(
+        uid=kwargs.pop("uid", uuid.uuid4()),
+        bot_uid=kwargs.pop("bot_uid", uuid.uuid4()),
+        platform_user_uid=uuid.uuid4(),
+        phone_number="+10000000000",
+        session_string=kwargs.pop("session_string", "session"),
+        is_active=True,
+    )
+
+
+def _supervisor(telethon, repository, lease_manager=None, **kwargs) -> TelegramListenerSupervisor:
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("backoff_max", 0.05)
+    return TelegramListenerSupervisor(
+        telethon_service=telethon,
+        event_handler_service=object(),
+        unit_of_work_factory=lambda: FakeUnitOfWork(repository),
+        bot_platform_linker_service=FakeLinkerService(),
+        lease_manager=lease_manager,
+        **kwargs,
+    )
+
+
+async def _until(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+def test_backoff_is_jittered_and_capped():
+    supervisor = _supervisor(object(), None, backoff_base=1.0, backoff_max=30.0)
+
+    for attempt, cap in [(1, 1.0), (2, 2.0), (4, 8.0), (6, 30.0), (20, 30.0)]:
+        delays = [supervisor._backoff_delay(attempt) for _ in range(200)]
+        assert all(cap / 2 <= delay <= cap for delay in delays)
+
+
+async def test_sync_restores_every_active_link_in_batches():
+    links = [await _make_link() for _ in range(7)]
+    telethon, repository = FakeTelethonService(), FakeLinkRepository(links)
+    supervisor = _supervisor(telethon, repository, batch_size=3)
+
+    await supervisor.sync()
+    await _until(lambda: len(repository.connected) == 7)
+
+    assert repository.pages == 3
+    assert {health.link_uid for health in supervisor.health()} == {link.uid for link in links}
+    assert all(health.state == ListenerState.CONNECTED for health in supervisor.health())
+    await supervisor.stop()
+
+
+async def test_starts_are_bounded():
+    links = [await _make_link() for _ in range(10)]
+    telethon = FakeTelethonService(start_delay=0.02)
+    supervisor = _supervisor(telethon, FakeLinkRepository(links), max_concurrent_starts=2)
+
+    await supervisor.sync()
+    await _until(lambda: sum(telethon.starts.values()) == 10)
+
+    assert telethon.max_in_flight == 2
+    await supervisor.stop()
+
+
+async def test_disconnected_listener_is_restarted():
+    link = await _make_link()
+    telethon, repository = FakeTelethonService(), FakeLinkRepository([link])
+    supervisor = _supervisor(telethon, repository)
+
+    await supervisor.sync()
+    await _until(lambda: telethon.starts.get(link.uid) == 1)
+    telethon.disconnect(link.uid)
+    await _until(lambda: telethon.starts.get(link.uid) == 2)
+    await _until(lambda: supervisor.health()[0].state == ListenerState.CONNECTED)
+
+    health = supervisor.health()[0]
+    assert health.reconnects == 1
+    assert health.failed_attempts == 1  # the first connection did not stay up long enough to count as stable
+    await supervisor.stop()
+
+
+async def test_unauthorized_session_is_not_retried():
+    link = await _make_link()
+    telethon = FakeTelethonService()
+    telethon.unauthorized.add(link.uid)
+    supervisor = _supervisor(telethon, FakeLinkRepository([link]))
+
+    await supervisor.sync()
+    await _until(lambda: supervisor.health()[0].state == ListenerState.UNAUTHORIZED)
+    await asyncio.sleep(0.1)
+
+    assert telethon.starts == {}
+    await supervisor.stop()
+
+
+async def test_session_change_restarts_listener_and_inactive_link_is_dropped():
+    link = await _make_link()
+    telethon, repository = FakeTelethonService(), FakeLinkRepository([link])
+    supervisor = _supervisor(telethon, repository)
+    await supervisor.sync()
+    await _until(lambda: telethon.starts.get(link.uid) == 1)
+
+    repository.links = [await _make_link(uid=link.uid, bot_uid=link.bot_uid, session_string="new-session")]
+    await supervisor.sync()
+    await _until(lambda: telethon.starts.get(link.uid) == 2)
+
+    repository.links[0].is_active = False
+    await supervisor.sync()
+    assert supervisor.health() == []
+
+
+async def test_lease_keeps_link_on_a_single_worker():
+    link = await _make_link()
+    held: Dict[str, str] = {}
+    first_telethon, second_telethon = FakeTelethonService(), FakeTelethonService()
+    repository = FakeLinkRepository([link])
+    first = _supervisor(first_telethon, repository, FakeLeaseManager(held, "worker-1"))
+    second = _supervisor(second_telethon, repository, FakeLeaseManager(held, "worker-2"))
+
+    await first.sync()
+    await second.sync()
+    await _until(lambda: first_telethon.starts.get(link.uid) == 1)
+    assert second.health() == []
+
+    # The first worker goes away; its lease is released and the second one takes over
+    await first.stop()
+    await second.sync()
+    await _until(lambda: second_telethon.starts.get(link.uid) == 1)
+    await second.stop()
+    assert held == {}
+
+
+async def test_failed_renewals_lose_the_lease_once_its_ttl_has_passed():
+    link = await _make_link()
+    telethon = FakeTelethonService()
+    lease_manager = FakeLeaseManager({}, "worker-1", ttl_seconds=0.2)
+    supervisor = _supervisor(telethon, FakeLinkRepository([link]), lease_manager)
+
+    await supervisor.sync()
+    await _until(lambda: telethon.starts.get(link.uid) == 1)
+
+    # A blip shorter than the lease TTL keeps the listener
+    lease_manager.unreachable = True
+    await supervisor.sync()
+    assert [h.link_uid for h in supervisor.health()] == [link.uid]
+
+    # Past the TTL another worker may hold the link, so this one stops listening
+    await asyncio.sleep(0.25)
+    await supervisor.sync()
+    assert supervisor.health() == []
+    await supervisor.stop()
@@ -0,0 +1,200 @@
+"""
+Own-identity and sender profile caching in TelegramEventHandlerServiceHandler:
+a burst of messages should not cost a get_me()/get_sender() round trip each.
+Queued messages need the listener's client registered in this process.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+
+async def _import_telegram_package():
+    # The package __init__ pulls in the API routes, whose auth dependencies log at import time
+    import src.features.integrations.messengers  # noqa: F401
+
+
+asyncio.run(_import_telegram_package())
+
+from src.features.integrations.messengers.telegram.application.services.telegram_event_handler_service_impl import \
+    TelegramEventHandlerServiceHandler
+from src.features.integrations.messengers.telegram.infra.services.sender_profile_cache import (
+    SenderProfile,
+    SenderProfileCache,
+)
+from src.infra.services.queue.exceptions import WorkNotReadyError
+
+pytestmark = pytest.mark.anyio
+
+
+
+class FakeClient:
+    def __init__(self):
+        self.get_me_calls = 0
+        self.get_entity_calls = 0
+
+    async def get_me(self):
+        self.get_me_calls += 1
+        return SimpleNamespace(id=4242)
+
+    async def get_entity(self, entity):
+        self.get_entity_calls += 1
+        return SimpleNamespace(username=f"renamed{entity}", phone="+200")
+
+    async def send_message(self, chat_id, text, reply_to=None):
+        pass
+
+
+class FakeEvent:
+    def __init__(self, sender_id: int, text: str = "hi", sender=None):
+        self.is_private = True
+        self.is_group = False
+        self.id = 1
+        self.chat_id = sender_id
+        self.raw_text = text
+        self.sender_id = sender_id
+        self.sender = sender
+        self.message = SimpleNamespace(date=datetime(2024, 1, 1))
+        self.replies = []
+        self.get_sender_calls = 0
+
+    async def get_sender(self):
+        self.get_sender_calls += 1
+        return SimpleNamespace(username=f"user{self.sender_id}", phone="+100")
+
+    async def reply(self, text):
+        self.replies.append(text)
+
+
+class FakeMediator:
+    def __init__(self):
+        self.commands = []
+
+    async def execute(self, command):
+        self.commands.append(command)
+        return SimpleNamespace(ai_response_generated=True, ai_response_content="ok", message=None)
+
+
+def _handler(cache=None):
+    mediator = FakeMediator()
+    return TelegramEventHandlerServiceHandler(telethon_service=None, mediator=mediator, sender_profile_cache=cache), mediator
+
+
+async def test_identity_remembered_at_listener_start_is_reused():
+    handler, mediator = _handler()
+    client, service_uid = FakeClient(), uuid.uuid4()
+    handler.remember_identity(service_uid, await client.get_me())
+
+    for _ in range(5):
+        await handler.handle_new_telethon_message(FakeEvent(1), client, uuid.uuid4(), service_uid)
+
+    assert client.get_me_calls == 1
+    assert len(mediator.commands) == 5
+    assert handler.stats()["identity_hits"] == 5
+
+
+async def test_identity_is_fetched_once_when_not_remembered():
+    handler, _ = _handler()
+    client, service_uid = FakeClient(), uuid.uuid4()
+
+    for _ in range(3):
+        await handler.handle_new_telethon_message(FakeEvent(1), client, uuid.uuid4(), service_uid)
+    assert client.get_me_calls == 1
+
+    # A stopped listener forgets its account; the next message reads it again
+    handler.forget_identity(service_uid)
+    await handler.handle_new_telethon_message(FakeEvent(1), client, uuid.uuid4(), service_uid)
+    assert client.get_me_calls == 2
+    assert handler.stats()["identity_misses"] == 2
+
+
+async def test_sender_profile_is_fetched_once_per_sender():
+    handler, mediator = _handler()
+    client, service_uid = FakeClient(), uuid.uuid4()
+    events = [FakeEvent(sender_id) for sender_id in (1, 2, 1, 1, 2)]
+
+    for event in events:
+        await handler.handle_new_telethon_message(event, client, uuid.uuid4(), service_uid)
+
+    assert sum(event.get_sender_calls for event in events) == 2
+    assert [command.sender_nickname for command in mediator.commands] == ["user1", "user2", "user1", "user1", "user2"]
+    assert handler.stats()["sender_profile_hits"] == 3
+
+
+async def test_sender_attached_to_update_avoids_get_sender():
+    handler, mediator = _handler()
+    event = FakeEvent(7, sender=SimpleNamespace(username="attached", phone=None))
+
+    await handler.handle_new_telethon_message(event, FakeClient(), uuid.uuid4(), uuid.uuid4())
+
+    assert event.get_sender_calls == 0
+    assert mediator.commands[0].sender_nickname == "attached"
+
+
+async def test_identity_refresh_reads_the_account_again():
+    handler, _ = _handler()
+    client, service_uid = FakeClient(), uuid.uuid4()
+    handler.remember_identity(service_uid, SimpleNamespace(id=1111))
+
+    assert await handler.get_own_telegram_id(service_uid, client) == "1111"
+    assert await handler.get_own_telegram_id(service_uid, client, refresh=True) == "4242"
+    assert await handler.get_own_telegram_id(service_uid, client) == "4242"
+    assert client.get_me_calls == 1
+
+
+async def test_sender_profile_refresh_fetches_the_user_again():
+    handler, mediator = _handler()
+    client, service_uid = FakeClient(), uuid.uuid4()
+    await handler.handle_new_telethon_message(FakeEvent(1), client, uuid.uuid4(), service_uid)
+
+    profile = await handler.get_sender_profile(FakeEvent(1), client, refresh=True)
+    event = FakeEvent(1)
+    await handler.handle_new_telethon_message(event, client, uuid.uuid4(), service_uid)
+
+    assert profile == SenderProfile(username="renamed1", phone="+200")
+    assert client.get_entity_calls == 1
+    assert event.get_sender_calls == 0  # the refreshed profile replaced the cached one
+    assert [command.sender_nickname for command in mediator.commands] == ["user1", "renamed1"]
+
+
+async def test_queued_message_waits_for_the_listener_client():
+    handler, mediator = _handler()
+    client, service_uid = FakeClient(), uuid.uuid4()
+    payload = {
+        "service_uid": str(service_uid), "bot_uid": str(uuid.uuid4()), "sender_id": "1", "chat_id": 1,
+        "message_id": 9, "content": "hi", "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat(),
+        "sender_nickname": None, "sender_phone": None,
+    }
+
+    # Replayed from the queue after a restart, before the listener is back
+    with pytest.raises(WorkNotReadyError):
+        await handler.process_queued_message("key", payload)
+    assert mediator.commands == []
+
+    handler.register_client(service_uid, client)
+    await handler.process_queued_message("key", payload)
+    assert len(mediator.commands) == 1
+
+
+def test_sender_cache_expires_and_is_bounded(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    cache = SenderProfileCache(ttl_seconds=10, max_size=2)
+
+    cache.set("1", SenderProfile(username="a"))
+    cache.set("2", SenderProfile(username="b"))
+    cache.set("3", SenderProfile(username="c"))
+    assert cache.get("1") is None
+    assert cache.get("3").username == "c"
+
+    now[0] += 11
+    assert cache.get("3") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2, "evictions": 1}
@@ -0,0 +1,346 @@
+"""
+Keyed work queues: per-key ordering, cross-key parallelism, backpressure and,
+for the Redis Streams backend, replay of entries read but never acknowledged,
+routing jobs to the process that owns them (in order) and adopting a dead
+process's streams, retries and dead letters.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, List
+
+import pytest
+
+from src.infra.logging.setup_async_logging import async_logger
+
+# No log handlers are configured in tests
+async_logger.disabled = True
+
+from src.infra.services.queue.exceptions import WorkNotReadyError, WorkQueueFullError
+from src.infra.services.queue.keyed_work_queue import KeyedWorkQueue
+from src.infra.services.queue.redis_stream_work_queue import RedisStreamWorkQueue
+
+pytestmark = pytest.mark.anyio
+
+
+
+class Recorder:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.seen: Dict[str, List[int]] = defaultdict(list)
+        self.running: Dict[str, int] = defaultdict(int)
+        self.overlapping_same_key = False
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    async def __call__(self, key, payload):
+        self.running[key] += 1
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        if self.running[key] > 1:
+            self.overlapping_same_key = True
+        try:
+            await asyncio.sleep(self.delay)
+            if payload.get("fail"):
+                raise RuntimeError("job failed")
+            self.seen[key].append(payload["n"])
+        finally:
+            self.running[key] -= 1
+            self.concurrent -= 1
+
+
+async def test_jobs_of_one_key_run_in_order_and_keys_run_in_parallel():
+    queue = KeyedWorkQueue("test", workers=4, max_pending=100)
+    recorder = Recorder(delay=0.01)
+    await queue.start(recorder)
+
+    for n in range(5):
+        for key in ("a", "b", "c", "d"):
+            await queue.submit(key, {"n": n})
+    await queue.stop()
+
+    assert all(recorder.seen[key] == list(range(5)) for key in "abcd")
+    assert not recorder.overlapping_same_key
+    assert recorder.max_concurrent == 4
+    assert queue.stats()["completed"] == 20
+
+
+async def test_failed_job_does_not_block_its_key():
+    queue = KeyedWorkQueue("test", workers=2)
+    recorder = Recorder()
+    await queue.start(recorder)
+
+    await queue.submit("a", {"n": 0, "fail": True})
+    await queue.submit("a", {"n": 1})
+    await queue.stop()
+
+    assert recorder.seen["a"] == [1]
+    assert queue.stats()["failed"] == 1
+
+
+async def test_full_queue_applies_backpressure_then_rejects():
+    queue = KeyedWorkQueue("test", workers=1, max_pending=2, max_pending_per_key=2, submit_timeout=0.05)
+    release = asyncio.Event()
+
+    async def blocked(key, payload):
+        await release.wait()
+
+    await queue.start(blocked)
+    await queue.submit("a", {"n": 0})
+    await asyncio.sleep(0)  # the worker takes the first job, freeing its slot
+    await queue.submit("a", {"n": 1})
+    await queue.submit("b", {"n": 2})
+
+    with pytest.raises(WorkQueueFullError):
+        await queue.submit("c", {"n": 3})
+    assert queue.stats()["rejected"] == 1
+
+    # A submit that is waiting goes through as soon as a worker frees a slot
+    waiting = asyncio.create_task(queue.submit("c", {"n": 3}))
+    release.set()
+    await asyncio.wait_for(waiting, timeout=1.0)
+    await queue.stop()
+
+
+async def test_per_key_bound_does_not_block_other_keys():
+    queue = KeyedWorkQueue("test", workers=1, max_pending=10, max_pending_per_key=1, submit_timeout=0.05)
+    await queue.submit("a", {"n": 0})
+
+    with pytest.raises(WorkQueueFullError):
+        await queue.submit("a", {"n": 1})
+    await queue.submit("b", {"n": 0})
+
+
+class FakeRedisStreams:
+    """Just enough of the Redis Streams (and key/set) commands for one consumer per stream; keys never expire."""
+
+    def __init__(self):
+        self.streams: Dict[str, List] = defaultdict(list)
+        self.delivered: Dict[str, set] = defaultdict(set)
+        self.acked: Dict[str, set] = defaultdict(set)
+        self.values: Dict[str, bytes] = {}
+        self.sets: Dict[str, set] = defaultdict(set)
+        self.ttls: Dict[str, int] = {}
+        self._next_id = 0
+
+    async def set(self, key, value, nx=False, px=None, get=False):
+        previous = self.values.get(key)
+        if nx and previous is not None:
+            return None
+        self.values[key] = value.encode() if isinstance(value, str) else value
+        if px is not None:
+            self.ttls[key] = px
+        return previous if get else True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.streams.pop(key, None)
+
+    async def sadd(self, key, member):
+        self.sets[key].add(member.encode())
+
+    async def smembers(self, key):
+        return set(self.sets[key])
+
+    async def srem(self, key, member):
+        self.sets[key].discard(member.encode())
+
+    async def xrange(self, stream, min="-", max="+", count=None):
+        return list(self.streams[stream][:count])
+
+    async def xgroup_create(self, stream, group, id="0", mkstream=False):
+        self.streams.setdefault(stream, [])
+
+    async def xlen(self, stream):
+        return len(self.streams[stream])
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self._next_id += 1
+        entry_id = f"{self._next_id}-0".encode()
+        self.streams[stream].append((entry_id, {k.encode(): v.encode() for k, v in fields.items()}))
+        return entry_id
+
+    async def xreadgroup(self, group, consumer, streams, count=10, block=0):
+        (stream, last_id), = streams.items()
+        if last_id == "0":
+            entries = [e for e in self.streams[stream] if e[0] in self.delivered[stream] and e[0] not in self.acked[stream]]
+        else:
+            entries = [e for e in self.streams[stream] if e[0] not in self.delivered[stream]]
+        entries = entries[:count]
+        if not entries:
+            await asyncio.sleep(block / 1000)
+            return []
+        self.delivered[stream].update(entry_id for entry_id, _ in entries)
+        return [[stream.encode(), entries]]
+
+    async def xack(self, stream, group, entry_id):
+        self.acked[stream].add(entry_id)
+
+    async def xdel(self, stream, entry_id):
+        self.streams[stream] = [e for e in self.streams[stream] if e[0] != entry_id]
+
+
+async def test_redis_stream_queue_keeps_key_order():
+    redis = FakeRedisStreams()
+    queue = RedisStreamWorkQueue("test", "ingest:", namespace="host", partitions=3, block_ms=5, redis=redis)
+    recorder = Recorder()
+    await queue.start(recorder)
+
+    for n in range(5):
+        for key in ("a", "b", "c", "d"):
+            await queue.submit(key, {"n": n})
+    while queue.stats()["completed"] < 20:
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    assert all(recorder.seen[key] == list(range(5)) for key in "abcd")
+    assert not recorder.overlapping_same_key
+    assert all(len(entries) == 0 for entries in redis.streams.values())
+
+
+async def test_redis_stream_queue_replays_unacknowledged_entries():
+    redis = FakeRedisStreams()
+    first = RedisStreamWorkQueue("test", "ingest:", namespace="host", partitions=1, block_ms=5, redis=redis)
+    started = asyncio.Event()
+
+    async def crash_midway(key, payload):
+        started.set()
+        await asyncio.Event().wait()
+
+    await first.start(crash_midway)
+    await first.submit("a", {"n": 0})
+    await asyncio.wait_for(started.wait(), timeout=1.0)
+    await first.stop()
+
+    second = RedisStreamWorkQueue("test", "ingest:", namespace="host", partitions=1, block_ms=5, redis=redis)
+    recorder = Recorder()
+    await second.start(recorder)
+    while not recorder.seen["a"]:
+        await asyncio.sleep(0.01)
+    await second.stop()
+
+    assert recorder.seen["a"] == [0]
+
+
+def test_submit_is_rejected_when_the_stream_is_full():
+    async def scenario():
+        redis = FakeRedisStreams()
+        queue = RedisStreamWorkQueue(
+            "test", "ingest:", namespace="host", partitions=1, max_pending_per_partition=1, submit_timeout=0.05, redis=redis
+        )
+        await queue.submit("a", {"n": 0})
+        with pytest.raises(WorkQueueFullError):
+            await queue.submit("a", {"n": 1})
+
+    asyncio.run(scenario())
+
+
+async def test_redis_stream_queues_of_two_processes_do_not_share_a_consumer():
+    redis = FakeRedisStreams()
+    first = RedisStreamWorkQueue("test", "ingest:", redis=redis)
+    second = RedisStreamWorkQueue("test", "ingest:", redis=redis)
+
+    assert first.namespace != second.namespace
+
+
+async def test_redis_stream_job_is_forwarded_to_the_process_owning_its_route():
+    redis = FakeRedisStreams()
+    old = RedisStreamWorkQueue("test", "ingest:", namespace="old", partitions=2, block_ms=5,
+                               route_by="service_uid", redis=redis)
+    new = RedisStreamWorkQueue("test", "ingest:", namespace="new", partitions=2, block_ms=5,
+                               route_by="service_uid", redis=redis)
+    old_recorder, new_recorder = Recorder(), Recorder()
+    await new.start(new_recorder)
+
+    # Accepted by the old process, then the account's listener moved to the new one
+    await old.submit("a", {"n": 0, "service_uid": "s1"})
+    await new.submit("b", {"n": 1, "service_uid": "s1"})
+    await old.start(old_recorder)
+    while new.stats()["completed"] < 2:
+        await asyncio.sleep(0.01)
+    await old.stop()
+    await new.stop()
+
+    assert new_recorder.seen == {"a": [0], "b": [1]} and not old_recorder.seen
+    assert old.stats()["forwarded"] == 1
+
+
+async def test_redis_stream_forwarded_job_runs_before_newer_jobs_of_its_key():
+    redis = FakeRedisStreams()
+    old = RedisStreamWorkQueue("test", "ingest:", namespace="old", partitions=2, block_ms=5,
+                               route_by="service_uid", redis=redis)
+    new = RedisStreamWorkQueue("test", "ingest:", namespace="new", partitions=2, block_ms=5,
+                               route_by="service_uid", redis=redis)
+    await old._heartbeat()
+    recorder = Recorder()
+
+    # Two messages of one conversation reached the old process, the third the new one
+    await old.submit("a", {"n": 0, "service_uid": "s1"})
+    await old.submit("a", {"n": 1, "service_uid": "s1"})
+    await new.submit("a", {"n": 2, "service_uid": "s1"})
+    await new.start(recorder)
+    await asyncio.sleep(0.05)
+    assert recorder.seen["a"] == []  # held back until the old process hands its jobs over
+
+    await old.start(Recorder())
+    while new.stats()["completed"] < 3:
+        await asyncio.sleep(0.01)
+    await old.stop()
+    await new.stop()
+
+    assert recorder.seen["a"] == [0, 1, 2]
+    assert redis.ttls["ingest:route:s1"] == 86400 * 1000
+
+
+async def test_redis_stream_job_that_is_not_ready_is_retried_then_dead_lettered():
+    redis = FakeRedisStreams()
+    queue = RedisStreamWorkQueue("test", "ingest:", namespace="host", partitions=1, block_ms=5,
+                                 max_attempts=3, retry_backoff=0.001, redis=redis)
+    attempts: Dict[int, int] = defaultdict(int)
+
+    async def needs_client(key, payload):
+        attempts[payload["n"]] += 1
+        # Job 1 finds its client on the second try, job 0 never does
+        if payload["n"] == 0 or attempts[1] < 2:
+            raise WorkNotReadyError("no client yet")
+
+    await queue.start(needs_client)
+    await queue.submit("a", {"n": 1})
+    await queue.submit("b", {"n": 0})
+    while queue.stats()["dead_lettered"] < 1:
+        await asyncio.sleep(0.01)
+    await queue.stop()
+
+    assert attempts == {1: 2, 0: 3}
+    assert queue.stats()["retried"] == 3 and queue.stats()["completed"] == 1
+    (_, fields), = redis.streams["ingest:dead"]
+    assert fields[b"key"] == b"b" and fields[b"error"] == b"no client yet"
+
+
+async def test_redis_stream_entries_of_a_dead_process_are_adopted():
+    redis = FakeRedisStreams()
+    dead = RedisStreamWorkQueue("test", "ingest:", namespace="dead", partitions=2, block_ms=5, redis=redis)
+    await dead._heartbeat()
+    for n in range(3):
+        await dead.submit("a", {"n": n})
+    # Its heartbeat expires
+    await redis.delete("ingest:alive:dead")
+
+    live = RedisStreamWorkQueue("test", "ingest:", namespace="live", partitions=2, block_ms=5,
+                                heartbeat_seconds=0.01, redis=redis)
+    recorder = Recorder()
+    await live.start(recorder)
+    while live.stats()["completed"] < 3:
+        await asyncio.sleep(0.01)
+    await live.stop()
+
+    assert recorder.seen["a"] == [0, 1, 2]
+    assert live.stats()["adopted"] == 3
+    assert b"dead" not in redis.sets["ingest:namespaces"]